@@ -1,14 +1,19 @@
 from enum import Enum
 from importlib.metadata import distributions
+from typing import Optional
 
 import torch
-from fastapi import Body
+from fastapi import Body, Query
 from fastapi.routing import APIRouter
 from pydantic import BaseModel, Field
 
 from invokeai.app.api.dependencies import ApiDependencies
 from invokeai.app.services.config.config_default import InvokeAIAppConfig, get_config
 from invokeai.app.services.invocation_cache.invocation_cache_common import InvocationCacheStatus
+from invokeai.app.services.performance_history.performance_history_common import (
+    PerformanceHistorySummary,
+    PerformanceRegression,
+)
 from invokeai.backend.image_util.infill_methods.patchmatch import PatchMatch
 from invokeai.backend.util.logging import logging
 from invokeai.version import __version__
@@ -135,3 +140,58 @@ async def disable_invocation_cache() -> None:
 async def get_invocation_cache_status() -> InvocationCacheStatus:
     """Clears the invocation cache"""
     return ApiDependencies.invoker.services.invocation_cache.get_status()
+
+
+@app_router.get(
+    "/performance_history",
+    operation_id="get_performance_history",
+    responses={200: {"model": list[PerformanceHistorySummary]}},
+)
+async def get_performance_history(
+    app_version: Optional[str] = Query(default=None, description="Only include invocations run by this app version"),
+    invocation_type: Optional[str] = Query(default=None, description="Only include invocations of this type"),
+) -> list[PerformanceHistorySummary]:
+    """Gets invocation timing percentiles, grouped by invocation type, model, resolution, steps and app version"""
+    return ApiDependencies.invoker.services.performance_history.get_summaries(
+        app_version=app_version, invocation_type=invocation_type
+    )
+
+
+@app_router.get(
+    "/performance_history/versions",
+    operation_id="get_performance_history_versions",
+    responses={200: {"model": list[str]}},
+)
+async def get_performance_history_versions() -> list[str]:
+    """Gets the app versions that have entries in the performance history, oldest first"""
+    return ApiDependencies.invoker.services.performance_history.get_app_versions()
+
+
+@app_router.get(
+    "/performance_history/regressions",
+    operation_id="get_performance_regressions",
+    responses={200: {"model": list[PerformanceRegression]}},
+)
+async def get_performance_regressions(
+    baseline_version: str = Query(description="The app version to compare against"),
+    candidate_version: str = Query(default=__version__, description="The app version to check for regressions"),
+    threshold: float = Query(default=0.1, ge=0, description="The relative slowdown of the median to flag, e.g. 0.1"),
+    min_count: int = Query(default=5, ge=1, description="The min number of invocations in each version to compare"),
+) -> list[PerformanceRegression]:
+    """Finds groups of comparable invocations whose median duration regressed between two app versions"""
+    return ApiDependencies.invoker.services.performance_history.find_regressions(
+        baseline_version=baseline_version,
+        candidate_version=candidate_version,
+        threshold=threshold,
+        min_count=min_count,
+    )
+
+
+@app_router.delete(
+    "/performance_history",
+    operation_id="clear_performance_history",
+    responses={200: {"description": "The operation was successful"}},
+)
+async def clear_performance_history() -> None:
+    """Clears the performance history"""
+    ApiDependencies.invoker.services.performance_history.clear()
@@ -4,7 +4,7 @@ import traceback
 from typing import ClassVar, Optional
 
 from fastapi import BackgroundTasks, Body, HTTPException, Path, Query, Request, Response, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.routing import APIRouter
 from PIL import Image
 from pydantic import BaseModel, Field, model_validator
@@ -12,10 +12,12 @@ from pydantic import BaseModel, Field, model_validator
 from invokeai.app.api.dependencies import ApiDependencies
 from invokeai.app.api.extract_metadata_from_image import extract_metadata_from_image
 from invokeai.app.invocations.fields import MetadataField
+from invokeai.app.services.board_records.board_records_common import BoardRecordNotFoundException
 from invokeai.app.services.image_records.image_records_common import (
     ImageCategory,
     ImageNamesResult,
     ImageRecordChanges,
+    ImageRecordNotFoundException,
     ResourceOrigin,
 )
 from invokeai.app.services.images.images_common import (
@@ -531,6 +533,41 @@ async def download_images_from_list(
     return ImagesDownloaded(bulk_download_item_name=bulk_download_item_id + ".zip")
 
 
+@images_router.post(
+    "/download/stream",
+    operation_id="stream_images_download",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "A zip file of the images, generated as it is downloaded",
+            "content": {"application/zip": {}},
+        },
+        400: {"description": "No images or board id specified"},
+        404: {"description": "Image or board not found"},
+    },
+)
+def stream_images_download(
+    image_names: Optional[list[str]] = Body(
+        default=None, description="The list of names of images to download", embed=True
+    ),
+    board_id: Optional[str] = Body(
+        default=None, description="The board from which image should be downloaded", embed=True
+    ),
+) -> StreamingResponse:
+    """Downloads a zip file of images, streamed as it is generated rather than prepared in the background"""
+    if (image_names is None or len(image_names) == 0) and board_id is None:
+        raise HTTPException(status_code=400, detail="No images or board id specified.")
+    bulk_download = ApiDependencies.invoker.services.bulk_download
+    try:
+        chunks = bulk_download.stream(image_names, board_id)
+    except (ImageRecordNotFoundException, BoardRecordNotFoundException):
+        raise HTTPException(status_code=404)
+    file_name = bulk_download.generate_item_id(board_id) + ".zip"
+    return StreamingResponse(
+        chunks, media_type="application/zip", headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
+
+
 @images_router.api_route(
     "/download/{bulk_download_item_name}",
     methods=["GET"],
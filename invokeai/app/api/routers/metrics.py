@@ -0,0 +1,42 @@
+from fastapi import Response
+from fastapi.routing import APIRouter
+
+from invokeai.app.api.dependencies import ApiDependencies
+from invokeai.app.services.download.download_base import DownloadJobStatus
+from invokeai.app.util.metrics import (
+    DOWNLOAD_JOBS,
+    INVOCATION_CACHE_HIT_RATIO,
+    INVOCATION_CACHE_HITS,
+    INVOCATION_CACHE_MISSES,
+    INVOCATION_CACHE_SIZE,
+    QUEUE_ITEMS,
+    REGISTRY,
+)
+
+metrics_router = APIRouter(tags=["metrics"])
+
+# The queue whose depth is reported. The app only uses a single queue.
+METRICS_QUEUE_ID = "default"
+
+
+@metrics_router.get("/metrics", operation_id="get_metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Gets the app's metrics in the Prometheus text exposition format"""
+    services = ApiDependencies.invoker.services
+
+    queue_status = services.session_queue.get_queue_status(METRICS_QUEUE_ID)
+    for status in ("pending", "in_progress", "completed", "failed", "canceled"):
+        QUEUE_ITEMS.set(getattr(queue_status, status), queue_id=METRICS_QUEUE_ID, status=status)
+
+    cache_status = services.invocation_cache.get_status()
+    INVOCATION_CACHE_HITS.set(cache_status.hits)
+    INVOCATION_CACHE_MISSES.set(cache_status.misses)
+    INVOCATION_CACHE_SIZE.set(cache_status.size)
+    lookups = cache_status.hits + cache_status.misses
+    INVOCATION_CACHE_HIT_RATIO.set(cache_status.hits / lookups if lookups > 0 else 0)
+
+    download_jobs = services.download_queue.list_jobs()
+    for status in DownloadJobStatus:
+        DOWNLOAD_JOBS.set(sum(1 for job in download_jobs if job.status == status), status=status.value)
+
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -283,7 +283,7 @@ async def scan_for_models(
             detail=f"The search path '{scan_path}' does not exist or is not directory",
         )
 
-    search = ModelSearch()
+    search = ModelSearch(max_workers=ApiDependencies.invoker.services.configuration.model_scan_threads)
     try:
         found_model_paths = search.search(path)
         models_path = ApiDependencies.invoker.services.configuration.models_path
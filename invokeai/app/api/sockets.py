@@ -1,6 +1,10 @@
 # Copyright (c) 2022 Kyle Schouviller (https://github.com/kyle0654)
 
-from typing import Any
+import asyncio
+import io
+import math
+import struct
+from typing import Any, Literal
 
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -18,6 +22,7 @@ from invokeai.app.services.events.events_common import (
     DownloadEventBase,
     DownloadProgressEvent,
     DownloadStartedEvent,
+    EventBase,
     FastAPIEvent,
     InvocationCompleteEvent,
     InvocationErrorEvent,
@@ -32,6 +37,7 @@ from invokeai.app.services.events.events_common import (
     ModelInstallStartedEvent,
     ModelLoadCompleteEvent,
     ModelLoadStartedEvent,
+    ModelScanProgressEvent,
     QueueClearedEvent,
     QueueEventBase,
     QueueItemStatusChangedEvent,
@@ -79,10 +85,65 @@ MODEL_EVENTS = {
     ModelInstallCompleteEvent,
     ModelInstallCancelledEvent,
     ModelInstallErrorEvent,
+    ModelScanProgressEvent,
 }
 
+
+PreviewFrameFormat = Literal["webp", "rgb"]
+
+
+class BinaryPreviewSubscriptionEvent(BaseModel):
+    """Event data for subscribing to progress images as binary frames.
+    This is a pydantic model to ensure the data is in the correct format."""
+
+    format: PreviewFrameFormat = "webp"
+
+
+PREVIEW_FRAME_MAGIC = b"IPF1"
+PREVIEW_FRAME_FORMATS: dict[PreviewFrameFormat, int] = {"rgb": 0, "webp": 1}
+PREVIEW_FRAME_HEADER = struct.Struct("<4sBBHHIf")
+"""
+The header of a binary progress image frame, followed by the invocation source ID (UTF-8) and the image data.
+
+All values are little-endian:
+- magic (4 bytes): b"IPF1"
+- format (uint8): 0 for raw RGB (width * height * 3 bytes), 1 for WEBP
+- length of the invocation source ID in bytes (uint8)
+- width and height of the image data in pixels (uint16 each)
+- the queue item ID (uint32)
+- the progress percentage (float32), NaN if indeterminate
+"""
+
+
+def encode_preview_frame(event: InvocationProgressEvent, format: PreviewFrameFormat) -> bytes:
+    """Encode an invocation progress event's image as a binary frame."""
+    assert event.image is not None and event.image.image is not None
+    image = event.image.image.convert("RGB")
+    if format == "webp":
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=80)
+        data = buffer.getvalue()
+    else:
+        data = image.tobytes()
+    node_id = event.invocation_source_id.encode("utf-8")[:255]
+    header = PREVIEW_FRAME_HEADER.pack(
+        PREVIEW_FRAME_MAGIC,
+        PREVIEW_FRAME_FORMATS[format],
+        len(node_id),
+        image.width,
+        image.height,
+        event.item_id,
+        math.nan if event.percentage is None else event.percentage,
+    )
+    return header + node_id + data
+
+
 BULK_DOWNLOAD_EVENTS = {BulkDownloadStartedEvent, BulkDownloadCompleteEvent, BulkDownloadErrorEvent}
 
+# A client with more than this many packets waiting to be sent to it is falling behind. Progress events are not sent
+# to it until it catches up.
+SLOW_CLIENT_MAX_PENDING_PACKETS = 32
+
 
 class SocketIO:
     _sub_queue = "subscribe_queue"
@@ -91,6 +152,11 @@ class SocketIO:
     _sub_bulk_download = "subscribe_bulk_download"
     _unsub_bulk_download = "unsubscribe_bulk_download"
 
+    _sub_binary_previews = "subscribe_binary_previews"
+    _unsub_binary_previews = "unsubscribe_binary_previews"
+
+    _preview_frame_event = "invocation_progress_image"
+
     def __init__(self, app: FastAPI):
         self._sio = AsyncServer(async_mode="asgi", cors_allowed_origins="*")
         self._app = ASGIApp(socketio_server=self._sio, socketio_path="/ws/socket.io")
@@ -100,6 +166,12 @@ class SocketIO:
         self._sio.on(self._unsub_queue, handler=self._handle_unsub_queue)
         self._sio.on(self._sub_bulk_download, handler=self._handle_sub_bulk_download)
         self._sio.on(self._unsub_bulk_download, handler=self._handle_unsub_bulk_download)
+        self._sio.on(self._sub_binary_previews, handler=self._handle_sub_binary_previews)
+        self._sio.on(self._unsub_binary_previews, handler=self._handle_unsub_binary_previews)
+        self._sio.on("disconnect", handler=self._handle_disconnect)
+
+        # Clients that receive progress images as binary frames, and the format they want
+        self._binary_preview_clients: dict[str, PreviewFrameFormat] = {}
 
         register_events(QUEUE_EVENTS, self._handle_queue_event)
         register_events(MODEL_EVENTS, self._handle_model_event)
@@ -117,11 +189,67 @@ class SocketIO:
     async def _handle_unsub_bulk_download(self, sid: str, data: Any) -> None:
         await self._sio.leave_room(sid, BulkDownloadSubscriptionEvent(**data).bulk_download_id)
 
+    async def _handle_sub_binary_previews(self, sid: str, data: Any) -> None:
+        self._binary_preview_clients[sid] = BinaryPreviewSubscriptionEvent(**(data or {})).format
+
+    async def _handle_unsub_binary_previews(self, sid: str, data: Any = None) -> None:
+        self._binary_preview_clients.pop(sid, None)
+
+    async def _handle_disconnect(self, sid: str, *args: Any) -> None:
+        self._binary_preview_clients.pop(sid, None)
+
     async def _handle_queue_event(self, event: FastAPIEvent[QueueEventBase]):
-        await self._sio.emit(event=event[0], data=event[1].model_dump(mode="json"), room=event[1].queue_id)
+        if isinstance(event[1], InvocationProgressEvent) and self._binary_preview_clients:
+            await self._emit_invocation_progress(event[0], event[1])
+        else:
+            await self._emit(event, room=event[1].queue_id)
+
+    async def _emit_invocation_progress(self, event_name: str, event: InvocationProgressEvent) -> None:
+        """Emit an invocation progress event, sending its image as a binary frame to the clients that want one.
+
+        Those clients get the event without the image's data URL, followed by the frame.
+        """
+        slow_clients = set(self._get_slow_clients(event.queue_id))
+        binary_clients: dict[PreviewFrameFormat, list[str]] = {}
+        json_clients: list[str] = []
+        for sid, _ in self._sio.manager.get_participants("/", event.queue_id):
+            if sid in slow_clients:
+                continue
+            if event.image is not None and event.image.image is not None and sid in self._binary_preview_clients:
+                binary_clients.setdefault(self._binary_preview_clients[sid], []).append(sid)
+            else:
+                json_clients.append(sid)
+
+        if json_clients:
+            await self._sio.emit(event=event_name, data=event.model_dump(mode="json"), to=json_clients)
+        if binary_clients:
+            data = event.model_dump(mode="json", exclude={"image": {"dataURL"}})
+            await self._sio.emit(event=event_name, data=data, to=[s for sids in binary_clients.values() for s in sids])
+        for format, sids in binary_clients.items():
+            # Encoding a frame is CPU-bound - keep it off the event loop
+            frame = await asyncio.to_thread(encode_preview_frame, event, format)
+            await self._sio.emit(event=self._preview_frame_event, data=frame, to=sids)
 
     async def _handle_model_event(self, event: FastAPIEvent[ModelEventBase | DownloadEventBase]) -> None:
-        await self._sio.emit(event=event[0], data=event[1].model_dump(mode="json"))
+        await self._emit(event)
 
     async def _handle_bulk_image_download_event(self, event: FastAPIEvent[BulkDownloadEventBase]) -> None:
-        await self._sio.emit(event=event[0], data=event[1].model_dump(mode="json"), room=event[1].bulk_download_id)
+        await self._emit(event, room=event[1].bulk_download_id)
+
+    async def _emit(self, event: FastAPIEvent[EventBase], room: str | None = None) -> None:
+        """Emit an event to a room, or to all clients. The payload is serialized once for all recipients.
+
+        Progress events are not sent to clients that are falling behind - they would only add to the client's backlog
+        and are superseded by the next progress event anyway.
+        """
+        skip_sid = self._get_slow_clients(room) if event[1].get_coalesce_key() is not None else None
+        await self._sio.emit(event=event[0], data=event[1].model_dump(mode="json"), room=room, skip_sid=skip_sid)
+
+    def _get_slow_clients(self, room: str | None) -> list[str]:
+        """Get the clients in a room (or all clients) with a backlog of packets waiting to be sent to them."""
+        slow_clients: list[str] = []
+        for sid, eio_sid in self._sio.manager.get_participants("/", room):
+            socket = self._sio.eio.sockets.get(eio_sid)
+            if socket is not None and socket.queue.qsize() > SLOW_CLIENT_MAX_PENDING_PACKETS:
+                slow_clients.append(sid)
+        return slow_clients
@@ -2,6 +2,7 @@ import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
+from threading import Thread
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -22,6 +23,7 @@ from invokeai.app.api.routers import (
     client_state,
     download_queue,
     images,
+    metrics,
     model_manager,
     model_relationships,
     recall_parameters,
@@ -32,7 +34,7 @@ from invokeai.app.api.routers import (
 )
 from invokeai.app.api.sockets import SocketIO
 from invokeai.app.services.config.config_default import get_config
-from invokeai.app.util.custom_openapi import get_openapi_func
+from invokeai.app.util.custom_openapi import get_openapi_cache_key, get_openapi_func
 from invokeai.backend.util.logging import InvokeAILogger
 
 app_config = get_config()
@@ -62,6 +64,9 @@ async def lifespan(app: FastAPI):
     )
     logger.handle(record)
 
+    # Prepare the OpenAPI schema in the background, so it is ready (or nearly so) when the UI first requests it.
+    Thread(target=prepare_openapi_schema, name="openapi-schema", daemon=True).start()
+
     yield
     # Shut down threads
     ApiDependencies.shutdown()
@@ -135,8 +140,25 @@ app.include_router(workflows.workflows_router, prefix="/api")
 app.include_router(style_presets.style_presets_router, prefix="/api")
 app.include_router(client_state.client_state_router, prefix="/api")
 app.include_router(recall_parameters.recall_parameters_router, prefix="/api")
+# Served at the root, where Prometheus scrapes by default.
+app.include_router(metrics.metrics_router)
+
+app.openapi = get_openapi_func(
+    app,
+    cache_path=app_config.root_path / ".cache" / "openapi.json",
+    get_cache_key=lambda: get_openapi_cache_key(
+        custom_nodes_path=app_config.custom_nodes_path,
+        allow_nodes=app_config.allow_nodes,
+        deny_nodes=app_config.deny_nodes,
+    ),
+)
+
 
-app.openapi = get_openapi_func(app)
+def prepare_openapi_schema() -> None:
+    try:
+        app.openapi()
+    except Exception as e:
+        logger.warning(f"Failed to prepare the OpenAPI schema: {e}")
 
 
 @app.get("/docs", include_in_schema=False)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import importlib
 import inspect
 import re
 import sys
@@ -84,10 +85,15 @@ class Bottleneck(str, Enum, metaclass=MetaEnum):
     The bottleneck of an invocation.
     - `Network`: The invocation's execution is network-bound.
     - `GPU`: The invocation's execution is GPU-bound.
+    - `CPU`: The invocation's execution is CPU-bound, and it does not use the GPU or load models.
+
+    GPU-bound invocations run one at a time. Network-bound and CPU-bound invocations may run alongside other invocations
+    in the same session (see the `max_parallel_nodes` setting), so they must not share mutable state with them.
     """
 
     Network = "network"
     GPU = "gpu"
+    CPU = "cpu"
 
 
 class UIConfigBase(BaseModel):
@@ -212,6 +218,15 @@ class BaseInvocation(ABC, BaseModel):
         Internal invoke method, calls `invoke()` after some prep.
         Handles optional fields that are required to call `invoke()` and invocation cache.
         """
+        output, _ = self.invoke_internal_with_cache_status(context, services)
+        return output
+
+    def invoke_internal_with_cache_status(
+        self, context: InvocationContext, services: "InvocationServices"
+    ) -> tuple[BaseInvocationOutput, bool]:
+        """
+        Like `invoke_internal()`, but also returns whether the output came from the invocation cache.
+        """
         for field_name, field in type(self).model_fields.items():
             if not field.json_schema_extra or callable(field.json_schema_extra):
                 # something has gone terribly awry, we should always have this and it should be a dict
@@ -233,7 +248,7 @@ class BaseInvocation(ABC, BaseModel):
 
         # skip node cache codepath if it's disabled
         if services.configuration.node_cache_size == 0:
-            return self.invoke(context)
+            return self.invoke(context), False
 
         output: BaseInvocationOutput
         if self.use_cache:
@@ -243,13 +258,13 @@ class BaseInvocation(ABC, BaseModel):
                 services.logger.debug(f'Invocation cache miss for type "{self.get_type()}": {self.id}')
                 output = self.invoke(context)
                 services.invocation_cache.save(key, output)
-                return output
+                return output, False
             else:
                 services.logger.debug(f'Invocation cache hit for type "{self.get_type()}": {self.id}')
-                return cached_value
+                return cached_value, True
         else:
             services.logger.debug(f'Skipping invocation cache for "{self.get_type()}": {self.id}')
-            return self.invoke(context)
+            return self.invoke(context), False
 
     id: str = Field(
         default_factory=uuid_string,
@@ -271,6 +286,8 @@ class BaseInvocation(ABC, BaseModel):
 
     bottleneck: ClassVar[Bottleneck]
 
+    mutates_inputs: ClassVar[bool]
+
     UIConfig: ClassVar[UIConfigBase]
 
     model_config = ConfigDict(
@@ -291,6 +308,41 @@ TBaseInvocation = TypeVar("TBaseInvocation", bound=BaseInvocation)
 class InvocationRegistry:
     _invocation_classes: ClassVar[set[type[BaseInvocation]]] = set()
     _output_classes: ClassVar[set[type[BaseInvocationOutput]]] = set()
+    # Modules that define invocations and outputs, but have not been imported yet. They are imported on first use of
+    # one of their types, or when all invocations or outputs are requested.
+    _lazy_invocation_modules: ClassVar[dict[str, str]] = {}
+    _lazy_output_modules: ClassVar[dict[str, str]] = {}
+
+    @classmethod
+    def register_lazy_module(cls, module_name: str, invocation_types: list[str], output_types: list[str]) -> None:
+        """Registers a module that defines the given invocation and output types, without importing it.
+
+        The module is imported the first time one of its types is requested. Types that are already registered are
+        ignored.
+        """
+        if module_name in sys.modules:
+            return
+        for invocation_type in invocation_types:
+            cls._lazy_invocation_modules.setdefault(invocation_type, module_name)
+        for output_type in output_types:
+            cls._lazy_output_modules.setdefault(output_type, module_name)
+
+    @classmethod
+    def load_lazy_modules(cls) -> None:
+        """Imports all modules registered with `register_lazy_module` that have not been imported yet."""
+        module_names = {*cls._lazy_invocation_modules.values(), *cls._lazy_output_modules.values()}
+        for module_name in sorted(module_names):
+            cls._load_lazy_module(module_name)
+
+    @classmethod
+    def _load_lazy_module(cls, module_name: str) -> None:
+        # The module's types are unregistered first, so that the module's own registrations (which look up the types
+        # to detect clobbering) do not attempt to import it again.
+        for lazy_modules in (cls._lazy_invocation_modules, cls._lazy_output_modules):
+            for type_, lazy_module_name in list(lazy_modules.items()):
+                if lazy_module_name == module_name:
+                    lazy_modules.pop(type_, None)
+        importlib.import_module(module_name)
 
     @classmethod
     def register_invocation(cls, invocation: type[BaseInvocation]) -> None:
@@ -340,7 +392,13 @@ class InvocationRegistry:
 
     @classmethod
     def get_invocation_classes(cls) -> Iterable[type[BaseInvocation]]:
-        """Gets all invocations, respecting the allowlist and denylist."""
+        """Gets all invocations, respecting the allowlist and denylist. This imports any lazily-registered modules."""
+        cls.load_lazy_modules()
+        return cls.get_loaded_invocation_classes()
+
+    @classmethod
+    def get_loaded_invocation_classes(cls) -> Iterable[type[BaseInvocation]]:
+        """Gets all invocations whose modules have been imported, respecting the allowlist and denylist."""
         app_config = get_config()
         allowed_invocations: set[type[BaseInvocation]] = set()
         for sc in cls._invocation_classes:
@@ -367,8 +425,11 @@ class InvocationRegistry:
 
     @classmethod
     def get_invocation_for_type(cls, invocation_type: str) -> type[BaseInvocation] | None:
-        """Gets the invocation class for a given invocation type."""
-        return cls.get_invocations_map().get(invocation_type)
+        """Gets the invocation class for a given invocation type. If the type's module was registered lazily, only that
+        module is imported."""
+        if (module_name := cls._lazy_invocation_modules.get(invocation_type)) is not None:
+            cls._load_lazy_module(module_name)
+        return next((i for i in cls.get_loaded_invocation_classes() if i.get_type() == invocation_type), None)
 
     @classmethod
     def register_output(cls, output: "type[TBaseInvocationOutput]") -> None:
@@ -387,7 +448,13 @@ class InvocationRegistry:
 
     @classmethod
     def get_output_classes(cls) -> Iterable[type[BaseInvocationOutput]]:
-        """Gets all invocation outputs."""
+        """Gets all invocation outputs. This imports any lazily-registered modules."""
+        cls.load_lazy_modules()
+        return cls.get_loaded_output_classes()
+
+    @classmethod
+    def get_loaded_output_classes(cls) -> Iterable[type[BaseInvocationOutput]]:
+        """Gets all invocation outputs whose modules have been imported."""
         return cls._output_classes
 
     @classmethod
@@ -408,7 +475,7 @@ class InvocationRegistry:
 
         @see https://docs.pydantic.dev/latest/concepts/type_adapter/
         """
-        return TypeAdapter(Annotated[Union[tuple(cls._output_classes)], Field(discriminator="type")])
+        return TypeAdapter(Annotated[Union[tuple(cls.get_output_classes())], Field(discriminator="type")])
 
     @classmethod
     def invalidate_output_typeadapter(cls) -> None:
@@ -422,8 +489,11 @@ class InvocationRegistry:
 
     @classmethod
     def get_output_for_type(cls, output_type: str) -> type[BaseInvocationOutput] | None:
-        """Gets the output class for a given output type."""
-        return cls.get_outputs_map().get(output_type)
+        """Gets the output class for a given output type. If the type's module was registered lazily, only that module
+        is imported."""
+        if (module_name := cls._lazy_output_modules.get(output_type)) is not None:
+            cls._load_lazy_module(module_name)
+        return next((o for o in cls.get_loaded_output_classes() if o.get_type() == output_type), None)
 
 
 RESERVED_NODE_ATTRIBUTE_FIELD_NAMES = {
@@ -433,6 +503,7 @@ RESERVED_NODE_ATTRIBUTE_FIELD_NAMES = {
     "type",
     "workflow",
     "bottleneck",
+    "mutates_inputs",
 }
 
 RESERVED_INPUT_FIELD_NAMES = {"metadata", "board"}
@@ -617,6 +688,7 @@ def invocation(
     use_cache: Optional[bool] = True,
     classification: Classification = Classification.Stable,
     bottleneck: Bottleneck = Bottleneck.GPU,
+    mutates_inputs: Optional[bool] = None,
 ) -> Callable[[Type[TBaseInvocation]], Type[TBaseInvocation]]:
     """
     Registers an invocation.
@@ -628,7 +700,8 @@ def invocation(
     :param Optional[str] version: Adds a version to the invocation. Must be a valid semver string. Defaults to None.
     :param Optional[bool] use_cache: Whether or not to use the invocation cache. Defaults to True. The user may override this in the workflow editor.
     :param Classification classification: The classification of the invocation. Defaults to FeatureClassification.Stable. Use Beta or Prototype if the invocation is unstable.
-    :param Bottleneck bottleneck: The bottleneck of the invocation. Defaults to Bottleneck.GPU. Use Network if the invocation is network-bound.
+    :param Bottleneck bottleneck: The bottleneck of the invocation. Defaults to Bottleneck.GPU. Use Network if the invocation is network-bound, or CPU if it is CPU-bound and does not use the GPU or load models.
+    :param Optional[bool] mutates_inputs: Whether the invocation modifies its input values in place. Inputs are shared with the outputs of upstream nodes and deep-copied only for invocations that modify them. Defaults to False for core nodes and True for custom nodes.
     """
 
     def wrapper(cls: Type[TBaseInvocation]) -> Type[TBaseInvocation]:
@@ -687,6 +760,9 @@ def invocation(
 
         cls.bottleneck = bottleneck
 
+        # Custom nodes may not have been written with shared inputs in mind, so they get copies unless they opt out.
+        cls.mutates_inputs = mutates_inputs if mutates_inputs is not None else node_pack != "invokeai"
+
         # Add the invocation type to the model.
 
         # You'd be tempted to just add the type field and rebuild the model, like this:
@@ -1,6 +1,6 @@
 import cv2
 
-from invokeai.app.invocations.baseinvocation import BaseInvocation, invocation
+from invokeai.app.invocations.baseinvocation import BaseInvocation, Bottleneck, invocation
 from invokeai.app.invocations.fields import ImageField, InputField, WithBoard, WithMetadata
 from invokeai.app.invocations.primitives import ImageOutput
 from invokeai.app.services.shared.invocation_context import InvocationContext
@@ -13,6 +13,7 @@ from invokeai.backend.image_util.util import cv2_to_pil, pil_to_cv2
     tags=["controlnet", "canny"],
     category="controlnet",
     version="1.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class CannyEdgeDetectionInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Geneartes an edge map using a cv2's Canny algorithm."""
@@ -1,6 +1,6 @@
 import cv2
 
-from invokeai.app.invocations.baseinvocation import BaseInvocation, invocation
+from invokeai.app.invocations.baseinvocation import BaseInvocation, Bottleneck, invocation
 from invokeai.app.invocations.fields import FieldDescriptions, ImageField, InputField, WithBoard, WithMetadata
 from invokeai.app.invocations.primitives import ImageOutput
 from invokeai.app.services.shared.invocation_context import InvocationContext
@@ -13,6 +13,7 @@ from invokeai.backend.image_util.util import np_to_pil, pil_to_np
     tags=["controlnet"],
     category="controlnet",
     version="1.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class ColorMapInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Generates a color map from the provided image."""
@@ -392,6 +392,7 @@ class CLIPSkipInvocationOutput(BaseInvocationOutput):
     tags=["clipskip", "clip", "skip"],
     category="conditioning",
     version="1.1.1",
+    mutates_inputs=True,
 )
 class CLIPSkipInvocation(BaseInvocation):
     """Skip layers in clip text_encoder model."""
@@ -8,6 +8,7 @@ from PIL import Image, ImageChops, ImageFilter, ImageOps
 
 from invokeai.app.invocations.baseinvocation import (
     BaseInvocation,
+    Bottleneck,
     Classification,
     invocation,
 )
@@ -29,7 +30,9 @@ from invokeai.backend.image_util.invisible_watermark import InvisibleWatermark
 from invokeai.backend.image_util.safety_checker import SafetyChecker
 
 
-@invocation("show_image", title="Show Image", tags=["image"], category="image", version="1.0.1")
+@invocation(
+    "show_image", title="Show Image", tags=["image"], category="image", version="1.0.1", bottleneck=Bottleneck.CPU
+)
 class ShowImageInvocation(BaseInvocation):
     """Displays a provided image using the OS image viewer, and passes it forward in the pipeline."""
 
@@ -54,6 +57,7 @@ class ShowImageInvocation(BaseInvocation):
     tags=["image"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class BlankImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Creates a blank image and forwards it to the pipeline"""
@@ -77,6 +81,7 @@ class BlankImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "crop"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageCropInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Crops an image to a specified box. The box can be outside of the image."""
@@ -104,6 +109,7 @@ class ImageCropInvocation(BaseInvocation, WithMetadata, WithBoard):
     category="image",
     tags=["image", "pad", "crop"],
     version="1.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class CenterPadCropInvocation(BaseInvocation):
     """Pad or crop an image's sides from the center by specified pixels. Positive values are outside of the image."""
@@ -148,6 +154,7 @@ class CenterPadCropInvocation(BaseInvocation):
     tags=["image", "paste"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImagePasteInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Pastes an image into another image."""
@@ -199,6 +206,7 @@ class ImagePasteInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "mask"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class MaskFromAlphaInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Extracts the alpha channel of an image as a mask."""
@@ -224,6 +232,7 @@ class MaskFromAlphaInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "multiply"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageMultiplyInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Multiplies two images together using `PIL.ImageChops.multiply()`."""
@@ -251,6 +260,7 @@ IMAGE_CHANNELS = Literal["A", "R", "G", "B"]
     tags=["image", "channel"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageChannelInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Gets a channel from an image."""
@@ -274,6 +284,7 @@ class ImageChannelInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "convert"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageConvertInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Converts an image to a different mode."""
@@ -297,6 +308,7 @@ class ImageConvertInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "blur"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageBlurInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Blurs an image"""
@@ -355,6 +367,7 @@ class ImageBlurInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "unsharp_mask"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class UnsharpMaskInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Applies an unsharp mask filter to an image"""
@@ -423,6 +436,7 @@ PIL_RESAMPLING_MAP = {
     tags=["image", "resize"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageResizeInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Resizes an image to specific dimensions"""
@@ -453,6 +467,7 @@ class ImageResizeInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "scale"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageScaleInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Scales an image by a factor"""
@@ -488,6 +503,7 @@ class ImageScaleInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "lerp"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageLerpInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Linear interpolation of all pixels of an image"""
@@ -515,6 +531,7 @@ class ImageLerpInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "ilerp"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageInverseLerpInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Inverse linear interpolation of all pixels of an image"""
@@ -566,6 +583,7 @@ class ImageNSFWBlurInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "watermark"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageWatermarkInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Add an invisible watermark to an image"""
@@ -587,6 +605,7 @@ class ImageWatermarkInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "mask", "inpaint"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class MaskEdgeInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Applies an edge mask to an image"""
@@ -626,6 +645,7 @@ class MaskEdgeInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "mask", "multiply"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class MaskCombineInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Combine two masks together by multiplying them using `PIL.ImageChops.multiply()`."""
@@ -650,6 +670,7 @@ class MaskCombineInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "color"],
     category="image",
     version="2.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class ColorCorrectInvocation(BaseInvocation, WithMetadata, WithBoard):
     """
@@ -756,6 +777,7 @@ class ColorCorrectInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "hue"],
     category="image",
     version="1.2.2",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageHueAdjustmentInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Adjusts the Hue of an image."""
@@ -845,6 +867,7 @@ CHANNEL_FORMATS = {
     ],
     category="image",
     version="1.2.3",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageChannelOffsetInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Add or subtract a value from a specific color channel of an image."""
@@ -909,6 +932,7 @@ class ImageChannelOffsetInvocation(BaseInvocation, WithMetadata, WithBoard):
     ],
     category="image",
     version="1.2.3",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageChannelMultiplyInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Scale a specific color channel of an image."""
@@ -958,6 +982,7 @@ class ImageChannelMultiplyInvocation(BaseInvocation, WithMetadata, WithBoard):
     category="primitives",
     version="1.2.2",
     use_cache=False,
+    bottleneck=Bottleneck.CPU,
 )
 class SaveImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Saves an image. Unlike an image primitive, this invocation stores a copy of the image."""
@@ -978,6 +1003,7 @@ class SaveImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "combine"],
     category="image",
     version="1.0.1",
+    bottleneck=Bottleneck.CPU,
 )
 class CanvasPasteBackInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Combines two images by using the mask provided. Intended for use on the Unified Canvas."""
@@ -1015,6 +1041,7 @@ class CanvasPasteBackInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "mask", "id"],
     category="image",
     version="1.0.1",
+    bottleneck=Bottleneck.CPU,
 )
 class MaskFromIDInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Generate a mask for a particular color in an ID Map"""
@@ -1053,6 +1080,7 @@ class MaskFromIDInvocation(BaseInvocation, WithMetadata, WithBoard):
     category="image",
     version="1.0.0",
     classification=Classification.Deprecated,
+    bottleneck=Bottleneck.CPU,
 )
 class CanvasV2MaskAndCropInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Handles Canvas V2 image output masking and cropping"""
@@ -1091,7 +1119,12 @@ class CanvasV2MaskAndCropInvocation(BaseInvocation, WithMetadata, WithBoard):
 
 
 @invocation(
-    "expand_mask_with_fade", title="Expand Mask with Fade", tags=["image", "mask"], category="image", version="1.0.1"
+    "expand_mask_with_fade",
+    title="Expand Mask with Fade",
+    tags=["image", "mask"],
+    category="image",
+    version="1.0.1",
+    bottleneck=Bottleneck.CPU,
 )
 class ExpandMaskWithFadeInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Expands a mask with a fade effect. The mask uses black to indicate areas to keep from the generated image and white for areas to discard.
@@ -1182,6 +1215,7 @@ class ExpandMaskWithFadeInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "mask", "blend"],
     category="image",
     version="1.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class ApplyMaskToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     """
@@ -1221,6 +1255,7 @@ class ApplyMaskToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     tags=["image", "noise"],
     category="image",
     version="1.1.0",
+    bottleneck=Bottleneck.CPU,
 )
 class ImageNoiseInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Add noise to an image"""
@@ -1303,6 +1338,7 @@ class ImageNoiseInvocation(BaseInvocation, WithMetadata, WithBoard):
     category="image",
     version="1.0.0",
     tags=["image", "crop"],
+    bottleneck=Bottleneck.CPU,
 )
 class CropImageToBoundingBoxInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Crop an image to the given bounding box. If the bounding box is omitted, the image is cropped to the non-transparent pixels."""
@@ -1329,6 +1365,7 @@ class CropImageToBoundingBoxInvocation(BaseInvocation, WithMetadata, WithBoard):
     category="image",
     version="1.0.0",
     tags=["image", "crop"],
+    bottleneck=Bottleneck.CPU,
 )
 class PasteImageIntoBoundingBoxInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Paste the source image into the target image at the given bounding box.
@@ -1357,6 +1394,7 @@ class PasteImageIntoBoundingBoxInvocation(BaseInvocation, WithMetadata, WithBoar
     tags=["image", "concatenate", "flux", "kontext"],
     category="image",
     version="1.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class FluxKontextConcatenateImagesInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Prepares an image or images for use with FLUX Kontext. The first/single image is resized to the nearest
@@ -3,6 +3,7 @@ from pydantic import ValidationInfo, field_validator
 from invokeai.app.invocations.baseinvocation import (
     BaseInvocation,
     BaseInvocationOutput,
+    Bottleneck,
     Classification,
     invocation,
     invocation_output,
@@ -26,6 +27,7 @@ class ImagePanelCoordinateOutput(BaseInvocationOutput):
     category="image",
     version="1.0.0",
     classification=Classification.Prototype,
+    bottleneck=Bottleneck.CPU,
 )
 class ImagePanelLayoutInvocation(BaseInvocation):
     """Get the coordinates of a single panel in a grid. (If the full image shape cannot be divided evenly into panels,
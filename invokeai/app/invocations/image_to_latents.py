@@ -1,6 +1,6 @@
 from contextlib import nullcontext
 from functools import singledispatchmethod
-from typing import Literal
+from typing import Callable, Literal, Optional
 
 import einops
 import torch
@@ -26,7 +26,11 @@ from invokeai.app.invocations.primitives import LatentsOutput
 from invokeai.app.services.shared.invocation_context import InvocationContext
 from invokeai.backend.model_manager.load.load_base import LoadedModel
 from invokeai.backend.stable_diffusion.diffusers_pipeline import image_resized_to_grid_as_tensor
-from invokeai.backend.stable_diffusion.vae_tiling import patch_vae_tiling_params
+from invokeai.backend.stable_diffusion.vae_tiling import (
+    VAETilingStats,
+    patch_vae_tiling_params,
+    run_with_adaptive_vae_tiling,
+)
 from invokeai.backend.util.devices import TorchDevice
 from invokeai.backend.util.vae_working_memory import estimate_vae_working_memory_sd15_sdxl
 
@@ -74,7 +78,14 @@ class ImageToLatentsInvocation(BaseInvocation):
         tiled: bool,
         image_tensor: torch.Tensor,
         tile_size: int = 0,
+        adaptive_tiling: bool = False,
+        on_vae_tiling_stats: Optional[Callable[[VAETilingStats], None]] = None,
     ) -> torch.Tensor:
+        """Encode an image tensor to latents.
+
+        If `adaptive_tiling` is set and `tiled` is not, tiling is chosen based on the free device memory (see
+        `run_with_adaptive_vae_tiling(...)`), and the resulting stats are passed to `on_vae_tiling_stats`.
+        """
         assert isinstance(vae_info.model, (AutoencoderKL, AutoencoderTiny)), "VAE must be of type SD-1.5 or SDXL"
         estimated_working_memory = estimate_vae_working_memory_sd15_sdxl(
             operation="encode",
@@ -111,24 +122,36 @@ class ImageToLatentsInvocation(BaseInvocation):
                 vae.to(dtype=torch.float16)
                 # latents = latents.half()
 
-            if tiled:
-                vae.enable_tiling()
-            else:
-                vae.disable_tiling()
-
-            tiling_context = nullcontext()
-            if tile_size > 0:
-                tiling_context = patch_vae_tiling_params(
-                    vae,
-                    tile_sample_min_size=tile_size,
-                    tile_latent_min_size=tile_size // LATENT_SCALE_FACTOR,
-                    tile_overlap_factor=0.25,
-                )
-
             # non_noised_latents_from_image
             image_tensor = image_tensor.to(device=TorchDevice.choose_torch_device(), dtype=vae.dtype)
-            with torch.inference_mode(), tiling_context:
-                latents = ImageToLatentsInvocation._encode_to_tensor(vae, image_tensor)
+
+            def encode() -> torch.Tensor:
+                with torch.inference_mode():
+                    return ImageToLatentsInvocation._encode_to_tensor(vae, image_tensor)
+
+            if adaptive_tiling and not tiled:
+                latents, vae_tiling_stats = run_with_adaptive_vae_tiling(
+                    vae=vae, operation="encode", image_tensor=image_tensor, fp32=upcast, fn=encode
+                )
+                if on_vae_tiling_stats is not None:
+                    on_vae_tiling_stats(vae_tiling_stats)
+            else:
+                if tiled:
+                    vae.enable_tiling()
+                else:
+                    vae.disable_tiling()
+
+                tiling_context = nullcontext()
+                if tile_size > 0:
+                    tiling_context = patch_vae_tiling_params(
+                        vae,
+                        tile_sample_min_size=tile_size,
+                        tile_latent_min_size=tile_size // LATENT_SCALE_FACTOR,
+                        tile_overlap_factor=0.25,
+                    )
+
+                with tiling_context:
+                    latents = encode()
 
             latents = vae.config.scaling_factor * latents
             latents = latents.to(dtype=orig_dtype)
@@ -158,6 +181,10 @@ class ImageToLatentsInvocation(BaseInvocation):
             tiled=self.tiled or context.config.get().force_tiled_decode,
             image_tensor=image_tensor,
             tile_size=self.tile_size,
+            adaptive_tiling=context.config.get().adaptive_vae_tiling,
+            on_vae_tiling_stats=lambda stats: context._services.performance_statistics.add_vae_tiling_stats(
+                context._data.queue_item.session_id, stats
+            ),
         )
 
         latents = latents.to("cpu")
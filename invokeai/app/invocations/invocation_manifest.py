@@ -0,0 +1,135 @@
+"""A manifest of the core invocation modules and the invocation and output types each one defines.
+
+Importing every invocation module pulls in most of the model stacks (diffusers, transformers, etc), which accounts for
+much of the app's startup time. With the manifest, the `InvocationRegistry` knows which module defines each type without
+importing it, and imports each module the first time one of its types is used.
+
+The manifest is built by parsing the modules' source for `@invocation` and `@invocation_output` decorators. It is cached
+alongside the modules' bytecode, and, like the bytecode, a module's entry is rebuilt when the module's file changes.
+"""
+
+import ast
+import importlib
+import sys
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from invokeai.app.invocations.baseinvocation import InvocationRegistry
+from invokeai.backend.util.logging import InvokeAILogger
+from invokeai.version import __version__
+
+INVOCATIONS_DIR = Path(__file__).parent
+INVOCATIONS_PACKAGE = "invokeai.app.invocations"
+MANIFEST_CACHE_PATH = INVOCATIONS_DIR / "__pycache__" / "invocation_manifest.json"
+
+logger = InvokeAILogger.get_logger()
+
+
+class InvocationModuleManifest(BaseModel):
+    """The invocation and output types defined by a module."""
+
+    mtime_ns: int = Field(description="The modification time of the module's file, in nanoseconds")
+    size: int = Field(description="The size of the module's file, in bytes")
+    invocation_types: list[str] = Field(default_factory=list, description="The invocation types defined by the module")
+    output_types: list[str] = Field(default_factory=list, description="The output types defined by the module")
+    eager: bool = Field(
+        default=False, description="Whether the module's types could not be determined, so it must be imported eagerly"
+    )
+
+
+class InvocationManifest(BaseModel):
+    """The invocation and output types defined by each core invocation module."""
+
+    version: str = Field(description="The app version that built the manifest")
+    modules: dict[str, InvocationModuleManifest] = Field(
+        default_factory=dict, description="The manifest of each module, keyed by the module's file name"
+    )
+
+
+def _get_decorator_type(call: ast.Call, keyword: str) -> Optional[str]:
+    """Gets the type passed to an `@invocation` or `@invocation_output` decorator, if it is a string literal."""
+    type_arg = call.args[0] if call.args else next((k.value for k in call.keywords if k.arg == keyword), None)
+    if isinstance(type_arg, ast.Constant) and isinstance(type_arg.value, str):
+        return type_arg.value
+    return None
+
+
+def scan_invocation_module(path: Path) -> InvocationModuleManifest:
+    """Finds the invocation and output types defined by a module, by parsing its source."""
+    stat = path.stat()
+    manifest = InvocationModuleManifest(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+        if not isinstance(node, ast.Call):
+            continue
+        func_name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+        if func_name == "invocation":
+            types, keyword = manifest.invocation_types, "invocation_type"
+        elif func_name == "invocation_output":
+            types, keyword = manifest.output_types, "output_type"
+        else:
+            continue
+        type_ = _get_decorator_type(node, keyword)
+        if type_ is None:
+            # The type is computed at runtime, so we can't know it without importing the module
+            manifest.eager = True
+        else:
+            types.append(type_)
+    return manifest
+
+
+def _read_cached_manifest() -> Optional[InvocationManifest]:
+    try:
+        manifest = InvocationManifest.model_validate_json(MANIFEST_CACHE_PATH.read_bytes())
+    except (OSError, ValidationError):
+        return None
+    return manifest if manifest.version == __version__ else None
+
+
+def _write_cached_manifest(manifest: InvocationManifest) -> None:
+    # Like bytecode, the manifest is only a cache - if it can't be written (e.g. a read-only install), we rebuild it on
+    # the next startup.
+    if sys.dont_write_bytecode:
+        return
+    try:
+        MANIFEST_CACHE_PATH.parent.mkdir(exist_ok=True)
+        tmp_path = MANIFEST_CACHE_PATH.with_suffix(".tmp")
+        tmp_path.write_text(manifest.model_dump_json(indent=2))
+        tmp_path.replace(MANIFEST_CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"Unable to write invocation manifest cache: {e}")
+
+
+def get_invocation_manifest() -> InvocationManifest:
+    """Gets the manifest of the core invocation modules, rebuilding the entries of any modules that have changed since
+    the manifest was cached."""
+    cached = _read_cached_manifest()
+    cached_modules = cached.modules if cached is not None else {}
+    manifest = InvocationManifest(version=__version__)
+    for path in sorted(INVOCATIONS_DIR.glob("*.py")):
+        if path.name.startswith("_"):
+            continue
+        cached_module = cached_modules.get(path.name)
+        stat = path.stat()
+        if cached_module is not None and (cached_module.mtime_ns, cached_module.size) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            manifest.modules[path.name] = cached_module
+        else:
+            manifest.modules[path.name] = scan_invocation_module(path)
+    if cached is None or manifest.modules != cached_modules:
+        _write_cached_manifest(manifest)
+    return manifest
+
+
+def register_core_invocations() -> None:
+    """Registers the core invocation modules with the `InvocationRegistry`, to be imported on first use of one of their
+    types. Modules whose types can't be determined from their source are imported immediately."""
+    for file_name, module in get_invocation_manifest().modules.items():
+        module_name = f"{INVOCATIONS_PACKAGE}.{Path(file_name).stem}"
+        if module.eager:
+            importlib.import_module(module_name)
+        elif module.invocation_types or module.output_types:
+            InvocationRegistry.register_lazy_module(module_name, module.invocation_types, module.output_types)
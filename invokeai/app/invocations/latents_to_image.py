@@ -19,7 +19,7 @@ from invokeai.app.invocations.model import VAEField
 from invokeai.app.invocations.primitives import ImageOutput
 from invokeai.app.services.shared.invocation_context import InvocationContext
 from invokeai.backend.stable_diffusion.extensions.seamless import SeamlessExt
-from invokeai.backend.stable_diffusion.vae_tiling import patch_vae_tiling_params
+from invokeai.backend.stable_diffusion.vae_tiling import patch_vae_tiling_params, run_with_adaptive_vae_tiling
 from invokeai.backend.util.devices import TorchDevice
 from invokeai.backend.util.vae_working_memory import estimate_vae_working_memory_sd15_sdxl
 
@@ -53,6 +53,7 @@ class LatentsToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
         latents = context.tensors.load(self.latents.latents_name)
 
         use_tiling = self.tiled or context.config.get().force_tiled_decode
+        use_adaptive_tiling = not use_tiling and context.config.get().adaptive_vae_tiling
 
         vae_info = context.models.load(self.vae.vae)
         assert isinstance(vae_info.model, (AutoencoderKL, AutoencoderTiny))
@@ -78,32 +79,43 @@ class LatentsToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
                 vae.to(dtype=torch.float16)
                 latents = latents.half()
 
-            if use_tiling:
-                vae.enable_tiling()
-            else:
-                vae.disable_tiling()
-
-            tiling_context = nullcontext()
-            if self.tile_size > 0:
-                tiling_context = patch_vae_tiling_params(
-                    vae,
-                    tile_sample_min_size=self.tile_size,
-                    tile_latent_min_size=self.tile_size // LATENT_SCALE_FACTOR,
-                    tile_overlap_factor=0.25,
-                )
-
             # clear memory as vae decode can request a lot
             TorchDevice.empty_cache()
 
-            with torch.inference_mode(), tiling_context:
-                # copied from diffusers pipeline
-                latents = latents / vae.config.scaling_factor
-                image = vae.decode(latents, return_dict=False)[0]
-                image = (image / 2 + 0.5).clamp(0, 1)  # denormalize
-                # we always cast to float32 as this does not cause significant overhead and is compatible with bfloat16
-                np_image = image.cpu().permute(0, 2, 3, 1).float().numpy()
+            def decode() -> torch.Tensor:
+                with torch.inference_mode():
+                    # copied from diffusers pipeline
+                    image = vae.decode(latents / vae.config.scaling_factor, return_dict=False)[0]
+                    return (image / 2 + 0.5).clamp(0, 1)  # denormalize
 
-                image = VaeImageProcessor.numpy_to_pil(np_image)[0]
+            if use_adaptive_tiling:
+                decoded, vae_tiling_stats = run_with_adaptive_vae_tiling(
+                    vae=vae, operation="decode", image_tensor=latents, fp32=self.fp32, fn=decode
+                )
+                context._services.performance_statistics.add_vae_tiling_stats(
+                    context._data.queue_item.session_id, vae_tiling_stats
+                )
+            else:
+                if use_tiling:
+                    vae.enable_tiling()
+                else:
+                    vae.disable_tiling()
+
+                tiling_context = nullcontext()
+                if self.tile_size > 0:
+                    tiling_context = patch_vae_tiling_params(
+                        vae,
+                        tile_sample_min_size=self.tile_size,
+                        tile_latent_min_size=self.tile_size // LATENT_SCALE_FACTOR,
+                        tile_overlap_factor=0.25,
+                    )
+
+                with tiling_context:
+                    decoded = decode()
+
+            # we always cast to float32 as this does not cause significant overhead and is compatible with bfloat16
+            np_image = decoded.cpu().permute(0, 2, 3, 1).float().numpy()
+            image = VaeImageProcessor.numpy_to_pil(np_image)[0]
 
         TorchDevice.empty_cache()
 
@@ -1,4 +1,4 @@
-from invokeai.app.invocations.baseinvocation import BaseInvocation, invocation
+from invokeai.app.invocations.baseinvocation import BaseInvocation, Bottleneck, invocation
 from invokeai.app.invocations.fields import ImageField, InputField, WithBoard, WithMetadata
 from invokeai.app.invocations.primitives import ImageOutput
 from invokeai.app.services.shared.invocation_context import InvocationContext
@@ -11,6 +11,7 @@ from invokeai.backend.image_util.mediapipe_face import detect_faces
     tags=["controlnet", "face"],
     category="controlnet",
     version="1.0.0",
+    bottleneck=Bottleneck.CPU,
 )
 class MediaPipeFaceDetectionInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Detects faces using MediaPipe."""
@@ -252,6 +252,7 @@ def get_model(
     category="metadata",
     version="1.0.1",
     classification=Classification.Beta,
+    mutates_inputs=True,
 )
 class MetadataItemLinkedInvocation(BaseInvocation, WithMetadata):
     """Used to Create/Add/Update a value into a metadata label"""
@@ -623,6 +624,7 @@ class LatentsMetaOutput(LatentsOutput, MetadataOutput):
     tags=["latents", "denoise", "txt2img", "t2i", "t2l", "img2img", "i2i", "l2l"],
     category="latents",
     version="1.1.1",
+    mutates_inputs=True,
 )
 class DenoiseLatentsMetaInvocation(DenoiseLatentsInvocation, WithMetadata):
     def invoke(self, context: InvocationContext) -> LatentsMetaOutput:
@@ -688,6 +690,7 @@ class DenoiseLatentsMetaInvocation(DenoiseLatentsInvocation, WithMetadata):
     tags=["flux", "latents", "denoise", "txt2img", "t2i", "t2l", "img2img", "i2i", "l2l"],
     category="latents",
     version="1.0.1",
+    mutates_inputs=True,
 )
 class FluxDenoiseLatentsMetaInvocation(FluxDenoiseInvocation, WithMetadata):
     """Run denoising process with a FLUX transformer model + metadata."""
@@ -736,6 +739,7 @@ class FluxDenoiseLatentsMetaInvocation(FluxDenoiseInvocation, WithMetadata):
     tags=["z-image", "latents", "denoise", "txt2img", "t2i", "t2l", "img2img", "i2i", "l2l"],
     category="latents",
     version="1.0.0",
+    mutates_inputs=True,
 )
 class ZImageDenoiseMetaInvocation(ZImageDenoiseInvocation, WithMetadata):
     """Run denoising process with a Z-Image transformer model + metadata."""
@@ -16,16 +16,16 @@ from invokeai.app.invocations.fields import (
 )
 from invokeai.app.invocations.model import ModelIdentifierField
 from invokeai.app.invocations.primitives import ImageOutput
-from invokeai.app.services.session_processor.session_processor_common import CanceledException
 from invokeai.app.services.shared.invocation_context import InvocationContext
 from invokeai.backend.model_manager.taxonomy import ModelType
 from invokeai.backend.spandrel_image_to_image_model import SpandrelImageToImageModel
+from invokeai.backend.tiles.pipelined_image_to_image import run_tiled_image_to_image
 from invokeai.backend.tiles.tiles import calc_tiles_min_overlap
 from invokeai.backend.tiles.utils import TBLR, Tile
 from invokeai.backend.util.devices import TorchDevice
 
 
-@invocation("spandrel_image_to_image", title="Image-to-Image", tags=["upscale"], category="upscale", version="1.3.0")
+@invocation("spandrel_image_to_image", title="Image-to-Image", tags=["upscale"], category="upscale", version="1.4.0")
 class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     """Run any spandrel image-to-image model (https://github.com/chaiNNer-org/spandrel)."""
 
@@ -38,6 +38,12 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     tile_size: int = InputField(
         default=512, description="The tile size for tiled image-to-image. Set to 0 to disable tiling."
     )
+    tile_batch_size: int = InputField(
+        default=1,
+        ge=1,
+        le=16,
+        description="The max number of same-sized tiles to process at once. Higher values can be faster, but use more VRAM.",
+    )
 
     @classmethod
     def scale_tile(cls, tile: Tile, scale: int) -> Tile:
@@ -64,6 +70,7 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
         spandrel_model: SpandrelImageToImageModel,
         is_canceled: Callable[[], bool],
         step_callback: Callable[[int, int], None],
+        tile_batch_size: int = 1,
     ) -> Image.Image:
         # Compute the image tiles.
         if tile_size > 0:
@@ -93,56 +100,25 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
         # Prepare input image for inference.
         image_tensor = SpandrelImageToImageModel.pil_to_tensor(image)
 
-        # Scale the tiles for re-assembling the final image.
-        scale = spandrel_model.scale
-        scaled_tiles = [cls.scale_tile(tile, scale=scale) for tile in tiles]
-
-        # Prepare the output tensor.
-        _, channels, height, width = image_tensor.shape
-        output_tensor = torch.zeros(
-            (height * scale, width * scale, channels), dtype=torch.uint8, device=torch.device("cpu")
-        )
-
         image_tensor = image_tensor.to(device=TorchDevice.choose_torch_device(), dtype=spandrel_model.dtype)
 
-        # Run the model on each tile.
-        pbar = tqdm(list(zip(tiles, scaled_tiles, strict=True)), desc="Upscaling Tiles")
-
-        # Update progress, starting with 0.
-        step_callback(0, pbar.total)
-
-        for tile, scaled_tile in pbar:
-            # Exit early if the invocation has been canceled.
-            if is_canceled():
-                raise CanceledException
-
-            # Extract the current tile from the input tensor.
-            input_tile = image_tensor[:, :, tile.coords.top : tile.coords.bottom, tile.coords.left : tile.coords.right]
-
-            # Run the model on the tile.
-            output_tile = spandrel_model.run(input_tile)
-
-            # Convert the output tile into the output tensor's format.
-            # (N, C, H, W) -> (C, H, W)
-            output_tile = output_tile.squeeze(0)
-            # (C, H, W) -> (H, W, C)
-            output_tile = output_tile.permute(1, 2, 0)
-            output_tile = output_tile.clamp(0, 1)
-            output_tile = (output_tile * 255).to(dtype=torch.uint8, device=torch.device("cpu"))
-
-            # Merge the output tile into the output tensor.
-            # We only keep half of the overlap on the top and left side of the tile. We do this in case there are
-            # edge artifacts. We don't bother with any 'blending' in the current implementation - for most upscalers
-            # it seems unnecessary, but we may find a need in the future.
-            top_overlap = scaled_tile.overlap.top // 2
-            left_overlap = scaled_tile.overlap.left // 2
-            output_tensor[
-                scaled_tile.coords.top + top_overlap : scaled_tile.coords.bottom,
-                scaled_tile.coords.left + left_overlap : scaled_tile.coords.right,
-                :,
-            ] = output_tile[top_overlap:, left_overlap:, :]
-
-            step_callback(pbar.n + 1, pbar.total)
+        pbar = tqdm(total=len(tiles), desc="Upscaling Tiles")
+
+        def tile_callback(step: int, total_steps: int) -> None:
+            pbar.update(step - pbar.n)
+            step_callback(step, total_steps)
+
+        # Run the model on the tiles, merging them into the output tensor.
+        with pbar:
+            output_tensor = run_tiled_image_to_image(
+                image_tensor,
+                tiles,
+                scale=spandrel_model.scale,
+                run_model=spandrel_model.run,
+                batch_size=tile_batch_size,
+                is_canceled=is_canceled,
+                step_callback=tile_callback,
+            )
 
         # Convert the output tensor to a PIL image.
         np_image = output_tensor.detach().numpy().astype(np.uint8)
@@ -168,7 +144,7 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
 
             # Upscale the image
             pil_image = self.upscale_image(
-                image, self.tile_size, spandrel_model, context.util.is_canceled, step_callback
+                image, self.tile_size, spandrel_model, context.util.is_canceled, step_callback, self.tile_batch_size
             )
 
         image_dto = context.images.save(image=pil_image)
@@ -180,7 +156,7 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
     title="Image-to-Image (Autoscale)",
     tags=["upscale"],
     category="upscale",
-    version="1.0.0",
+    version="1.1.0",
 )
 class SpandrelImageToImageAutoscaleInvocation(SpandrelImageToImageInvocation):
     """Run any spandrel image-to-image model (https://github.com/chaiNNer-org/spandrel) until the target scale is reached."""
@@ -227,6 +203,7 @@ class SpandrelImageToImageAutoscaleInvocation(SpandrelImageToImageInvocation):
                 spandrel_model,
                 context.util.is_canceled,
                 functools.partial(step_callback, iteration),
+                self.tile_batch_size,
             )
 
             # Some models don't upscale the image, but we have no way to know this in advance. We'll check if the model
@@ -245,6 +222,7 @@ class SpandrelImageToImageAutoscaleInvocation(SpandrelImageToImageInvocation):
                         spandrel_model,
                         context.util.is_canceled,
                         functools.partial(step_callback, iteration),
+                        self.tile_batch_size,
                     )
 
                     # Sanity check to prevent excessive or infinite loops. All known upscaling models are at least 2x.
@@ -1,3 +1,5 @@
+import itertools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Literal
 
 import numpy as np
@@ -14,11 +16,11 @@ from invokeai.app.invocations.fields import ImageField, Input, InputField, Outpu
 from invokeai.app.invocations.primitives import ImageOutput
 from invokeai.app.services.shared.invocation_context import InvocationContext
 from invokeai.backend.tiles.tiles import (
+    LinearBlendingTileMerger,
+    SeamBlendingTileMerger,
     calc_tiles_even_split,
     calc_tiles_min_overlap,
     calc_tiles_with_overlap,
-    merge_tiles_with_linear_blending,
-    merge_tiles_with_seam_blending,
 )
 from invokeai.backend.tiles.utils import Tile
 
@@ -217,6 +219,11 @@ class PairTileImageInvocation(BaseInvocation):
 
 BLEND_MODES = Literal["Linear", "Seam"]
 
+# The max number of worker threads used to decode tile images while merging.
+TILE_DECODE_MAX_WORKERS = 4
+# The max number of decoded tile images that may be held in memory while merging.
+TILE_DECODE_WINDOW = 2 * TILE_DECODE_MAX_WORKERS
+
 
 @invocation(
     "merge_tiles_to_image",
@@ -252,33 +259,49 @@ class MergeTilesToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
             height = max(height, tile.coords.bottom)
             width = max(width, tile.coords.right)
 
-        # Get all tile images for processing.
-        # TODO(ryand): It pains me that we spend time PNG decoding each tile from disk when they almost certainly
-        # existed in memory at an earlier point in the graph.
-        tile_np_images: list[np.ndarray] = []
-        for image in images:
-            pil_image = context.images.get_pil(image.image_name)
-            pil_image = pil_image.convert("RGB")
-            tile_np_images.append(np.array(pil_image))
-
-        # Prepare the output image buffer.
-        # Check the first tile to determine how many image channels are expected in the output.
-        channels = tile_np_images[0].shape[-1]
-        dtype = tile_np_images[0].dtype
-        np_image = np.zeros(shape=(height, width, channels), dtype=dtype)
+        # Prepare the output image buffer. Tiles are always loaded as 8-bit RGB (see `_load_np_image(...)`).
+        np_image = np.zeros(shape=(height, width, 3), dtype=np.uint8)
         if self.blend_mode == "Linear":
-            merge_tiles_with_linear_blending(
-                dst_image=np_image, tiles=tiles, tile_images=tile_np_images, blend_amount=self.blend_amount
-            )
+            merger = LinearBlendingTileMerger(dst_image=np_image, tiles=tiles, blend_amount=self.blend_amount)
         elif self.blend_mode == "Seam":
-            merge_tiles_with_seam_blending(
-                dst_image=np_image, tiles=tiles, tile_images=tile_np_images, blend_amount=self.blend_amount
-            )
+            merger = SeamBlendingTileMerger(dst_image=np_image, tiles=tiles, blend_amount=self.blend_amount)
         else:
             raise ValueError(f"Unsupported blend mode: '{self.blend_mode}'.")
 
+        # Decode the tile images on a thread pool and stream them into the merger as they complete. Tiles are
+        # submitted in merge order through a bounded window, so at most TILE_DECODE_WINDOW decoded tiles are held in
+        # memory at a time (either in flight, or waiting in the merger for a predecessor).
+        # TODO(ryand): It pains me that we spend time PNG decoding each tile from disk when they almost certainly
+        # existed in memory at an earlier point in the graph.
+        tile_idxs = iter(merger.tile_idxs_in_merge_order)
+        executor = ThreadPoolExecutor(max_workers=TILE_DECODE_MAX_WORKERS)
+        try:
+            in_flight: dict[Future[np.ndarray], int] = {}
+            for tile_idx in itertools.islice(tile_idxs, TILE_DECODE_WINDOW):
+                in_flight[executor.submit(self._load_np_image, context, images[tile_idx])] = tile_idx
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Drop our reference to the future so that the decoded tile can be freed once it has been merged.
+                    merger.add_tile(in_flight.pop(future), future.result())
+                    next_tile_idx = next(tile_idxs, None)
+                    if next_tile_idx is not None:
+                        in_flight[executor.submit(self._load_np_image, context, images[next_tile_idx])] = next_tile_idx
+        except BaseException:
+            # Don't wait for the remaining decodes before surfacing the error.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        merger.finalize()
+
         # Convert into a PIL image and save
         pil_image = Image.fromarray(np_image)
 
         image_dto = context.images.save(image=pil_image)
         return ImageOutput.build(image_dto)
+
+    @staticmethod
+    def _load_np_image(context: InvocationContext, image: ImageField) -> np.ndarray:
+        pil_image = context.images.get_pil(image.image_name)
+        pil_image = pil_image.convert("RGB")
+        return np.array(pil_image)
@@ -63,16 +63,17 @@ def run_app() -> None:
     # Initialize the app and event loop.
     app, loop = get_app()
 
-    # Load custom nodes. This must be done after importing the Graph class, which itself imports all modules from the
+    # Load custom nodes. This must be done after importing the Graph class, which itself registers all modules from the
     # invocations module. The ordering here is implicit, but important - we want to load custom nodes after all the
-    # core nodes have been imported so that we can catch when a custom node clobbers a core node.
+    # core nodes have been registered so that we can catch when a custom node clobbers a core node.
     load_custom_nodes(custom_nodes_path=app_config.custom_nodes_path, logger=logger)
 
-    # Check all invocations and ensure their outputs are registered.
-    for invocation in InvocationRegistry.get_invocation_classes():
+    # Check all loaded invocations and ensure their outputs are registered. Core invocation modules are imported on
+    # first use, so this checks the custom nodes and the core modules they import, without importing the rest.
+    for invocation in InvocationRegistry.get_loaded_invocation_classes():
         invocation_type = invocation.get_type()
         output_annotation = invocation.get_output_annotation()
-        if output_annotation not in InvocationRegistry.get_output_classes():
+        if output_annotation not in InvocationRegistry.get_loaded_output_classes():
             logger.warning(
                 f'Invocation "{invocation_type}" has unregistered output class "{output_annotation.__name__}"'
             )
@@ -84,22 +84,20 @@ class SqliteBoardImageRecordStorage(BoardImageRecordStorageBase):
         with self._db.transaction() as cursor:
             params: list[str | bool] = []
 
-            # Base query is a join between images and board_images
-            stmt = """
+            # Handle board_id filter. For a specific board, the CROSS JOIN makes SQLite start from the board's images.
+            if board_id == "none":
+                stmt = """--sql
                     SELECT images.image_name
                     FROM images
                     LEFT JOIN board_images ON board_images.image_name = images.image_name
-                    WHERE 1=1
-                    """
-
-            # Handle board_id filter
-            if board_id == "none":
-                stmt += """--sql
-                    AND board_images.board_id IS NULL
+                    WHERE board_images.board_id IS NULL
                     """
             else:
-                stmt += """--sql
-                    AND board_images.board_id = ?
+                stmt = """--sql
+                    SELECT images.image_name
+                    FROM board_images
+                    CROSS JOIN images ON images.image_name = board_images.image_name
+                    WHERE board_images.board_id = ?
                     """
                 params.append(board_id)
 
@@ -161,7 +159,7 @@ class SqliteBoardImageRecordStorage(BoardImageRecordStorageBase):
                 f"""--sql
                     SELECT COUNT(*)
                     FROM board_images
-                    INNER JOIN images ON board_images.image_name = images.image_name
+                    CROSS JOIN images ON board_images.image_name = images.image_name
                     WHERE images.is_intermediate = FALSE AND images.image_category IN ( {placeholders} )
                     AND board_images.board_id = ?;
                     """,
@@ -180,7 +178,7 @@ class SqliteBoardImageRecordStorage(BoardImageRecordStorageBase):
                 f"""--sql
                     SELECT COUNT(*)
                     FROM board_images
-                    INNER JOIN images ON board_images.image_name = images.image_name
+                    CROSS JOIN images ON board_images.image_name = images.image_name
                     WHERE images.is_intermediate = FALSE AND images.image_category IN ( {placeholders} )
                     AND board_images.board_id = ?;
                     """,
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 
-from invokeai.app.services.board_records.board_records_common import BoardChanges, BoardRecord, BoardRecordOrderBy
+from invokeai.app.services.board_records.board_records_common import (
+    BoardChanges,
+    BoardRecordOrderBy,
+    BoardRecordWithStats,
+)
 from invokeai.app.services.shared.pagination import OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 
@@ -17,7 +21,7 @@ class BoardRecordStorageBase(ABC):
     def save(
         self,
         board_name: str,
-    ) -> BoardRecord:
+    ) -> BoardRecordWithStats:
         """Saves a board record."""
         pass
 
@@ -25,8 +29,8 @@ class BoardRecordStorageBase(ABC):
     def get(
         self,
         board_id: str,
-    ) -> BoardRecord:
-        """Gets a board record."""
+    ) -> BoardRecordWithStats:
+        """Gets a board record, with its stats."""
         pass
 
     @abstractmethod
@@ -34,7 +38,7 @@ class BoardRecordStorageBase(ABC):
         self,
         board_id: str,
         changes: BoardChanges,
-    ) -> BoardRecord:
+    ) -> BoardRecordWithStats:
         """Updates a board record."""
         pass
 
@@ -46,13 +50,13 @@ class BoardRecordStorageBase(ABC):
         offset: int = 0,
         limit: int = 10,
         include_archived: bool = False,
-    ) -> OffsetPaginatedResults[BoardRecord]:
-        """Gets many board records."""
+    ) -> OffsetPaginatedResults[BoardRecordWithStats]:
+        """Gets many board records, with their stats."""
         pass
 
     @abstractmethod
     def get_all(
         self, order_by: BoardRecordOrderBy, direction: SQLiteDirection, include_archived: bool = False
-    ) -> list[BoardRecord]:
-        """Gets all board records."""
+    ) -> list[BoardRecordWithStats]:
+        """Gets all board records, with their stats."""
         pass
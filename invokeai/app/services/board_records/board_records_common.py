@@ -28,6 +28,26 @@ class BoardRecord(BaseModelExcludeNull):
     """Whether or not the board is archived."""
 
 
+class BoardStats(BaseModel):
+    """The stats of a board. These are kept up to date by the database as images are added, changed and removed."""
+
+    image_count: int = Field(default=0, description="The number of images in the board.")
+    """The number of images in the board."""
+    asset_count: int = Field(default=0, description="The number of assets in the board.")
+    """The number of assets in the board."""
+    cover_image_name: Optional[str] = Field(
+        default=None, description="The name of the most recent image in the board, starred images first."
+    )
+    """The name of the most recent image in the board, starred images first."""
+
+
+class BoardRecordWithStats(BoardRecord):
+    """Deserialized board record, with the board's stats."""
+
+    stats: BoardStats = Field(description="The stats of the board.")
+    """The stats of the board."""
+
+
 def deserialize_board_record(board_dict: dict) -> BoardRecord:
     """Deserializes a board record."""
 
@@ -52,6 +72,19 @@ def deserialize_board_record(board_dict: dict) -> BoardRecord:
     )
 
 
+def deserialize_board_record_with_stats(board_dict: dict) -> BoardRecordWithStats:
+    """Deserializes a board record joined with its stats."""
+
+    board_record = deserialize_board_record(board_dict)
+    stats = BoardStats(
+        image_count=board_dict.get("image_count") or 0,
+        asset_count=board_dict.get("asset_count") or 0,
+        cover_image_name=board_dict.get("stats_cover_image_name"),
+    )
+
+    return BoardRecordWithStats(**board_record.model_dump(), stats=stats)
+
+
 class BoardChanges(BaseModel, extra="forbid"):
     board_name: Optional[str] = Field(default=None, description="The board's new name.", max_length=300)
     cover_image_name: Optional[str] = Field(default=None, description="The name of the board's new cover image.")
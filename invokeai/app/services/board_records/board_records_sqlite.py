@@ -4,18 +4,28 @@ from typing import Union, cast
 from invokeai.app.services.board_records.board_records_base import BoardRecordStorageBase
 from invokeai.app.services.board_records.board_records_common import (
     BoardChanges,
-    BoardRecord,
     BoardRecordDeleteException,
     BoardRecordNotFoundException,
     BoardRecordOrderBy,
     BoardRecordSaveException,
-    deserialize_board_record,
+    BoardRecordWithStats,
+    deserialize_board_record_with_stats,
 )
 from invokeai.app.services.shared.pagination import OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
 from invokeai.app.util.misc import uuid_string
 
+# Boards are always selected with their stats, so that they can be listed in a single query.
+BOARDS_WITH_STATS = """
+    boards.*,
+    board_stats.image_count,
+    board_stats.asset_count,
+    board_stats.cover_image_name AS stats_cover_image_name
+    FROM boards
+    LEFT JOIN board_stats ON board_stats.board_id = boards.board_id
+"""
+
 
 class SqliteBoardRecordStorage(BoardRecordStorageBase):
     def __init__(self, db: SqliteDatabase) -> None:
@@ -38,7 +48,7 @@ class SqliteBoardRecordStorage(BoardRecordStorageBase):
     def save(
         self,
         board_name: str,
-    ) -> BoardRecord:
+    ) -> BoardRecordWithStats:
         with self._db.transaction() as cursor:
             try:
                 board_id = uuid_string()
@@ -56,14 +66,13 @@ class SqliteBoardRecordStorage(BoardRecordStorageBase):
     def get(
         self,
         board_id: str,
-    ) -> BoardRecord:
+    ) -> BoardRecordWithStats:
         with self._db.transaction() as cursor:
             try:
                 cursor.execute(
-                    """--sql
-                    SELECT *
-                    FROM boards
-                    WHERE board_id = ?;
+                    f"""--sql
+                    SELECT {BOARDS_WITH_STATS}
+                    WHERE boards.board_id = ?;
                     """,
                     (board_id,),
                 )
@@ -73,13 +82,13 @@ class SqliteBoardRecordStorage(BoardRecordStorageBase):
                 raise BoardRecordNotFoundException from e
         if result is None:
             raise BoardRecordNotFoundException
-        return BoardRecord(**dict(result))
+        return deserialize_board_record_with_stats(dict(result))
 
     def update(
         self,
         board_id: str,
         changes: BoardChanges,
-    ) -> BoardRecord:
+    ) -> BoardRecordWithStats:
         with self._db.transaction() as cursor:
             try:
                 # Change the name of a board
@@ -126,29 +135,31 @@ class SqliteBoardRecordStorage(BoardRecordStorageBase):
         offset: int = 0,
         limit: int = 10,
         include_archived: bool = False,
-    ) -> OffsetPaginatedResults[BoardRecord]:
+    ) -> OffsetPaginatedResults[BoardRecordWithStats]:
         with self._db.transaction() as cursor:
             # Build base query
             base_query = """
-                    SELECT *
-                    FROM boards
+                    SELECT {boards_with_stats}
                     {archived_filter}
-                    ORDER BY {order_by} {direction}
+                    ORDER BY boards.{order_by} {direction}
                     LIMIT ? OFFSET ?;
                 """
 
             # Determine archived filter condition
-            archived_filter = "" if include_archived else "WHERE archived = 0"
+            archived_filter = "" if include_archived else "WHERE boards.archived = 0"
 
             final_query = base_query.format(
-                archived_filter=archived_filter, order_by=order_by.value, direction=direction.value
+                boards_with_stats=BOARDS_WITH_STATS,
+                archived_filter=archived_filter,
+                order_by=order_by.value,
+                direction=direction.value,
             )
 
             # Execute query to fetch boards
             cursor.execute(final_query, (limit, offset))
 
             result = cast(list[sqlite3.Row], cursor.fetchall())
-            boards = [deserialize_board_record(dict(r)) for r in result]
+            boards = [deserialize_board_record_with_stats(dict(r)) for r in result]
 
             # Determine count query
             if include_archived:
@@ -168,36 +179,37 @@ class SqliteBoardRecordStorage(BoardRecordStorageBase):
 
             count = cast(int, cursor.fetchone()[0])
 
-        return OffsetPaginatedResults[BoardRecord](items=boards, offset=offset, limit=limit, total=count)
+        return OffsetPaginatedResults[BoardRecordWithStats](items=boards, offset=offset, limit=limit, total=count)
 
     def get_all(
         self, order_by: BoardRecordOrderBy, direction: SQLiteDirection, include_archived: bool = False
-    ) -> list[BoardRecord]:
+    ) -> list[BoardRecordWithStats]:
         with self._db.transaction() as cursor:
             if order_by == BoardRecordOrderBy.Name:
                 base_query = """
-                        SELECT *
-                        FROM boards
+                        SELECT {boards_with_stats}
                         {archived_filter}
-                        ORDER BY LOWER(board_name) {direction}
+                        ORDER BY LOWER(boards.board_name) {direction}
                     """
             else:
                 base_query = """
-                        SELECT *
-                        FROM boards
+                        SELECT {boards_with_stats}
                         {archived_filter}
-                        ORDER BY {order_by} {direction}
+                        ORDER BY boards.{order_by} {direction}
                     """
 
-            archived_filter = "" if include_archived else "WHERE archived = 0"
+            archived_filter = "" if include_archived else "WHERE boards.archived = 0"
 
             final_query = base_query.format(
-                archived_filter=archived_filter, order_by=order_by.value, direction=direction.value
+                boards_with_stats=BOARDS_WITH_STATS,
+                archived_filter=archived_filter,
+                order_by=order_by.value,
+                direction=direction.value,
             )
 
             cursor.execute(final_query)
 
             result = cast(list[sqlite3.Row], cursor.fetchall())
-        boards = [deserialize_board_record(dict(r)) for r in result]
+        boards = [deserialize_board_record_with_stats(dict(r)) for r in result]
 
         return boards
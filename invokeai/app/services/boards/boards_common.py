@@ -2,7 +2,7 @@ from typing import Optional
 
 from pydantic import Field
 
-from invokeai.app.services.board_records.board_records_common import BoardRecord
+from invokeai.app.services.board_records.board_records_common import BoardRecord, BoardRecordWithStats
 
 
 class BoardDTO(BoardRecord):
@@ -16,13 +16,11 @@ class BoardDTO(BoardRecord):
     """The number of assets in the board."""
 
 
-def board_record_to_dto(
-    board_record: BoardRecord, cover_image_name: Optional[str], image_count: int, asset_count: int
-) -> BoardDTO:
+def board_record_to_dto(board_record: BoardRecordWithStats) -> BoardDTO:
     """Converts a board record to a board DTO."""
     return BoardDTO(
-        **board_record.model_dump(exclude={"cover_image_name"}),
-        cover_image_name=cover_image_name,
-        image_count=image_count,
-        asset_count=asset_count,
+        **board_record.model_dump(exclude={"cover_image_name", "stats"}),
+        cover_image_name=board_record.stats.cover_image_name,
+        image_count=board_record.stats.image_count,
+        asset_count=board_record.stats.asset_count,
     )
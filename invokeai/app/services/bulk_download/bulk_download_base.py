@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 
 
 class BulkDownloadBase(ABC):
@@ -17,6 +17,19 @@ class BulkDownloadBase(ABC):
         :param bulk_download_item_id: The bulk_download_item_id that will be used to retrieve the bulk download item when it is prepared, if none is provided a uuid will be generated.
         """
 
+    @abstractmethod
+    def stream(self, image_names: Optional[list[str]], board_id: Optional[str]) -> Iterator[bytes]:
+        """
+        Stream a zip file containing the images specified by the given image names or board id.
+
+        The zip file is generated as it is consumed, without being written to disk. The images are looked up before
+        this method returns, so missing images or boards raise here rather than part-way through the stream.
+
+        :param image_names: A list of image names to include in the zip file.
+        :param board_id: The ID of the board. If provided, all images associated with the board will be included in the zip file.
+        :return: An iterator over the chunks of the zip file.
+        """
+
     @abstractmethod
     def get_path(self, bulk_download_item_name: str) -> str:
         """
@@ -1,7 +1,11 @@
+import io
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Optional, Union
-from zipfile import ZipFile
+from typing import Iterable, Iterator, Optional, Union
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
 from invokeai.app.services.board_records.board_records_common import BoardRecordNotFoundException
 from invokeai.app.services.bulk_download.bulk_download_base import BulkDownloadBase
@@ -16,6 +20,37 @@ from invokeai.app.services.images.images_common import ImageDTO
 from invokeai.app.services.invoker import Invoker
 from invokeai.app.util.misc import uuid_string
 
+# The number of image files read ahead of the one being added to a zip file
+ZIP_READ_AHEAD = 8
+
+# A zip stream is yielded in chunks of at least this size (other than the last)
+ZIP_STREAM_CHUNK_SIZE = 2**20
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """An unseekable buffer for a ZipFile to write to, which is drained as the zip file is generated."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._size += len(b)
+        return len(b)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self._size = 0
+        return data
+
 
 class BulkDownloadService(BulkDownloadBase):
     def start(self, invoker: Invoker) -> None:
@@ -59,6 +94,15 @@ class BulkDownloadService(BulkDownloadBase):
             self._invoker.services.logger.error("Problem bulk downloading images.")
             raise e
 
+    def stream(self, image_names: Optional[list[str]], board_id: Optional[str]) -> Iterator[bytes]:
+        if board_id:
+            image_dtos = self._board_handler(board_id)
+        elif image_names:
+            image_dtos = self._image_handler(image_names)
+        else:
+            raise BulkDownloadParametersException()
+        return self._generate_zip(image_dtos)
+
     def _image_handler(self, image_names: list[str]) -> list[ImageDTO]:
         return [self._invoker.services.images.get_dto(image_name) for image_name in image_names]
 
@@ -89,14 +133,53 @@ class BulkDownloadService(BulkDownloadBase):
         zip_file_name = bulk_download_item_id + ".zip"
         zip_file_path = self._bulk_downloads_folder / (zip_file_name)
 
-        with ZipFile(zip_file_path, "w") as zip_file:
-            for image_dto in image_dtos:
-                image_zip_path = Path(image_dto.image_category.value) / image_dto.image_name
-                image_disk_path = self._invoker.services.images.get_path(image_dto.image_name)
-                zip_file.write(image_disk_path, arcname=image_zip_path)
+        with open(zip_file_path, "wb") as zip_file:
+            for chunk in self._generate_zip(image_dtos):
+                zip_file.write(chunk)
 
         return str(zip_file_name)
 
+    def _generate_zip(self, image_dtos: list[ImageDTO]) -> Iterator[bytes]:
+        """
+        Generate a zip file containing the given images, in chunks.
+
+        The images are stored rather than compressed, as they are already compressed. They are read from disk in a
+        thread pool, ahead of being added to the zip file.
+        """
+        buffer = _ZipStreamBuffer()
+        executor = ThreadPoolExecutor(max_workers=ZIP_READ_AHEAD, thread_name_prefix="bulk_download")
+        try:
+            with ZipFile(buffer, "w", compression=ZIP_STORED) as zip_file:
+                for zip_info, data in self._read_images(image_dtos, executor):
+                    zip_file.writestr(zip_info, data)
+                    if len(buffer) >= ZIP_STREAM_CHUNK_SIZE:
+                        yield buffer.drain()
+            yield buffer.drain()
+        finally:
+            # If the consumer stops early (e.g. the client disconnects), don't bother reading the remaining images
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _read_images(
+        self, image_dtos: Iterable[ImageDTO], executor: ThreadPoolExecutor
+    ) -> Iterator[tuple[ZipInfo, bytes]]:
+        """Read the images in order, keeping up to ZIP_READ_AHEAD reads in flight."""
+        image_dtos = iter(image_dtos)
+        reads: deque[Future[tuple[ZipInfo, bytes]]] = deque(
+            executor.submit(self._read_image, image_dto) for image_dto in islice(image_dtos, ZIP_READ_AHEAD)
+        )
+        while reads:
+            result = reads.popleft().result()
+            if (image_dto := next(image_dtos, None)) is not None:
+                reads.append(executor.submit(self._read_image, image_dto))
+            yield result
+
+    def _read_image(self, image_dto: ImageDTO) -> tuple[ZipInfo, bytes]:
+        image_zip_path = Path(image_dto.image_category.value) / image_dto.image_name
+        image_disk_path = Path(self._invoker.services.images.get_path(image_dto.image_name))
+        zip_info = ZipInfo.from_file(image_disk_path, arcname=image_zip_path)
+        zip_info.compress_type = ZIP_STORED
+        return zip_info, image_disk_path.read_bytes()
+
     # from https://stackoverflow.com/questions/7406102/create-sane-safe-filename-from-any-unsafe-string
     def _clean_string_to_path_safe(self, s: str) -> str:
         """Clean a string to be path safe."""
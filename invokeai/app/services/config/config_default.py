@@ -66,6 +66,7 @@ class InvokeAIAppConfig(BaseSettings):
         models_dir: Path to the models directory.
         convert_cache_dir: Path to the converted models cache directory (DEPRECATED, but do not delete because it is needed for migration from previous versions).
         download_cache_dir: Path to the directory that contains dynamically downloaded models.
+        vram_placement_plans_dir: Path to the directory that contains the profiled VRAM placement plans of partially-loaded models.
         legacy_conf_dir: Path to directory of legacy checkpoint config files.
         db_dir: Path to InvokeAI databases directory.
         outputs_dir: Path to directory for outputs.
@@ -82,6 +83,8 @@ class InvokeAIAppConfig(BaseSettings):
         profile_graphs: Enable graph profiling using `cProfile`.
         profile_prefix: An optional prefix for profile output files.
         profiles_dir: Path to profiles output directory.
+        trace_graphs: Record tracing spans for each session (dequeue, nodes, model cache operations, LoRA patching, denoising steps, image saves and database writes) and write them to the profiles directory as a Chrome trace (`.trace.json`, viewable in https://ui.perfetto.dev) and as OTLP/JSON (`.otlp.json`).
+        performance_history_size: The number of invocation timings to keep in the performance history, which is used to compare performance across app versions. Set to 0 to disable recording.
         max_cache_ram_gb: The maximum amount of CPU RAM to use for model caching in GB. If unset, the limit will be configured based on the available RAM. In most cases, it is recommended to leave this unset.
         max_cache_vram_gb: The amount of VRAM to use for model caching in GB. If unset, the limit will be configured based on the available VRAM and the device_working_mem_gb. In most cases, it is recommended to leave this unset.
         log_memory_usage: If True, a memory snapshot will be captured before and after every model cache operation, and the result will be logged (at debug level). There is a time cost to capturing the memory snapshots, so it is recommended to only enable this feature if you are actively inspecting the model cache's behaviour.
@@ -89,6 +92,9 @@ class InvokeAIAppConfig(BaseSettings):
         device_working_mem_gb: The amount of working memory to keep available on the compute device (in GB). Has no effect if running on CPU. If you are experiencing OOM errors, try increasing this value.
         enable_partial_loading: Enable partial loading of models. This enables models to run with reduced VRAM requirements (at the cost of slower speed) by streaming the model from RAM to VRAM as its used. In some edge cases, partial loading can cause models to run more slowly if they were previously being fully loaded into VRAM.
         keep_ram_copy_of_weights: Whether to keep a full RAM copy of a model's weights when the model is loaded in VRAM. Keeping a RAM copy increases average RAM usage, but speeds up model switching and LoRA patching (assuming there is sufficient RAM). Set this to False if RAM pressure is consistently high.
+        enable_vram_placement_profiling: Profile the first forward pass of each partially-loaded model architecture to plan which of its weights to keep in VRAM, saving the plans to `vram_placement_plans_dir`. On CUDA, the profiled execution order is also used to prefetch streamed weights. Experimental. When disabled, the plan is estimated from the shapes of the weights.
+        gguf_dequant_cache_vram_gb: The max amount of VRAM to use for keeping dequantized GGUF model weights between steps, in GB. Only VRAM that is not needed for models or working memory is used. Speeds up quantized models (e.g. Q8 FLUX) when there is spare VRAM. Set to 0 to disable.
+        gguf_dequant_cache_ram_gb: The max amount of RAM to use for keeping dequantized GGUF model weights between steps, in GB. This RAM counts against the model cache's RAM limit. Only helps models that run on the CPU. Set to 0 to disable.
         ram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
         vram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_vram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
         lazy_offload: DEPRECATED: This setting is no longer used. Lazy-offloading is enabled by default. This config setting will be removed once the new model cache behavior is stable.
@@ -99,14 +105,18 @@ class InvokeAIAppConfig(BaseSettings):
         attention_type: Attention type.<br>Valid values: `auto`, `normal`, `xformers`, `sliced`, `torch-sdp`
         attention_slice_size: Slice size, valid when attention_type=="sliced".<br>Valid values: `auto`, `balanced`, `max`, `1`, `2`, `3`, `4`, `5`, `6`, `7`, `8`
         force_tiled_decode: Whether to enable tiled VAE decode (reduces memory consumption with some performance penalty).
+        adaptive_vae_tiling: Automatically choose whether to tile VAE encode/decode, and the tile size, based on the free memory on the compute device. Out-of-memory errors are retried with smaller tiles. Only applies to SD1.5 and SDXL VAEs, and has no effect on nodes with tiling enabled or when `force_tiled_decode` is set.
         pil_compress_level: The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.
         max_queue_size: Maximum number of items in the session queue.
         clear_queue_on_startup: Empties session queue on startup.
         allow_nodes: List of nodes to allow. Omit to allow all.
         deny_nodes: List of nodes to deny. Omit to deny none.
         node_cache_size: How many cached nodes to keep in memory.
+        max_parallel_nodes: The max number of nodes to run at once within a session. Only nodes that are not GPU-bound (e.g. image resizes, Canny edge detection) run alongside other nodes; GPU-bound nodes always run one at a time. Set to 1 to run all nodes one at a time.
         hashing_algorithm: Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.<br>Valid values: `blake3_multi`, `blake3_single`, `random`, `md5`, `sha1`, `sha224`, `sha256`, `sha384`, `sha512`, `blake2b`, `blake2s`, `sha3_224`, `sha3_256`, `sha3_384`, `sha3_512`, `shake_128`, `shake_256`
         remote_api_tokens: List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.
+        download_connections: The max number of connections used to download each large model file, where the server supports range requests. Interrupted downloads made over several connections are resumed. Set to 1 to download each file over a single connection.
+        model_scan_threads: The number of threads used to search, probe and hash models when scanning a directory for models. Raise this for network shares and SSDs; use 1 for spinning disk HDDs.
         scan_models_on_startup: Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.
         unsafe_disable_picklescan: UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.
         allow_unknown_models: Allow installation of models that we are unable to identify. If enabled, models will be marked as `unknown` in the database, and will not have any metadata associated with them. If disabled, unknown models will be rejected during installation.
@@ -140,6 +150,7 @@ class InvokeAIAppConfig(BaseSettings):
     models_dir:                    Path = Field(default=Path("models"),     description="Path to the models directory.")
     convert_cache_dir:             Path = Field(default=Path("models/.convert_cache"), description="Path to the converted models cache directory (DEPRECATED, but do not delete because it is needed for migration from previous versions).")
     download_cache_dir:            Path = Field(default=Path("models/.download_cache"), description="Path to the directory that contains dynamically downloaded models.")
+    vram_placement_plans_dir:      Path = Field(default=Path("models/.vram_placement_plans"), description="Path to the directory that contains the profiled VRAM placement plans of partially-loaded models.")
     legacy_conf_dir:               Path = Field(default=Path("configs"), description="Path to directory of legacy checkpoint config files.")
     db_dir:                        Path = Field(default=Path("databases"),  description="Path to InvokeAI databases directory.")
     outputs_dir:                   Path = Field(default=Path("outputs"),    description="Path to directory for outputs.")
@@ -161,6 +172,8 @@ class InvokeAIAppConfig(BaseSettings):
     profile_graphs:                bool = Field(default=False,              description="Enable graph profiling using `cProfile`.")
     profile_prefix:       Optional[str] = Field(default=None,               description="An optional prefix for profile output files.")
     profiles_dir:                  Path = Field(default=Path("profiles"),   description="Path to profiles output directory.")
+    trace_graphs:                  bool = Field(default=False,              description="Record tracing spans for each session (dequeue, nodes, model cache operations, LoRA patching, denoising steps, image saves and database writes) and write them to the profiles directory as a Chrome trace (`.trace.json`, viewable in https://ui.perfetto.dev) and as OTLP/JSON (`.otlp.json`).")
+    performance_history_size:       int = Field(default=100_000, ge=0,      description="The number of invocation timings to keep in the performance history, which is used to compare performance across app versions. Set to 0 to disable recording.")
 
     # CACHE
     max_cache_ram_gb:   Optional[float] = Field(default=None, gt=0,         description="The maximum amount of CPU RAM to use for model caching in GB. If unset, the limit will be configured based on the available RAM. In most cases, it is recommended to leave this unset.")
@@ -170,6 +183,9 @@ class InvokeAIAppConfig(BaseSettings):
     device_working_mem_gb:        float = Field(default=3,                  description="The amount of working memory to keep available on the compute device (in GB). Has no effect if running on CPU. If you are experiencing OOM errors, try increasing this value.")
     enable_partial_loading:        bool = Field(default=False,              description="Enable partial loading of models. This enables models to run with reduced VRAM requirements (at the cost of slower speed) by streaming the model from RAM to VRAM as its used. In some edge cases, partial loading can cause models to run more slowly if they were previously being fully loaded into VRAM.")
     keep_ram_copy_of_weights:      bool = Field(default=True,               description="Whether to keep a full RAM copy of a model's weights when the model is loaded in VRAM. Keeping a RAM copy increases average RAM usage, but speeds up model switching and LoRA patching (assuming there is sufficient RAM). Set this to False if RAM pressure is consistently high.")
+    enable_vram_placement_profiling: bool = Field(default=False,            description="Profile the first forward pass of each partially-loaded model architecture to plan which of its weights to keep in VRAM, saving the plans to `vram_placement_plans_dir`. On CUDA, the profiled execution order is also used to prefetch streamed weights. Experimental. When disabled, the plan is estimated from the shapes of the weights.")
+    gguf_dequant_cache_vram_gb:   float = Field(default=0, ge=0,            description="The max amount of VRAM to use for keeping dequantized GGUF model weights between steps, in GB. Only VRAM that is not needed for models or working memory is used. Speeds up quantized models (e.g. Q8 FLUX) when there is spare VRAM. Set to 0 to disable.")
+    gguf_dequant_cache_ram_gb:    float = Field(default=0, ge=0,            description="The max amount of RAM to use for keeping dequantized GGUF model weights between steps, in GB. This RAM counts against the model cache's RAM limit. Only helps models that run on the CPU. Set to 0 to disable.")
     # Deprecated CACHE configs
     ram:                Optional[float] = Field(default=None, gt=0,         description="DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.")
     vram:               Optional[float] = Field(default=None, ge=0,         description="DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_vram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.")
@@ -187,6 +203,7 @@ class InvokeAIAppConfig(BaseSettings):
     attention_type:      ATTENTION_TYPE = Field(default="auto",             description="Attention type.")
     attention_slice_size: ATTENTION_SLICE_SIZE = Field(default="auto",      description='Slice size, valid when attention_type=="sliced".')
     force_tiled_decode:            bool = Field(default=False,              description="Whether to enable tiled VAE decode (reduces memory consumption with some performance penalty).")
+    adaptive_vae_tiling:           bool = Field(default=False,              description="Automatically choose whether to tile VAE encode/decode, and the tile size, based on the free memory on the compute device. Out-of-memory errors are retried with smaller tiles. Only applies to SD1.5 and SDXL VAEs, and has no effect on nodes with tiling enabled or when `force_tiled_decode` is set.")
     pil_compress_level:             int = Field(default=1,                  description="The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.")
     max_queue_size:                 int = Field(default=10000, gt=0,        description="Maximum number of items in the session queue.")
     clear_queue_on_startup:        bool = Field(default=False,              description="Empties session queue on startup.")
@@ -195,10 +212,13 @@ class InvokeAIAppConfig(BaseSettings):
     allow_nodes:    Optional[list[str]] = Field(default=None,               description="List of nodes to allow. Omit to allow all.")
     deny_nodes:     Optional[list[str]] = Field(default=None,               description="List of nodes to deny. Omit to deny none.")
     node_cache_size:                int = Field(default=512,                description="How many cached nodes to keep in memory.")
+    max_parallel_nodes:             int = Field(default=1, ge=1,            description="The max number of nodes to run at once within a session. Only nodes that are not GPU-bound (e.g. image resizes, Canny edge detection) run alongside other nodes; GPU-bound nodes always run one at a time. Set to 1 to run all nodes one at a time.")
 
     # MODEL INSTALL
     hashing_algorithm: HASHING_ALGORITHMS = Field(default="blake3_single",  description="Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.")
     remote_api_tokens: Optional[list[URLRegexTokenPair]] = Field(default=None, description="List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.")
+    download_connections:           int = Field(default=4, ge=1,            description="The max number of connections used to download each large model file, where the server supports range requests. Interrupted downloads made over several connections are resumed. Set to 1 to download each file over a single connection.")
+    model_scan_threads:             int = Field(default=4, ge=1,            description="The number of threads used to search, probe and hash models when scanning a directory for models. Raise this for network shares and SSDs; use 1 for spinning disk HDDs.")
     scan_models_on_startup:        bool = Field(default=False,              description="Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.")
     unsafe_disable_picklescan:     bool = Field(default=False,              description="UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.")
     allow_unknown_models:          bool = Field(default=True,              description="Allow installation of models that we are unable to identify. If enabled, models will be marked as `unknown` in the database, and will not have any metadata associated with them. If disabled, unknown models will be rejected during installation.")
@@ -326,6 +346,11 @@ class InvokeAIAppConfig(BaseSettings):
         """Path to the downloaded models directory, resolved to an absolute path.."""
         return self._resolve(self.download_cache_dir)
 
+    @property
+    def vram_placement_plans_path(self) -> Path:
+        """Path to the VRAM placement plans directory, resolved to an absolute path.."""
+        return self._resolve(self.vram_placement_plans_dir)
+
     @property
     def custom_nodes_path(self) -> Path:
         """Path to the custom nodes directory, resolved to an absolute path.."""
@@ -4,6 +4,7 @@ from invokeai.app.services.download.download_base import (
     DownloadJob,
     DownloadJobStatus,
     DownloadQueueServiceBase,
+    DownloadVerificationException,
     MultiFileDownloadJob,
     UnknownJobIDException,
 )
@@ -16,5 +17,6 @@ __all__ = [
     "DownloadQueueService",
     "TqdmProgress",
     "DownloadJobStatus",
+    "DownloadVerificationException",
     "UnknownJobIDException",
 ]
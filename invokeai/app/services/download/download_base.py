@@ -35,6 +35,10 @@ class ServiceInactiveException(Exception):
     """This exception is raised when user attempts to initiate a download before the service is started."""
 
 
+class DownloadVerificationException(Exception):
+    """This exception is raised when a downloaded file does not have the expected size or hash."""
+
+
 SingleFileDownloadEventHandler = Callable[["DownloadJob"], None]
 SingleFileDownloadExceptionHandler = Callable[["DownloadJob", Optional[Exception]], None]
 MultiFileDownloadEventHandler = Callable[["MultiFileDownloadJob"], None]
@@ -162,6 +166,12 @@ class DownloadJob(DownloadJobBase):
     )
     content_type: Optional[str] = Field(default=None, description="Content type of downloaded file")
 
+    # optional, used to verify the downloaded file
+    expected_size: Optional[int] = Field(default=None, description="Expected size of the downloaded file, if known")
+    expected_sha256: Optional[str] = Field(
+        default=None, description="Expected SHA256 hash of the downloaded file, if known"
+    )
+
     def __hash__(self) -> int:
         """Return hash of the string representation of this object, for indexing."""
         return hash(str(self))
@@ -1,17 +1,20 @@
 # Copyright (c) 2023, Lincoln D. Stein
 """Implementation of multithreaded download queue for invokeai."""
 
+import hashlib
 import os
 import re
 import threading
 import time
 import traceback
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
 from queue import Empty, PriorityQueue
 from shutil import disk_usage
 from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Set
 
 import requests
+from pydantic import BaseModel, Field, ValidationError
 from pydantic.networks import AnyHttpUrl
 from requests import HTTPError
 from tqdm import tqdm
@@ -25,6 +28,7 @@ from invokeai.app.services.download.download_base import (
     DownloadJobCancelledException,
     DownloadJobStatus,
     DownloadQueueServiceBase,
+    DownloadVerificationException,
     MultiFileDownloadJob,
     ServiceInactiveException,
     UnknownJobIDException,
@@ -39,6 +43,33 @@ if TYPE_CHECKING:
 # Maximum number of bytes to download during each call to requests.iter_content()
 DOWNLOAD_CHUNK_SIZE = 100000
 
+# Files at least this large are downloaded over several connections, if the server supports range requests
+SEGMENTED_DOWNLOAD_MIN_SIZE = 64 * 2**20
+
+# The resume state of a segmented download is saved each time this many more bytes have been downloaded
+SEGMENT_STATE_SAVE_INTERVAL = 16 * 2**20
+
+
+class DownloadSegment(BaseModel):
+    """A byte range of a file being downloaded over several connections."""
+
+    start: int = Field(description="Offset of the first byte of the segment")
+    end: int = Field(description="Offset of the last byte of the segment (inclusive)")
+    downloaded: int = Field(default=0, description="Number of bytes of the segment downloaded so far")
+
+    @property
+    def remaining(self) -> int:
+        return self.end + 1 - self.start - self.downloaded
+
+
+class SegmentedDownloadState(BaseModel):
+    """The resume state of a file being downloaded over several connections, saved next to the in-progress file."""
+
+    source: str = Field(description="URL of the file")
+    total_bytes: int = Field(description="Size of the file")
+    validator: Optional[str] = Field(description="The file's ETag or Last-Modified header, if any")
+    segments: List[DownloadSegment] = Field(description="The segments of the file")
+
 
 class DownloadQueueService(DownloadQueueServiceBase):
     """Class for queued download of models."""
@@ -371,23 +402,177 @@ class DownloadQueueService(DownloadQueueServiceBase):
             raise HTTPError(resp.reason)
 
         self._logger.debug(f"{job.source}: Downloading {job.download_path}")
-        report_delta = job.total_bytes / 100  # report every 1% change
-        last_report_bytes = 0
 
-        # DOWNLOAD LOOP
-        with open(in_progress_path, open_mode) as file:
-            for data in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
-                if job.cancelled:
-                    raise DownloadJobCancelledException("Job was cancelled at caller's request")
+        if self._can_download_segmented(job, resp):
+            resp.close()
+            self._do_segmented_download(job, in_progress_path, header, resp.headers)
+        else:
+            report_delta = job.total_bytes / 100  # report every 1% change
+            last_report_bytes = 0
+
+            # DOWNLOAD LOOP
+            with open(in_progress_path, open_mode) as file:
+                for data in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if job.cancelled:
+                        raise DownloadJobCancelledException("Job was cancelled at caller's request")
+
+                    job.bytes += file.write(data)
+                    if (job.bytes - last_report_bytes >= report_delta) or (job.bytes >= job.total_bytes):
+                        last_report_bytes = job.bytes
+                        self._signal_job_progress(job)
 
-                job.bytes += file.write(data)
-                if (job.bytes - last_report_bytes >= report_delta) or (job.bytes >= job.total_bytes):
-                    last_report_bytes = job.bytes
-                    self._signal_job_progress(job)
+        # The content-length of an encoded response is not the size of the decoded file
+        self._verify_download(job, in_progress_path, check_total_bytes=not resp.headers.get("Content-Encoding"))
 
         # if we get here we are done and can rename the file to the original dest
         self._logger.debug(f"{job.source}: saved to {job.download_path} (bytes={job.bytes})")
         in_progress_path.rename(job.download_path)
+        self._segment_state_path(job.download_path).unlink(missing_ok=True)
+
+    def _can_download_segmented(self, job: DownloadJob, resp: requests.Response) -> bool:
+        """Whether a file can be downloaded over several connections, using range requests."""
+        return (
+            self._app_config.download_connections > 1
+            and resp.status_code == 200
+            and job.total_bytes >= SEGMENTED_DOWNLOAD_MIN_SIZE
+            and resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+            # The content-length of an encoded response is not the size of the file
+            and not resp.headers.get("Content-Encoding")
+        )
+
+    def _do_segmented_download(
+        self, job: DownloadJob, in_progress_path: Path, header: Dict[str, str], resp_headers: Any
+    ) -> None:
+        """Download a file over several connections, each fetching a byte range (segment) of the file.
+
+        The in-progress file is preallocated (sparse, where the filesystem supports it) and each segment is written in
+        place. The segments' progress is saved next to the in-progress file, so that an interrupted download resumes
+        where it left off - unless the remote file has changed in the meantime.
+        """
+        assert job.download_path is not None
+        state_path = self._segment_state_path(job.download_path)
+        validator = resp_headers.get("ETag") or resp_headers.get("Last-Modified")
+        state = self._load_segment_state(state_path, in_progress_path, job, validator)
+        if state is None:
+            state = SegmentedDownloadState(
+                source=str(job.source),
+                total_bytes=job.total_bytes,
+                validator=validator,
+                segments=self._split_segments(job.total_bytes, self._app_config.download_connections),
+            )
+            with open(in_progress_path, "wb") as file:
+                file.truncate(job.total_bytes)
+            self._save_segment_state(state_path, state)
+        else:
+            self._logger.warning(f"{job.download_path}: partial file found. Resuming")
+
+        lock = threading.Lock()
+        stop_event = threading.Event()
+        job.bytes = sum(s.downloaded for s in state.segments)
+        report_delta = job.total_bytes / 100  # report every 1% change
+        last_report_bytes = job.bytes
+        last_save_bytes = job.bytes
+        self._signal_job_progress(job)
+
+        def download_segment(segment: DownloadSegment) -> None:
+            nonlocal last_report_bytes, last_save_bytes
+            offset = segment.start + segment.downloaded
+            range_header = {**header, "Range": f"bytes={offset}-{segment.end}"}
+            with self._requests.get(str(job.source), headers=range_header, stream=True) as seg_resp:
+                if seg_resp.status_code != 206:
+                    raise HTTPError(f"Range request failed: {seg_resp.status_code} {seg_resp.reason}")
+                # Unbuffered, so that the saved state never gets ahead of the data written to the file
+                with open(in_progress_path, "r+b", buffering=0) as file:
+                    file.seek(offset)
+                    for data in seg_resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if job.cancelled:
+                            raise DownloadJobCancelledException("Job was cancelled at caller's request")
+                        if stop_event.is_set():
+                            return
+                        data = data[: segment.remaining]
+                        file.write(data)
+                        with lock:
+                            segment.downloaded += len(data)
+                            job.bytes += len(data)
+                            if job.bytes - last_save_bytes >= SEGMENT_STATE_SAVE_INTERVAL:
+                                last_save_bytes = job.bytes
+                                self._save_segment_state(state_path, state)
+                            if (job.bytes - last_report_bytes >= report_delta) or (job.bytes >= job.total_bytes):
+                                last_report_bytes = job.bytes
+                                self._signal_job_progress(job)
+                        if segment.remaining == 0:
+                            break
+            if segment.remaining > 0:
+                raise HTTPError(f"Connection closed with {segment.remaining} bytes of the segment remaining")
+
+        pending = [s for s in state.segments if s.remaining > 0]
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1), thread_name_prefix="download_segment") as executor:
+            futures = [executor.submit(download_segment, s) for s in pending]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            # Stop the other segments on the first error - their progress is saved below, to be resumed later
+            stop_event.set()
+            wait(futures)
+        with lock:
+            self._save_segment_state(state_path, state)
+        errors = [e for f in futures if (e := f.exception()) is not None]
+        for e in errors:
+            if isinstance(e, DownloadJobCancelledException):
+                raise e
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _split_segments(total_bytes: int, count: int) -> List[DownloadSegment]:
+        segment_size = -(-total_bytes // count)  # ceil
+        return [
+            DownloadSegment(start=start, end=min(start + segment_size, total_bytes) - 1)
+            for start in range(0, total_bytes, segment_size)
+        ]
+
+    def _load_segment_state(
+        self, state_path: Path, in_progress_path: Path, job: DownloadJob, validator: Optional[str]
+    ) -> Optional[SegmentedDownloadState]:
+        """Load the resume state of an interrupted download, if it is for the same remote file."""
+        try:
+            state = SegmentedDownloadState.model_validate_json(state_path.read_bytes())
+            partial_size = in_progress_path.stat().st_size
+        except (OSError, ValidationError):
+            return None
+        if (state.source, state.total_bytes, state.validator) != (str(job.source), job.total_bytes, validator):
+            self._logger.warning(f"{job.download_path}: remote file has changed. Restarting download")
+            return None
+        if partial_size != job.total_bytes:
+            return None
+        return state
+
+    def _save_segment_state(self, state_path: Path, state: SegmentedDownloadState) -> None:
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        tmp_path.write_text(state.model_dump_json())
+        tmp_path.replace(state_path)
+
+    def _verify_download(self, job: DownloadJob, in_progress_path: Path, check_total_bytes: bool = True) -> None:
+        """Check the downloaded file's size and, if known, its hash. A file that fails is deleted.
+
+        The size is checked against the expected size, if known, and against the size reported by the server unless
+        `check_total_bytes` is False.
+        """
+        size = in_progress_path.stat().st_size
+        expected_sizes = {x for x in [job.total_bytes if check_total_bytes else 0, job.expected_size] if x}
+        error: Optional[str] = None
+        if any(size != x for x in expected_sizes):
+            error = f"expected {' or '.join(str(x) for x in expected_sizes)} bytes, got {size}"
+        elif job.expected_sha256:
+            hasher = hashlib.sha256()
+            with open(in_progress_path, "rb") as file:
+                while data := file.read(2**20):
+                    hasher.update(data)
+            if hasher.hexdigest() != job.expected_sha256.lower():
+                error = f"expected SHA256 {job.expected_sha256}, got {hasher.hexdigest()}"
+        if error is not None:
+            in_progress_path.unlink(missing_ok=True)
+            assert job.download_path is not None
+            self._segment_state_path(job.download_path).unlink(missing_ok=True)
+            raise DownloadVerificationException(f"{job.download_path}: download is corrupt, {error}")
 
     def _validate_filename(self, directory: str, filename: str) -> bool:
         pc_name_max = get_pc_name_max(directory)
@@ -405,6 +590,9 @@ class DownloadQueueService(DownloadQueueServiceBase):
     def _in_progress_path(self, path: Path) -> Path:
         return path.with_name(path.name + ".downloading")
 
+    def _segment_state_path(self, path: Path) -> Path:
+        return path.with_name(path.name + ".downloading.json")
+
     def _lookup_access_token(self, source: AnyHttpUrl) -> Optional[str]:
         # Pull the token from config if it exists and matches the URL
         token = None
@@ -457,6 +645,7 @@ class DownloadQueueService(DownloadQueueServiceBase):
         self._logger.debug(f"Cleaning up leftover files from cancelled download job {job.download_path}")
         try:
             if job.download_path:
+                self._segment_state_path(job.download_path).unlink(missing_ok=True)
                 partial_file = self._in_progress_path(job.download_path)
                 partial_file.unlink()
         except OSError as excp:
@@ -27,6 +27,7 @@ from invokeai.app.services.events.events_common import (
     ModelInstallStartedEvent,
     ModelLoadCompleteEvent,
     ModelLoadStartedEvent,
+    ModelScanProgressEvent,
     QueueClearedEvent,
     QueueItemsRetriedEvent,
     QueueItemStatusChangedEvent,
@@ -36,7 +37,7 @@ from invokeai.app.services.events.events_common import (
 if TYPE_CHECKING:
     from invokeai.app.invocations.baseinvocation import BaseInvocation, BaseInvocationOutput
     from invokeai.app.services.download.download_base import DownloadJob
-    from invokeai.app.services.model_install.model_install_common import ModelInstallJob
+    from invokeai.app.services.model_install.model_install_common import ModelInstallJob, ModelScanReport
     from invokeai.app.services.session_processor.session_processor_common import ProgressImage
     from invokeai.app.services.session_queue.session_queue_common import (
         BatchStatus,
@@ -184,6 +185,10 @@ class EventServiceBase:
         """Emitted when an install job encounters an exception."""
         self.dispatch(ModelInstallErrorEvent.build(job))
 
+    def emit_model_scan_progress(self, report: "ModelScanReport") -> None:
+        """Emitted as each model found by a directory scan is probed."""
+        self.dispatch(ModelScanProgressEvent.build(report))
+
     # endregion
 
     # region Bulk image download
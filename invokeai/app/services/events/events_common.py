@@ -1,10 +1,10 @@
-from typing import TYPE_CHECKING, Any, ClassVar, Coroutine, Generic, Optional, Protocol, TypeAlias, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Coroutine, Generic, Hashable, Optional, Protocol, TypeAlias, TypeVar
 
 from fastapi_events.handlers.local import local_handler
 from fastapi_events.registry.payload_schema import registry as payload_schema
 from pydantic import BaseModel, ConfigDict, Field
 
-from invokeai.app.services.model_install.model_install_common import ModelInstallJob, ModelSource
+from invokeai.app.services.model_install.model_install_common import ModelInstallJob, ModelScanReport, ModelSource
 from invokeai.app.services.session_processor.session_processor_common import ProgressImage
 from invokeai.app.services.session_queue.session_queue_common import (
     QUEUE_ITEM_STATUS,
@@ -39,6 +39,14 @@ class EventBase(BaseModel):
 
     model_config = ConfigDict(json_schema_serialization_defaults_required=True)
 
+    def get_coalesce_key(self) -> Optional[Hashable]:
+        """Get the key of a progress event, identifying what it reports progress on.
+
+        An event with a key supersedes any earlier event with the same key that has not yet been delivered, which is
+        then dropped. Events that must always be delivered (the default) have no key.
+        """
+        return None
+
     @classmethod
     def get_events(cls) -> set[type["EventBase"]]:
         """Get a set of all event models."""
@@ -137,6 +145,9 @@ class InvocationProgressEvent(InvocationEventBase):
         default=None, description="An image representing the current state of the progress"
     )
 
+    def get_coalesce_key(self) -> Optional[Hashable]:
+        return (self.__event_name__, self.queue_id, self.item_id, self.session_id, self.invocation_source_id)
+
     @classmethod
     def build(
         cls,
@@ -345,6 +356,9 @@ class DownloadProgressEvent(DownloadEventBase):
     current_bytes: int = Field(description="The number of bytes downloaded so far")
     total_bytes: int = Field(description="The total number of bytes to be downloaded")
 
+    def get_coalesce_key(self) -> Optional[Hashable]:
+        return (self.__event_name__, self.source, self.download_path)
+
     @classmethod
     def build(cls, job: "DownloadJob") -> "DownloadProgressEvent":
         assert job.download_path
@@ -481,6 +495,9 @@ class ModelInstallDownloadProgressEvent(ModelEventBase):
         description="Progress of downloading URLs that comprise the model, if any"
     )
 
+    def get_coalesce_key(self) -> Optional[Hashable]:
+        return (self.__event_name__, self.id)
+
     @classmethod
     def build(cls, job: "ModelInstallJob") -> "ModelInstallDownloadProgressEvent":
         parts: list[dict[str, str | int]] = [
@@ -586,6 +603,34 @@ class ModelInstallErrorEvent(ModelEventBase):
         return cls(id=job.id, source=job.source, error_type=job.error_type, error=job.error)
 
 
+@payload_schema.register
+class ModelScanProgressEvent(ModelEventBase):
+    """Event model for model_scan_progress"""
+
+    __event_name__ = "model_scan_progress"
+
+    directory: str = Field(description="The directory being scanned")
+    total: int = Field(description="The number of models found that are not yet installed")
+    probed: int = Field(description="The number of models probed so far")
+    registered: int = Field(description="The number of models registered so far")
+    errors: int = Field(description="The number of models that could not be probed or registered so far")
+    dry_run: bool = Field(description="Whether this is a dry run, which does not register any models")
+
+    def get_coalesce_key(self) -> Optional[Hashable]:
+        return (self.__event_name__, self.directory)
+
+    @classmethod
+    def build(cls, report: ModelScanReport) -> "ModelScanProgressEvent":
+        return cls(
+            directory=report.directory.as_posix(),
+            total=report.total,
+            probed=report.probed,
+            registered=len(report.registered),
+            errors=len(report.errors),
+            dry_run=report.dry_run,
+        )
+
+
 class BulkDownloadEventBase(EventBase):
     """Base class for events associated with a bulk image download"""
 
@@ -1,18 +1,40 @@
 import asyncio
 import threading
+from collections import OrderedDict
+from typing import Hashable
 
 from fastapi_events.dispatcher import dispatch
 
 from invokeai.app.services.events.events_base import EventServiceBase
 from invokeai.app.services.events.events_common import EventBase
+from invokeai.backend.util.logging import InvokeAILogger
+
+# The max number of events waiting to be dispatched. Beyond this, the oldest progress events are dropped.
+MAX_PENDING_EVENTS = 1000
 
 
 class FastAPIEventService(EventServiceBase):
-    def __init__(self, event_handler_id: int, loop: asyncio.AbstractEventLoop) -> None:
+    """Dispatches events to fastapi-events handlers, from the event loop.
+
+    Events are queued until the event loop gets to them. While queued, a progress event is superseded by a newer event
+    reporting progress on the same thing (see `EventBase.get_coalesce_key()`), so a busy loop delivers the latest
+    progress rather than a backlog of stale progress (and preview images). Other events are always delivered, in order.
+    """
+
+    def __init__(
+        self, event_handler_id: int, loop: asyncio.AbstractEventLoop, max_pending_events: int = MAX_PENDING_EVENTS
+    ) -> None:
         self.event_handler_id = event_handler_id
-        self._queue = asyncio.Queue[EventBase | None]()
+        # Queued events, keyed by their coalesce key, or by a sequence number if they have none
+        self._pending: OrderedDict[Hashable, EventBase] = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._max_pending_events = max_pending_events
+        self._next_seq = 0
+        self._dropped_count = 0
+        self._wakeup = asyncio.Event()
         self._stop_event = threading.Event()
         self._loop = loop
+        self._logger = InvokeAILogger.get_logger(self.__class__.__name__)
 
         # We need to store a reference to the task so it doesn't get GC'd
         # See: https://docs.python.org/3/library/asyncio-task.html#creating-tasks
@@ -25,20 +47,48 @@ class FastAPIEventService(EventServiceBase):
 
     def stop(self, *args, **kwargs):
         self._stop_event.set()
-        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+        self._loop.call_soon_threadsafe(self._wakeup.set)
 
     def dispatch(self, event: EventBase) -> None:
-        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        key = event.get_coalesce_key()
+        with self._pending_lock:
+            was_empty = not self._pending
+            if key is None:
+                key = self._next_seq
+                self._next_seq += 1
+            else:
+                # The newer event supersedes the queued one, and takes its place at the back of the queue
+                self._pending.pop(key, None)
+            self._pending[key] = event
+            if len(self._pending) > self._max_pending_events:
+                self._drop_oldest_progress_event(keep=key)
+        # The loop only needs waking when the queue was empty - otherwise, it is already due to drain the queue
+        if was_empty:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _drop_oldest_progress_event(self, keep: Hashable) -> None:
+        # Only progress events are dropped, other than the latest - the queue can exceed its bound if it is full of
+        # other events
+        key = next((k for k, e in self._pending.items() if k != keep and e.get_coalesce_key() is not None), None)
+        if key is None:
+            return
+        del self._pending[key]
+        self._dropped_count += 1
+        if self._dropped_count % 100 == 1:
+            self._logger.warning(f"Event queue is full, dropped {self._dropped_count} progress events so far")
 
     async def _dispatch_from_queue(self, stop_event: threading.Event):
         """Get events on from the queue and dispatch them, from the correct thread"""
         while not stop_event.is_set():
             try:
-                event = await self._queue.get()
-                if not event:  # Probably stopping
-                    continue
-                # Leave the payloads as live pydantic models
-                dispatch(event, middleware_id=self.event_handler_id, payload_schema_dump=False)
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                with self._pending_lock:
+                    events = list(self._pending.values())
+                    self._pending.clear()
+                for event in events:
+                    # Leave the payloads as live pydantic models
+                    dispatch(event, middleware_id=self.event_handler_id, payload_schema_dump=False)
 
             except asyncio.CancelledError as e:
                 raise e  # Raise a proper error
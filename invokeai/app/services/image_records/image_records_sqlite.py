@@ -21,6 +21,20 @@ from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
 
 
+def _get_images_from_clause(board_id: Optional[str]) -> str:
+    """Gets the FROM clause for a query of images, optionally filtered by board.
+
+    The `board_images` join is only needed to filter by board. For a specific board, the CROSS JOIN makes SQLite find
+    the board's images with the `board_images` index and sort them, rather than read every image in gallery order and
+    check whether each is in the board.
+    """
+    if board_id is None:
+        return "FROM images"
+    if board_id == "none":
+        return "FROM images LEFT JOIN board_images ON board_images.image_name = images.image_name"
+    return "FROM board_images CROSS JOIN images ON images.image_name = board_images.image_name"
+
+
 class SqliteImageRecordStorage(ImageRecordStorageBase):
     def __init__(self, db: SqliteDatabase) -> None:
         super().__init__()
@@ -137,17 +151,17 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
     ) -> OffsetPaginatedResults[ImageRecord]:
         with self._db.transaction() as cursor:
             # Manually build two queries - one for the count, one for the records
-            count_query = """--sql
+            from_clause = _get_images_from_clause(board_id)
+
+            count_query = f"""--sql
             SELECT COUNT(*)
-            FROM images
-            LEFT JOIN board_images ON board_images.image_name = images.image_name
+            {from_clause}
             WHERE 1=1
             """
 
             images_query = f"""--sql
             SELECT {IMAGE_DTO_COLS}
-            FROM images
-            LEFT JOIN board_images ON board_images.image_name = images.image_name
+            {from_clause}
             WHERE 1=1
             """
 
@@ -360,8 +374,8 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
             cursor.execute(
                 """--sql
                 SELECT images.*
-                FROM images
-                JOIN board_images ON images.image_name = board_images.image_name
+                FROM board_images
+                CROSS JOIN images ON images.image_name = board_images.image_name
                 WHERE board_images.board_id = ?
                 AND images.is_intermediate = FALSE
                 ORDER BY images.starred DESC, images.created_at DESC
@@ -433,13 +447,14 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
                 query_params.append(f"%{search_term.lower()}%")
                 query_params.append(f"%{search_term.lower()}%")
 
+            from_clause = _get_images_from_clause(board_id)
+
             # Get starred count if starred_first is enabled
             starred_count = 0
             if starred_first:
                 starred_count_query = f"""--sql
                 SELECT COUNT(*)
-                FROM images
-                LEFT JOIN board_images ON board_images.image_name = images.image_name
+                {from_clause}
                 WHERE images.starred = TRUE AND (1=1{query_conditions})
                 """
                 cursor.execute(starred_count_query, query_params)
@@ -449,16 +464,14 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
             if starred_first:
                 names_query = f"""--sql
                 SELECT images.image_name
-                FROM images
-                LEFT JOIN board_images ON board_images.image_name = images.image_name
+                {from_clause}
                 WHERE 1=1{query_conditions}
                 ORDER BY images.starred DESC, images.created_at {order_dir.value}
                 """
             else:
                 names_query = f"""--sql
                 SELECT images.image_name
-                FROM images
-                LEFT JOIN board_images ON board_images.image_name = images.image_name
+                {from_clause}
                 WHERE 1=1{query_conditions}
                 ORDER BY images.created_at {order_dir.value}
                 """
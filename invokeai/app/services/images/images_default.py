@@ -25,6 +25,8 @@ from invokeai.app.services.images.images_common import ImageDTO, image_record_to
 from invokeai.app.services.invoker import Invoker
 from invokeai.app.services.shared.pagination import OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
+from invokeai.app.util.metrics import IMAGE_SAVE_SECONDS
+from invokeai.backend.util.tracing import get_tracer
 
 
 class ImageService(ImageServiceABC):
@@ -80,9 +82,13 @@ class ImageService(ImageServiceABC):
                     )
                 except Exception as e:
                     self.__invoker.services.logger.warning(f"Failed to add image to board {board_id}: {str(e)}")
-            self.__invoker.services.image_files.save(
-                image_name=image_name, image=image, metadata=metadata, workflow=workflow, graph=graph
-            )
+            with (
+                get_tracer().span("image_files.save", category="images", image_name=image_name),
+                IMAGE_SAVE_SECONDS.time(),
+            ):
+                self.__invoker.services.image_files.save(
+                    image_name=image_name, image=image, metadata=metadata, workflow=workflow, graph=graph
+                )
             image_dto = self.get_dto(image_name)
 
             self._on_changed(image_dto)
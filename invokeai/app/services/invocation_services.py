@@ -33,6 +33,7 @@ if TYPE_CHECKING:
     )
     from invokeai.app.services.model_relationships.model_relationships_base import ModelRelationshipsServiceABC
     from invokeai.app.services.names.names_base import NameServiceBase
+    from invokeai.app.services.performance_history.performance_history_base import PerformanceHistoryStorageBase
     from invokeai.app.services.session_processor.session_processor_base import SessionProcessorBase
     from invokeai.app.services.session_queue.session_queue_base import SessionQueueBase
     from invokeai.app.services.urls.urls_base import UrlServiceBase
@@ -75,6 +76,7 @@ class InvocationServices:
         style_preset_image_files: "StylePresetImageFileStorageBase",
         workflow_thumbnails: "WorkflowThumbnailServiceBase",
         client_state_persistence: "ClientStatePersistenceABC",
+        performance_history: "PerformanceHistoryStorageBase",
     ):
         self.board_images = board_images
         self.board_image_records = board_image_records
@@ -105,3 +107,4 @@ class InvocationServices:
         self.style_preset_image_files = style_preset_image_files
         self.workflow_thumbnails = workflow_thumbnails
         self.client_state_persistence = client_state_persistence
+        self.performance_history = performance_history
@@ -34,6 +34,7 @@ from typing import ContextManager
 
 from invokeai.app.invocations.baseinvocation import BaseInvocation
 from invokeai.app.services.invocation_stats.invocation_stats_common import InvocationStatsSummary
+from invokeai.backend.stable_diffusion.vae_tiling import VAETilingStats
 
 
 class InvocationStatsServiceBase(ABC):
@@ -59,6 +60,15 @@ class InvocationStatsServiceBase(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_vae_tiling_stats(self, graph_execution_state_id: str, vae_tiling_stats: VAETilingStats) -> None:
+        """
+        Record the tiling decision and timings of an adaptively-tiled VAE operation.
+        :param graph_execution_state_id: The id of the current session.
+        :param vae_tiling_stats: The VAE tiling stats.
+        """
+        pass
+
     @abstractmethod
     def reset_stats(self, graph_execution_state_id: str) -> None:
         """Reset all stored statistics."""
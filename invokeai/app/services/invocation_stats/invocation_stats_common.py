@@ -1,7 +1,9 @@
 from collections import defaultdict
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from typing import Any, Optional
 
+from invokeai.backend.stable_diffusion.vae_tiling import VAETilingStats
+
 
 class GESStatsNotFoundError(Exception):
     """Raised when execution stats are not found for a given Graph Execution State."""
@@ -30,6 +32,19 @@ class ModelCacheStatsSummary:
     models_cleared: int
 
 
+@dataclass
+class VAETilingStatsSummary:
+    """The stats for an adaptively-tiled VAE encode or decode."""
+
+    operation: str
+    image_width: int
+    image_height: int
+    tile_size: Optional[int]  # None if the operation was not tiled.
+    free_memory_gb: Optional[float]
+    oom_retries: int
+    time_used_seconds: float
+
+
 @dataclass
 class GraphExecutionStatsSummary:
     """The stats for the graph execution state."""
@@ -54,6 +69,7 @@ class InvocationStatsSummary:
     graph_stats: GraphExecutionStatsSummary
     model_cache_stats: ModelCacheStatsSummary
     node_stats: list[NodeExecutionStatsSummary]
+    vae_tiling_stats: list[VAETilingStatsSummary] = field(default_factory=list)
 
     def __str__(self) -> str:
         _str = ""
@@ -81,6 +97,16 @@ class InvocationStatsSummary:
         _str += f"   Models cleared from cache: {self.model_cache_stats.models_cleared}\n"
         _str += f"   Cache high water mark: {self.model_cache_stats.high_water_mark_gb:4.2f}/{self.model_cache_stats.cache_size_gb:4.2f}G\n"
 
+        if self.vae_tiling_stats:
+            _str += "Adaptive VAE tiling:\n"
+            for summary in self.vae_tiling_stats:
+                tiling = f"tile size {summary.tile_size}" if summary.tile_size is not None else "untiled"
+                free_memory = f"{summary.free_memory_gb:4.2f}G" if summary.free_memory_gb is not None else "n/a"
+                _str += (
+                    f"   {summary.operation} {summary.image_width}x{summary.image_height}: {tiling}, "
+                    f"{summary.time_used_seconds:.3f}s, {summary.oom_retries} OOM retries, {free_memory} free\n"
+                )
+
         return _str
 
     def as_dict(self) -> dict[str, Any]:
@@ -111,10 +137,14 @@ class GraphExecutionStats:
 
     def __init__(self):
         self._node_stats_list: list[NodeExecutionStats] = []
+        self._vae_tiling_stats_list: list[VAETilingStats] = []
 
     def add_node_execution_stats(self, node_stats: NodeExecutionStats):
         self._node_stats_list.append(node_stats)
 
+    def add_vae_tiling_stats(self, vae_tiling_stats: VAETilingStats):
+        self._vae_tiling_stats_list.append(vae_tiling_stats)
+
     def get_total_run_time(self) -> float:
         """Get the total time spent executing nodes in the graph."""
         total = 0.0
@@ -181,3 +211,20 @@ class GraphExecutionStats:
             summaries.append(summary)
 
         return summaries
+
+    def get_vae_tiling_stats_summaries(self) -> list[VAETilingStatsSummary]:
+        """Get a summary of the adaptive VAE tiling stats."""
+        return [
+            VAETilingStatsSummary(
+                operation=vae_tiling_stats.operation,
+                image_width=vae_tiling_stats.image_width,
+                image_height=vae_tiling_stats.image_height,
+                tile_size=vae_tiling_stats.tile_size,
+                free_memory_gb=vae_tiling_stats.free_memory_bytes / 2**30
+                if vae_tiling_stats.free_memory_bytes is not None
+                else None,
+                oom_retries=vae_tiling_stats.num_oom_retries,
+                time_used_seconds=sum(a.seconds for a in vae_tiling_stats.attempts),
+            )
+            for vae_tiling_stats in self._vae_tiling_stats_list
+        ]
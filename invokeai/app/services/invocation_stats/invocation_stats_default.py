@@ -21,6 +21,7 @@ from invokeai.app.services.invocation_stats.invocation_stats_common import (
 )
 from invokeai.app.services.invoker import Invoker
 from invokeai.backend.model_manager.load.model_cache.cache_stats import CacheStats
+from invokeai.backend.stable_diffusion.vae_tiling import VAETilingStats
 
 # Size of 1GB in bytes.
 GB = 2**30
@@ -45,9 +46,10 @@ class InvocationStatsService(InvocationStatsServiceBase):
         # during some tests.
         services = self._invoker.services
         if not self._stats.get(graph_execution_state_id):
-            # First time we're seeing this graph_execution_state_id.
-            self._stats[graph_execution_state_id] = GraphExecutionStats()
-            self._cache_stats[graph_execution_state_id] = CacheStats()
+            # First time we're seeing this graph_execution_state_id. Nodes may run in parallel, so use setdefault to
+            # avoid replacing stats created by another node.
+            self._stats.setdefault(graph_execution_state_id, GraphExecutionStats())
+            self._cache_stats.setdefault(graph_execution_state_id, CacheStats())
 
         # Record state before the invocation.
         start_time = time.time()
@@ -76,6 +78,13 @@ class InvocationStatsService(InvocationStatsServiceBase):
             )
             self._stats[graph_execution_state_id].add_node_execution_stats(node_stats)
 
+    def add_vae_tiling_stats(self, graph_execution_state_id: str, vae_tiling_stats: VAETilingStats) -> None:
+        graph_stats = self._stats.get(graph_execution_state_id)
+        if graph_stats is None:
+            # The stats are only tracked for graphs whose nodes are being collected.
+            return
+        graph_stats.add_vae_tiling_stats(vae_tiling_stats)
+
     def reset_stats(self, graph_execution_state_id: str) -> None:
         self._stats.pop(graph_execution_state_id, None)
         self._cache_stats.pop(graph_execution_state_id, None)
@@ -93,6 +102,7 @@ class InvocationStatsService(InvocationStatsServiceBase):
             model_cache_stats=model_cache_stats_summary,
             node_stats=node_stats_summaries,
             vram_usage_gb=vram_usage_gb,
+            vae_tiling_stats=self._stats[graph_execution_state_id].get_vae_tiling_stats_summaries(),
         )
 
     def log_stats(self, graph_execution_state_id: str) -> None:
@@ -10,7 +10,12 @@ from pydantic.networks import AnyHttpUrl
 from invokeai.app.services.config import InvokeAIAppConfig
 from invokeai.app.services.download import DownloadQueueServiceBase
 from invokeai.app.services.invoker import Invoker
-from invokeai.app.services.model_install.model_install_common import ModelInstallJob, ModelSource
+from invokeai.app.services.model_install.model_install_common import (
+    ModelHashVerification,
+    ModelInstallJob,
+    ModelScanReport,
+    ModelSource,
+)
 from invokeai.app.services.model_records import ModelRecordChanges, ModelRecordServiceBase
 
 if TYPE_CHECKING:
@@ -77,6 +82,34 @@ class ModelInstallServiceBase(ABC):
         :returns id: The string ID of the registered model.
         """
 
+    @abstractmethod
+    def scan_directory(self, scan_dir: Union[Path, str], dry_run: bool = False) -> ModelScanReport:
+        """
+        Search a directory tree for models, then probe and register those that are not already installed.
+
+        The models are probed and hashed concurrently, and registered in batches. A `model_scan_progress`
+        event is emitted as each model is probed.
+
+        :param scan_dir: Path to the directory to scan.
+        :param dry_run: If True, probe the models but do not register them.
+        :returns: A report of the models found, registered and in error.
+        """
+
+    @abstractmethod
+    def verify_model_hashes(
+        self, keys: Optional[List[str]] = None, max_workers_per_device: int = 1
+    ) -> List[ModelHashVerification]:
+        """
+        Re-hash installed models and compare the results with their recorded hashes.
+
+        Every byte of each model is re-read, regardless of the hash cache. Models are hashed
+        concurrently, with at most `max_workers_per_device` models hashed at once on each disk.
+
+        :param keys: Keys of the models to verify. If None, all models are verified.
+        :param max_workers_per_device: The max number of models to hash at once on each disk.
+        :returns: The result of verifying each model.
+        """
+
     @abstractmethod
     def unregister(self, key: str) -> None:
         """Remove model with indicated key from the database."""
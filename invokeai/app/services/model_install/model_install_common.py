@@ -246,3 +246,44 @@ class ModelInstallJob(BaseModel):
     def in_terminal_state(self) -> bool:
         """Return true if job is in a terminal state."""
         return self.status in [InstallStatus.COMPLETED, InstallStatus.ERROR, InstallStatus.CANCELLED]
+
+
+class ModelScanResult(BaseModel):
+    """The result of probing a model found by a directory scan."""
+
+    path: Path = Field(description="Path to the model")
+    config: Optional[AnyModelConfig] = Field(default=None, description="The model's config, if it was identified")
+    error: Optional[str] = Field(default=None, description="Why the model could not be identified or registered")
+
+
+class ModelScanReport(BaseModel):
+    """Report of a scan of a directory for models."""
+
+    directory: Path = Field(description="The scanned directory")
+    dry_run: bool = Field(description="Whether this was a dry run, which does not register any models")
+    already_installed: list[Path] = Field(
+        default_factory=list, description="Models found in the directory that were already installed"
+    )
+    total: int = Field(default=0, description="The number of models found that were not already installed")
+    probed: int = Field(default=0, description="The number of models probed")
+    registered: list[ModelScanResult] = Field(
+        default_factory=list,
+        description="Models that were registered, or, for a dry run, that would have been registered",
+    )
+    errors: list[ModelScanResult] = Field(
+        default_factory=list, description="Models that could not be identified or registered"
+    )
+
+
+class ModelHashVerification(BaseModel):
+    """The result of verifying a model's files against its recorded hash."""
+
+    key: str = Field(description="The model's key")
+    path: Path = Field(description="Path to the model")
+    expected_hash: str = Field(description="The model's recorded hash")
+    actual_hash: Optional[str] = Field(default=None, description="The hash of the model's files, if they were hashed")
+    error: Optional[str] = Field(default=None, description="Why the model could not be verified")
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None and self.actual_hash == self.expected_hash
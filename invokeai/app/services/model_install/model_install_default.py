@@ -7,12 +7,13 @@ import re
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import deepcopy
 from pathlib import Path
 from queue import Empty, Queue
 from shutil import move, rmtree
 from tempfile import mkdtemp
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union, get_args
 
 import torch
 import yaml
@@ -31,13 +32,18 @@ from invokeai.app.services.model_install.model_install_common import (
     InstallStatus,
     InvalidModelConfigException,
     LocalModelSource,
+    ModelHashVerification,
     ModelInstallJob,
+    ModelScanReport,
+    ModelScanResult,
     ModelSource,
     StringLikeSource,
     URLModelSource,
 )
 from invokeai.app.services.model_records import DuplicateModelException, ModelRecordServiceBase
 from invokeai.app.services.model_records.model_records_base import ModelRecordChanges
+from invokeai.backend.model_hash.hash_cache import ModelHashCache
+from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS, ModelHash
 from invokeai.backend.model_manager.configs.base import Checkpoint_Config_Base
 from invokeai.backend.model_manager.configs.factory import (
     AnyModelConfig,
@@ -52,6 +58,7 @@ from invokeai.backend.model_manager.metadata import (
     RemoteModelFile,
 )
 from invokeai.backend.model_manager.metadata.metadata_base import HuggingFaceMetadata
+from invokeai.backend.model_manager.model_on_disk import ModelOnDisk
 from invokeai.backend.model_manager.search import ModelSearch
 from invokeai.backend.model_manager.taxonomy import ModelRepoVariant, ModelSourceType
 from invokeai.backend.model_manager.util.lora_metadata_extractor import apply_lora_metadata
@@ -65,6 +72,7 @@ if TYPE_CHECKING:
 
 
 TMPDIR_PREFIX = "tmpinstall_"
+SCAN_BATCH_SIZE = 50
 
 
 class ModelInstallService(ModelInstallServiceBase):
@@ -101,6 +109,9 @@ class ModelInstallService(ModelInstallServiceBase):
         self._session = session
         self._install_thread: Optional[threading.Thread] = None
         self._next_job_id = 0
+        self._hash_cache: Optional[ModelHashCache] = None
+        # Not `self._lock`, which is held by `start()` while it probes orphaned models.
+        self._hash_cache_lock = threading.Lock()
 
     @property
     def app_config(self) -> InvokeAIAppConfig:  # noqa D102
@@ -641,36 +652,155 @@ class ModelInstallService(ModelInstallServiceBase):
         This is typically only used during testing with a new DB or when using the memory DB, because those are the
         only situations in which we may have orphaned models in the models directory.
         """
+        self._logger.info(f"Scanning {self._app_config.models_path} for orphaned models")
+        report = self.scan_directory(self._app_config.models_path)
+        self._logger.info(f"{len(report.registered)} new models registered")
+
+    def scan_directory(self, scan_dir: Union[Path, str], dry_run: bool = False) -> ModelScanReport:  # noqa D102
+        scan_dir = Path(scan_dir).resolve()
+        report = ModelScanReport(directory=scan_dir, dry_run=dry_run)
         installed_model_paths = {
             (self._app_config.models_path / x.path).resolve() for x in self.record_store.all_models()
         }
+        # Core models aren't registered with the model manager
+        special_directories = [
+            self.app_config.models_path / "core",
+            self.app_config.convert_cache_dir,
+            self.app_config.download_cache_dir,
+        ]
+        new_model_paths: list[Path] = []
 
         # The bool returned by this callback determines if the model is added to the list of models found by the search
         def on_model_found(model_path: Path) -> bool:
             resolved_path = model_path.resolve()
             # Already registered models should be in the list of found models, but not re-registered.
             if resolved_path in installed_model_paths:
+                report.already_installed.append(resolved_path)
                 return True
-            # Skip core models entirely - these aren't registered with the model manager.
-            for special_directory in [
-                self.app_config.models_path / "core",
-                self.app_config.convert_cache_dir,
-                self.app_config.download_cache_dir,
-            ]:
-                if resolved_path.is_relative_to(special_directory):
-                    return False
-            try:
-                model_id = self.register_path(model_path)
-                self._logger.info(f"Registered {model_path.name} with id {model_id}")
-            except DuplicateModelException:
-                # In case a duplicate models sneaks by, we will ignore this error - we "found" the model
-                pass
+            if any(resolved_path.is_relative_to(d) for d in special_directories):
+                return False
+            new_model_paths.append(model_path)
             return True
 
-        self._logger.info(f"Scanning {self._app_config.models_path} for orphaned models")
-        search = ModelSearch(on_model_found=on_model_found)
-        found_models = search.search(self._app_config.models_path)
-        self._logger.info(f"{len(found_models)} new models registered")
+        max_workers = self._app_config.model_scan_threads
+        ModelSearch(on_model_found=on_model_found, max_workers=max_workers).search(scan_dir)
+        report.total = len(new_model_paths)
+
+        # Probing and hashing are mostly I/O, so they run concurrently. The records are written by this thread only, in
+        # batches, to keep the database writes to a single writer and a few transactions.
+        batch: list[tuple[Path, AnyModelConfig]] = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model_scan") as executor:
+            futures = {executor.submit(self._probe_for_registration, p): p for p in new_model_paths}
+            for future in as_completed(futures):
+                model_path = futures[future]
+                report.probed += 1
+                try:
+                    info = future.result()
+                except Exception as e:
+                    self._logger.warning(f"Unable to register {model_path}: {e}")
+                    report.errors.append(ModelScanResult(path=model_path, error=f"{type(e).__name__}: {e}"))
+                else:
+                    if dry_run:
+                        report.registered.append(ModelScanResult(path=model_path, config=info))
+                    else:
+                        batch.append((model_path, info))
+                        if len(batch) >= SCAN_BATCH_SIZE:
+                            self._add_scanned_models(batch, report)
+                            batch = []
+                if self._event_bus is not None:
+                    self._event_bus.emit_model_scan_progress(report)
+
+        if batch:
+            self._add_scanned_models(batch, report)
+            if self._event_bus is not None:
+                self._event_bus.emit_model_scan_progress(report)
+
+        report.already_installed.sort()
+        report.registered.sort(key=lambda r: r.path)
+        report.errors.sort(key=lambda r: r.path)
+        return report
+
+    def _probe_for_registration(self, model_path: Path) -> AnyModelConfig:
+        """Probes a model to be registered in place, returning the config to be added to the record store."""
+        config = ModelRecordChanges(source=model_path.resolve().as_posix(), source_type=ModelSourceType.Path)
+        info = self._probe(model_path, config)
+        self._prepare_for_registration(model_path, info)
+        return info
+
+    def _add_scanned_models(self, batch: list[tuple[Path, AnyModelConfig]], report: ModelScanReport) -> None:
+        added_keys = {c.key for c in self.record_store.add_models([info for _, info in batch])}
+        for model_path, info in batch:
+            if info.key in added_keys:
+                self._logger.info(f"Registered {model_path.name} with id {info.key}")
+                report.registered.append(ModelScanResult(path=model_path, config=info))
+            else:
+                report.errors.append(ModelScanResult(path=model_path, config=info, error="Model is already installed"))
+
+    def verify_model_hashes(
+        self, keys: Optional[List[str]] = None, max_workers_per_device: int = 1
+    ) -> List[ModelHashVerification]:  # noqa D102
+        model_configs = (
+            self.record_store.all_models() if keys is None else [self.record_store.get_model(k) for k in keys]
+        )
+        results: List[ModelHashVerification] = []
+        configs_by_algorithm: Dict[HASHING_ALGORITHMS, List[Tuple[AnyModelConfig, Path]]] = {}
+        for model_config in model_configs:
+            path = (self.app_config.models_path / model_config.path).resolve()
+            algorithm = self._get_hash_algorithm(model_config.hash)
+            if algorithm is None:
+                results.append(
+                    ModelHashVerification(
+                        key=model_config.key,
+                        path=path,
+                        expected_hash=model_config.hash,
+                        error="The model's hash was not made with a known hashing algorithm",
+                    )
+                )
+            else:
+                configs_by_algorithm.setdefault(algorithm, []).append((model_config, path))
+
+        for algorithm, configs in configs_by_algorithm.items():
+            hasher = ModelHash(algorithm, cache=self._get_hash_cache(), refresh_cache=True)
+            hashes = hasher.hash_many([path for _, path in configs], max_workers_per_device=max_workers_per_device)
+            for model_config, path in configs:
+                hash_ = hashes[path]
+                results.append(
+                    ModelHashVerification(
+                        key=model_config.key,
+                        path=path,
+                        expected_hash=model_config.hash,
+                        actual_hash=hash_ if isinstance(hash_, str) else None,
+                        error=f"{type(hash_).__name__}: {hash_}" if isinstance(hash_, Exception) else None,
+                    )
+                )
+        return results
+
+    def _get_hash_algorithm(self, hash_: str) -> Optional[HASHING_ALGORITHMS]:
+        """Gets the algorithm used to make a model's hash, from the hash's prefix."""
+        prefix = hash_.split(":", 1)[0]
+        if prefix == "blake3":
+            # blake3_single and blake3_multi make the same hash - use the configured one, which suits the disk
+            configured = self.app_config.hashing_algorithm
+            return configured if configured in ("blake3_single", "blake3_multi") else "blake3_single"
+        if prefix != "random" and prefix in get_args(HASHING_ALGORITHMS):
+            return prefix  # type: ignore
+        return None
+
+    def _get_hash_cache(self) -> Optional[ModelHashCache]:
+        """Gets the persistent cache of model file hashes, opening it on first use.
+
+        The cache is kept outside the app's database, so that model hashes survive a database reset. It may be first
+        used by several probe threads at once, so it is opened under a lock.
+        """
+        with self._hash_cache_lock:
+            if self._hash_cache is None:
+                try:
+                    self._hash_cache = ModelHashCache(
+                        self.app_config.root_path / ".cache" / "model_hashes.db", logger=self._logger
+                    )
+                except Exception as e:
+                    self._logger.warning(f"Unable to open model hash cache: {e}")
+            return self._hash_cache
 
     def _probe(self, model_path: Path, config: Optional[ModelRecordChanges] = None):
         config = config or ModelRecordChanges()
@@ -678,7 +808,7 @@ class ModelInstallService(ModelInstallServiceBase):
         fields = config.model_dump()
 
         result = ModelConfigFactory.from_model_on_disk(
-            mod=model_path,
+            mod=ModelOnDisk(model_path, hash_algo, hash_cache=self._get_hash_cache()),
             override_fields=deepcopy(fields),
             hash_algo=hash_algo,
             allow_unknown=self.app_config.allow_unknown_models,
@@ -698,7 +828,12 @@ class ModelInstallService(ModelInstallServiceBase):
         config = config or ModelRecordChanges()
 
         info = info or self._probe(model_path, config)
+        self._prepare_for_registration(model_path, info)
+        self.record_store.add_model(info)
+        return info.key
 
+    def _prepare_for_registration(self, model_path: Path, info: AnyModelConfig) -> None:
+        """Sets the paths of a probed model's config, for a model registered in place."""
         # Apply LoRA metadata if applicable
         model_images_path = self.app_config.models_path / "model_images"
         apply_lora_metadata(info, model_path.resolve(), model_images_path)
@@ -718,8 +853,6 @@ class ModelInstallService(ModelInstallServiceBase):
             if legacy_config_path.is_relative_to(self.app_config.legacy_conf_path):
                 legacy_config_path = legacy_config_path.relative_to(self.app_config.legacy_conf_path)
             info.config_path = legacy_config_path.as_posix()
-        self.record_store.add_model(info)
-        return info.key
 
     def _next_id(self) -> int:
         with self._lock:
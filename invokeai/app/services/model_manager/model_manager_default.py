@@ -96,6 +96,10 @@ class ModelManagerService(ModelManagerServiceBase):
             log_memory_usage=app_config.log_memory_usage,
             logger=logger,
             keep_alive_minutes=app_config.model_cache_keep_alive_min,
+            gguf_dequant_cache_vram_gb=app_config.gguf_dequant_cache_vram_gb,
+            gguf_dequant_cache_ram_gb=app_config.gguf_dequant_cache_ram_gb,
+            enable_vram_placement_profiling=app_config.enable_vram_placement_profiling,
+            vram_placement_plan_dir=app_config.vram_placement_plans_path,
         )
         loader = ModelLoadService(
             app_config=app_config,
@@ -119,6 +119,18 @@ class ModelRecordServiceBase(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_models(self, configs: List[AnyModelConfig]) -> List[AnyModelConfig]:
+        """
+        Add a batch of models to the database, in a single transaction.
+
+        :param configs: Model configuration records.
+
+        Models that conflict with an installed model are skipped. Returns the
+        configs of the models that were added.
+        """
+        pass
+
     @abstractmethod
     def del_model(self, key: str) -> None:
         """
@@ -103,18 +103,57 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
 
             except sqlite3.IntegrityError as e:
                 if "UNIQUE constraint failed" in str(e):
-                    if "models.path" in str(e):
-                        msg = f"A model with path '{config.path}' is already installed"
-                    elif "models.name" in str(e):
-                        msg = f"A model with name='{config.name}', type='{config.type}', base='{config.base}' is already installed"
-                    else:
-                        msg = f"A model with key '{config.key}' is already installed"
-                    raise DuplicateModelException(msg) from e
+                    raise DuplicateModelException(self._get_duplicate_model_message(config, e)) from e
                 else:
                     raise e
 
         return self.get_model(config.key)
 
+    def add_models(self, configs: List[AnyModelConfig]) -> List[AnyModelConfig]:
+        """
+        Add a batch of models to the database, in a single transaction.
+
+        :param configs: Model configuration records.
+
+        Models that conflict with an installed model are skipped. Returns the
+        configs of the models that were added.
+        """
+        added: List[AnyModelConfig] = []
+        with self._db.transaction() as cursor:
+            for config in configs:
+                try:
+                    cursor.execute(
+                        """--sql
+                        INSERT INTO models (
+                            id,
+                            config
+                            )
+                        VALUES (?,?);
+                        """,
+                        (
+                            config.key,
+                            config.model_dump_json(),
+                        ),
+                    )
+                except sqlite3.IntegrityError as e:
+                    # A failed insert only rolls back its own statement, so the rest of the batch is unaffected
+                    if "UNIQUE constraint failed" in str(e):
+                        self._logger.warning(self._get_duplicate_model_message(config, e))
+                    else:
+                        raise e
+                else:
+                    added.append(config)
+        return added
+
+    @staticmethod
+    def _get_duplicate_model_message(config: AnyModelConfig, e: sqlite3.IntegrityError) -> str:
+        if "models.path" in str(e):
+            return f"A model with path '{config.path}' is already installed"
+        elif "models.name" in str(e):
+            return f"A model with name='{config.name}', type='{config.type}', base='{config.base}' is already installed"
+        else:
+            return f"A model with key '{config.key}' is already installed"
+
     def del_model(self, key: str) -> None:
         """
         Delete a model.
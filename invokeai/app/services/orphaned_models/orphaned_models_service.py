@@ -42,6 +42,7 @@ class OrphanedModelsService:
     SKIP_DIRS = {
         ".download_cache",
         ".convert_cache",
+        ".vram_placement_plans",
         "__pycache__",
         ".git",
     }
@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from invokeai.app.services.performance_history.performance_history_common import (
+    PerformanceHistoryEntry,
+    PerformanceHistorySummary,
+    PerformanceRegression,
+)
+
+
+class PerformanceHistoryStorageBase(ABC):
+    """A rolling store of invocation timings, used to compare performance across app versions."""
+
+    @abstractmethod
+    def add_entries(self, entries: list[PerformanceHistoryEntry]) -> None:
+        """Adds entries to the history, dropping the oldest entries if the history is full."""
+        pass
+
+    @abstractmethod
+    def get_summaries(
+        self, app_version: Optional[str] = None, invocation_type: Optional[str] = None
+    ) -> list[PerformanceHistorySummary]:
+        """Gets timing percentiles, grouped by invocation type, model, resolution, steps and app version."""
+        pass
+
+    @abstractmethod
+    def get_app_versions(self) -> list[str]:
+        """Gets the app versions that have entries in the history, oldest first."""
+        pass
+
+    @abstractmethod
+    def find_regressions(
+        self, baseline_version: str, candidate_version: str, threshold: float = 0.1, min_count: int = 5
+    ) -> list[PerformanceRegression]:
+        """Finds groups of comparable invocations whose median duration is more than `threshold` (e.g. 0.1 for 10%)
+        slower in `candidate_version` than in `baseline_version`. Groups with fewer than `min_count` entries in either
+        version are ignored."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Deletes all entries."""
+        pass
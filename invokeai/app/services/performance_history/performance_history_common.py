@@ -0,0 +1,135 @@
+import math
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from invokeai.app.invocations.baseinvocation import BaseInvocation, BaseInvocationOutput
+from invokeai.app.invocations.model import ModelIdentifierField
+from invokeai.backend.model_manager.taxonomy import ModelType
+
+
+class PerformanceHistoryEntry(BaseModel):
+    """The timing of a single invocation."""
+
+    invocation_type: str = Field(description="The type of the invocation")
+    model: Optional[str] = Field(default=None, description="The name of the main model used by the invocation")
+    width: Optional[int] = Field(default=None, description="The width of the invocation's output")
+    height: Optional[int] = Field(default=None, description="The height of the invocation's output")
+    steps: Optional[int] = Field(default=None, description="The number of steps run by the invocation")
+    duration: float = Field(description="The time taken by the invocation, in seconds")
+    app_version: str = Field(description="The app version that ran the invocation")
+
+
+class PerformanceHistorySummary(BaseModel):
+    """Timing percentiles for invocations with the same type, model, resolution, steps and app version."""
+
+    invocation_type: str = Field(description="The type of the invocations")
+    model: Optional[str] = Field(description="The name of the main model used by the invocations")
+    width: Optional[int] = Field(description="The width of the invocations' outputs")
+    height: Optional[int] = Field(description="The height of the invocations' outputs")
+    steps: Optional[int] = Field(description="The number of steps run by the invocations")
+    app_version: str = Field(description="The app version that ran the invocations")
+    count: int = Field(description="The number of invocations")
+    mean: float = Field(description="The mean duration, in seconds")
+    p50: float = Field(description="The median duration, in seconds")
+    p90: float = Field(description="The 90th percentile duration, in seconds")
+    p99: float = Field(description="The 99th percentile duration, in seconds")
+
+    @property
+    def group_key(self) -> tuple[str, Optional[str], Optional[int], Optional[int], Optional[int]]:
+        """The key that identifies comparable invocations across app versions."""
+        return (self.invocation_type, self.model, self.width, self.height, self.steps)
+
+
+class PerformanceRegression(BaseModel):
+    """A group of comparable invocations whose median duration increased between two app versions."""
+
+    baseline: PerformanceHistorySummary = Field(description="The summary for the baseline app version")
+    candidate: PerformanceHistorySummary = Field(description="The summary for the candidate app version")
+    ratio: float = Field(description="The candidate's median duration divided by the baseline's median duration")
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Get the q-th percentile (0 <= q <= 100) of sorted values, linearly interpolating between the closest ranks."""
+    if not sorted_values:
+        raise ValueError("Cannot compute a percentile of no values")
+    rank = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def find_regressions(
+    baseline: list[PerformanceHistorySummary],
+    candidate: list[PerformanceHistorySummary],
+    threshold: float,
+    min_count: int,
+) -> list[PerformanceRegression]:
+    """Find groups whose median duration in `candidate` is more than `threshold` (e.g. 0.1 for 10%) slower than in
+    `baseline`. Groups with fewer than `min_count` invocations in either version are ignored. The regressions are
+    sorted from worst to least bad."""
+    baseline_by_key = {s.group_key: s for s in baseline if s.count >= min_count}
+    regressions: list[PerformanceRegression] = []
+    for candidate_summary in candidate:
+        baseline_summary = baseline_by_key.get(candidate_summary.group_key)
+        if baseline_summary is None or candidate_summary.count < min_count or baseline_summary.p50 <= 0:
+            continue
+        ratio = candidate_summary.p50 / baseline_summary.p50
+        if ratio > 1 + threshold:
+            regressions.append(
+                PerformanceRegression(baseline=baseline_summary, candidate=candidate_summary, ratio=ratio)
+            )
+    return sorted(regressions, key=lambda r: r.ratio, reverse=True)
+
+
+def build_performance_history_entry(
+    invocation: BaseInvocation, output: BaseInvocationOutput, duration: float, app_version: str
+) -> PerformanceHistoryEntry:
+    """Build a history entry for an invocation, keyed by the invocation's main model, resolution and steps.
+
+    - The model is the first main model among the invocation's fields (or their direct sub-fields, e.g. `unet.unet`),
+      falling back to the first model of any type.
+    - The resolution is taken from the output's `width` and `height` if it has them (e.g. images and latents),
+      otherwise from the invocation's.
+    - The steps are the invocation's `steps` or `num_steps`.
+    """
+    width = _get_int_attr(output, "width")
+    height = _get_int_attr(output, "height")
+    if width is None or height is None:
+        width = _get_int_attr(invocation, "width")
+        height = _get_int_attr(invocation, "height")
+    steps = _get_int_attr(invocation, "steps")
+    if steps is None:
+        steps = _get_int_attr(invocation, "num_steps")
+    model = _get_main_model(invocation)
+    return PerformanceHistoryEntry(
+        invocation_type=invocation.get_type(),
+        model=model.name if model is not None else None,
+        width=width,
+        height=height,
+        steps=steps,
+        duration=duration,
+        app_version=app_version,
+    )
+
+
+def _get_int_attr(obj: object, name: str) -> Optional[int]:
+    value = getattr(obj, name, None)
+    # bool is a subclass of int, but is never a size or a step count.
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _get_main_model(invocation: BaseInvocation) -> Optional[ModelIdentifierField]:
+    models: list[ModelIdentifierField] = []
+    for field_name in type(invocation).model_fields:
+        value = getattr(invocation, field_name)
+        if isinstance(value, ModelIdentifierField):
+            models.append(value)
+        elif isinstance(value, BaseModel):
+            models.extend(
+                v for v in (getattr(value, f) for f in type(value).model_fields) if isinstance(v, ModelIdentifierField)
+            )
+    for model in models:
+        if model.type == ModelType.Main:
+            return model
+    return models[0] if models else None
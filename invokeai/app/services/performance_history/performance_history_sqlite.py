@@ -0,0 +1,117 @@
+from itertools import groupby
+from typing import Any, Optional
+
+from invokeai.app.services.performance_history.performance_history_base import PerformanceHistoryStorageBase
+from invokeai.app.services.performance_history.performance_history_common import (
+    PerformanceHistoryEntry,
+    PerformanceHistorySummary,
+    PerformanceRegression,
+    find_regressions,
+    percentile,
+)
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+
+
+class SqlitePerformanceHistoryStorage(PerformanceHistoryStorageBase):
+    def __init__(self, db: SqliteDatabase, max_entries: int) -> None:
+        """
+        Args:
+            db: The database.
+            max_entries: The max number of entries to keep. When exceeded, the oldest entries are dropped.
+        """
+        super().__init__()
+        self._db = db
+        self._max_entries = max_entries
+
+    def add_entries(self, entries: list[PerformanceHistoryEntry]) -> None:
+        if not entries:
+            return
+        with self._db.transaction() as cursor:
+            cursor.executemany(
+                """--sql
+                INSERT INTO invocation_performance_history
+                    (invocation_type, model, width, height, steps, duration, app_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?);
+                """,
+                [(e.invocation_type, e.model, e.width, e.height, e.steps, e.duration, e.app_version) for e in entries],
+            )
+            # Ids are never reused (AUTOINCREMENT), so this drops the oldest entries beyond the limit.
+            cursor.execute(
+                """--sql
+                DELETE FROM invocation_performance_history
+                WHERE id <= (SELECT MAX(id) FROM invocation_performance_history) - ?;
+                """,
+                (self._max_entries,),
+            )
+
+    def get_summaries(
+        self, app_version: Optional[str] = None, invocation_type: Optional[str] = None
+    ) -> list[PerformanceHistorySummary]:
+        conditions: list[str] = []
+        params: list[Any] = []
+        if app_version is not None:
+            conditions.append("app_version = ?")
+            params.append(app_version)
+        if invocation_type is not None:
+            conditions.append("invocation_type = ?")
+            params.append(invocation_type)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._db.transaction() as cursor:
+            cursor.execute(
+                f"""--sql
+                SELECT invocation_type, model, width, height, steps, app_version, duration
+                FROM invocation_performance_history
+                {where}
+                ORDER BY invocation_type, model, width, height, steps, app_version, duration;
+                """,
+                params,
+            )
+            rows = cursor.fetchall()
+
+        summaries: list[PerformanceHistorySummary] = []
+        for key, group in groupby(rows, key=lambda row: tuple(row[:6])):
+            durations = [row[6] for row in group]
+            invocation_type_, model, width, height, steps, app_version_ = key
+            summaries.append(
+                PerformanceHistorySummary(
+                    invocation_type=invocation_type_,
+                    model=model,
+                    width=width,
+                    height=height,
+                    steps=steps,
+                    app_version=app_version_,
+                    count=len(durations),
+                    mean=sum(durations) / len(durations),
+                    p50=percentile(durations, 50),
+                    p90=percentile(durations, 90),
+                    p99=percentile(durations, 99),
+                )
+            )
+        return summaries
+
+    def get_app_versions(self) -> list[str]:
+        with self._db.transaction() as cursor:
+            cursor.execute(
+                """--sql
+                SELECT app_version
+                FROM invocation_performance_history
+                GROUP BY app_version
+                ORDER BY MIN(id);
+                """
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def find_regressions(
+        self, baseline_version: str, candidate_version: str, threshold: float = 0.1, min_count: int = 5
+    ) -> list[PerformanceRegression]:
+        return find_regressions(
+            baseline=self.get_summaries(app_version=baseline_version),
+            candidate=self.get_summaries(app_version=candidate_version),
+            threshold=threshold,
+            min_count=min_count,
+        )
+
+    def clear(self) -> None:
+        with self._db.transaction() as cursor:
+            cursor.execute("DELETE FROM invocation_performance_history;")
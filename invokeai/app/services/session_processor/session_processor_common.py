@@ -1,5 +1,7 @@
+from typing import Optional
+
 from PIL.Image import Image as PILImageType
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from invokeai.backend.util.util import image_to_dataURL
 
@@ -22,12 +24,22 @@ class ProgressImage(BaseModel):
     height: int = Field(ge=1, description="The effective height of the image in pixels")
     dataURL: str = Field(description="The image data as a b64 data URL")
 
+    # The source image, for clients that receive progress images as binary frames. Not serialized.
+    _image: Optional[PILImageType] = PrivateAttr(default=None)
+
+    @property
+    def image(self) -> Optional[PILImageType]:
+        """The PIL image this progress image was built from, if any."""
+        return self._image
+
     @classmethod
     def build(cls, image: PILImageType, size: tuple[int, int] | None = None) -> "ProgressImage":
         """Build a ProgressImage from a PIL image"""
 
-        return cls(
+        progress_image = cls(
             width=size[0] if size else image.width,
             height=size[1] if size else image.height,
             dataURL=image_to_dataURL(image, image_format="JPEG"),
         )
+        progress_image._image = image
+        return progress_image
@@ -1,11 +1,15 @@
 import gc
+import time
 import traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import suppress
+from dataclasses import dataclass
 from threading import BoundedSemaphore, Thread
 from threading import Event as ThreadEvent
 from typing import Optional
 
-from invokeai.app.invocations.baseinvocation import BaseInvocation, BaseInvocationOutput
+from invokeai.app.invocations.baseinvocation import BaseInvocation, BaseInvocationOutput, Bottleneck
 from invokeai.app.services.events.events_common import (
     BatchEnqueuedEvent,
     FastAPIEvent,
@@ -15,6 +19,10 @@ from invokeai.app.services.events.events_common import (
 )
 from invokeai.app.services.invocation_stats.invocation_stats_common import GESStatsNotFoundError
 from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.performance_history.performance_history_common import (
+    PerformanceHistoryEntry,
+    build_performance_history_entry,
+)
 from invokeai.app.services.session_processor.session_processor_base import (
     InvocationServices,
     OnAfterRunNode,
@@ -30,7 +38,19 @@ from invokeai.app.services.session_processor.session_processor_common import Can
 from invokeai.app.services.session_queue.session_queue_common import SessionQueueItem, SessionQueueItemNotFoundError
 from invokeai.app.services.shared.graph import NodeInputError
 from invokeai.app.services.shared.invocation_context import InvocationContextData, build_invocation_context
+from invokeai.app.util.metrics import INVOCATION_ERRORS, INVOCATION_SECONDS, QUEUE_DEQUEUE_SECONDS
 from invokeai.app.util.profiler import Profiler
+from invokeai.backend.util.tracing import get_tracer, write_chrome_trace, write_otlp_json
+from invokeai.version import __version__
+
+
+@dataclass
+class _NodeOutcome:
+    """The result of invoking a node: its output, its error, or neither if it was canceled."""
+
+    output: Optional[BaseInvocationOutput] = None
+    error: Optional[Exception] = None
+    error_traceback: Optional[str] = None
 
 
 class DefaultSessionRunner(SessionRunnerBase):
@@ -63,6 +83,8 @@ class DefaultSessionRunner(SessionRunnerBase):
         self._services = services
         self._cancel_event = cancel_event
         self._profiler = profiler
+        # Timings of the current session's invocations, written to the performance history when the session ends.
+        self._performance_history_entries: list[PerformanceHistoryEntry] = []
 
     def _is_canceled(self) -> bool:
         """Check if the cancel event is set. This is also passed to the invocation context builder and called during
@@ -72,47 +94,136 @@ class DefaultSessionRunner(SessionRunnerBase):
     def run(self, queue_item: SessionQueueItem):
         # Exceptions raised outside `run_node` are handled by the processor. There is no need to catch them here.
 
+        try:
+            with get_tracer().span(
+                "session", category="session", session_id=queue_item.session_id, queue_item_id=queue_item.item_id
+            ):
+                self._run(queue_item)
+        finally:
+            self._write_trace(queue_item)
+
+    def _run(self, queue_item: SessionQueueItem):
         self._on_before_run_session(queue_item=queue_item)
 
+        if self._services.configuration.max_parallel_nodes > 1:
+            self._run_parallel(queue_item)
+        else:
+            self._run_serial(queue_item)
+
+        self._on_after_run_session(queue_item=queue_item)
+
+    def _run_serial(self, queue_item: SessionQueueItem):
         # Loop over invocations until the session is complete or canceled
         while True:
-            try:
-                invocation = queue_item.session.next()
-            # Anything other than a `NodeInputError` is handled as a processor error
-            except NodeInputError as e:
-                error_type = e.__class__.__name__
-                error_message = str(e)
-                error_traceback = traceback.format_exc()
-                self._on_node_error(
-                    invocation=e.node,
-                    queue_item=queue_item,
-                    error_type=error_type,
-                    error_message=error_message,
-                    error_traceback=error_traceback,
-                )
-                break
-
+            invocation = self._next_invocation(queue_item)
             if invocation is None or self._is_canceled():
                 break
 
             self.run_node(invocation, queue_item)
 
-            # The session is complete if all invocations have been run or there is an error on the session.
-            # At this time, the queue item may be canceled, but the object itself here won't be updated yet. We must
-            # use the cancel event to check if the session is canceled.
-            if (
-                queue_item.session.is_complete()
-                or self._is_canceled()
-                or queue_item.status in ["failed", "canceled", "completed"]
-            ):
+            if self._is_session_done(queue_item):
                 break
 
-        self._on_after_run_session(queue_item=queue_item)
+    def _run_parallel(self, queue_item: SessionQueueItem):
+        """Runs ready invocations concurrently on a worker pool.
+
+        GPU-bound invocations run one at a time, but may run alongside CPU-bound and network-bound invocations. The
+        session is only modified on this thread, and invocations are completed in the order they were dispatched, so
+        results, events and callbacks are in a deterministic order.
+        """
+        max_workers = self._services.configuration.max_parallel_nodes
+        # Dispatched invocations, in dispatch order
+        in_flight: deque[tuple[BaseInvocation, Future[_NodeOutcome]]] = deque()
+        # Ready GPU-bound invocations, waiting for the running GPU-bound invocation to complete
+        waiting_for_gpu: deque[BaseInvocation] = deque()
+        gpu_busy = False
+        no_more_ready = False
+        done = False
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="invocation") as executor:
+            while True:
+                # Dispatch as many ready invocations as the pool and the GPU allow
+                while not done and len(in_flight) < max_workers and not self._is_canceled():
+                    if waiting_for_gpu and not gpu_busy:
+                        invocation = waiting_for_gpu.popleft()
+                    elif no_more_ready:
+                        break
+                    else:
+                        invocation = self._next_invocation(queue_item)
+                        if invocation is None:
+                            # Nothing else is ready until an in-flight invocation completes
+                            no_more_ready = True
+                            break
+                        if invocation.bottleneck is Bottleneck.GPU and gpu_busy:
+                            waiting_for_gpu.append(invocation)
+                            continue
+                    if invocation.bottleneck is Bottleneck.GPU:
+                        gpu_busy = True
+                    in_flight.append((invocation, executor.submit(self._call_node, invocation, queue_item)))
+
+                if not in_flight:
+                    break
+
+                # Wait for the earliest-dispatched invocation. If the session is done, remaining invocations are
+                # allowed to finish, but their results are discarded.
+                invocation, future = in_flight.popleft()
+                outcome = future.result()
+                if invocation.bottleneck is Bottleneck.GPU:
+                    gpu_busy = False
+                if done:
+                    continue
+                self._finish_node(invocation, queue_item, outcome)
+                # Completing an invocation may make others ready
+                no_more_ready = False
+                if self._is_session_done(queue_item):
+                    done = True
+
+    def _next_invocation(self, queue_item: SessionQueueItem) -> Optional[BaseInvocation]:
+        """Gets the next ready invocation. If its inputs are invalid, the session errors and None is returned."""
+        try:
+            return queue_item.session.next()
+        # Anything other than a `NodeInputError` is handled as a processor error
+        except NodeInputError as e:
+            error_type = e.__class__.__name__
+            error_message = str(e)
+            error_traceback = traceback.format_exc()
+            self._on_node_error(
+                invocation=e.node,
+                queue_item=queue_item,
+                error_type=error_type,
+                error_message=error_message,
+                error_traceback=error_traceback,
+            )
+            return None
+
+    def _is_session_done(self, queue_item: SessionQueueItem) -> bool:
+        # The session is complete if all invocations have been run or there is an error on the session.
+        # At this time, the queue item may be canceled, but the object itself here won't be updated yet. We must
+        # use the cancel event to check if the session is canceled.
+        return (
+            queue_item.session.is_complete()
+            or self._is_canceled()
+            or queue_item.status in ["failed", "canceled", "completed"]
+        )
 
     def run_node(self, invocation: BaseInvocation, queue_item: SessionQueueItem):
+        self._finish_node(invocation, queue_item, self._call_node(invocation, queue_item))
+
+    def _call_node(self, invocation: BaseInvocation, queue_item: SessionQueueItem) -> "_NodeOutcome":
+        """Invokes a node, capturing its output or error. This does not modify the session, so it may be called from a
+        worker thread."""
         try:
             # Any unhandled exception in this scope is an invocation error & will fail the graph
-            with self._services.performance_statistics.collect_stats(invocation, queue_item.session_id):
+            with (
+                get_tracer().span(
+                    f"invocation.{invocation.get_type()}",
+                    category="invocation",
+                    invocation_id=invocation.id,
+                    invocation_type=invocation.get_type(),
+                ),
+                INVOCATION_SECONDS.time(invocation_type=invocation.get_type()),
+                self._services.performance_statistics.collect_stats(invocation, queue_item.session_id),
+            ):
                 self._on_before_run_node(invocation, queue_item)
 
                 data = InvocationContextData(
@@ -127,15 +238,18 @@ class DefaultSessionRunner(SessionRunnerBase):
                 )
 
                 # Invoke the node
-                output = invocation.invoke_internal(context=context, services=self._services)
-                # Save output and history
-                queue_item.session.complete(invocation.id, output)
-
-                self._on_after_run_node(invocation, queue_item, output)
+                start_time = time.perf_counter()
+                output, from_cache = invocation.invoke_internal_with_cache_status(
+                    context=context, services=self._services
+                )
+                # Outputs from the invocation cache do not reflect the invocation's performance.
+                if not from_cache:
+                    self._add_performance_history_entry(invocation, output, time.perf_counter() - start_time)
+                return _NodeOutcome(output=output)
 
         except KeyboardInterrupt:
             # TODO(psyche): This is expected to be caught in the main thread. Do we need to catch this here?
-            pass
+            return _NodeOutcome()
         except CanceledException:
             # A CanceledException is raised during the denoising step callback if the cancel event is set. We don't need
             # to do any handling here, and no error should be set - just pass and the cancellation will be handled
@@ -143,17 +257,29 @@ class DefaultSessionRunner(SessionRunnerBase):
             #
             # See the comment in the processor's `_on_queue_item_status_changed()` method for more details on how we
             # handle cancellation.
-            pass
+            return _NodeOutcome()
         except Exception as e:
-            error_type = e.__class__.__name__
-            error_message = str(e)
-            error_traceback = traceback.format_exc()
+            return _NodeOutcome(error=e, error_traceback=traceback.format_exc())
+
+    def _finish_node(self, invocation: BaseInvocation, queue_item: SessionQueueItem, outcome: "_NodeOutcome") -> None:
+        """Saves a node's output to the session and runs the after-node callbacks, or handles its error."""
+        if outcome.error is None and outcome.output is not None:
+            try:
+                # Save output and history
+                queue_item.session.complete(invocation.id, outcome.output)
+
+                self._on_after_run_node(invocation, queue_item, outcome.output)
+            except Exception as e:
+                outcome = _NodeOutcome(error=e, error_traceback=traceback.format_exc())
+
+        if outcome.error is not None:
+            INVOCATION_ERRORS.inc(invocation_type=invocation.get_type())
             self._on_node_error(
                 invocation=invocation,
                 queue_item=queue_item,
-                error_type=error_type,
-                error_message=error_message,
-                error_traceback=error_traceback,
+                error_type=outcome.error.__class__.__name__,
+                error_message=str(outcome.error),
+                error_traceback=outcome.error_traceback or "",
             )
 
     def _on_before_run_session(self, queue_item: SessionQueueItem) -> None:
@@ -178,6 +304,7 @@ class DefaultSessionRunner(SessionRunnerBase):
         """Called after a session is run.
 
         - Stop the profiler if profiling is enabled.
+        - Write the session's invocation timings to the performance history.
         - Update the queue item's session object in the database.
         - If not already canceled or failed, complete the queue item.
         - Log and reset performance statistics.
@@ -196,6 +323,8 @@ class DefaultSessionRunner(SessionRunnerBase):
                 graph_execution_state_id=queue_item.session.id, output_path=stats_path
             )
 
+        self._write_performance_history()
+
         try:
             # Update the queue item with the completed session. If the queue item has been removed from the queue,
             # we'll get a SessionQueueItemNotFoundError and we can ignore it. This can happen if the queue is cleared
@@ -218,6 +347,40 @@ class DefaultSessionRunner(SessionRunnerBase):
         except SessionQueueItemNotFoundError:
             pass
 
+    def _add_performance_history_entry(
+        self, invocation: BaseInvocation, output: BaseInvocationOutput, duration: float
+    ) -> None:
+        if self._services.configuration.performance_history_size == 0:
+            return
+        self._performance_history_entries.append(
+            build_performance_history_entry(invocation, output, duration=duration, app_version=__version__)
+        )
+
+    def _write_performance_history(self) -> None:
+        """Write the session's invocation timings to the performance history. Failures are logged, but do not affect
+        the session."""
+        entries, self._performance_history_entries = self._performance_history_entries, []
+        try:
+            self._services.performance_history.add_entries(entries)
+        except Exception as e:
+            self._services.logger.warning(f"Failed to write performance history: {e}")
+
+    def _write_trace(self, queue_item: SessionQueueItem) -> None:
+        """Write the spans recorded since the session was dequeued to the profiles directory, if tracing is enabled."""
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return
+
+        spans = tracer.collect_spans()
+        config = self._services.configuration
+        filename = (
+            f"{config.profile_prefix}_{queue_item.session_id}" if config.profile_prefix else queue_item.session_id
+        )
+        trace_path = config.profiles_path / f"{filename}.trace.json"
+        write_chrome_trace(spans, trace_path)
+        write_otlp_json(spans, config.profiles_path / f"{filename}.otlp.json", trace_id=queue_item.session_id)
+        self._services.logger.info(f"Wrote {len(spans)} trace spans to {trace_path}.")
+
     def _on_before_run_node(self, invocation: BaseInvocation, queue_item: SessionQueueItem):
         """Called before a node is run.
 
@@ -351,6 +514,9 @@ class DefaultSessionProcessor(SessionProcessorBase):
             else None
         )
 
+        if self._invoker.services.configuration.trace_graphs:
+            get_tracer().enable()
+
         self.session_runner.start(services=invoker.services, cancel_event=self._cancel_event, profiler=self._profiler)
         self._thread = Thread(
             name="session_processor",
@@ -431,8 +597,12 @@ class DefaultSessionProcessor(SessionProcessorBase):
                     # If we are paused, wait for resume event
                     resume_event.wait()
 
-                    # Get the next session to process
-                    self._queue_item = self._invoker.services.session_queue.dequeue()
+                    # Get the next session to process. Any spans recorded while idle are discarded, so that the
+                    # session's trace starts with its dequeue.
+                    tracer = get_tracer()
+                    tracer.collect_spans()
+                    with tracer.span("session_queue.dequeue", category="session"), QUEUE_DEQUEUE_SECONDS.time():
+                        self._queue_item = self._invoker.services.session_queue.dequeue()
 
                     if self._queue_item is None:
                         # The queue was empty, wait for next polling interval or event to try again
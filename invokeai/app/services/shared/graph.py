@@ -2,7 +2,10 @@
 
 import copy
 import itertools
-from collections import deque
+from collections import OrderedDict, deque
+from contextlib import suppress
+from functools import lru_cache
+from threading import Lock
 from typing import Any, Deque, Iterable, Optional, Type, TypeVar, Union, get_args, get_origin
 
 import networkx as nx
@@ -19,8 +22,6 @@ from pydantic.fields import Field
 from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import core_schema
 
-# Importing * is bad karma but needed here for node detection
-from invokeai.app.invocations import *  # noqa: F401 F403
 from invokeai.app.invocations.baseinvocation import (
     BaseInvocation,
     BaseInvocationOutput,
@@ -29,9 +30,13 @@ from invokeai.app.invocations.baseinvocation import (
     invocation_output,
 )
 from invokeai.app.invocations.fields import Input, InputField, OutputField, UIType
+from invokeai.app.invocations.invocation_manifest import register_core_invocations
 from invokeai.app.services.shared.invocation_context import InvocationContext
 from invokeai.app.util.misc import uuid_string
 
+# Register the core invocations for node detection. Their modules are imported when their types are first used.
+register_core_invocations()
+
 # in 3.10 this would be "from types import NoneType"
 NoneType = type(None)
 
@@ -67,8 +72,12 @@ def get_output_field_type(node: BaseInvocation, field: str) -> Any:
     # TODO(psyche): This is awkward - if field_info is None, it means the field is not defined in the output, which
     # really should raise. The consumers of this utility expect it to never raise, and return None instead. Fixing this
     # would require some fairly significant changes and I don't want risk breaking anything.
+    return _get_output_field_type(type(node), field)
+
+
+@lru_cache(maxsize=None)
+def _get_output_field_type(invocation_class: type[BaseInvocation], field: str) -> Any:
     try:
-        invocation_class = type(node)
         invocation_output_class = invocation_class.get_output_annotation()
         field_info = invocation_output_class.model_fields.get(field)
         assert field_info is not None, f"Output field '{field}' not found in {invocation_output_class.get_type()}"
@@ -82,8 +91,12 @@ def get_input_field_type(node: BaseInvocation, field: str) -> Any:
     # TODO(psyche): This is awkward - if field_info is None, it means the field is not defined in the output, which
     # really should raise. The consumers of this utility expect it to never raise, and return None instead. Fixing this
     # would require some fairly significant changes and I don't want risk breaking anything.
+    return _get_input_field_type(type(node), field)
+
+
+@lru_cache(maxsize=None)
+def _get_input_field_type(invocation_class: type[BaseInvocation], field: str) -> Any:
     try:
-        invocation_class = type(node)
         field_info = invocation_class.model_fields.get(field)
         assert field_info is not None, f"Input field '{field}' not found in {invocation_class.get_type()}"
         input_field_type = field_info.annotation
@@ -162,8 +175,18 @@ def are_connections_compatible(
     """Determines if a connection between fields of two nodes is compatible."""
 
     # TODO: handle iterators and collectors
-    from_type = get_output_field_type(from_node, from_field)
-    to_type = get_input_field_type(to_node, to_field)
+    return _are_invocation_fields_compatible(type(from_node), from_field, type(to_node), to_field)
+
+
+@lru_cache(maxsize=4096)
+def _are_invocation_fields_compatible(
+    from_class: type[BaseInvocation], from_field: str, to_class: type[BaseInvocation], to_field: str
+) -> bool:
+    """Determines if a connection between fields of two invocation classes is compatible. The type introspection is
+    relatively slow, and graphs tend to reuse the same few connections, so the result is cached for each pair of
+    classes and fields."""
+    from_type = _get_output_field_type(from_class, from_field)
+    to_type = _get_input_field_type(to_class, to_field)
 
     return are_connection_types_compatible(from_type, to_type)
 
@@ -178,6 +201,11 @@ def copydeep(obj: T) -> T:
     return copy.deepcopy(obj)
 
 
+def _share(obj: T) -> T:
+    """Passes an object by reference, for nodes that don't modify their inputs."""
+    return obj
+
+
 class NodeAlreadyInGraphError(ValueError):
     pass
 
@@ -300,10 +328,23 @@ class CollectInvocation(BaseInvocation):
         return CollectInvocationOutput(collection=copy.copy(self.collection))
 
 
+def _get_type_tag(v: Any) -> str:
+    """Gets the `type` of a serialized or deserialized invocation or output."""
+    type_ = v.get("type") if isinstance(v, dict) else getattr(v, "type", None)
+    return type_ if isinstance(type_, str) else ""
+
+
 class AnyInvocation(BaseInvocation):
     @classmethod
     def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
         def validate_invocation(v: Any) -> "AnyInvocation":
+            # Validating with the invocation's own class only imports the invocation's module, and avoids building the
+            # type adapter for all invocations. Unknown types and invalid invocations fall back to the type adapter,
+            # which raises the appropriate validation error.
+            invocation_class = InvocationRegistry.get_invocation_for_type(_get_type_tag(v))
+            if invocation_class is not None:
+                with suppress(ValidationError):
+                    return invocation_class.model_validate(v)
             return InvocationRegistry.get_invocation_typeadapter().validate_python(v)
 
         return core_schema.no_info_plain_validator_function(validate_invocation)
@@ -325,6 +366,11 @@ class AnyInvocationOutput(BaseInvocationOutput):
     @classmethod
     def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler):
         def validate_invocation_output(v: Any) -> "AnyInvocationOutput":
+            # See `AnyInvocation` for why the output's own class is used, if possible.
+            output_class = InvocationRegistry.get_output_for_type(_get_type_tag(v))
+            if output_class is not None:
+                with suppress(ValidationError):
+                    return output_class.model_validate(v)
             return InvocationRegistry.get_output_typeadapter().validate_python(v)
 
         return core_schema.no_info_plain_validator_function(validate_invocation_output)
@@ -343,6 +389,42 @@ class AnyInvocationOutput(BaseInvocationOutput):
         return {"oneOf": oneOf}
 
 
+class _ValidatedGraphCache:
+    """A bounded LRU set of the structures of graphs that have passed validation.
+
+    Graph validation only depends on a graph's structure - its node ids and classes, and its edges - not on the nodes'
+    field values. Batches enqueue many sessions with the same structure, and sessions are re-validated each time they
+    are loaded from the queue, so validating each structure once avoids a lot of repeated work. Failures are not cached,
+    so invalid graphs always raise the appropriate error.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._structures: OrderedDict[tuple[Any, ...], None] = OrderedDict()
+        self._lock = Lock()
+
+    def __contains__(self, structure: tuple[Any, ...]) -> bool:
+        with self._lock:
+            if structure not in self._structures:
+                return False
+            self._structures.move_to_end(structure)
+            return True
+
+    def add(self, structure: tuple[Any, ...]) -> None:
+        with self._lock:
+            self._structures[structure] = None
+            self._structures.move_to_end(structure)
+            while len(self._structures) > self._max_size:
+                self._structures.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._structures.clear()
+
+
+_validated_graphs = _ValidatedGraphCache(max_size=256)
+
+
 class Graph(BaseModel):
     id: str = Field(description="The id of this graph", default_factory=uuid_string)
     # TODO: use a list (and never use dict in a BaseModel) because pydantic/fastapi hates me
@@ -414,8 +496,14 @@ class Graph(BaseModel):
         - `NodeFieldNotFoundError`
         - `CyclicalGraphError`
         - `InvalidEdgeError`
+
+        Valid graph structures are cached, so re-validating a graph with the same structure is cheap.
         """
 
+        structure = self._get_structure()
+        if structure in _validated_graphs:
+            return None
+
         # Validate that all node ids are unique
         node_ids = [n.id for n in self.nodes.values()]
         seen = set()
@@ -477,8 +565,16 @@ class Graph(BaseModel):
                 if err is not None:
                     raise InvalidEdgeError(f"Invalid collector node ({node.id}): {err}")
 
+        _validated_graphs.add(structure)
         return None
 
+    def _get_structure(self) -> tuple[Any, ...]:
+        """Gets a hashable representation of everything that graph validation depends on."""
+        return (
+            tuple((k, v.id, type(v)) for k, v in self.nodes.items()),
+            tuple((e.source.node_id, e.source.field, e.destination.node_id, e.destination.field) for e in self.edges),
+        )
+
     def is_valid(self) -> bool:
         """
         Checks if the graph is valid.
@@ -768,6 +864,83 @@ class Graph(BaseModel):
         return g
 
 
+class _SourceGraphIndex:
+    """Precomputed structure of a source graph, used to prepare execution nodes without rebuilding NetworkX graphs.
+
+    The source graph is not modified while it is executed, so this is built once, and rebuilt only if the graph is
+    modified through the `GraphExecutionState` API.
+    """
+
+    def __init__(self, graph: Graph, nx_graph: nx.DiGraph, iterator_graph: nx.DiGraph) -> None:
+        self.topological_order: list[str] = list(nx.topological_sort(nx_graph))
+        topo_index = {n: i for i, n in enumerate(self.topological_order)}
+        self.parents: dict[str, list[str]] = {n: [u for u, _ in nx_graph.in_edges(n)] for n in nx_graph.nodes}
+        self.ancestors: dict[str, frozenset[str]] = {n: frozenset(nx.ancestors(nx_graph, n)) for n in nx_graph.nodes}
+        iterators = {n for n, node in graph.nodes.items() if isinstance(node, IterateInvocation)}
+        # Iterate ancestors in the full graph. A node can't be prepared until these have all executed.
+        self.iterate_ancestors: dict[str, list[str]] = {
+            n: [a for a in ancestors if a in iterators] for n, ancestors in self.ancestors.items()
+        }
+        # Active iterators for each node (i.e. not through a collector), ordered outer->inner.
+        it_topo_index = {n: i for i, n in enumerate(nx.topological_sort(iterator_graph))}
+        self.node_iterators: dict[str, list[str]] = {
+            n: sorted(
+                (a for a in nx.ancestors(iterator_graph, n) if a in iterators),
+                key=lambda a: (it_topo_index[a], topo_index[a]),
+            )
+            for n in iterator_graph.nodes
+        }
+
+    def has_path(self, from_node_id: str, to_node_id: str) -> bool:
+        return from_node_id == to_node_id or from_node_id in self.ancestors[to_node_id]
+
+
+class _ExecutionGraphIndex:
+    """Incrementally-maintained edge and iterator indexes for an execution graph.
+
+    Execution graphs can grow to many thousands of nodes when iterating over large collections, so per-node lookups
+    must not scan the edge list or walk the graph.
+    """
+
+    def __init__(self) -> None:
+        self.input_edges: dict[str, list[Edge]] = {}
+        self.output_edges: dict[str, list[Edge]] = {}
+        # The prepared iterate nodes that are ancestors of (or are) each execution node. Nodes without new iterators
+        # share their parent's set.
+        self.iterator_ancestors: dict[str, frozenset[str]] = {}
+
+    @classmethod
+    def build(cls, execution_graph: Graph) -> "_ExecutionGraphIndex":
+        index = cls()
+        for edge in execution_graph.edges:
+            index.input_edges.setdefault(edge.destination.node_id, []).append(edge)
+            index.output_edges.setdefault(edge.source.node_id, []).append(edge)
+        for node_id in nx.topological_sort(execution_graph.nx_graph_flat()):
+            index.add_node(execution_graph.nodes[node_id], index.input_edges.get(node_id, []))
+        return index
+
+    def add_node(self, node: BaseInvocation, input_edges: list[Edge]) -> None:
+        """Indexes a node. Its input edges must already be indexed, and its parents must already be added."""
+        ancestors: frozenset[str] = frozenset()
+        for parent_id in {e.source.node_id for e in input_edges}:
+            parent_ancestors = self.iterator_ancestors[parent_id]
+            if not ancestors:
+                ancestors = parent_ancestors
+            elif not parent_ancestors <= ancestors:
+                ancestors = ancestors | parent_ancestors
+        if isinstance(node, IterateInvocation):
+            ancestors = ancestors | {node.id}
+        self.iterator_ancestors[node.id] = ancestors
+
+    def add_edge(self, edge: Edge) -> None:
+        self.input_edges.setdefault(edge.destination.node_id, []).append(edge)
+        self.output_edges.setdefault(edge.source.node_id, []).append(edge)
+
+    def has_iterator_path(self, iterator_node_id: str, to_node_id: str) -> bool:
+        """Whether there is a path from a prepared iterate node to an execution node."""
+        return iterator_node_id in self.iterator_ancestors[to_node_id]
+
+
 class GraphExecutionState(BaseModel):
     """Tracks the state of a graph execution"""
 
@@ -813,6 +986,22 @@ class GraphExecutionState(BaseModel):
     ready_order: list[str] = Field(default_factory=list)
     indegree: dict[str, int] = Field(default_factory=dict, description="Remaining unmet input count for exec nodes")
     _iteration_path_cache: dict[str, tuple[int, ...]] = PrivateAttr(default_factory=dict)
+    # Indexes over the source and execution graphs (internal only, rebuilt on demand)
+    _source_index: Optional[_SourceGraphIndex] = PrivateAttr(default=None)
+    _execution_index: Optional[_ExecutionGraphIndex] = PrivateAttr(default=None)
+    # Per source node: prepared iterate node -> the source node's prepared nodes that descend from it
+    _iteration_lookup: dict[str, dict[str, list[str]]] = PrivateAttr(default_factory=dict)
+
+    def _get_source_index(self) -> _SourceGraphIndex:
+        if self._source_index is None:
+            g = self.graph.nx_graph_flat()
+            self._source_index = _SourceGraphIndex(self.graph, g, self._iterator_graph(g))
+        return self._source_index
+
+    def _get_execution_index(self) -> _ExecutionGraphIndex:
+        if self._execution_index is None:
+            self._execution_index = _ExecutionGraphIndex.build(self.execution_graph)
+        return self._execution_index
 
     def _type_key(self, node_obj: BaseInvocation) -> str:
         return node_obj.__class__.__name__
@@ -829,25 +1018,18 @@ class GraphExecutionState(BaseModel):
             self._iteration_path_cache[exec_node_id] = ()
             return ()
 
-        # Source-graph iterator ancestry, with edges into collectors removed so iteration context doesn't leak.
-        it_g = self._iterator_graph(self.graph.nx_graph())
-        iterator_sources = [
-            n for n in nx.ancestors(it_g, source_node_id) if isinstance(self.graph.get_node(n), IterateInvocation)
-        ]
-
-        # Order iterators outer->inner via topo order of the iterator graph.
-        topo = list(nx.topological_sort(it_g))
-        topo_index = {n: i for i, n in enumerate(topo)}
-        iterator_sources.sort(key=lambda n: topo_index.get(n, 0))
+        # Source-graph iterator ancestry (with edges into collectors removed so iteration context doesn't leak),
+        # ordered outer->inner.
+        iterator_sources = self._get_source_index().node_iterators[source_node_id]
 
         # Map iterator source nodes to the prepared iterator exec nodes that are ancestors of exec_node_id.
-        eg = self.execution_graph.nx_graph()
+        exec_iterator_ancestors = self._get_execution_index().iterator_ancestors[exec_node_id]
         path: list[int] = []
         for it_src in iterator_sources:
             prepared = self.source_prepared_mapping.get(it_src)
             if not prepared:
                 continue
-            it_exec = next((p for p in prepared if nx.has_path(eg, p, exec_node_id)), None)
+            it_exec = next(iter(exec_iterator_ancestors & prepared), None)
             if it_exec is None:
                 continue
             it_node = self.execution_graph.nodes.get(it_exec)
@@ -888,13 +1070,12 @@ class GraphExecutionState(BaseModel):
         node_obj = self.execution_graph.nodes[nid]
         q = self._queue_for(self._type_key(node_obj))
         nid_path = self._get_iteration_path(nid)
-        # Insert in lexicographic outer->inner order; preserve FIFO for equal paths.
-        for i, existing in enumerate(q):
-            if self._get_iteration_path(existing) > nid_path:
-                q.insert(i, nid)
-                break
-        else:
-            q.append(nid)
+        # Insert in lexicographic outer->inner order; preserve FIFO for equal paths. The queue is sorted, so search
+        # from the back: nodes are usually prepared in iteration order, making this an append.
+        i = len(q)
+        while i > 0 and self._get_iteration_path(q[i - 1]) > nid_path:
+            i -= 1
+        q.insert(i, nid)
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -927,12 +1108,11 @@ class GraphExecutionState(BaseModel):
         # If there are no prepared nodes, prepare some nodes
         next_node = self._get_next_node()
         if next_node is None:
-            base_g = self.graph.nx_graph_flat()
-            prepared_id = self._prepare(base_g)
+            prepared_id = self._prepare()
 
             # Prepare as many nodes as we can
             while prepared_id is not None:
-                prepared_id = self._prepare(base_g)
+                prepared_id = self._prepare()
                 if next_node is None:
                     next_node = self._get_next_node()
 
@@ -965,7 +1145,7 @@ class GraphExecutionState(BaseModel):
             self.executed_history.append(source_node)
 
         # Decrement children indegree and enqueue when ready
-        for e in self.execution_graph._get_output_edges(node_id):
+        for e in self._get_execution_index().output_edges.get(node_id, []):
             child = e.destination.node_id
             if child not in self.indegree:
                 raise KeyError(f"indegree missing for exec node {child}")
@@ -982,8 +1162,7 @@ class GraphExecutionState(BaseModel):
 
     def is_complete(self) -> bool:
         """Returns true if the graph is complete"""
-        node_ids = set(self.graph.nx_graph_flat().nodes)
-        return self.has_error() or all((k in self.executed for k in node_ids))
+        return self.has_error() or all((k in self.executed for k in self.graph.nodes))
 
     def has_error(self) -> bool:
         """Returns true if the graph has any errors"""
@@ -1014,6 +1193,7 @@ class GraphExecutionState(BaseModel):
 
         # Get all input edges
         input_edges = self.graph._get_input_edges(node_id)
+        execution_index = self._get_execution_index()
 
         # Create new edges for this iteration
         # For collect nodes, this may contain multiple inputs to the same field
@@ -1028,8 +1208,8 @@ class GraphExecutionState(BaseModel):
 
         # Create a new node (or one for each iteration of this iterator)
         for i in range(self_iteration_count) if self_iteration_count > 0 else [-1]:
-            # Create a new node
-            new_node = node.model_copy(deep=True)
+            # Create a new node. Its field values are only copied if the node modifies them.
+            new_node = node.model_copy(deep=type(node).mutates_inputs)
 
             # Create the node id (use a random uuid)
             new_node.id = uuid_string()
@@ -1045,16 +1225,20 @@ class GraphExecutionState(BaseModel):
                 self.source_prepared_mapping[node_id] = set()
             self.source_prepared_mapping[node_id].add(new_node.id)
 
-            # Add new edges to execution graph
+            # Add new edges to execution graph. These mirror edges of the validated source graph onto a new node, so
+            # they can't create cycles or type mismatches, and are added without re-validating the execution graph.
+            inputs: list[Edge] = []
             for edge in new_edges:
                 new_edge = Edge(
                     source=edge.source,
                     destination=EdgeConnection(node_id=new_node.id, field=edge.destination.field),
                 )
-                self.execution_graph.add_edge(new_edge)
+                self.execution_graph.edges.append(new_edge)
+                execution_index.add_edge(new_edge)
+                inputs.append(new_edge)
+            execution_index.add_node(new_node, inputs)
 
             # Initialize indegree as unmet inputs only and enqueue if ready
-            inputs = self.execution_graph._get_input_edges(new_node.id)
             unmet = sum(1 for e in inputs if e.source.node_id not in self.executed)
             self.indegree[new_node.id] = unmet
             self._enqueue_if_ready(new_node.id)
@@ -1071,37 +1255,30 @@ class GraphExecutionState(BaseModel):
             g.remove_edges_from(list(g.in_edges(c)))
         return g
 
-    def _get_node_iterators(self, node_id: str, it_graph: Optional[nx.DiGraph] = None) -> list[str]:
-        """Gets iterators for a node"""
-        g = it_graph or self._iterator_graph()
-        return [n for n in nx.ancestors(g, node_id) if isinstance(self.graph.get_node(n), IterateInvocation)]
-
-    def _prepare(self, base_g: Optional[nx.DiGraph] = None) -> Optional[str]:
-        # Get flattened source graph
-        g = base_g or self.graph.nx_graph_flat()
+    def _prepare(self) -> Optional[str]:
+        index = self._get_source_index()
 
         # Find next node that:
         # - was not already prepared
         # - is not an iterate node whose inputs have not been executed
         # - does not have an unexecuted iterate ancestor
-        sorted_nodes = nx.topological_sort(g)
-
         def unprepared(n: str) -> bool:
             return n not in self.source_prepared_mapping
 
         def iter_inputs_ready(n: str) -> bool:
             if not isinstance(self.graph.get_node(n), IterateInvocation):
                 return True
-            return all(u in self.executed for u, _ in g.in_edges(n))
+            return all(u in self.executed for u in index.parents[n])
 
         def no_unexecuted_iter_ancestors(n: str) -> bool:
-            return not any(
-                isinstance(self.graph.get_node(a), IterateInvocation) and a not in self.executed
-                for a in nx.ancestors(g, n)
-            )
+            return all(a in self.executed for a in index.iterate_ancestors[n])
 
         next_node_id = next(
-            (n for n in sorted_nodes if unprepared(n) and iter_inputs_ready(n) and no_unexecuted_iter_ancestors(n)),
+            (
+                n
+                for n in index.topological_order
+                if unprepared(n) and iter_inputs_ready(n) and no_unexecuted_iter_ancestors(n)
+            ),
             None,
         )
 
@@ -1109,7 +1286,7 @@ class GraphExecutionState(BaseModel):
             return None
 
         # Get all parents of the next node
-        next_node_parents = [u for u, _ in g.in_edges(next_node_id)]
+        next_node_parents = index.parents[next_node_id]
 
         # Create execution nodes
         next_node = self.graph.get_node(next_node_id)
@@ -1127,16 +1304,17 @@ class GraphExecutionState(BaseModel):
         else:  # Iterators or normal nodes
             # Get all iterator combinations for this node
             # Will produce a list of lists of prepared iterator nodes, from which results can be iterated
-            it_g = self._iterator_graph(g)
-            iterator_nodes = self._get_node_iterators(next_node_id, it_g)
-            iterator_nodes_prepared = [list(self.source_prepared_mapping[n]) for n in iterator_nodes]
+            iterator_nodes = index.node_iterators[next_node_id]
+            # Sorted by iteration index, so the combinations (and the ready queue insertions) are in iteration order
+            iterator_nodes_prepared = [
+                sorted(self.source_prepared_mapping[n], key=self._get_iteration_path) for n in iterator_nodes
+            ]
             iterator_node_prepared_combinations = list(itertools.product(*iterator_nodes_prepared))
 
             # Select the correct prepared parents for each iteration
             # For every iterator, the parent must either not be a child of that iterator, or must match the prepared iteration for that iterator
-            eg = self.execution_graph.nx_graph_flat()
             prepared_parent_mappings = [
-                [(n, self._get_iteration_node(n, g, eg, it)) for n in next_node_parents]
+                [(n, self._get_iteration_node(n, it)) for n in next_node_parents]
                 for it in iterator_node_prepared_combinations
             ]  # type: ignore
             prepared_parent_mappings = [m for m in prepared_parent_mappings if all(p[1] is not None for p in m)]
@@ -1149,31 +1327,56 @@ class GraphExecutionState(BaseModel):
 
         return next(iter(new_node_ids), None)
 
+    def _get_iteration_lookup(self, source_node_id: str) -> dict[str, list[str]]:
+        """Gets a map of prepared iterate nodes to the prepared nodes of a source node that descend from them.
+
+        A source node's prepared nodes are all created at once, before any of its children are prepared, so the map is
+        built once per source node.
+        """
+        lookup = self._iteration_lookup.get(source_node_id)
+        if lookup is None:
+            iterator_ancestors = self._get_execution_index().iterator_ancestors
+            lookup = {}
+            for prepared_node_id in self.source_prepared_mapping[source_node_id]:
+                for iterator_node_id in iterator_ancestors[prepared_node_id]:
+                    lookup.setdefault(iterator_node_id, []).append(prepared_node_id)
+            self._iteration_lookup[source_node_id] = lookup
+        return lookup
+
     def _get_iteration_node(
         self,
         source_node_id: str,
-        graph: nx.DiGraph,
-        execution_graph: nx.DiGraph,
-        prepared_iterator_nodes: list[str],
+        prepared_iterator_nodes: tuple[str, ...],
     ) -> Optional[str]:
         """Gets the prepared version of the specified source node that matches every iteration specified"""
         prepared_nodes = self.source_prepared_mapping[source_node_id]
         if len(prepared_nodes) == 1:
             return next(iter(prepared_nodes))
 
+        source_index = self._get_source_index()
+        execution_index = self._get_execution_index()
+
         # Filter to only iterator nodes that are a parent of the specified node, in tuple format (prepared, source)
         iterator_source_node_mapping = [(n, self.prepared_source_mapping[n]) for n in prepared_iterator_nodes]
-        parent_iterators = [itn for itn in iterator_source_node_mapping if nx.has_path(graph, itn[1], source_node_id)]
+        parent_iterators = [
+            itn for itn in iterator_source_node_mapping if source_index.has_path(itn[1], source_node_id)
+        ]
 
         # If the requested node is an iterator, only accept it if it is compatible with all parent iterators
-        prepared_iterator = next((n for n in prepared_nodes if n in prepared_iterator_nodes), None)
+        prepared_iterator = next((n for n in prepared_iterator_nodes if n in prepared_nodes), None)
         if prepared_iterator is not None:
-            if all(nx.has_path(execution_graph, pit[0], prepared_iterator) for pit in parent_iterators):
+            if all(execution_index.has_iterator_path(pit[0], prepared_iterator) for pit in parent_iterators):
                 return prepared_iterator
             return None
 
+        if not parent_iterators:
+            return next(iter(prepared_nodes), None)
+
+        # Only the prepared nodes that descend from a parent iterator can match, so search the smallest such group.
+        lookup = self._get_iteration_lookup(source_node_id)
+        candidates = min((lookup.get(pit[0], []) for pit in parent_iterators), key=len)
         return next(
-            (n for n in prepared_nodes if all(nx.has_path(execution_graph, pit[0], n) for pit in parent_iterators)),
+            (n for n in candidates if all(execution_index.has_iterator_path(pit[0], n) for pit in parent_iterators)),
             None,
         )
 
@@ -1205,21 +1408,25 @@ class GraphExecutionState(BaseModel):
         return None
 
     def _prepare_inputs(self, node: BaseInvocation):
-        input_edges = self.execution_graph._get_input_edges(node.id)
-        # Inputs must be deep-copied, else if a node mutates the object, other nodes that get the same input
-        # will see the mutation.
+        input_edges = self._get_execution_index().input_edges.get(node.id, [])
+        # Input values are shared with the results of the nodes that produced them, and with any other nodes that get
+        # the same inputs. They are deep-copied only for nodes that modify their inputs in place, else other nodes
+        # would see the modifications.
+        copy_value = copydeep if type(node).mutates_inputs else _share
         if isinstance(node, CollectInvocation):
             item_edges = [e for e in input_edges if e.destination.field == ITEM_FIELD]
             item_edges.sort(key=lambda e: (self._get_iteration_path(e.source.node_id), e.source.node_id))
 
-            output_collection = [copydeep(getattr(self.results[e.source.node_id], e.source.field)) for e in item_edges]
+            output_collection = [
+                copy_value(getattr(self.results[e.source.node_id], e.source.field)) for e in item_edges
+            ]
             node.collection = output_collection
         else:
             for edge in input_edges:
                 setattr(
                     node,
                     edge.destination.field,
-                    copydeep(getattr(self.results[edge.source.node_id], edge.source.field)),
+                    copy_value(getattr(self.results[edge.source.node_id], edge.source.field)),
                 )
 
     # TODO: Add API for modifying underlying graph that checks if the change will be valid given the current execution state
@@ -1242,6 +1449,7 @@ class GraphExecutionState(BaseModel):
 
     def add_node(self, node: BaseInvocation) -> None:
         self.graph.add_node(node)
+        self._source_index = None
 
     def update_node(self, node_id: str, new_node: BaseInvocation) -> None:
         if not self._is_node_updatable(node_id):
@@ -1249,6 +1457,7 @@ class GraphExecutionState(BaseModel):
                 f"Node {node_id} has already been prepared or executed and cannot be updated"
             )
         self.graph.update_node(node_id, new_node)
+        self._source_index = None
 
     def delete_node(self, node_id: str) -> None:
         if not self._is_node_updatable(node_id):
@@ -1256,6 +1465,7 @@ class GraphExecutionState(BaseModel):
                 f"Node {node_id} has already been prepared or executed and cannot be deleted"
             )
         self.graph.delete_node(node_id)
+        self._source_index = None
 
     def add_edge(self, edge: Edge) -> None:
         if not self._is_node_updatable(edge.destination.node_id):
@@ -1263,6 +1473,7 @@ class GraphExecutionState(BaseModel):
                 f"Destination node {edge.destination.node_id} has already been prepared or executed and cannot be linked to"
             )
         self.graph.add_edge(edge)
+        self._source_index = None
 
     def delete_edge(self, edge: Edge) -> None:
         if not self._is_node_updatable(edge.destination.node_id):
@@ -1270,3 +1481,4 @@ class GraphExecutionState(BaseModel):
                 f"Destination node {edge.destination.node_id} has already been prepared or executed and cannot have a source edge deleted"
             )
         self.graph.delete_edge(edge)
+        self._source_index = None
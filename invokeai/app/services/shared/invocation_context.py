@@ -1,3 +1,4 @@
+import time
 from copy import deepcopy
 from dataclasses import dataclass
 from pathlib import Path
@@ -25,6 +26,7 @@ from invokeai.backend.model_manager.load.load_base import LoadedModel, LoadedMod
 from invokeai.backend.model_manager.taxonomy import AnyModel, BaseModelType, ModelFormat, ModelType, SubModelType
 from invokeai.backend.stable_diffusion.diffusers_pipeline import PipelineIntermediateState
 from invokeai.backend.stable_diffusion.diffusion.conditioning_data import ConditioningFieldData
+from invokeai.backend.util.tracing import get_tracer
 
 if TYPE_CHECKING:
     from invokeai.app.invocations.baseinvocation import BaseInvocation
@@ -584,6 +586,8 @@ class UtilInterface(InvocationContextInterface):
     ) -> None:
         super().__init__(services, data)
         self._is_canceled = is_canceled
+        # The step and end time of the previous step callback, used to trace denoising steps.
+        self._last_step_callback: Optional[tuple[int, int]] = None
 
     def is_canceled(self) -> bool:
         """Checks if the current session has been canceled.
@@ -605,12 +609,7 @@ class UtilInterface(InvocationContextInterface):
             base_model: The base model for the current denoising step.
         """
 
-        diffusion_step_callback(
-            signal_progress=self.signal_progress,
-            intermediate_state=intermediate_state,
-            base_model=base_model,
-            is_canceled=self.is_canceled,
-        )
+        self._traced_step_callback(intermediate_state, base_model)
 
     def flux_step_callback(self, intermediate_state: PipelineIntermediateState) -> None:
         """
@@ -623,12 +622,7 @@ class UtilInterface(InvocationContextInterface):
             intermediate_state: The intermediate state of the diffusion pipeline.
         """
 
-        diffusion_step_callback(
-            signal_progress=self.signal_progress,
-            intermediate_state=intermediate_state,
-            base_model=BaseModelType.Flux,
-            is_canceled=self.is_canceled,
-        )
+        self._traced_step_callback(intermediate_state, BaseModelType.Flux)
 
     def flux2_step_callback(self, intermediate_state: PipelineIntermediateState) -> None:
         """
@@ -638,12 +632,39 @@ class UtilInterface(InvocationContextInterface):
             intermediate_state: The intermediate state of the diffusion pipeline.
         """
 
-        diffusion_step_callback(
-            signal_progress=self.signal_progress,
-            intermediate_state=intermediate_state,
-            base_model=BaseModelType.Flux2,
-            is_canceled=self.is_canceled,
-        )
+        self._traced_step_callback(intermediate_state, BaseModelType.Flux2)
+
+    def _traced_step_callback(self, intermediate_state: PipelineIntermediateState, base_model: BaseModelType) -> None:
+        """Runs the diffusion step callback, recording tracing spans for the denoising step that preceded it and for the
+        callback itself.
+
+        The step callback is called once before the denoising loop and once after each step, so the time between
+        consecutive callbacks is the time spent on a step. A decrease in the step number indicates that a new denoising
+        loop has started.
+        """
+        tracer = get_tracer()
+        start_ns = time.time_ns()
+        if self._last_step_callback is not None:
+            last_step, last_end_ns = self._last_step_callback
+            if intermediate_state.step >= last_step:
+                tracer.add_span(
+                    "denoise.step",
+                    start_ns=last_end_ns,
+                    end_ns=start_ns,
+                    category="denoise",
+                    step=intermediate_state.step,
+                    total_steps=intermediate_state.total_steps,
+                )
+        try:
+            with tracer.span("denoise.step_callback", category="denoise", step=intermediate_state.step):
+                diffusion_step_callback(
+                    signal_progress=self.signal_progress,
+                    intermediate_state=intermediate_state,
+                    base_model=base_model,
+                    is_canceled=self.is_canceled,
+                )
+        finally:
+            self._last_step_callback = (intermediate_state.step, time.time_ns())
 
     def signal_progress(
         self,
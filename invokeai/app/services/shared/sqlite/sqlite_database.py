@@ -6,6 +6,8 @@ from logging import Logger
 from pathlib import Path
 
 from invokeai.app.services.shared.sqlite.sqlite_common import sqlite_memory
+from invokeai.app.util.metrics import DB_TRANSACTION_SECONDS
+from invokeai.backend.util.tracing import get_tracer
 
 
 class SqliteDatabase:
@@ -81,7 +83,7 @@ class SqliteDatabase:
         Thread-safe context manager for DB work.
         Acquires the RLock, yields a Cursor, then commits or rolls back.
         """
-        with self._lock:
+        with get_tracer().span("sqlite.transaction", category="db"), DB_TRANSACTION_SECONDS.time(), self._lock:
             cursor = self._conn.cursor()
             try:
                 yield cursor
@@ -0,0 +1,40 @@
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+
+class Migration27Callback:
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TABLE IF NOT EXISTS invocation_performance_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                invocation_type TEXT NOT NULL,
+                -- The name of the main model used by the invocation, if any
+                model TEXT,
+                width INTEGER,
+                height INTEGER,
+                steps INTEGER,
+                duration REAL NOT NULL, -- seconds
+                app_version TEXT NOT NULL,
+                created_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW'))
+            );
+            """
+        )
+        cursor.execute(
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_invocation_performance_history_version_type
+            ON invocation_performance_history(app_version, invocation_type);
+            """
+        )
+
+
+def build_migration_27() -> Migration:
+    """Builds the migration object for migrating from version 26 to version 27. This includes:
+    - Creating the `invocation_performance_history` table, a rolling store of invocation timings.
+    """
+    return Migration(
+        from_version=26,
+        to_version=27,
+        callback=Migration27Callback(),
+    )
@@ -0,0 +1,238 @@
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+# The image categories that are counted as images and as assets. These are snapshots of IMAGE_CATEGORIES and
+# ASSETS_CATEGORIES at the time of writing - migrations must not change if those do.
+_IMAGE_CATEGORIES = "('general')"
+_ASSET_CATEGORIES = "('control', 'mask', 'user', 'other')"
+
+_NOW = "STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')"
+
+
+def _is_image(image: str) -> str:
+    """SQL for whether an image row counts towards a board's image count. Evaluates to 0 or 1."""
+    return f"({image}.is_intermediate = FALSE AND {image}.image_category IN {_IMAGE_CATEGORIES})"
+
+
+def _is_asset(image: str) -> str:
+    """SQL for whether an image row counts towards a board's asset count. Evaluates to 0 or 1."""
+    return f"({image}.is_intermediate = FALSE AND {image}.image_category IN {_ASSET_CATEGORIES})"
+
+
+def _select_cover(board_id: str, exclude_image_name: str = "NULL") -> str:
+    """SQL for the cover image of a board - the most recent non-intermediate image, starred images first.
+
+    The CROSS JOIN makes SQLite read the board's images and sort them, rather than read all images in order until it
+    finds one in the board - which reads every image if the board is empty.
+    """
+    return f"""(
+        SELECT images.image_name
+        FROM board_images
+        CROSS JOIN images ON board_images.image_name = images.image_name
+        WHERE board_images.board_id = {board_id}
+        AND images.is_intermediate = FALSE
+        AND images.image_name IS NOT {exclude_image_name}
+        ORDER BY images.starred DESC, images.created_at DESC
+        LIMIT 1
+    )"""
+
+
+def _beats_cover(image: str) -> str:
+    """SQL for whether an image row should replace the current cover of the board_stats row being updated."""
+    return f"""(
+        {image}.is_intermediate = FALSE
+        AND (
+            board_stats.cover_image_name IS NULL
+            OR EXISTS (
+                SELECT 1 FROM images AS cover
+                WHERE cover.image_name = board_stats.cover_image_name
+                AND (
+                    {image}.starred > cover.starred
+                    OR ({image}.starred = cover.starred AND {image}.created_at > cover.created_at)
+                )
+            )
+        )
+    )"""
+
+
+def _add_to_board(board_id: str, image_name: str) -> str:
+    """SQL to account for an image that was added to a board."""
+    return f"""--sql
+        UPDATE board_stats
+        SET
+            image_count = image_count + COALESCE(
+                (SELECT {_is_image("i")} FROM images AS i WHERE i.image_name = {image_name}), 0
+            ),
+            asset_count = asset_count + COALESCE(
+                (SELECT {_is_asset("i")} FROM images AS i WHERE i.image_name = {image_name}), 0
+            ),
+            cover_image_name = CASE
+                WHEN EXISTS (SELECT 1 FROM images AS i WHERE i.image_name = {image_name} AND {_beats_cover("i")})
+                THEN {image_name}
+                ELSE cover_image_name
+            END,
+            updated_at = {_NOW}
+        WHERE board_id = {board_id};
+    """
+
+
+def _remove_from_board(board_id: str, image_name: str) -> str:
+    """SQL to account for an image that was removed from a board. If the image was deleted, it has already been
+    accounted for by the `images` delete trigger, and is no longer found."""
+    return f"""--sql
+        UPDATE board_stats
+        SET
+            image_count = image_count - COALESCE(
+                (SELECT {_is_image("i")} FROM images AS i WHERE i.image_name = {image_name}), 0
+            ),
+            asset_count = asset_count - COALESCE(
+                (SELECT {_is_asset("i")} FROM images AS i WHERE i.image_name = {image_name}), 0
+            ),
+            cover_image_name = CASE
+                WHEN cover_image_name = {image_name} THEN {_select_cover(board_id, image_name)}
+                ELSE cover_image_name
+            END,
+            updated_at = {_NOW}
+        WHERE board_id = {board_id};
+    """
+
+
+class Migration28Callback:
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        self._create_board_stats(cursor)
+        self._populate_board_stats(cursor)
+
+    def _create_board_stats(self, cursor: sqlite3.Cursor) -> None:
+        """Creates the `board_stats` table, and the triggers that keep it up to date.
+
+        The triggers run in the same transaction as the change to `boards`, `board_images` or `images` that caused
+        them, so the stats are never out of sync - whichever service, script or migration changed the tables.
+        """
+        tables = [
+            """--sql
+            CREATE TABLE IF NOT EXISTS board_stats (
+                board_id TEXT NOT NULL PRIMARY KEY,
+                -- The number of non-intermediate images in the `general` category
+                image_count INTEGER NOT NULL DEFAULT 0,
+                -- The number of non-intermediate images in the asset categories
+                asset_count INTEGER NOT NULL DEFAULT 0,
+                -- The most recent non-intermediate image, starred images first
+                cover_image_name TEXT,
+                -- When any of the stats last changed
+                updated_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')),
+                FOREIGN KEY (board_id) REFERENCES boards (board_id) ON DELETE CASCADE
+            );
+            """
+        ]
+
+        triggers = [
+            """--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_inserted
+            AFTER INSERT ON boards FOR EACH ROW
+            BEGIN
+                INSERT OR IGNORE INTO board_stats (board_id) VALUES (NEW.board_id);
+            END;
+            """,
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_image_inserted
+            AFTER INSERT ON board_images FOR EACH ROW
+            BEGIN
+                {_add_to_board("NEW.board_id", "NEW.image_name")}
+            END;
+            """,
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_image_moved
+            AFTER UPDATE OF board_id ON board_images FOR EACH ROW
+            WHEN OLD.board_id IS NOT NEW.board_id
+            BEGIN
+                {_remove_from_board("OLD.board_id", "OLD.image_name")}
+                {_add_to_board("NEW.board_id", "NEW.image_name")}
+            END;
+            """,
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_image_deleted
+            AFTER DELETE ON board_images FOR EACH ROW
+            BEGIN
+                {_remove_from_board("OLD.board_id", "OLD.image_name")}
+            END;
+            """,
+            # An image that is changed in place keeps its board, but may change its counts or the cover.
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_image_updated
+            AFTER UPDATE OF image_category, is_intermediate, starred, created_at ON images FOR EACH ROW
+            BEGIN
+                UPDATE board_stats
+                SET
+                    image_count = image_count + {_is_image("NEW")} - {_is_image("OLD")},
+                    asset_count = asset_count + {_is_asset("NEW")} - {_is_asset("OLD")},
+                    cover_image_name = CASE
+                        WHEN cover_image_name = NEW.image_name THEN {_select_cover("board_stats.board_id")}
+                        WHEN {_beats_cover("NEW")} THEN NEW.image_name
+                        ELSE cover_image_name
+                    END,
+                    updated_at = {_NOW}
+                WHERE board_id = (SELECT board_id FROM board_images WHERE image_name = NEW.image_name);
+            END;
+            """,
+            # Deleting an image cascades to `board_images`, but the image is gone by the time that the `board_images`
+            # trigger runs, so it is accounted for here, while it still exists.
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_image_deleted
+            BEFORE DELETE ON images FOR EACH ROW
+            BEGIN
+                UPDATE board_stats
+                SET
+                    image_count = image_count - {_is_image("OLD")},
+                    asset_count = asset_count - {_is_asset("OLD")},
+                    cover_image_name = CASE
+                        WHEN cover_image_name = OLD.image_name
+                        THEN {_select_cover("board_stats.board_id", "OLD.image_name")}
+                        ELSE cover_image_name
+                    END,
+                    updated_at = {_NOW}
+                WHERE board_id = (SELECT board_id FROM board_images WHERE image_name = OLD.image_name);
+            END;
+            """,
+        ]
+
+        for stmt in tables + triggers:
+            cursor.execute(stmt)
+
+    def _populate_board_stats(self, cursor: sqlite3.Cursor) -> None:
+        """Computes the stats of the existing boards."""
+        cursor.execute(
+            f"""--sql
+            INSERT OR REPLACE INTO board_stats (board_id, image_count, asset_count, cover_image_name)
+            SELECT
+                boards.board_id,
+                (
+                    SELECT COUNT(*)
+                    FROM board_images
+                    INNER JOIN images ON board_images.image_name = images.image_name
+                    WHERE board_images.board_id = boards.board_id AND {_is_image("images")}
+                ),
+                (
+                    SELECT COUNT(*)
+                    FROM board_images
+                    INNER JOIN images ON board_images.image_name = images.image_name
+                    WHERE board_images.board_id = boards.board_id AND {_is_asset("images")}
+                ),
+                {_select_cover("boards.board_id")}
+            FROM boards;
+            """
+        )
+
+
+def build_migration_28() -> Migration:
+    """Builds the migration object for migrating from version 27 to version 28. This includes:
+    - Creating the `board_stats` table, which holds each board's image count, asset count and cover image, so that
+      boards can be listed without counting their images.
+    - Creating triggers on `boards`, `board_images` and `images` that keep `board_stats` up to date.
+    - Computing the stats of the existing boards.
+    """
+    return Migration(
+        from_version=27,
+        to_version=28,
+        callback=Migration28Callback(),
+    )
@@ -0,0 +1,60 @@
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+
+class Migration29Callback:
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        self._create_gallery_indices(cursor)
+
+    def _create_gallery_indices(self, cursor: sqlite3.Cursor) -> None:
+        """Creates composite indices for the gallery queries.
+
+        The gallery always filters on `is_intermediate`, and orders by either `starred DESC, created_at` or
+        `created_at`, in either direction. An index that starts with the filter column and continues with the sort
+        columns lets SQLite read the images in order, instead of sorting every matching image before returning the
+        first page. `image_category` comes after the sort columns - the asset categories are matched with `IN`, which
+        would split the index into one ordered range per category. As the last column, it is still filtered from the
+        index without reading the table.
+
+        Scanned forwards, `(starred, created_at)` gives `starred ASC, created_at ASC`, and backwards it gives
+        `starred DESC, created_at DESC`. The gallery also orders by `starred DESC, created_at ASC`, which needs the
+        index with `starred DESC`.
+
+        Images in a board are looked up with the `(board_id, image_name)` index on `board_images`, which covers the
+        join to `images`. It replaces the index on `board_id` alone.
+        """
+        indices = [
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_images_gallery_starred
+            ON images (is_intermediate, starred, created_at, image_category);
+            """,
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_images_gallery_starred_oldest_first
+            ON images (is_intermediate, starred DESC, created_at, image_category);
+            """,
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_images_gallery_created_at
+            ON images (is_intermediate, created_at, image_category);
+            """,
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_board_images_board_id_image_name
+            ON board_images (board_id, image_name);
+            """,
+            "DROP INDEX IF EXISTS idx_board_images_board_id;",
+        ]
+
+        for stmt in indices:
+            cursor.execute(stmt)
+
+
+def build_migration_29() -> Migration:
+    """Builds the migration object for migrating from version 28 to version 29. This includes:
+    - Creating composite indices on `images` for the filters and sort orders of the gallery queries.
+    - Replacing the `board_images` index on `board_id` with a covering index on `(board_id, image_name)`.
+    """
+    return Migration(
+        from_version=28,
+        to_version=29,
+        callback=Migration29Callback(),
+    )
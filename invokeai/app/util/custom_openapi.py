@@ -1,5 +1,11 @@
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
 from typing import Any, Callable, Optional
 
+import fastapi
+import pydantic
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from pydantic.json_schema import models_json_schema
@@ -14,9 +20,14 @@ from invokeai.app.services.events.events_common import EventBase
 from invokeai.app.services.session_processor.session_processor_common import ProgressImage
 from invokeai.backend.model_manager.configs.factory import AnyModelConfigValidator
 from invokeai.backend.util.logging import InvokeAILogger
+from invokeai.version import __version__
 
 logger = InvokeAILogger.get_logger()
 
+# The packages whose code determines the schema. Only their modules' metadata is used for the cache key, so changes are
+# detected during development without hashing the whole codebase.
+SCHEMA_SOURCE_DIRS = [Path(__file__).parents[1], Path(__file__).parents[2] / "backend"]
+
 
 def move_defs_to_top_level(openapi_schema: dict[str, Any], component_schema: dict[str, Any]) -> None:
     """Moves a component schema's $defs to the top level of the openapi schema. Useful when generating a schema
@@ -30,8 +41,56 @@ def move_defs_to_top_level(openapi_schema: dict[str, Any], component_schema: dic
         openapi_schema["components"]["schemas"][schema_key] = json_schema
 
 
+def get_openapi_cache_key(
+    custom_nodes_path: Optional[Path],
+    allow_nodes: Optional[list[str]] = None,
+    deny_nodes: Optional[list[str]] = None,
+) -> str:
+    """Gets a key that changes whenever the inputs to the OpenAPI schema change.
+
+    The key covers the app, pydantic and fastapi versions, the size and modification time of the app's modules, the
+    content of the custom nodes and the node allowlist and denylist.
+    """
+    key = hashlib.sha256()
+    key.update(json.dumps([__version__, pydantic.VERSION, fastapi.__version__, allow_nodes, deny_nodes]).encode())
+    for source_dir in SCHEMA_SOURCE_DIRS:
+        for path in sorted(source_dir.rglob("*.py")):
+            stat = path.stat()
+            key.update(f"{path.relative_to(source_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    if custom_nodes_path is not None and custom_nodes_path.is_dir():
+        for path in sorted(custom_nodes_path.rglob("*.py")):
+            key.update(f"{path.relative_to(custom_nodes_path)}\n".encode())
+            key.update(hashlib.sha256(path.read_bytes()).digest())
+    return key.hexdigest()
+
+
+def read_cached_openapi_schema(cache_path: Path, cache_key: str) -> Optional[dict[str, Any]]:
+    """Reads the cached OpenAPI schema, if it exists and was generated with the given key."""
+    try:
+        cached = json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != cache_key or not isinstance(cached.get("schema"), dict):
+        return None
+    return cached["schema"]
+
+
+def write_cached_openapi_schema(cache_path: Path, cache_key: str, openapi_schema: dict[str, Any]) -> None:
+    """Writes the OpenAPI schema to the cache. Failures are logged, but otherwise ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"key": cache_key, "schema": openapi_schema}))
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        logger.warning(f"Unable to write OpenAPI schema cache: {e}")
+
+
 def get_openapi_func(
-    app: FastAPI, post_transform: Optional[Callable[[dict[str, Any]], dict[str, Any]]] = None
+    app: FastAPI,
+    post_transform: Optional[Callable[[dict[str, Any]], dict[str, Any]]] = None,
+    cache_path: Optional[Path] = None,
+    get_cache_key: Optional[Callable[[], str]] = None,
 ) -> Callable[[], dict[str, Any]]:
     """Gets the OpenAPI schema generator function.
 
@@ -39,96 +98,121 @@ def get_openapi_func(
         app (FastAPI): The FastAPI app to generate the schema for.
         post_transform (Optional[Callable[[dict[str, Any]], dict[str, Any]]], optional): A function to apply to the
             generated schema before returning it. Defaults to None.
+        cache_path (Optional[Path], optional): A file to cache the generated schema in, across restarts. Defaults to
+            None, which disables the file cache.
+        get_cache_key (Optional[Callable[[], str]], optional): A function that gets the key for the inputs to the
+            schema, which must be provided with `cache_path`. The cached schema is only used if its key matches.
+            Defaults to None.
 
     Returns:
         Callable[[], dict[str, Any]]: The OpenAPI schema generator function. When first called, the generated schema is
             cached in `app.openapi_schema`. On subsequent calls, the cached schema is returned. This caching behaviour
-            matches FastAPI's default schema generation caching.
+            matches FastAPI's default schema generation caching. The function is thread-safe, so it may be called in
+            the background to prepare the schema before it is first requested.
     """
 
+    assert (cache_path is None) == (get_cache_key is None), "cache_path and get_cache_key must be provided together"
+    lock = Lock()
+
     def openapi() -> dict[str, Any]:
-        if app.openapi_schema:
+        with lock:
+            if app.openapi_schema:
+                return app.openapi_schema
+
+            if cache_path is None or get_cache_key is None:
+                app.openapi_schema = build_openapi_schema(app, post_transform)
+                return app.openapi_schema
+
+            cache_key = get_cache_key()
+            openapi_schema = read_cached_openapi_schema(cache_path, cache_key)
+            if openapi_schema is None:
+                openapi_schema = build_openapi_schema(app, post_transform)
+                write_cached_openapi_schema(cache_path, cache_key, openapi_schema)
+            app.openapi_schema = openapi_schema
             return app.openapi_schema
 
-        openapi_schema = get_openapi(
-            title=app.title,
-            description="An API for invoking AI image operations",
-            version="1.0.0",
-            routes=app.routes,
-            separate_input_output_schemas=False,  # https://fastapi.tiangolo.com/how-to/separate-openapi-schemas/
-        )
-
-        # We'll create a map of invocation type to output schema to make some types simpler on the client.
-        invocation_output_map_properties: dict[str, Any] = {}
-        invocation_output_map_required: list[str] = []
-
-        # We need to manually add all outputs to the schema - pydantic doesn't add them because they aren't used directly.
-        for output in InvocationRegistry.get_output_classes():
-            json_schema = output.model_json_schema(mode="serialization", ref_template="#/components/schemas/{model}")
-            # Remove output_metadata that is only used on back-end from the schema
-            if "output_meta" in json_schema["properties"]:
-                json_schema["properties"].pop("output_meta")
-
-            move_defs_to_top_level(openapi_schema, json_schema)
-            openapi_schema["components"]["schemas"][output.__name__] = json_schema
-
-        # Technically, invocations are added to the schema by pydantic, but we still need to manually set their output
-        # property, so we'll just do it all manually.
-        for invocation in InvocationRegistry.get_invocation_classes():
-            json_schema = invocation.model_json_schema(
-                mode="serialization", ref_template="#/components/schemas/{model}"
-            )
-            move_defs_to_top_level(openapi_schema, json_schema)
-            output_title = invocation.get_output_annotation().__name__
-            outputs_ref = {"$ref": f"#/components/schemas/{output_title}"}
-            json_schema["output"] = outputs_ref
-            openapi_schema["components"]["schemas"][invocation.__name__] = json_schema
-
-            # Add this invocation and its output to the output map
-            invocation_type = invocation.get_type()
-            invocation_output_map_properties[invocation_type] = json_schema["output"]
-            invocation_output_map_required.append(invocation_type)
-
-        # Add the output map to the schema
-        openapi_schema["components"]["schemas"]["InvocationOutputMap"] = {
-            "type": "object",
-            "properties": dict(sorted(invocation_output_map_properties.items())),
-            "required": invocation_output_map_required,
-        }
-
-        # Some models don't end up in the schemas as standalone definitions because they aren't used directly in the API.
-        # We need to add them manually here. WARNING: Pydantic can choke if you call `model.model_json_schema()` to get
-        # a schema. This has something to do with schema refs - not totally clear. For whatever reason, using
-        # `models_json_schema` seems to work fine.
-        additional_models = [
-            *EventBase.get_events(),
-            UIConfigBase,
-            InputFieldJSONSchemaExtra,
-            OutputFieldJSONSchemaExtra,
-            ModelIdentifierField,
-            ProgressImage,
-        ]
-
-        additional_schemas = models_json_schema(
-            [(m, "serialization") for m in additional_models],
-            ref_template="#/components/schemas/{model}",
-        )
-        # additional_schemas[1] is a dict of $defs that we need to add to the top level of the schema
-        move_defs_to_top_level(openapi_schema, additional_schemas[1])
-
-        any_model_config_schema = AnyModelConfigValidator.json_schema(
-            mode="serialization",
-            ref_template="#/components/schemas/{model}",
-        )
-        move_defs_to_top_level(openapi_schema, any_model_config_schema)
-        openapi_schema["components"]["schemas"]["AnyModelConfig"] = any_model_config_schema
-
-        if post_transform is not None:
-            openapi_schema = post_transform(openapi_schema)
-
-        openapi_schema["components"]["schemas"] = dict(sorted(openapi_schema["components"]["schemas"].items()))
-
-        app.openapi_schema = openapi_schema
-        return app.openapi_schema
-
     return openapi
+
+
+def build_openapi_schema(
+    app: FastAPI, post_transform: Optional[Callable[[dict[str, Any]], dict[str, Any]]] = None
+) -> dict[str, Any]:
+    """Generates the OpenAPI schema for the app, including all invocations and outputs."""
+
+    openapi_schema = get_openapi(
+        title=app.title,
+        description="An API for invoking AI image operations",
+        version="1.0.0",
+        routes=app.routes,
+        separate_input_output_schemas=False,  # https://fastapi.tiangolo.com/how-to/separate-openapi-schemas/
+    )
+
+    # We'll create a map of invocation type to output schema to make some types simpler on the client.
+    invocation_output_map_properties: dict[str, Any] = {}
+    invocation_output_map_required: list[str] = []
+
+    # We need to manually add all outputs to the schema - pydantic doesn't add them because they aren't used directly.
+    for output in InvocationRegistry.get_output_classes():
+        json_schema = output.model_json_schema(mode="serialization", ref_template="#/components/schemas/{model}")
+        # Remove output_metadata that is only used on back-end from the schema
+        if "output_meta" in json_schema["properties"]:
+            json_schema["properties"].pop("output_meta")
+
+        move_defs_to_top_level(openapi_schema, json_schema)
+        openapi_schema["components"]["schemas"][output.__name__] = json_schema
+
+    # Technically, invocations are added to the schema by pydantic, but we still need to manually set their output
+    # property, so we'll just do it all manually.
+    for invocation in InvocationRegistry.get_invocation_classes():
+        json_schema = invocation.model_json_schema(mode="serialization", ref_template="#/components/schemas/{model}")
+        move_defs_to_top_level(openapi_schema, json_schema)
+        output_title = invocation.get_output_annotation().__name__
+        outputs_ref = {"$ref": f"#/components/schemas/{output_title}"}
+        json_schema["output"] = outputs_ref
+        openapi_schema["components"]["schemas"][invocation.__name__] = json_schema
+
+        # Add this invocation and its output to the output map
+        invocation_type = invocation.get_type()
+        invocation_output_map_properties[invocation_type] = json_schema["output"]
+        invocation_output_map_required.append(invocation_type)
+
+    # Add the output map to the schema
+    openapi_schema["components"]["schemas"]["InvocationOutputMap"] = {
+        "type": "object",
+        "properties": dict(sorted(invocation_output_map_properties.items())),
+        "required": invocation_output_map_required,
+    }
+
+    # Some models don't end up in the schemas as standalone definitions because they aren't used directly in the API.
+    # We need to add them manually here. WARNING: Pydantic can choke if you call `model.model_json_schema()` to get
+    # a schema. This has something to do with schema refs - not totally clear. For whatever reason, using
+    # `models_json_schema` seems to work fine.
+    additional_models = [
+        *EventBase.get_events(),
+        UIConfigBase,
+        InputFieldJSONSchemaExtra,
+        OutputFieldJSONSchemaExtra,
+        ModelIdentifierField,
+        ProgressImage,
+    ]
+
+    additional_schemas = models_json_schema(
+        [(m, "serialization") for m in additional_models],
+        ref_template="#/components/schemas/{model}",
+    )
+    # additional_schemas[1] is a dict of $defs that we need to add to the top level of the schema
+    move_defs_to_top_level(openapi_schema, additional_schemas[1])
+
+    any_model_config_schema = AnyModelConfigValidator.json_schema(
+        mode="serialization",
+        ref_template="#/components/schemas/{model}",
+    )
+    move_defs_to_top_level(openapi_schema, any_model_config_schema)
+    openapi_schema["components"]["schemas"]["AnyModelConfig"] = any_model_config_schema
+
+    if post_transform is not None:
+        openapi_schema = post_transform(openapi_schema)
+
+    openapi_schema["components"]["schemas"] = dict(sorted(openapi_schema["components"]["schemas"].items()))
+
+    return openapi_schema
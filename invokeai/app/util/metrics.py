@@ -0,0 +1,292 @@
+"""Process-wide metrics, rendered in the Prometheus text exposition format.
+
+The metrics are always recorded. Recording a value takes a lock and a few arithmetic operations, which is negligible
+compared to the operations being measured.
+
+Usage:
+
+```py
+from invokeai.app.util.metrics import IMAGE_SAVE_SECONDS
+
+with IMAGE_SAVE_SECONDS.time():
+    save_image(...)
+```
+
+The metrics are served at `/metrics` (see `invokeai/app/api/routers/metrics.py`). Metrics that are derived from the
+state of a service (e.g. queue depth) are set when the endpoint is scraped.
+"""
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Generator, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from invokeai.backend.model_manager.load.model_cache.model_cache import CacheEntrySnapshot, ModelCache
+
+# Bucket upper bounds (in seconds) for fast operations, e.g. DB transactions and image saves.
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Bucket upper bounds (in seconds) for slow operations, e.g. invocations.
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = tuple[str, ...]
+_MetricT = TypeVar("_MetricT", bound="_Metric")
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _label_values(self, label_values: dict[str, str]) -> LabelValues:
+        if set(label_values) != set(self.labels):
+            raise ValueError(f"Metric {self.name} requires labels {self.labels}, got {tuple(label_values)}")
+        return tuple(str(label_values[label]) for label in self.labels)
+
+    def _format_labels(self, label_values: LabelValues, extra: Optional[tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labels, label_values, strict=True))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    @abstractmethod
+    def _render_samples(self) -> list[str]:
+        """Renders the metric's samples, one per line."""
+
+
+class Counter(_Metric):
+    """A value that only increases."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **label_values: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        key = self._label_values(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **label_values: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(label_values), 0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(k)} {_format_value(v)}" for k, v in values]
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **label_values: str) -> None:
+        key = self._label_values(label_values)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **label_values: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(label_values), 0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(k)} {_format_value(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    """Counts observations in cumulative buckets, and tracks their sum."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...], labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: the (non-cumulative) count in each bucket, with a final +Inf bucket, and the sum.
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **label_values: str) -> None:
+        key = self._label_values(label_values)
+        bucket_idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+                self._counts[key] = counts
+                self._sums[key] = 0.0
+            counts[bucket_idx] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **label_values: str) -> Generator[None, None, None]:
+        """Observe the duration of the body of a `with` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **label_values)
+
+    def get_count(self, **label_values: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._label_values(label_values), []))
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        lines: list[str] = []
+        for key, counts, total in items:
+            cumulative = 0
+            for upper_bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if upper_bound == math.inf else _format_value(upper_bound)
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """A collection of metrics that are rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self, name: str, documentation: str, buckets: tuple[float, ...], labels: tuple[str, ...] = ()
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, buckets, labels))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _MetricT) -> _MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+QUEUE_ITEMS = REGISTRY.gauge(
+    "invokeai_queue_items", "Number of session queue items by status.", labels=("queue_id", "status")
+)
+QUEUE_DEQUEUE_SECONDS = REGISTRY.histogram(
+    "invokeai_queue_dequeue_seconds", "Time taken to dequeue the next session queue item.", buckets=FAST_BUCKETS
+)
+INVOCATION_SECONDS = REGISTRY.histogram(
+    "invokeai_invocation_seconds",
+    "Time taken to run an invocation, by invocation type.",
+    buckets=SLOW_BUCKETS,
+    labels=("invocation_type",),
+)
+INVOCATION_ERRORS = REGISTRY.counter(
+    "invokeai_invocation_errors_total", "Number of invocations that raised an error.", labels=("invocation_type",)
+)
+MODEL_CACHE_HITS = REGISTRY.counter("invokeai_model_cache_hits_total", "Number of model cache hits.")
+MODEL_CACHE_MISSES = REGISTRY.counter("invokeai_model_cache_misses_total", "Number of model cache misses.")
+MODEL_CACHE_EVICTIONS = REGISTRY.counter(
+    "invokeai_model_cache_evictions_total", "Number of models dropped from the model cache to make room."
+)
+MODEL_CACHE_EVICTED_BYTES = REGISTRY.counter(
+    "invokeai_model_cache_evicted_bytes_total", "Bytes freed by dropping models from the model cache."
+)
+MODEL_CACHE_BYTES = REGISTRY.gauge(
+    "invokeai_model_cache_bytes",
+    "Bytes of cached models by tier, as of the last model cache operation. The ram tier counts the full size of all "
+    "cached models, and the vram tier counts the part that is on the execution device.",
+    labels=("tier",),
+)
+MODEL_CACHE_MODELS = REGISTRY.gauge(
+    "invokeai_model_cache_models", "Number of models in the model cache, as of the last model cache operation."
+)
+INVOCATION_CACHE_HITS = REGISTRY.gauge("invokeai_invocation_cache_hits", "Number of invocation cache hits.")
+INVOCATION_CACHE_MISSES = REGISTRY.gauge("invokeai_invocation_cache_misses", "Number of invocation cache misses.")
+INVOCATION_CACHE_SIZE = REGISTRY.gauge("invokeai_invocation_cache_size", "Number of entries in the invocation cache.")
+INVOCATION_CACHE_HIT_RATIO = REGISTRY.gauge(
+    "invokeai_invocation_cache_hit_ratio", "Ratio of invocation cache hits to lookups. 0 if there were no lookups."
+)
+DOWNLOAD_JOBS = REGISTRY.gauge("invokeai_download_jobs", "Number of download jobs by status.", labels=("status",))
+IMAGE_SAVE_SECONDS = REGISTRY.histogram(
+    "invokeai_image_save_seconds", "Time taken to write an image file to disk.", buckets=FAST_BUCKETS
+)
+DB_TRANSACTION_SECONDS = REGISTRY.histogram(
+    "invokeai_db_transaction_seconds",
+    "Time taken by a database transaction, including waiting for the database lock.",
+    buckets=FAST_BUCKETS,
+)
+
+
+def register_model_cache_metrics(model_cache: "ModelCache") -> None:
+    """Record model cache hits, misses and evictions, and the bytes held by the cache, using its callbacks."""
+
+    def update_size(cache_snapshot: dict[str, "CacheEntrySnapshot"]) -> None:
+        MODEL_CACHE_BYTES.set(sum(e.total_bytes for e in cache_snapshot.values()), tier="ram")
+        MODEL_CACHE_BYTES.set(sum(e.current_vram_bytes for e in cache_snapshot.values()), tier="vram")
+        MODEL_CACHE_MODELS.set(len(cache_snapshot))
+
+    def on_hit(model_key: str, cache_snapshot: dict[str, "CacheEntrySnapshot"]) -> None:
+        MODEL_CACHE_HITS.inc()
+        update_size(cache_snapshot)
+
+    def on_miss(model_key: str, cache_snapshot: dict[str, "CacheEntrySnapshot"]) -> None:
+        MODEL_CACHE_MISSES.inc()
+        update_size(cache_snapshot)
+
+    def on_models_cleared(
+        models_cleared: int, bytes_requested: int, bytes_freed: int, cache_snapshot: dict[str, "CacheEntrySnapshot"]
+    ) -> None:
+        MODEL_CACHE_EVICTIONS.inc(models_cleared)
+        MODEL_CACHE_EVICTED_BYTES.inc(bytes_freed)
+        update_size(cache_snapshot)
+
+    model_cache.on_cache_hit(on_hit)
+    model_cache.on_cache_miss(on_miss)
+    model_cache.on_cache_models_cleared(on_models_cleared)
@@ -0,0 +1,107 @@
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class ModelHashCache:
+    """
+    A persistent cache of model file hashes, keyed by the file's identity.
+
+    A file's hash is reused as long as the file's path, size, modification time and inode are unchanged, so re-importing
+    a model library (e.g. after resetting the database) doesn't re-read every byte of every model. An entry whose file
+    has changed is discarded the next time it is looked up.
+
+    The cache is kept in its own SQLite database, separate from the app's database, so it survives database resets.
+
+    Args:
+        db_path: Path to the cache's database file. If None, an in-memory cache is used.
+        logger: Logger to use for logging.
+
+    Errors reading or writing the cache are logged and otherwise ignored - the file is simply hashed.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, logger: Optional[logging.Logger] = None) -> None:
+        # This module is imported by the app config, so it can't use the InvokeAILogger, which imports the config
+        self._logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(database=db_path or ":memory:", check_same_thread=False)
+        # Several processes (e.g. multiple app instances sharing a root) may use the same cache
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA busy_timeout = 5000;")
+        with self._conn:
+            self._conn.execute(
+                """--sql
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (path, algorithm)
+                );
+                """
+            )
+
+    def get(self, file_path: Path, algorithm: str, stat: os.stat_result) -> Optional[str]:
+        """Returns the cached hash of a file, or None if it isn't cached or the file has changed since it was hashed.
+
+        Args:
+            file_path: Path to the file
+            algorithm: The hashing algorithm
+            stat: The file's current stat result
+        """
+        path = file_path.resolve().as_posix()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, inode, hash FROM file_hashes WHERE path = ? AND algorithm = ?;",
+                    (path, algorithm),
+                ).fetchone()
+                if row is None:
+                    return None
+                size, mtime_ns, inode, hash_ = row
+                if (size, mtime_ns, inode) == (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+                    return hash_
+                # The file has changed since it was hashed
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM file_hashes WHERE path = ? AND algorithm = ?;",
+                        (path, algorithm),
+                    )
+                return None
+        except sqlite3.Error as e:
+            self._logger.warning(f"Unable to read model hash cache: {e}")
+            return None
+
+    def put(self, file_path: Path, algorithm: str, stat: os.stat_result, hash_: str) -> None:
+        """Caches the hash of a file.
+
+        Args:
+            file_path: Path to the file
+            algorithm: The hashing algorithm
+            stat: The file's stat result, taken before it was hashed
+            hash_: The file's hash
+        """
+        path = file_path.resolve().as_posix()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    """--sql
+                    INSERT OR REPLACE INTO file_hashes (path, algorithm, size, mtime_ns, inode, hash)
+                    VALUES (?, ?, ?, ?, ?, ?);
+                    """,
+                    (path, algorithm, stat.st_size, stat.st_mtime_ns, stat.st_ino, hash_),
+                )
+        except sqlite3.Error as e:
+            self._logger.warning(f"Unable to write model hash cache: {e}")
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM file_hashes;")
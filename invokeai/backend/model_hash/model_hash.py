@@ -2,13 +2,16 @@
 
 import hashlib
 import os
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Literal, Optional, Union
+from typing import Callable, Iterable, Literal, Optional, Union
 
 from blake3 import blake3
 from tqdm import tqdm
 
 from invokeai.app.util.misc import uuid_string
+from invokeai.backend.model_hash.hash_cache import ModelHashCache
 
 HASHING_ALGORITHMS = Literal[
     "blake3_multi",
@@ -39,6 +42,9 @@ class ModelHash:
     Args:
         algorithm: Hashing algorithm to use. Defaults to BLAKE3.
         file_filter: A function that takes a file name and returns True if the file should be included in the hash.
+        cache: An optional cache of file hashes. Files that are unchanged since they were cached are not re-hashed.
+        refresh_cache: If True, files are always hashed, and the cache is updated with the results. Use this to verify
+            models against their recorded hashes.
 
     If the model is a single file, it is hashed directly using the provided algorithm.
 
@@ -61,9 +67,16 @@ class ModelHash:
     """
 
     def __init__(
-        self, algorithm: HASHING_ALGORITHMS = "blake3_single", file_filter: Optional[Callable[[str], bool]] = None
+        self,
+        algorithm: HASHING_ALGORITHMS = "blake3_single",
+        file_filter: Optional[Callable[[str], bool]] = None,
+        cache: Optional[ModelHashCache] = None,
+        refresh_cache: bool = False,
     ) -> None:
         self.algorithm: HASHING_ALGORITHMS = algorithm
+        # Random "hashes" are not hashes, so must never be cached
+        self._cache = cache if algorithm != "random" else None
+        self._refresh_cache = refresh_cache
         if algorithm == "blake3_multi":
             self._hash_file = self._blake3
         elif algorithm == "blake3_single":
@@ -100,7 +113,7 @@ class ModelHash:
             pbar = tqdm([model_path], desc=f"Hashing {model_path.name}", unit="file")
             for component in pbar:
                 pbar.set_description(f"Hashing {component.name}")
-                hash_ = prefix + self._hash_file(model_path)
+                hash_ = prefix + self._hash_file_cached(model_path)
             assert hash_ is not None
             return hash_
         elif model_path.is_dir():
@@ -123,7 +136,7 @@ class ModelHash:
         pbar = tqdm(sorted(model_component_paths), desc=f"Hashing {dir.name}", unit="file")
         for component in pbar:
             pbar.set_description(f"Hashing {component.name}")
-            component_hashes.append(self._hash_file(component))
+            component_hashes.append(self._hash_file_cached(component))
 
         # BLAKE3 is cryptographically secure. We may as well fall back on a secure algorithm
         # for the composite hash
@@ -133,6 +146,63 @@ class ModelHash:
 
         return composite_hasher.hexdigest()
 
+    def hash_many(
+        self, model_paths: Iterable[Union[str, Path]], max_workers_per_device: int = 1
+    ) -> dict[Path, Union[str, Exception]]:
+        """
+        Hash many models concurrently, limiting the number of models hashed at once on each storage device.
+
+        Models on different devices (e.g. disks) are hashed in parallel, while models on the same device are hashed at
+        most `max_workers_per_device` at a time. For spinning disks, 1 avoids thrashing the disk heads.
+
+        Args:
+            model_paths: Paths to the models
+            max_workers_per_device: The max number of models to hash at once on each device
+
+        Returns:
+            A dict mapping each model path to its hash, or to the exception raised while hashing it
+        """
+        paths_by_device: dict[int, list[Path]] = defaultdict(list)
+        results: dict[Path, Union[str, Exception]] = {}
+        for model_path in map(Path, model_paths):
+            try:
+                paths_by_device[model_path.stat().st_dev].append(model_path)
+            except OSError as e:
+                results[model_path] = e
+
+        executors = [
+            ThreadPoolExecutor(max_workers=max_workers_per_device, thread_name_prefix=f"model_hash_{device}")
+            for device in paths_by_device
+        ]
+        try:
+            futures: dict[Path, Future[str]] = {}
+            for executor, paths in zip(executors, paths_by_device.values(), strict=True):
+                for model_path in paths:
+                    futures[model_path] = executor.submit(self.hash, model_path)
+            for model_path, future in futures.items():
+                try:
+                    results[model_path] = future.result()
+                except Exception as e:
+                    results[model_path] = e
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    def _hash_file_cached(self, file_path: Path) -> str:
+        """Hashes a file, using the cached hash if the file is unchanged since it was cached."""
+        if self._cache is None:
+            return self._hash_file(file_path)
+        # blake3_single and blake3_multi produce the same hash
+        algorithm = self._get_prefix(self.algorithm).rstrip(":")
+        # The stat is taken before hashing, so a file modified while it is being hashed is re-hashed next time
+        stat = file_path.stat()
+        hash_ = None if self._refresh_cache else self._cache.get(file_path, algorithm, stat)
+        if hash_ is None:
+            hash_ = self._hash_file(file_path)
+            self._cache.put(file_path, algorithm, stat, hash_)
+        return hash_
+
     @staticmethod
     def _get_file_paths(model_path: Path, file_filter: Callable[[str], bool]) -> list[Path]:
         """Return a list of all model files in the directory.
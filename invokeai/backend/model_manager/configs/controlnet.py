@@ -168,7 +168,7 @@ class ControlNet_Checkpoint_Config_Base(Checkpoint_Config_Base):
     @classmethod
     def _validate_looks_like_controlnet(cls, mod: ModelOnDisk) -> None:
         if not state_dict_has_any_keys_starting_with(
-            mod.load_state_dict(),
+            mod.load_state_dict_meta(),
             {
                 "controlnet",
                 "control_model",
@@ -185,7 +185,7 @@ class ControlNet_Checkpoint_Config_Base(Checkpoint_Config_Base):
 
     @classmethod
     def _get_base_or_raise(cls, mod: ModelOnDisk) -> BaseModelType:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         if is_state_dict_xlabs_controlnet(state_dict) or is_state_dict_instantx_controlnet(state_dict):
             # TODO(ryand): Should I distinguish between XLabs, InstantX and other ControlNet models by implementing
@@ -271,6 +271,6 @@ class ControlNet_Checkpoint_ZImage_Config(Checkpoint_Config_Base, Config_Base):
 
     @classmethod
     def _validate_looks_like_z_image_control(cls, mod: ModelOnDisk) -> None:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if not _has_z_image_control_keys(state_dict):
             raise NotAMatchError("state dict does not look like a Z-Image Control model")
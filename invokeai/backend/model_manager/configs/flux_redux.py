@@ -34,7 +34,7 @@ class FLUXRedux_Checkpoint_Config(Config_Base):
 
         raise_for_override_fields(cls, override_fields)
 
-        if not is_state_dict_likely_flux_redux(mod.load_state_dict()):
+        if not is_state_dict_likely_flux_redux(mod.load_state_dict_meta()):
             raise NotAMatchError("model does not match FLUX Tools Redux heuristics")
 
         return cls(**override_fields)
@@ -73,7 +73,7 @@ class IPAdapter_InvokeAI_Config_Base(IPAdapter_Config_Base):
 
     @classmethod
     def _get_base_or_raise(cls, mod: ModelOnDisk) -> BaseModelType:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         try:
             cross_attention_dim = state_dict["ip_adapter"]["1.to_k_ip.weight"].shape[-1]
@@ -131,7 +131,7 @@ class IPAdapter_Checkpoint_Config_Base(IPAdapter_Config_Base):
     @classmethod
     def _validate_looks_like_ip_adapter(cls, mod: ModelOnDisk) -> None:
         if not state_dict_has_any_keys_starting_with(
-            mod.load_state_dict(),
+            mod.load_state_dict_meta(),
             {
                 "image_proj.",
                 "ip_adapter.",
@@ -143,7 +143,7 @@ class IPAdapter_Checkpoint_Config_Base(IPAdapter_Config_Base):
 
     @classmethod
     def _get_base_or_raise(cls, mod: ModelOnDisk) -> BaseModelType:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         if is_state_dict_xlabs_ip_adapter(state_dict):
             return BaseModelType.Flux
@@ -56,7 +56,7 @@ def _get_flux_lora_format(mod: ModelOnDisk) -> FluxLoRAFormat | None:
     # TODO(psyche): Moving this import to the function to avoid circular imports. Refactor later.
     from invokeai.backend.patches.lora_conversions.formats import flux_format_from_state_dict
 
-    state_dict = mod.load_state_dict()
+    state_dict = mod.load_state_dict_meta()
     value = flux_format_from_state_dict(state_dict, mod.metadata())
     return value
 
@@ -164,7 +164,7 @@ class LoRA_LyCORIS_Config_Base(LoRA_Config_Base):
         # Note: Existence of these key prefixes/suffixes does not guarantee that this is a LoRA.
         # Some main models have these keys, likely due to the creator merging in a LoRA.
         has_key_with_lora_prefix = state_dict_has_any_keys_starting_with(
-            mod.load_state_dict(),
+            mod.load_state_dict_meta(),
             {
                 "lora_te_",
                 "lora_unet_",
@@ -175,7 +175,7 @@ class LoRA_LyCORIS_Config_Base(LoRA_Config_Base):
         )
 
         has_key_with_lora_suffix = state_dict_has_any_keys_ending_with(
-            mod.load_state_dict(),
+            mod.load_state_dict_meta(),
             {
                 "to_k_lora.up.weight",
                 "to_q_lora.down.weight",
@@ -192,7 +192,7 @@ class LoRA_LyCORIS_Config_Base(LoRA_Config_Base):
         if _get_flux_lora_format(mod):
             return BaseModelType.Flux
 
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         # If we've gotten here, we assume that the model is a Stable Diffusion model
         token_vector_length = lora_token_vector_length(state_dict)
         if token_vector_length == 768:
@@ -238,7 +238,7 @@ class LoRA_LyCORIS_ZImage_Config(LoRA_LyCORIS_Config_Base, Config_Base):
         - diffusion_model.layers.X.attention.to_k.lora_A.weight (PEFT format)
         - diffusion_model.layers.X.attention.to_k.dora_scale (DoRA scale)
         """
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         # Check for Z-Image specific LoRA patterns
         has_z_image_lora_keys = state_dict_has_any_keys_starting_with(
@@ -273,7 +273,7 @@ class LoRA_LyCORIS_ZImage_Config(LoRA_LyCORIS_Config_Base, Config_Base):
         - diffusion_model.layers.0.attention.to_k.lora_A.weight
         - diffusion_model.layers.0.feed_forward.w1.lora_A.weight
         """
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         # Check for Z-Image transformer layer patterns
         # Z-Image uses diffusion_model.layers.X structure (unlike Flux which uses double_blocks/single_blocks)
@@ -316,7 +316,7 @@ class ControlLoRA_LyCORIS_FLUX_Config(ControlAdapter_Config_Base, Config_Base):
 
     @classmethod
     def _validate_looks_like_control_lora(cls, mod: ModelOnDisk) -> None:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         if not is_state_dict_likely_flux_control(state_dict):
             raise NotAMatchError("model state dict does not look like a Flux Control LoRA")
@@ -355,7 +355,7 @@ class LoRA_Diffusers_Config_Base(LoRA_Config_Base):
 
         # If we've gotten here, we assume that the LoRA is a Stable Diffusion LoRA
         path_to_weight_file = cls._get_weight_file_or_raise(mod)
-        state_dict = mod.load_state_dict(path_to_weight_file)
+        state_dict = mod.load_state_dict_meta(path_to_weight_file)
         token_vector_length = lora_token_vector_length(state_dict)
 
         match token_vector_length:
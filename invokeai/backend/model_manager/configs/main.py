@@ -210,7 +210,7 @@ class Main_SD_Checkpoint_Config_Base(Checkpoint_Config_Base, Main_Config_Base):
 
     @classmethod
     def _get_base_or_raise(cls, mod: ModelOnDisk) -> BaseModelType:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
 
         key_name = "model.diffusion_model.input_blocks.2.1.transformer_blocks.0.attn2.to_k.weight"
         if key_name in state_dict and state_dict[key_name].shape[-1] == 768:
@@ -231,7 +231,7 @@ class Main_SD_Checkpoint_Config_Base(Checkpoint_Config_Base, Main_Config_Base):
         base = cls.model_fields["base"].default
 
         if base is BaseModelType.StableDiffusion2:
-            state_dict = mod.load_state_dict()
+            state_dict = mod.load_state_dict_meta()
             key_name = "model.diffusion_model.input_blocks.2.1.transformer_blocks.0.attn2.to_k.weight"
             if key_name in state_dict and state_dict[key_name].shape[-1] == 1024:
                 if "global_step" in state_dict:
@@ -247,7 +247,7 @@ class Main_SD_Checkpoint_Config_Base(Checkpoint_Config_Base, Main_Config_Base):
     def _get_variant_or_raise(cls, mod: ModelOnDisk) -> ModelVariantType:
         base = cls.model_fields["base"].default
 
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         key_name = "model.diffusion_model.input_blocks.0.0.weight"
 
         if key_name not in state_dict:
@@ -269,7 +269,7 @@ class Main_SD_Checkpoint_Config_Base(Checkpoint_Config_Base, Main_Config_Base):
 
     @classmethod
     def _validate_looks_like_main_model(cls, mod: ModelOnDisk) -> None:
-        has_main_model_keys = _has_main_keys(mod.load_state_dict())
+        has_main_model_keys = _has_main_keys(mod.load_state_dict_meta())
         if not has_main_model_keys:
             raise NotAMatchError("state dict does not look like a main model")
 
@@ -465,7 +465,7 @@ class Main_Checkpoint_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Conf
 
     @classmethod
     def _validate_is_flux(cls, mod: ModelOnDisk) -> None:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if not state_dict_has_any_keys_exact(
             state_dict,
             {
@@ -482,7 +482,7 @@ class Main_Checkpoint_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Conf
     @classmethod
     def _get_variant_or_raise(cls, mod: ModelOnDisk) -> FluxVariantType:
         # FLUX Model variant types are distinguished by input channels and the presence of certain keys.
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_flux_variant(state_dict)
 
         if variant is None:
@@ -495,19 +495,19 @@ class Main_Checkpoint_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Conf
 
     @classmethod
     def _validate_looks_like_main_model(cls, mod: ModelOnDisk) -> None:
-        has_main_model_keys = _has_main_keys(mod.load_state_dict())
+        has_main_model_keys = _has_main_keys(mod.load_state_dict_meta())
         if not has_main_model_keys:
             raise NotAMatchError("state dict does not look like a main model")
 
     @classmethod
     def _validate_does_not_look_like_bnb_quantized(cls, mod: ModelOnDisk) -> None:
-        has_bnb_nf4_keys = _has_bnb_nf4_keys(mod.load_state_dict())
+        has_bnb_nf4_keys = _has_bnb_nf4_keys(mod.load_state_dict_meta())
         if has_bnb_nf4_keys:
             raise NotAMatchError("state dict looks like bnb quantized nf4")
 
     @classmethod
     def _validate_does_not_look_like_gguf_quantized(cls, mod: ModelOnDisk):
-        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict_meta())
         if has_ggml_tensors:
             raise NotAMatchError("state dict looks like GGUF quantized")
 
@@ -541,13 +541,13 @@ class Main_Checkpoint_Flux2_Config(Checkpoint_Config_Base, Main_Config_Base, Con
     @classmethod
     def _validate_is_flux2(cls, mod: ModelOnDisk) -> None:
         """Validate that this is a FLUX.2 model, not FLUX.1."""
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if not _is_flux2_model(state_dict):
             raise NotAMatchError("state dict does not look like a FLUX.2 model")
 
     @classmethod
     def _get_variant_or_raise(cls, mod: ModelOnDisk) -> Flux2VariantType:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_flux2_variant(state_dict)
 
         if variant is None:
@@ -557,19 +557,19 @@ class Main_Checkpoint_Flux2_Config(Checkpoint_Config_Base, Main_Config_Base, Con
 
     @classmethod
     def _validate_looks_like_main_model(cls, mod: ModelOnDisk) -> None:
-        has_main_model_keys = _has_main_keys(mod.load_state_dict())
+        has_main_model_keys = _has_main_keys(mod.load_state_dict_meta())
         if not has_main_model_keys:
             raise NotAMatchError("state dict does not look like a main model")
 
     @classmethod
     def _validate_does_not_look_like_bnb_quantized(cls, mod: ModelOnDisk) -> None:
-        has_bnb_nf4_keys = _has_bnb_nf4_keys(mod.load_state_dict())
+        has_bnb_nf4_keys = _has_bnb_nf4_keys(mod.load_state_dict_meta())
         if has_bnb_nf4_keys:
             raise NotAMatchError("state dict looks like bnb quantized nf4")
 
     @classmethod
     def _validate_does_not_look_like_gguf_quantized(cls, mod: ModelOnDisk):
-        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict_meta())
         if has_ggml_tensors:
             raise NotAMatchError("state dict looks like GGUF quantized")
 
@@ -599,7 +599,7 @@ class Main_BnBNF4_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Config_B
     @classmethod
     def _get_variant_or_raise(cls, mod: ModelOnDisk) -> FluxVariantType:
         # FLUX Model variant types are distinguished by input channels and the presence of certain keys.
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_flux_variant(state_dict)
 
         if variant is None:
@@ -612,13 +612,13 @@ class Main_BnBNF4_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Config_B
 
     @classmethod
     def _validate_looks_like_main_model(cls, mod: ModelOnDisk) -> None:
-        has_main_model_keys = _has_main_keys(mod.load_state_dict())
+        has_main_model_keys = _has_main_keys(mod.load_state_dict_meta())
         if not has_main_model_keys:
             raise NotAMatchError("state dict does not look like a main model")
 
     @classmethod
     def _validate_model_looks_like_bnb_quantized(cls, mod: ModelOnDisk) -> None:
-        has_bnb_nf4_keys = _has_bnb_nf4_keys(mod.load_state_dict())
+        has_bnb_nf4_keys = _has_bnb_nf4_keys(mod.load_state_dict_meta())
         if not has_bnb_nf4_keys:
             raise NotAMatchError("state dict does not look like bnb quantized nf4")
 
@@ -650,7 +650,7 @@ class Main_GGUF_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Config_Bas
     @classmethod
     def _get_variant_or_raise(cls, mod: ModelOnDisk) -> FluxVariantType:
         # FLUX Model variant types are distinguished by input channels and the presence of certain keys.
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_flux_variant(state_dict)
 
         if variant is None:
@@ -663,20 +663,20 @@ class Main_GGUF_FLUX_Config(Checkpoint_Config_Base, Main_Config_Base, Config_Bas
 
     @classmethod
     def _validate_looks_like_main_model(cls, mod: ModelOnDisk) -> None:
-        has_main_model_keys = _has_main_keys(mod.load_state_dict())
+        has_main_model_keys = _has_main_keys(mod.load_state_dict_meta())
         if not has_main_model_keys:
             raise NotAMatchError("state dict does not look like a main model")
 
     @classmethod
     def _validate_looks_like_gguf_quantized(cls, mod: ModelOnDisk) -> None:
-        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict_meta())
         if not has_ggml_tensors:
             raise NotAMatchError("state dict does not look like GGUF quantized")
 
     @classmethod
     def _validate_is_not_flux2(cls, mod: ModelOnDisk) -> None:
         """Validate that this is NOT a FLUX.2 model."""
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if _is_flux2_model(state_dict):
             raise NotAMatchError("model is a FLUX.2 model, not FLUX.1")
 
@@ -708,13 +708,13 @@ class Main_GGUF_Flux2_Config(Checkpoint_Config_Base, Main_Config_Base, Config_Ba
     @classmethod
     def _validate_is_flux2(cls, mod: ModelOnDisk) -> None:
         """Validate that this is a FLUX.2 model, not FLUX.1."""
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if not _is_flux2_model(state_dict):
             raise NotAMatchError("state dict does not look like a FLUX.2 model")
 
     @classmethod
     def _get_variant_or_raise(cls, mod: ModelOnDisk) -> Flux2VariantType:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_flux2_variant(state_dict)
 
         if variant is None:
@@ -724,13 +724,13 @@ class Main_GGUF_Flux2_Config(Checkpoint_Config_Base, Main_Config_Base, Config_Ba
 
     @classmethod
     def _validate_looks_like_main_model(cls, mod: ModelOnDisk) -> None:
-        has_main_model_keys = _has_main_keys(mod.load_state_dict())
+        has_main_model_keys = _has_main_keys(mod.load_state_dict_meta())
         if not has_main_model_keys:
             raise NotAMatchError("state dict does not look like a main model")
 
     @classmethod
     def _validate_looks_like_gguf_quantized(cls, mod: ModelOnDisk) -> None:
-        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict_meta())
         if not has_ggml_tensors:
             raise NotAMatchError("state dict does not look like GGUF quantized")
 
@@ -1156,13 +1156,13 @@ class Main_Checkpoint_ZImage_Config(Checkpoint_Config_Base, Main_Config_Base, Co
 
     @classmethod
     def _validate_looks_like_z_image_model(cls, mod: ModelOnDisk) -> None:
-        has_z_image_keys = _has_z_image_keys(mod.load_state_dict())
+        has_z_image_keys = _has_z_image_keys(mod.load_state_dict_meta())
         if not has_z_image_keys:
             raise NotAMatchError("state dict does not look like a Z-Image model")
 
     @classmethod
     def _validate_does_not_look_like_gguf_quantized(cls, mod: ModelOnDisk) -> None:
-        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict_meta())
         if has_ggml_tensors:
             raise NotAMatchError("state dict looks like GGUF quantized")
 
@@ -1190,12 +1190,12 @@ class Main_GGUF_ZImage_Config(Checkpoint_Config_Base, Main_Config_Base, Config_B
 
     @classmethod
     def _validate_looks_like_z_image_model(cls, mod: ModelOnDisk) -> None:
-        has_z_image_keys = _has_z_image_keys(mod.load_state_dict())
+        has_z_image_keys = _has_z_image_keys(mod.load_state_dict_meta())
         if not has_z_image_keys:
             raise NotAMatchError("state dict does not look like a Z-Image model")
 
     @classmethod
     def _validate_looks_like_gguf_quantized(cls, mod: ModelOnDisk) -> None:
-        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml_tensors = _has_ggml_tensors(mod.load_state_dict_meta())
         if not has_ggml_tensors:
             raise NotAMatchError("state dict does not look like GGUF quantized")
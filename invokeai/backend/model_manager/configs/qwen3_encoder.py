@@ -127,19 +127,19 @@ class Qwen3Encoder_Checkpoint_Config(Checkpoint_Config_Base, Config_Base):
     @classmethod
     def _get_variant_or_default(cls, mod: ModelOnDisk) -> Qwen3VariantType:
         """Get variant from state dict, defaulting to 4B if unknown."""
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_qwen3_variant_from_state_dict(state_dict)
         return variant if variant is not None else Qwen3VariantType.Qwen3_4B
 
     @classmethod
     def _validate_looks_like_qwen3_model(cls, mod: ModelOnDisk) -> None:
-        has_qwen3_keys = _has_qwen3_keys(mod.load_state_dict())
+        has_qwen3_keys = _has_qwen3_keys(mod.load_state_dict_meta())
         if not has_qwen3_keys:
             raise NotAMatchError("state dict does not look like a Qwen3 model")
 
     @classmethod
     def _validate_does_not_look_like_gguf_quantized(cls, mod: ModelOnDisk) -> None:
-        has_ggml = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml = _has_ggml_tensors(mod.load_state_dict_meta())
         if has_ggml:
             raise NotAMatchError("state dict looks like GGUF quantized")
 
@@ -251,18 +251,18 @@ class Qwen3Encoder_GGUF_Config(Checkpoint_Config_Base, Config_Base):
     @classmethod
     def _get_variant_or_default(cls, mod: ModelOnDisk) -> Qwen3VariantType:
         """Get variant from state dict, defaulting to 4B if unknown."""
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         variant = _get_qwen3_variant_from_state_dict(state_dict)
         return variant if variant is not None else Qwen3VariantType.Qwen3_4B
 
     @classmethod
     def _validate_looks_like_qwen3_model(cls, mod: ModelOnDisk) -> None:
-        has_qwen3_keys = _has_qwen3_keys(mod.load_state_dict())
+        has_qwen3_keys = _has_qwen3_keys(mod.load_state_dict_meta())
         if not has_qwen3_keys:
             raise NotAMatchError("state dict does not look like a Qwen3 model")
 
     @classmethod
     def _validate_looks_like_gguf_quantized(cls, mod: ModelOnDisk) -> None:
-        has_ggml = _has_ggml_tensors(mod.load_state_dict())
+        has_ggml = _has_ggml_tensors(mod.load_state_dict_meta())
         if not has_ggml:
             raise NotAMatchError("state dict does not look like GGUF quantized")
@@ -77,6 +77,6 @@ class T5Encoder_BnBLLMint8_Config(Config_Base):
 
     @classmethod
     def raise_if_state_dict_doesnt_look_like_bnb_quantized(cls, mod: ModelOnDisk) -> None:
-        has_scb_key_suffix = state_dict_has_any_keys_ending_with(mod.load_state_dict(), "SCB")
+        has_scb_key_suffix = state_dict_has_any_keys_ending_with(mod.load_state_dict_meta(), "SCB")
         if not has_scb_key_suffix:
             raise NotAMatchError("state dict does not look like bnb quantized llm_int8")
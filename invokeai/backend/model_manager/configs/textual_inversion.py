@@ -48,7 +48,7 @@ class TI_Config_Base(ABC, BaseModel):
             if p.name in [f"learned_embeds.{s}" for s in mod.weight_files()]:
                 return True
 
-            state_dict = mod.load_state_dict(p)
+            state_dict = mod.load_state_dict_meta(p)
 
             # Heuristic: textual inversion embeddings have these keys
             if any(key in {"string_to_param", "emb_params", "clip_g"} for key in state_dict.keys()):
@@ -67,7 +67,7 @@ class TI_Config_Base(ABC, BaseModel):
         p = path or mod.path
 
         try:
-            state_dict = mod.load_state_dict(p)
+            state_dict = mod.load_state_dict_meta(p)
         except Exception as e:
             raise NotAMatchError(f"unable to load state dict from {p}: {e}") from e
 
@@ -80,7 +80,7 @@ class VAE_Checkpoint_Config_Base(Checkpoint_Config_Base):
 
     @classmethod
     def _validate_looks_like_vae(cls, mod: ModelOnDisk) -> None:
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if not state_dict_has_any_keys_starting_with(
             state_dict,
             {
@@ -97,7 +97,7 @@ class VAE_Checkpoint_Config_Base(Checkpoint_Config_Base):
     @classmethod
     def _get_base_or_raise(cls, mod: ModelOnDisk) -> BaseModelType:
         # First, try to identify by latent space dimensions (most reliable)
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         decoder_conv_in_key = "decoder.conv_in.weight"
         if decoder_conv_in_key in state_dict:
             latent_channels = state_dict[decoder_conv_in_key].shape[1]
@@ -159,7 +159,7 @@ class VAE_Checkpoint_Flux2_Config(Checkpoint_Config_Base, Config_Base):
     @classmethod
     def _validate_looks_like_vae(cls, mod: ModelOnDisk) -> None:
         if not state_dict_has_any_keys_starting_with(
-            mod.load_state_dict(),
+            mod.load_state_dict_meta(),
             {
                 "encoder.conv_in",
                 "decoder.conv_in",
@@ -170,7 +170,7 @@ class VAE_Checkpoint_Flux2_Config(Checkpoint_Config_Base, Config_Base):
     @classmethod
     def _validate_is_flux2_vae(cls, mod: ModelOnDisk) -> None:
         """Validate that this is a FLUX.2 VAE, not FLUX.1."""
-        state_dict = mod.load_state_dict()
+        state_dict = mod.load_state_dict_meta()
         if not _is_flux2_vae(state_dict):
             raise NotAMatchError("state dict does not look like a FLUX.2 VAE")
 
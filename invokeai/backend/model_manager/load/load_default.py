@@ -20,6 +20,7 @@ from invokeai.backend.model_manager.taxonomy import (
     SubModelType,
 )
 from invokeai.backend.util.devices import TorchDevice
+from invokeai.backend.util.tracing import get_tracer
 
 
 # TO DO: The loader is not thread safe!
@@ -99,18 +100,22 @@ class ModelLoader(ModelLoaderBase):
         except IndexError:
             pass
 
+        tracer = get_tracer()
         config.path = str(self._get_model_path(config))
-        self._ram_cache.make_room(self.get_size_fs(config, Path(config.path), submodel_type))
-        loaded_model = self._load_model(config, submodel_type)
+        with tracer.span("model_cache.make_room", category="model_cache", model=stats_name):
+            self._ram_cache.make_room(self.get_size_fs(config, Path(config.path), submodel_type))
+        with tracer.span("model_loader.load_from_disk", category="model_loader", model=stats_name):
+            loaded_model = self._load_model(config, submodel_type)
 
         # Determine execution device from model config, considering submodel type
         execution_device = self._get_execution_device(config, submodel_type)
 
-        self._ram_cache.put(
-            get_model_cache_key(config.key, submodel_type),
-            model=loaded_model,
-            execution_device=execution_device,
-        )
+        with tracer.span("model_cache.put", category="model_cache", model=stats_name):
+            self._ram_cache.put(
+                get_model_cache_key(config.key, submodel_type),
+                model=loaded_model,
+                execution_device=execution_device,
+            )
 
         return self._ram_cache.get(key=get_model_cache_key(config.key, submodel_type), stats_name=stats_name)
 
@@ -1,5 +1,14 @@
+from pathlib import Path
+
 import torch
 
+from invokeai.backend.model_manager.load.model_cache.cached_model.vram_placement import (
+    VRAMPlacementPlan,
+    VRAMPlacementProfiler,
+    VRAMPrefetcher,
+    build_placement_plan,
+    get_architecture_id,
+)
 from invokeai.backend.model_manager.load.model_cache.torch_module_autocast.custom_modules.custom_module_mixin import (
     CustomModuleMixin,
 )
@@ -14,7 +23,21 @@ class CachedModelWithPartialLoad:
     MPS memory, etc.
     """
 
-    def __init__(self, model: torch.nn.Module, compute_device: torch.device, keep_ram_copy: bool = False):
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        compute_device: torch.device,
+        keep_ram_copy: bool = False,
+        enable_placement_profiling: bool = False,
+        placement_plan_dir: Path | None = None,
+    ):
+        """
+        :param enable_placement_profiling: If True, the first forward pass of each model architecture is profiled to
+            plan which weights to keep in VRAM, and on CUDA, the profiled execution order is used to prefetch streamed
+            weights. Otherwise, the plan is estimated from the shapes of the weights, and nothing is prefetched.
+        :param placement_plan_dir: The directory in which to persist the profiled VRAM placement plans. Only used if
+            enable_placement_profiling is True.
+        """
         self._model = model
         self._compute_device = compute_device
 
@@ -39,6 +62,20 @@ class CachedModelWithPartialLoad:
         )
         self._state_dict_keys_by_module_prefix = self._group_state_dict_keys_by_module_prefix(model_state_dict)
 
+        # The plan for which weights to keep in VRAM when the model does not fit. Weights are loaded in the plan's
+        # priority order, and unloaded in reverse.
+        self._enable_placement_profiling = enable_placement_profiling
+        self._placement_plan_dir = placement_plan_dir
+        self._architecture = get_architecture_id(model, model_state_dict)
+        self._placement_plan = self._get_placement_plan()
+        self._placement_profiler: VRAMPlacementProfiler | None = None
+        if enable_placement_profiling and not self._placement_plan.profiled:
+            self._placement_profiler = VRAMPlacementProfiler(
+                model, self._modules_that_support_autocast, self._on_placement_profiled
+            )
+            self._placement_profiler.install()
+        self._prefetcher: VRAMPrefetcher | None = None
+
     def _find_modules_that_support_autocast(self) -> dict[str, torch.nn.Module]:
         """Find all modules that support autocasting."""
         return {n: m for n, m in self._model.named_modules() if isinstance(m, CustomModuleMixin)}  # type: ignore
@@ -94,6 +131,66 @@ class CachedModelWithPartialLoad:
             state_dict_keys_by_module_prefix[module_name].append(key)
         return state_dict_keys_by_module_prefix
 
+    def _get_placement_plan(self) -> VRAMPlacementPlan:
+        """Load the persisted placement plan for this architecture, or estimate one."""
+        if self._enable_placement_profiling and self._placement_plan_dir is not None:
+            plan = VRAMPlacementPlan.load(self._placement_plan_dir, self._architecture)
+            if plan is not None and set(plan.key_priority) == self._state_dict_bytes.keys():
+                return plan
+        return build_placement_plan(
+            architecture=self._architecture,
+            autocast_modules=self._modules_that_support_autocast,
+            state_dict_bytes=self._state_dict_bytes,
+            required_keys=self._keys_in_modules_that_do_not_support_autocast,
+        )
+
+    def _on_placement_profiled(self, module_flops: dict[str, float], module_order: list[str]) -> None:
+        self._placement_profiler = None
+        self._placement_plan = build_placement_plan(
+            architecture=self._architecture,
+            autocast_modules=self._modules_that_support_autocast,
+            state_dict_bytes=self._state_dict_bytes,
+            required_keys=self._keys_in_modules_that_do_not_support_autocast,
+            module_flops=module_flops,
+            module_order=module_order,
+        )
+        if self._placement_plan_dir is not None:
+            try:
+                self._placement_plan.save(self._placement_plan_dir)
+            except OSError as e:
+                InvokeAILogger.get_logger().warning(f"Failed to save VRAM placement plan for {self._architecture}: {e}")
+        # The new priorities apply from the next load, but the execution order can be used for prefetching right away.
+        self._update_prefetcher()
+
+    @property
+    def placement_plan(self) -> VRAMPlacementPlan:
+        """The plan for which weights to keep in VRAM when the model does not fit."""
+        return self._placement_plan
+
+    def _remove_prefetcher(self) -> None:
+        if self._prefetcher is not None:
+            self._prefetcher.remove()
+            self._prefetcher = None
+
+    def _update_prefetcher(self) -> None:
+        """Prefetch streamed weights if the model is partially loaded, and the execution order of its modules is known.
+
+        Prefetching is part of placement profiling, and uses a separate CUDA stream, so it is only supported on CUDA.
+        """
+        self._remove_prefetcher()
+        if not self._enable_placement_profiling:
+            return
+        if self._compute_device.type != "cuda" or not self._placement_plan.module_order:
+            return
+        if self.cur_vram_bytes() == self.total_bytes():
+            return
+        prefetcher = VRAMPrefetcher(
+            self._model, self._modules_that_support_autocast, self._placement_plan.module_order, self._compute_device
+        )
+        if prefetcher.num_streamed_modules > 0:
+            prefetcher.install()
+            self._prefetcher = prefetcher
+
     def _move_non_persistent_buffers_to_device(self, device: torch.device):
         """Move the non-persistent buffers to the target device. These buffers are not included in the state dict,
         so we need to move them manually.
@@ -235,6 +332,9 @@ class CachedModelWithPartialLoad:
         # TODO(ryand): Handle the case where an exception is thrown while loading or unloading weights. At the very
         # least, we should reset self._cur_vram_bytes to None.
 
+        # The prefetcher temporarily swaps weights into modules, so it must be removed while weights are moved.
+        self._remove_prefetcher()
+
         vram_bytes_loaded = 0
 
         cur_state_dict = self._model.state_dict()
@@ -259,13 +359,14 @@ class CachedModelWithPartialLoad:
                 "requested. This is the minimum set of weights in VRAM required to run the model."
             )
 
-        # Next, process the keys that can optionally be loaded into VRAM.
+        # Next, process the keys that can optionally be loaded into VRAM, in order of placement priority.
         fully_loaded = True
-        for key, param in cur_state_dict.items():
+        for key in self._placement_plan.key_priority:
             # Skip the keys that have already been processed above.
             if key in keys_to_load:
                 continue
 
+            param = cur_state_dict[key]
             if param.device.type == self._compute_device.type:
                 continue
 
@@ -297,6 +398,8 @@ class CachedModelWithPartialLoad:
         # the vram_bytes_loaded tracking.
         self._move_non_persistent_buffers_to_device(self._compute_device)
 
+        self._update_prefetcher()
+
         return vram_bytes_loaded
 
     @torch.no_grad()
@@ -309,19 +412,22 @@ class CachedModelWithPartialLoad:
         Returns:
             The number of bytes unloaded from VRAM.
         """
+        self._remove_prefetcher()
+
         vram_bytes_freed = 0
         required_weights_in_vram = 0
 
         offload_device = "cpu"
         cur_state_dict = self._model.state_dict()
 
-        # Identify the keys that will be offloaded to CPU.
+        # Identify the keys that will be offloaded to CPU, starting with the lowest placement priority.
         keys_to_offload: set[str] = set()
 
-        for key, param in cur_state_dict.items():
+        for key in reversed(self._placement_plan.key_priority):
             if vram_bytes_freed >= vram_bytes_to_free:
                 break
 
+            param = cur_state_dict[key]
             if param.device.type == offload_device:
                 continue
 
@@ -341,4 +447,5 @@ class CachedModelWithPartialLoad:
         # We may have gone from a fully-loaded model to a partially-loaded model, so we need to reapply the custom
         # layers.
         self._set_autocast_enabled_in_all_modules(True)
+        self._update_prefetcher()
         return vram_bytes_freed
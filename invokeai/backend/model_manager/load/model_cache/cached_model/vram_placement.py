@@ -0,0 +1,302 @@
+import hashlib
+import math
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import torch
+from pydantic import BaseModel, Field, ValidationError
+
+from invokeai.backend.util.logging import InvokeAILogger
+
+
+class VRAMPlacementPlan(BaseModel):
+    """A plan for which weights of a partially-loaded model to keep in VRAM.
+
+    Streaming a module's weights to the compute device costs time in proportion to its bytes, and the time is hidden
+    behind compute in proportion to its FLOPs. The weights of the modules with the highest bytes-to-FLOPs ratio are the
+    most expensive to stream, so they are kept in VRAM first.
+    """
+
+    architecture: str = Field(description="Identifies the model architecture, dtypes and quantization.")
+    profiled: bool = Field(description="Whether the FLOPs were measured in a forward pass, rather than estimated.")
+    module_order: list[str] = Field(
+        default_factory=list, description="The execution order of the modules that support autocast, if profiled."
+    )
+    key_priority: list[str] = Field(description="The state dict keys, in the order that they should be kept in VRAM.")
+
+    @classmethod
+    def load(cls, plan_dir: Path, architecture: str) -> Optional["VRAMPlacementPlan"]:
+        """Load a persisted plan, or return None if there is no valid plan for the architecture."""
+        path = plan_dir / f"{architecture}.json"
+        try:
+            plan = cls.model_validate_json(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            InvokeAILogger.get_logger().warning(f"Ignoring invalid VRAM placement plan {path}: {e}")
+            return None
+        return plan if plan.architecture == architecture else None
+
+    def save(self, plan_dir: Path) -> None:
+        """Persist the plan. The plan is written to a temporary file first, so a partially-written plan is never read."""
+        plan_dir.mkdir(parents=True, exist_ok=True)
+        path = plan_dir / f"{self.architecture}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(self.model_dump_json())
+        tmp_path.replace(path)
+
+
+def get_architecture_id(model: torch.nn.Module, state_dict: dict[str, torch.Tensor]) -> str:
+    """Get an identifier for the model's architecture, which changes if any weight's shape, dtype or quantization
+    changes."""
+    hasher = hashlib.sha256()
+    for key, tensor in state_dict.items():
+        qtype = getattr(tensor, "_ggml_quantization_type", None)
+        hasher.update(f"{key}:{tuple(tensor.shape)}:{tensor.dtype}:{qtype}\n".encode())
+    return f"{model.__class__.__name__}-{hasher.hexdigest()[:16]}"
+
+
+def estimate_flops(module: torch.nn.Module, output_numel: Optional[int] = None) -> float:
+    """Estimate the FLOPs of a call to the module.
+
+    If `output_numel` is None, the FLOPs per output position (e.g. per token, or per pixel) are estimated.
+    """
+    if isinstance(module, torch.nn.Embedding):
+        # A lookup, with no compute to hide the transfer behind.
+        return float(output_numel if output_numel is not None else module.embedding_dim)
+
+    if isinstance(module, torch.nn.Linear):
+        weight_numel = module.in_features * module.out_features
+        out_dim = module.out_features
+    else:
+        weight = getattr(module, "weight", None)
+        if weight is None:
+            return 0.0
+        # Note that the shape of a GGMLTensor is the dequantized shape.
+        weight_numel = math.prod(weight.shape)
+        out_dim = weight.shape[0]
+
+    positions = output_numel / out_dim if output_numel is not None else 1.0
+    return 2.0 * weight_numel * positions
+
+
+def build_placement_plan(
+    architecture: str,
+    autocast_modules: dict[str, torch.nn.Module],
+    state_dict_bytes: dict[str, int],
+    required_keys: set[str],
+    module_flops: Optional[dict[str, float]] = None,
+    module_order: Optional[list[str]] = None,
+) -> VRAMPlacementPlan:
+    """Build a placement plan from the measured FLOPs of the model's modules, or from estimates if none are given.
+
+    :param autocast_modules: The modules that support autocast, by name. Only their weights can be streamed.
+    :param state_dict_bytes: The size of each state dict tensor, in state dict order.
+    :param required_keys: The keys that must be in VRAM to run the model. These come first.
+    :param module_flops: The measured FLOPs of each module that was called in a forward pass.
+    :param module_order: The order in which the modules were first called in a forward pass.
+    """
+    order_index = {name: i for i, name in enumerate(module_order or [])}
+
+    keys_by_module: dict[str, list[str]] = {}
+    for key in state_dict_bytes:
+        if key in required_keys:
+            continue
+        module_name = key.rsplit(".", 1)[0] if "." in key else ""
+        keys_by_module.setdefault(module_name, []).append(key)
+
+    def bytes_per_flop(module_name: str) -> float:
+        module = autocast_modules.get(module_name)
+        if module is None:
+            # Not expected, but play it safe and keep the weights of an unknown module resident.
+            return math.inf
+        if module_flops is not None:
+            if module_name not in module_flops:
+                # The module was not called, so there is nothing to gain from keeping it resident.
+                return 0.0
+            flops = module_flops[module_name]
+        else:
+            flops = estimate_flops(module)
+        module_bytes = sum(state_dict_bytes[k] for k in keys_by_module[module_name])
+        return module_bytes / flops if flops > 0 else math.inf
+
+    # Sort by bytes-per-FLOP, highest first. Ties (e.g. layers of the same shape) are broken by execution order, so that
+    # a contiguous run of layers stays resident, and then by state dict order.
+    ranked_modules = sorted(keys_by_module, key=lambda n: (-bytes_per_flop(n), order_index.get(n, len(order_index))))
+    key_priority = [k for k in state_dict_bytes if k in required_keys]
+    key_priority += [key for name in ranked_modules for key in keys_by_module[name]]
+
+    return VRAMPlacementPlan(
+        architecture=architecture,
+        profiled=module_flops is not None,
+        module_order=module_order or [],
+        key_priority=key_priority,
+    )
+
+
+class VRAMPlacementProfiler:
+    """Measures the execution order and FLOPs of a model's modules during its first forward pass.
+
+    Hooks are added to the modules, and are removed when the root module's forward pass finishes.
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        modules: dict[str, torch.nn.Module],
+        on_profiled: Callable[[dict[str, float], list[str]], None],
+    ):
+        self._model = model
+        self._modules = modules
+        self._on_profiled = on_profiled
+        self._module_flops: dict[str, float] = {}
+        self._module_order: list[str] = []
+        self._handles: list[torch.utils.hooks.RemovableHandle] = []
+
+    def install(self) -> None:
+        for name, module in self._modules.items():
+            self._handles.append(module.register_forward_hook(self._make_module_hook(name)))
+        self._handles.append(self._model.register_forward_hook(self._root_hook))
+
+    def remove(self) -> None:
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+
+    def _make_module_hook(self, name: str) -> Callable[..., None]:
+        def hook(module: torch.nn.Module, args: Any, output: Any) -> None:
+            if name not in self._module_flops:
+                self._module_order.append(name)
+                self._module_flops[name] = 0.0
+            output_tensor = output[0] if isinstance(output, (tuple, list)) else output
+            if isinstance(output_tensor, torch.Tensor):
+                self._module_flops[name] += estimate_flops(module, output_tensor.numel())
+
+        return hook
+
+    def _root_hook(self, module: torch.nn.Module, args: Any, output: Any) -> None:
+        self.remove()
+        if self._module_order:
+            self._on_profiled(self._module_flops, self._module_order)
+
+
+class VRAMPrefetcher:
+    """Copies the weights of the next streamed module to the compute device while the current module runs.
+
+    Streamed modules copy their weights to the compute device when they are called, so the compute device waits for
+    the copy. With the prefetcher, when a streamed module returns, the copy of the next streamed module's weights (in
+    execution order) is started on a separate CUDA stream, and overlaps with the compute that is already queued. When
+    the next module is called, its parameters are temporarily replaced by the copies.
+
+    At most two modules' copies exist at a time, and they are not counted against the model cache's VRAM. They are
+    dropped at the end of each forward pass, so that they are never stale if the weights are patched between passes.
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        modules: dict[str, torch.nn.Module],
+        module_order: list[str],
+        device: torch.device,
+    ):
+        self._model = model
+        self._device = device
+        self._stream = torch.cuda.Stream(device=device)
+        streamed = [n for n in module_order if n in modules and self._has_offloaded_tensors(modules[n])]
+        self._modules = {n: modules[n] for n in streamed}
+        self._first = streamed[0] if streamed else None
+        self._next = {name: streamed[i + 1] for i, name in enumerate(streamed[:-1])}
+        self._prefetched: dict[str, tuple[dict[str, torch.Tensor], torch.cuda.Event]] = {}
+        self._swapped: dict[str, dict[str, torch.Tensor]] = {}
+        self._handles: list[torch.utils.hooks.RemovableHandle] = []
+
+    @property
+    def num_streamed_modules(self) -> int:
+        return len(self._modules)
+
+    def install(self) -> None:
+        if self._first is None:
+            return
+        for name, module in self._modules.items():
+            self._handles.append(module.register_forward_pre_hook(self._make_pre_hook(name)))
+            self._handles.append(module.register_forward_hook(self._make_post_hook(name)))
+        self._handles.append(self._model.register_forward_pre_hook(self._root_pre_hook))
+        self._handles.append(self._model.register_forward_hook(self._root_post_hook))
+
+    def remove(self) -> None:
+        """Remove the hooks, restore any swapped parameters and drop the prefetched copies."""
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+        for name in list(self._swapped):
+            self._restore(name)
+        self._prefetched = {}
+
+    def _has_offloaded_tensors(self, module: torch.nn.Module) -> bool:
+        return any(t.device.type != self._device.type for t in self._module_tensors(module).values())
+
+    @staticmethod
+    def _module_tensors(module: torch.nn.Module) -> dict[str, torch.Tensor]:
+        tensors: dict[str, torch.Tensor] = {n: t for n, t in module._parameters.items() if t is not None}
+        tensors.update({n: t for n, t in module._buffers.items() if t is not None})
+        return tensors
+
+    def _make_pre_hook(self, name: str) -> Callable[..., None]:
+        def hook(module: torch.nn.Module, args: Any) -> None:
+            prefetched = self._prefetched.pop(name, None)
+            if prefetched is None:
+                return
+            copies, copied = prefetched
+            compute_stream = torch.cuda.current_stream(self._device)
+            compute_stream.wait_event(copied)
+            originals: dict[str, torch.Tensor] = {}
+            for tensor_name, copy in copies.items():
+                # The copy was allocated on the prefetch stream, but is used on the compute stream.
+                copy.record_stream(compute_stream)
+                tensors = module._parameters if tensor_name in module._parameters else module._buffers
+                originals[tensor_name] = tensors[tensor_name]  # type: ignore
+                tensors[tensor_name] = copy  # type: ignore
+            self._swapped[name] = originals
+
+        return hook
+
+    def _make_post_hook(self, name: str) -> Callable[..., None]:
+        def hook(module: torch.nn.Module, args: Any, output: Any) -> None:
+            self._restore(name)
+            next_name = self._next.get(name)
+            if next_name is not None:
+                self._prefetch(next_name)
+
+        return hook
+
+    def _root_pre_hook(self, module: torch.nn.Module, args: Any) -> None:
+        assert self._first is not None
+        self._prefetch(self._first)
+
+    def _root_post_hook(self, module: torch.nn.Module, args: Any, output: Any) -> None:
+        for name in list(self._swapped):
+            self._restore(name)
+        self._prefetched = {}
+
+    def _restore(self, name: str) -> None:
+        originals = self._swapped.pop(name, None)
+        if originals is None:
+            return
+        module = self._modules[name]
+        for tensor_name, original in originals.items():
+            tensors = module._parameters if tensor_name in module._parameters else module._buffers
+            tensors[tensor_name] = original  # type: ignore
+
+    def _prefetch(self, name: str) -> None:
+        if name in self._prefetched or name in self._swapped:
+            return
+        module = self._modules[name]
+        with torch.cuda.stream(self._stream):
+            copies = {
+                n: t.to(self._device, non_blocking=True)
+                for n, t in self._module_tensors(module).items()
+                if t.device.type != self._device.type
+            }
+            copied = torch.cuda.Event()
+            copied.record(self._stream)
+        self._prefetched[name] = (copies, copied)
@@ -5,6 +5,7 @@ import time
 from dataclasses import dataclass
 from functools import wraps
 from logging import Logger
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Protocol
 
 import psutil
@@ -24,9 +25,11 @@ from invokeai.backend.model_manager.load.model_cache.torch_module_autocast.torch
 )
 from invokeai.backend.model_manager.load.model_util import calc_model_size_by_data
 from invokeai.backend.model_manager.taxonomy import AnyModel, SubModelType
+from invokeai.backend.quantization.gguf.dequantized_weight_cache import dequantized_weight_cache
 from invokeai.backend.util.devices import TorchDevice
 from invokeai.backend.util.logging import InvokeAILogger
 from invokeai.backend.util.prefix_logger_adapter import PrefixedLoggerAdapter
+from invokeai.backend.util.tracing import get_tracer
 
 # Size of a GB in bytes.
 GB = 2**30
@@ -148,6 +151,10 @@ class ModelCache:
         log_memory_usage: bool = False,
         logger: Optional[Logger] = None,
         keep_alive_minutes: float = 0,
+        gguf_dequant_cache_vram_gb: float = 0,
+        gguf_dequant_cache_ram_gb: float = 0,
+        enable_vram_placement_profiling: bool = False,
+        vram_placement_plan_dir: Optional[Path] = None,
     ):
         """Initialize the model RAM cache.
 
@@ -168,6 +175,15 @@ class ModelCache:
             behaviour.
         :param logger: InvokeAILogger to use (otherwise creates one)
         :param keep_alive_minutes: How long to keep models in cache after last use (in minutes). 0 means keep indefinitely.
+        :param gguf_dequant_cache_vram_gb: The max amount of VRAM to use for caching dequantized GGUF weights in GB. The
+            cache only uses VRAM that is not needed for models or working memory. 0 disables caching in VRAM.
+        :param gguf_dequant_cache_ram_gb: The max amount of RAM to use for caching dequantized GGUF weights in GB. This
+            RAM counts against the RAM cache size. 0 disables caching in RAM.
+        :param enable_vram_placement_profiling: Whether to profile the first run of each partially-loaded model
+            architecture to plan which of its weights to keep in VRAM, and to prefetch streamed weights on CUDA. If
+            False, the plans are estimated from the shapes of the weights.
+        :param vram_placement_plan_dir: The directory in which to persist the profiled VRAM placement plans. Only used if
+            enable_vram_placement_profiling is True.
         """
         self._enable_partial_loading = enable_partial_loading
         self._keep_ram_copy_of_weights = keep_ram_copy_of_weights
@@ -175,6 +191,9 @@ class ModelCache:
         self._execution_device: torch.device = torch.device(execution_device)
         self._storage_device: torch.device = torch.device(storage_device)
 
+        self._enable_vram_placement_profiling = enable_vram_placement_profiling
+        self._vram_placement_plan_dir = vram_placement_plan_dir
+
         self._max_ram_cache_size_gb = max_ram_cache_size_gb
         self._max_vram_cache_size_gb = max_vram_cache_size_gb
 
@@ -205,6 +224,15 @@ class ModelCache:
         self._timeout_timer: Optional[threading.Timer] = None
         self._shutdown_event = threading.Event()
 
+        # The dequantized GGUF weight cache shares the model cache's memory budgets, and is freed before models are
+        # offloaded or dropped.
+        gguf_dequant_cache_enabled = gguf_dequant_cache_vram_gb > 0 or gguf_dequant_cache_ram_gb > 0
+        dequantized_weight_cache.configure(
+            vram_budget_bytes=int(gguf_dequant_cache_vram_gb * GB),
+            ram_budget_bytes=int(gguf_dequant_cache_ram_gb * GB),
+            get_headroom=self._get_dequantized_weight_cache_headroom if gguf_dequant_cache_enabled else None,
+        )
+
     def on_cache_hit(self, cb: CacheHitCallback) -> Callable[[], None]:
         self._on_cache_hit_callbacks.add(cb)
 
@@ -350,7 +378,11 @@ class ModelCache:
         # Wrap model.
         if isinstance(model, torch.nn.Module) and running_with_cuda and self._enable_partial_loading:
             wrapped_model = CachedModelWithPartialLoad(
-                model, effective_execution_device, keep_ram_copy=self._keep_ram_copy_of_weights
+                model,
+                effective_execution_device,
+                keep_ram_copy=self._keep_ram_copy_of_weights,
+                enable_placement_profiling=self._enable_vram_placement_profiling,
+                placement_plan_dir=self._vram_placement_plan_dir,
             )
         else:
             wrapped_model = CachedModelOnlyFullLoad(
@@ -446,7 +478,8 @@ class ModelCache:
             return
 
         try:
-            self._load_locked_model(cache_entry, working_mem_bytes)
+            with get_tracer().span("model_cache.lock", category="model_cache", model_key=cache_entry.key):
+                self._load_locked_model(cache_entry, working_mem_bytes)
             self._logger.debug(
                 f"Finished locking model {cache_entry.key} (Type: {cache_entry.cached_model.model.__class__.__name__})"
             )
@@ -519,7 +552,8 @@ class ModelCache:
         # vram_available = int(model_vram_needed * 0.1)
         # We add 1 MB to the available VRAM to account for small errors in memory tracking (e.g. off-by-one). A fully
         # loaded model is much faster than a 95% loaded model.
-        model_bytes_loaded = self._move_model_to_vram(cache_entry, vram_available + MB)
+        with get_tracer().span("model_cache.move_to_vram", category="model_cache", model_key=cache_entry.key):
+            model_bytes_loaded = self._move_model_to_vram(cache_entry, vram_available + MB)
 
         model_cur_vram_bytes = cache_entry.cached_model.cur_vram_bytes()
         vram_available = self._get_vram_available(working_mem_bytes)
@@ -678,12 +712,24 @@ class ModelCache:
 
     def _get_ram_in_use(self) -> int:
         """Get the amount of RAM currently in use."""
-        return sum(ce.cached_model.total_bytes() for ce in self._cached_models.values())
+        models_bytes = sum(ce.cached_model.total_bytes() for ce in self._cached_models.values())
+        return models_bytes + dequantized_weight_cache.bytes_in_use(self._storage_device)
 
     def _get_ram_available(self) -> int:
         """Get the amount of RAM available for the cache to use."""
         return self._ram_cache_size_bytes - self._get_ram_in_use()
 
+    def _get_dequantized_weight_cache_headroom(self, device: torch.device) -> int:
+        """Get the amount of memory on the device that the dequantized GGUF weight cache may use without taking memory
+        from models or working memory.
+        """
+        with self._lock:
+            if device.type == "cpu":
+                return self._get_ram_available()
+            if self._execution_device.type == "cpu":
+                return 0
+            return self._get_vram_available(None)
+
     def _capture_memory_snapshot(self) -> Optional[MemorySnapshot]:
         if self._log_memory_usage:
             return MemorySnapshot.capture()
@@ -710,6 +756,14 @@ class ModelCache:
             f"Offloading unlocked models with goal of making room for {vram_bytes_required / MB:.2f}MB of VRAM."
         )
         vram_bytes_freed = 0
+
+        # Dequantized GGUF weights are cheaper to recreate than models are to reload, so they are freed first.
+        vram_bytes_to_free = vram_bytes_required - self._get_vram_available(working_mem_bytes)
+        if vram_bytes_to_free > 0 and dequantized_weight_cache.bytes_in_use(self._execution_device) > 0:
+            dequant_bytes_freed = dequantized_weight_cache.free(self._execution_device, vram_bytes_to_free)
+            self._logger.debug(f"Freed {(dequant_bytes_freed / MB):.0f} MB of dequantized GGUF weights from VRAM.")
+            vram_bytes_freed += dequant_bytes_freed
+
         # TODO(ryand): Give more thought to the offloading policy used here.
         cache_entries_increasing_size = sorted(self._cached_models.values(), key=lambda x: x.cached_model.total_bytes())
         for cache_entry in cache_entries_increasing_size:
@@ -722,7 +776,8 @@ class ModelCache:
                 # TODO(ryand): In the future, we may want to partially unload locked models, but this requires careful
                 # handling of model patches (e.g. LoRA).
                 continue
-            cache_entry_bytes_freed = self._move_model_to_ram(cache_entry, vram_bytes_to_free)
+            with get_tracer().span("model_cache.offload", category="model_cache", model_key=cache_entry.key):
+                cache_entry_bytes_freed = self._move_model_to_ram(cache_entry, vram_bytes_to_free)
             if cache_entry_bytes_freed > 0:
                 self._logger.debug(
                     f"Unloaded {cache_entry.key} from VRAM to free {(cache_entry_bytes_freed / MB):.0f} MB."
@@ -774,6 +829,11 @@ class ModelCache:
         if torch.cuda.is_available():
             log += "  {:<30} {:.1f} MB\n".format("CUDA Memory Allocated:", torch.cuda.memory_allocated() / MB)
         log += "  {:<30} {}\n".format("Total models:", len(self._cached_models))
+        log += "  {:<30} vram={:.1f} MB, ram={:.1f} MB\n".format(
+            "Dequantized GGUF weights:",
+            dequantized_weight_cache.bytes_in_use(self._execution_device) / MB,
+            dequantized_weight_cache.bytes_in_use(self._storage_device) / MB,
+        )
 
         if include_entry_details and len(self._cached_models) > 0:
             log += "  Models:\n"
@@ -817,6 +877,12 @@ class ModelCache:
         ram_bytes_available = self._get_ram_available()
         ram_bytes_to_free = max(0, bytes_needed - ram_bytes_available)
 
+        # Dequantized GGUF weights are cheaper to recreate than models are to reload, so they are freed first.
+        if ram_bytes_to_free > 0 and dequantized_weight_cache.bytes_in_use(self._storage_device) > 0:
+            dequant_bytes_freed = dequantized_weight_cache.free(self._storage_device, ram_bytes_to_free)
+            self._logger.debug(f"Freed {(dequant_bytes_freed / MB):.2f}MB of dequantized GGUF weights from RAM.")
+            ram_bytes_to_free -= dequant_bytes_freed
+
         ram_bytes_freed = 0
         pos = 0
         models_cleared = 0
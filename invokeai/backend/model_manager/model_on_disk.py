@@ -7,8 +7,10 @@ from picklescan.scanner import scan_file_path
 from safetensors import safe_open
 
 from invokeai.app.services.config.config_default import get_config
+from invokeai.backend.model_hash.hash_cache import ModelHashCache
 from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS, ModelHash
 from invokeai.backend.model_manager.taxonomy import ModelRepoVariant
+from invokeai.backend.model_manager.util.model_util import read_checkpoint_meta
 from invokeai.backend.quantization.gguf.loaders import gguf_sd_loader
 from invokeai.backend.util.logging import InvokeAILogger
 from invokeai.backend.util.silence_warnings import SilenceWarnings
@@ -21,20 +23,27 @@ logger = InvokeAILogger.get_logger()
 class ModelOnDisk:
     """A utility class representing a model stored on disk."""
 
-    def __init__(self, path: Path, hash_algo: HASHING_ALGORITHMS = "blake3_single"):
+    def __init__(
+        self,
+        path: Path,
+        hash_algo: HASHING_ALGORITHMS = "blake3_single",
+        hash_cache: Optional[ModelHashCache] = None,
+    ):
         self.path = path
         if self.path.suffix in {".safetensors", ".bin", ".pt", ".ckpt"}:
             self.name = path.stem
         else:
             self.name = path.name
         self.hash_algo = hash_algo
+        self.hash_cache = hash_cache
         # Having a cache helps users of ModelOnDisk (i.e. configs) to save state
         # This prevents redundant computations during matching and parsing
         self._state_dict_cache: dict[Path, Any] = {}
+        self._state_dict_meta_cache: dict[Path, Any] = {}
         self._metadata_cache: dict[Path, Any] = {}
 
     def hash(self) -> str:
-        return ModelHash(algorithm=self.hash_algo).hash(self.path)
+        return ModelHash(algorithm=self.hash_algo, cache=self.hash_cache).hash(self.path)
 
     def size(self) -> int:
         if self.path.is_file():
@@ -89,25 +98,7 @@ class ModelOnDisk:
 
         with SilenceWarnings():
             if path.suffix.endswith((".ckpt", ".pt", ".pth", ".bin")):
-                scan_result = scan_file_path(path)
-                if scan_result.infected_files != 0:
-                    if get_config().unsafe_disable_picklescan:
-                        logger.warning(
-                            f"The model {path.stem} is potentially infected by malware, but picklescan is disabled. "
-                            "Proceeding with caution."
-                        )
-                    else:
-                        raise RuntimeError(
-                            f"The model {path.stem} is potentially infected by malware. Aborting import."
-                        )
-                if scan_result.scan_err:
-                    if get_config().unsafe_disable_picklescan:
-                        logger.warning(
-                            f"Error scanning the model at {path.stem} for malware, but picklescan is disabled. "
-                            "Proceeding with caution."
-                        )
-                    else:
-                        raise RuntimeError(f"Error scanning the model at {path.stem} for malware. Aborting import.")
+                self._scan_for_malware(path)
                 checkpoint = torch.load(path, map_location="cpu")
                 assert isinstance(checkpoint, dict)
             elif path.suffix.endswith(".gguf"):
@@ -121,6 +112,49 @@ class ModelOnDisk:
         self._state_dict_cache[path] = state_dict
         return state_dict
 
+    def load_state_dict_meta(self, path: Optional[Path] = None) -> StateDict:
+        """Loads the model's state dict without loading its tensors' data.
+
+        The keys, and the tensors' shapes and dtypes, are read from the file's header (safetensors), tensor table (GGUF)
+        or memory-mapped pickle (checkpoints). Tensors are on the meta device, and GGUF tensors are `GGMLTensor`s, so
+        the state dict can be used to identify the model, but not to run it. Use `load_state_dict` for that.
+        """
+        path = self.resolve_weight_file(path)
+
+        if path in self._state_dict_meta_cache:
+            return self._state_dict_meta_cache[path]
+
+        if not path.suffix.endswith((".ckpt", ".pt", ".pth", ".bin", ".gguf", ".safetensors")):
+            raise ValueError(f"Unrecognized model extension: {path.suffix}")
+
+        with SilenceWarnings():
+            if path.suffix.endswith((".ckpt", ".pt", ".pth", ".bin")):
+                self._scan_for_malware(path)
+            checkpoint = read_checkpoint_meta(path, scan=False)
+
+        state_dict = checkpoint.get("state_dict", checkpoint)
+        self._state_dict_meta_cache[path] = state_dict
+        return state_dict
+
+    def _scan_for_malware(self, path: Path) -> None:
+        scan_result = scan_file_path(path)
+        if scan_result.infected_files != 0:
+            if get_config().unsafe_disable_picklescan:
+                logger.warning(
+                    f"The model {path.stem} is potentially infected by malware, but picklescan is disabled. "
+                    "Proceeding with caution."
+                )
+            else:
+                raise RuntimeError(f"The model {path.stem} is potentially infected by malware. Aborting import.")
+        if scan_result.scan_err:
+            if get_config().unsafe_disable_picklescan:
+                logger.warning(
+                    f"Error scanning the model at {path.stem} for malware, but picklescan is disabled. "
+                    "Proceeding with caution."
+                )
+            else:
+                raise RuntimeError(f"Error scanning the model at {path.stem} for malware. Aborting import.")
+
     def resolve_weight_file(self, path: Optional[Path] = None) -> Path:
         if not path:
             weight_files = list(self.weight_files())
@@ -21,6 +21,7 @@ Example usage:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Optional
@@ -50,13 +51,26 @@ class ModelSearch:
         search = ModelSearch()
         search.on_model_found = lambda path : 'anime' in path.as_posix()
         found = search.search(Path('/tmp/models1'))
+
+    Directories are listed by a pool of `max_workers` threads, which speeds up searches of network shares and other
+    high-latency filesystems. Callbacks are always invoked from the thread that called `search()`.
     """
 
+    MODEL_DIR_MARKERS = [
+        "config.json",
+        "model_index.json",
+        "learned_embeds.bin",
+        "pytorch_lora_weights.bin",
+        "image_encoder.txt",
+    ]
+    MODEL_FILE_SUFFIXES = (".ckpt", ".bin", ".pth", ".safetensors", ".pt", ".gguf")
+
     def __init__(
         self,
         on_search_started: Optional[Callable[[Path], None]] = None,
         on_model_found: Optional[Callable[[Path], bool]] = None,
         on_search_completed: Optional[Callable[[set[Path]], None]] = None,
+        max_workers: int = 1,
     ) -> None:
         """Create a new ModelSearch object.
 
@@ -65,6 +79,7 @@ class ModelSearch:
             on_model_found: callback to be invoked when a model is found. The callback should return True if the model
                 should be included in the results.
             on_search_completed: callback to be invoked when the search is completed
+            max_workers: the number of threads used to list directories
         """
         self.stats = SearchStats()
         self.logger = InvokeAILogger.get_logger()
@@ -72,6 +87,7 @@ class ModelSearch:
         self.on_model_found = on_model_found
         self.on_search_completed = on_search_completed
         self.models_found: set[Path] = set()
+        self.max_workers = max_workers
 
     def search_started(self) -> None:
         self.models_found = set()
@@ -98,45 +114,42 @@ class ModelSearch:
         return self.models_found
 
     def _walk_directory(self, path: Path, max_depth: int = 20) -> None:
-        """Recursively walk the directory tree, looking for models."""
-        absolute_path = Path(path)
-        if (
-            len(absolute_path.parts) - len(self._directory.parts) > max_depth
-            or not absolute_path.exists()
-            or absolute_path.parent in self.models_found
-        ):
-            return
-        entries = os.scandir(absolute_path.as_posix())
-        entries = [entry for entry in entries if not entry.name.startswith(".")]
-        dirs = [entry for entry in entries if entry.is_dir()]
+        """Walk the directory tree, looking for models.
+
+        The tree is walked one level at a time. The directories of each level are listed concurrently, then the models
+        they contain are reported in order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="model_search") as executor:
+            level = [Path(path)]
+            while level:
+                next_level: list[Path] = []
+                for candidates, subdirs in executor.map(self._scan_directory, level):
+                    for candidate in candidates:
+                        try:
+                            self.model_found(candidate)
+                        except KeyboardInterrupt:
+                            raise
+                        except Exception as e:
+                            self.logger.warning(str(e))
+                    next_level.extend(d for d in subdirs if len(d.parts) - len(self._directory.parts) <= max_depth)
+                level = next_level
+
+    def _scan_directory(self, path: Path) -> tuple[list[Path], list[Path]]:
+        """Lists a directory, returning the models it contains and the subdirectories to search.
+
+        A directory containing one of the `MODEL_DIR_MARKERS` is itself a model, and is not searched any further.
+        """
+        try:
+            with os.scandir(path.as_posix()) as it:
+                entries = [entry for entry in it if not entry.name.startswith(".")]
+        except FileNotFoundError:
+            return [], []
+        except OSError as e:
+            self.logger.warning(f"Unable to search {path}: {e}")
+            return [], []
         file_names = [entry.name for entry in entries if entry.is_file()]
-        if any(
-            x in file_names
-            for x in [
-                "config.json",
-                "model_index.json",
-                "learned_embeds.bin",
-                "pytorch_lora_weights.bin",
-                "image_encoder.txt",
-            ]
-        ):
-            try:
-                self.model_found(absolute_path)
-                return
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                self.logger.warning(str(e))
-                return
-
-        for n in file_names:
-            if n.endswith((".ckpt", ".bin", ".pth", ".safetensors", ".pt", ".gguf")):
-                try:
-                    self.model_found(absolute_path / n)
-                except KeyboardInterrupt:
-                    raise
-                except Exception as e:
-                    self.logger.warning(str(e))
-
-        for d in dirs:
-            self._walk_directory(absolute_path / d)
+        if any(x in file_names for x in self.MODEL_DIR_MARKERS):
+            return [path], []
+        candidates = [path / n for n in file_names if n.endswith(self.MODEL_FILE_SUFFIXES)]
+        subdirs = [path / entry.name for entry in entries if entry.is_dir()]
+        return candidates, subdirs
@@ -10,13 +10,30 @@ import torch
 
 from invokeai.app.services.config.config_default import get_config
 from invokeai.backend.model_manager.taxonomy import ClipVariantType
-from invokeai.backend.quantization.gguf.loaders import gguf_sd_loader
+from invokeai.backend.quantization.gguf.loaders import gguf_sd_meta_loader
 from invokeai.backend.util.logging import InvokeAILogger
 
 logger = InvokeAILogger.get_logger()
 
 
+SAFETENSORS_DTYPES = {
+    "BOOL": torch.bool,
+    "U8": torch.uint8,
+    "I8": torch.int8,
+    "I16": torch.int16,
+    "I32": torch.int32,
+    "I64": torch.int64,
+    "F8_E4M3": torch.float8_e4m3fn,
+    "F8_E5M2": torch.float8_e5m2,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "F32": torch.float32,
+    "F64": torch.float64,
+}
+
+
 def _fast_safetensors_reader(path: str) -> Dict[str, torch.Tensor]:
+    """Reads a safetensors file's header into a state dict of tensors on the meta device, without reading any data."""
     checkpoint = {}
     device = torch.device("meta")
     with open(path, "rb") as f:
@@ -33,22 +50,21 @@ def _fast_safetensors_reader(path: str) -> Dict[str, torch.Tensor]:
         definition.pop("__metadata__", None)
 
         for key, info in definition.items():
-            dtype = {
-                "I8": torch.int8,
-                "I16": torch.int16,
-                "I32": torch.int32,
-                "I64": torch.int64,
-                "F16": torch.float16,
-                "F32": torch.float32,
-                "F64": torch.float64,
-            }[info["dtype"]]
-
+            dtype = SAFETENSORS_DTYPES[info["dtype"]]
             checkpoint[key] = torch.empty(info["shape"], dtype=dtype, device=device)
 
     return checkpoint
 
 
 def read_checkpoint_meta(path: Union[str, Path], scan: bool = True) -> Dict[str, torch.Tensor]:
+    """Reads a checkpoint's keys, and its tensors' shapes and dtypes, without reading the tensors' data (where the
+    format allows it).
+
+    - safetensors: Only the header is read. Tensors are on the meta device.
+    - GGUF: Only the header and tensor table are read. Tensors are `GGMLTensor`s wrapping data on the meta device.
+    - Pickle checkpoints: The pickle is memory-mapped (for the zip-based format), so the tensor data is not read.
+      Tensors are on the meta device. Non-tensor values (e.g. `global_step`) are preserved.
+    """
     if str(path).endswith(".safetensors"):
         try:
             path_str = path.as_posix() if isinstance(path, Path) else path
@@ -57,8 +73,7 @@ def read_checkpoint_meta(path: Union[str, Path], scan: bool = True) -> Dict[str,
             # TODO: create issue for support "meta"?
             checkpoint = safetensors.torch.load_file(path, device="cpu")
     elif str(path).endswith(".gguf"):
-        # The GGUF reader used here uses numpy memmap, so these tensors are not loaded into memory during this function
-        checkpoint = gguf_sd_loader(Path(path), compute_dtype=torch.float32)
+        checkpoint = gguf_sd_meta_loader(Path(path), compute_dtype=torch.float32)
     else:
         if scan:
             scan_result = pscan.scan_file_path(path)
@@ -79,7 +94,13 @@ def read_checkpoint_meta(path: Union[str, Path], scan: bool = True) -> Dict[str,
                 else:
                     raise RuntimeError(f"Error scanning the model at {path} for malware. Aborting import.")
 
-        checkpoint = torch.load(path, map_location=torch.device("meta"))
+        try:
+            # Memory-mapping avoids reading the tensor data, which torch.load would otherwise do before moving it to the
+            # meta device.
+            checkpoint = torch.load(path, map_location=torch.device("meta"), mmap=True)
+        except RuntimeError:
+            # Checkpoints in the legacy (non-zip) format can't be memory-mapped
+            checkpoint = torch.load(path, map_location=torch.device("meta"))
     return checkpoint
 
 
@@ -11,6 +11,7 @@ from invokeai.backend.patches.pad_with_zeros import pad_with_zeros
 from invokeai.backend.util import InvokeAILogger
 from invokeai.backend.util.devices import TorchDevice
 from invokeai.backend.util.original_weights_storage import OriginalWeightsStorage
+from invokeai.backend.util.tracing import get_tracer
 
 
 class LayerPatcher:
@@ -35,32 +36,35 @@ class LayerPatcher:
         original_weights = OriginalWeightsStorage(cached_weights)
         # original_modules are stored for unpatching layers that are wrapped.
         original_modules: dict[str, torch.nn.Module] = {}
+        tracer = get_tracer()
         try:
-            for patch, patch_weight in patches:
-                LayerPatcher.apply_smart_model_patch(
-                    model=model,
-                    prefix=prefix,
-                    patch=patch,
-                    patch_weight=patch_weight,
-                    original_weights=original_weights,
-                    original_modules=original_modules,
-                    dtype=dtype,
-                    force_direct_patching=force_direct_patching,
-                    force_sidecar_patching=force_sidecar_patching,
-                    suppress_warning_layers=suppress_warning_layers,
-                )
+            with tracer.span("layer_patcher.apply_patches", category="patches", prefix=prefix):
+                for patch, patch_weight in patches:
+                    LayerPatcher.apply_smart_model_patch(
+                        model=model,
+                        prefix=prefix,
+                        patch=patch,
+                        patch_weight=patch_weight,
+                        original_weights=original_weights,
+                        original_modules=original_modules,
+                        dtype=dtype,
+                        force_direct_patching=force_direct_patching,
+                        force_sidecar_patching=force_sidecar_patching,
+                        suppress_warning_layers=suppress_warning_layers,
+                    )
 
             yield
         finally:
-            # Restore directly patched layers.
-            for param_key, weight in original_weights.get_changed_weights():
-                cur_param = model.get_parameter(param_key)
-                cur_param.data = weight.to(dtype=cur_param.dtype, device=cur_param.device, copy=True)
-
-            # Clear patches from all patched modules.
-            # Note: This logic assumes no nested modules in original_modules.
-            for orig_module in original_modules.values():
-                orig_module.clear_patches()
+            with tracer.span("layer_patcher.restore", category="patches", prefix=prefix):
+                # Restore directly patched layers.
+                for param_key, weight in original_weights.get_changed_weights():
+                    cur_param = model.get_parameter(param_key)
+                    cur_param.data = weight.to(dtype=cur_param.dtype, device=cur_param.device, copy=True)
+
+                # Clear patches from all patched modules.
+                # Note: This logic assumes no nested modules in original_modules.
+                for orig_module in original_modules.values():
+                    orig_module.clear_patches()
 
     @staticmethod
     @torch.no_grad()
@@ -0,0 +1,138 @@
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import torch
+
+from invokeai.backend.util.calc_tensor_size import calc_tensor_size
+
+
+@dataclass
+class _CacheEntry:
+    dequantized: torch.Tensor
+    num_bytes: int
+    finalizer: weakref.finalize
+
+
+class DequantizedWeightCache:
+    """A cache of dequantized GGML weights, so that weights aren't dequantized again on every forward pass.
+
+    Entries are keyed by the quantized data tensor and the compute dtype, and are dropped when the quantized data tensor
+    is freed (e.g. when a model is offloaded from VRAM). A dequantized tensor lives on the same device as its quantized
+    data, and is counted against the VRAM budget or the RAM budget accordingly.
+
+    Weights are admitted while there is room in the budget, and are never evicted to make room for other weights. The
+    weights of a model are used in the same order on every step, so an LRU policy with a working set larger than the
+    budget would miss on every access. Instead, the weights that fit stay dequantized across steps and the rest are
+    dequantized on the fly. The model cache frees entries when it needs the memory for models.
+    """
+
+    def __init__(self, vram_budget_bytes: int = 0, ram_budget_bytes: int = 0):
+        self._vram_budget_bytes = vram_budget_bytes
+        self._ram_budget_bytes = ram_budget_bytes
+        # Returns the number of bytes that can be allocated on the given device without taking memory that the model
+        # cache needs.
+        self._get_headroom: Optional[Callable[[torch.device], int]] = None
+        self._entries: OrderedDict[tuple[int, torch.dtype], _CacheEntry] = OrderedDict()
+        self._bytes_in_use = {"vram": 0, "ram": 0}
+        # Entries are removed by finalizers, which can run on any thread and while the lock is held by the same thread.
+        self._lock = threading.RLock()
+
+    def configure(
+        self,
+        vram_budget_bytes: int,
+        ram_budget_bytes: int,
+        get_headroom: Optional[Callable[[torch.device], int]] = None,
+    ) -> None:
+        """Set the budgets, and drop any entries that no longer fit."""
+        with self._lock:
+            self._vram_budget_bytes = vram_budget_bytes
+            self._ram_budget_bytes = ram_budget_bytes
+            self._get_headroom = get_headroom
+        self.free(torch.device("cpu"), self.bytes_in_use(torch.device("cpu")) - ram_budget_bytes)
+        self.free(torch.device("cuda"), self.bytes_in_use(torch.device("cuda")) - vram_budget_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self._vram_budget_bytes > 0 or self._ram_budget_bytes > 0
+
+    def get(self, quantized_data: torch.Tensor, compute_dtype: torch.dtype) -> Optional[torch.Tensor]:
+        """Get the dequantized tensor for the quantized data, if it is cached."""
+        entry = self._entries.get((id(quantized_data), compute_dtype))
+        return entry.dequantized if entry is not None else None
+
+    def put(self, quantized_data: torch.Tensor, compute_dtype: torch.dtype, dequantized: torch.Tensor) -> bool:
+        """Cache the dequantized tensor for the quantized data, if there is room for it.
+
+        Returns:
+            True if the tensor was cached.
+        """
+        pool = _get_pool(dequantized.device)
+        num_bytes = calc_tensor_size(dequantized)
+        budget = self._vram_budget_bytes if pool == "vram" else self._ram_budget_bytes
+        if self._bytes_in_use[pool] + num_bytes > budget:
+            return False
+        # The headroom is checked outside the lock, because the model cache calls free() while holding its own lock.
+        get_headroom = self._get_headroom
+        if get_headroom is not None and get_headroom(dequantized.device) < num_bytes:
+            return False
+
+        key = (id(quantized_data), compute_dtype)
+        with self._lock:
+            if key in self._entries or self._bytes_in_use[pool] + num_bytes > budget:
+                return False
+            finalizer = weakref.finalize(quantized_data, self._remove, key)
+            finalizer.atexit = False
+            self._entries[key] = _CacheEntry(dequantized=dequantized, num_bytes=num_bytes, finalizer=finalizer)
+            self._bytes_in_use[pool] += num_bytes
+        return True
+
+    def bytes_in_use(self, device: torch.device) -> int:
+        """The number of bytes of dequantized weights cached on the device type (VRAM or RAM)."""
+        return self._bytes_in_use[_get_pool(device)]
+
+    def free(self, device: torch.device, bytes_to_free: int) -> int:
+        """Drop entries on the device type (VRAM or RAM), oldest first, until `bytes_to_free` bytes are freed.
+
+        Returns:
+            The number of bytes freed.
+        """
+        pool = _get_pool(device)
+        bytes_freed = 0
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if _get_pool(e.dequantized.device) == pool]:
+                if bytes_freed >= bytes_to_free:
+                    break
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                entry.finalizer.detach()
+                bytes_freed += self._remove(key)
+        return bytes_freed
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            for key in list(self._entries):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.finalizer.detach()
+                    self._remove(key)
+
+    def _remove(self, key: tuple[int, torch.dtype]) -> int:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return 0
+            self._bytes_in_use[_get_pool(entry.dequantized.device)] -= entry.num_bytes
+            return entry.num_bytes
+
+
+def _get_pool(device: torch.device) -> str:
+    return "ram" if device.type == "cpu" else "vram"
+
+
+# The dequantized weight cache used by all GGMLTensors. It is disabled until it is given a budget by the model cache.
+dequantized_weight_cache = DequantizedWeightCache()
@@ -3,6 +3,7 @@ from typing import overload
 import gguf
 import torch
 
+from invokeai.backend.quantization.gguf.dequantized_weight_cache import dequantized_weight_cache
 from invokeai.backend.quantization.gguf.utils import (
     DEQUANTIZE_FUNCTIONS,
     TORCH_COMPATIBLE_QTYPES,
@@ -14,6 +15,7 @@ def dequantize_and_run(func, args, kwargs):
     """A helper function for running math ops on GGMLTensor inputs.
 
     Dequantizes the inputs, and runs the function.
+    Dequantized weights are taken from the dequantized weight cache, unless the op mutates its inputs.
     Also casts other floating point tensors to match the compute_dtype of GGMLTensors
     to avoid dtype mismatches in matrix operations.
     """
@@ -36,9 +38,12 @@ def dequantize_and_run(func, args, kwargs):
             if compute_dtype is not None and target_device is not None:
                 break
 
+    # A mutating op must not modify a cached dequantized tensor.
+    use_cache = not func._schema.is_mutable
+
     def process_tensor(t):
         if hasattr(t, "get_dequantized_tensor"):
-            result = t.get_dequantized_tensor()
+            result = t.get_dequantized_tensor(use_cache=use_cache)
             # Ensure the dequantized tensor is on the target device
             if target_device is not None and result.device != target_device:
                 result = result.to(target_device)
@@ -169,15 +174,28 @@ class GGMLTensor(torch.Tensor):
         """
         return self
 
-    def get_dequantized_tensor(self):
+    def get_dequantized_tensor(self, use_cache: bool = False):
         """Return the dequantized tensor.
 
         Args:
-            dtype: The dtype of the dequantized tensor.
+            use_cache: Whether to use the dequantized weight cache. The returned tensor may be shared with other
+                callers, so it must not be modified in-place.
         """
         if self._ggml_quantization_type in TORCH_COMPATIBLE_QTYPES:
+            # This is just a cast, so there is nothing to gain from caching the result.
             return self.quantized_data.to(self.compute_dtype)
-        elif self._ggml_quantization_type in DEQUANTIZE_FUNCTIONS:
+
+        if not use_cache or not dequantized_weight_cache.enabled:
+            return self._dequantize()
+
+        dequantized = dequantized_weight_cache.get(self.quantized_data, self.compute_dtype)
+        if dequantized is None:
+            dequantized = self._dequantize()
+            dequantized_weight_cache.put(self.quantized_data, self.compute_dtype, dequantized)
+        return dequantized
+
+    def _dequantize(self) -> torch.Tensor:
+        if self._ggml_quantization_type in DEQUANTIZE_FUNCTIONS:
             # TODO(ryand): Look into how the dtype param is intended to be used.
             return dequantize(
                 data=self.quantized_data, qtype=self._ggml_quantization_type, oshape=self.tensor_shape, dtype=None
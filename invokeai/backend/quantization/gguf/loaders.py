@@ -1,5 +1,7 @@
 import gc
+import sys
 from pathlib import Path
+from typing import Optional
 
 import gguf
 import torch
@@ -36,20 +38,66 @@ class WrappedGGUFReader:
         gc.collect()
 
 
-def gguf_sd_loader(path: Path, compute_dtype: torch.dtype) -> dict[str, GGMLTensor]:
+def gguf_sd_loader(path: Path, compute_dtype: torch.dtype, mmap: Optional[bool] = None) -> dict[str, GGMLTensor]:
+    """Reads a GGUF file into a state dict of `GGMLTensor`s.
+
+    Args:
+        path: The path to the GGUF file.
+        compute_dtype: The dtype that the tensors are dequantized to.
+        mmap: Whether to keep the tensors backed by a memory map of the file instead of copying them into memory. A
+            tensor's pages are only read from disk (or the OS page cache) when the tensor is used or moved to another
+            device, and the file is unmapped when the last tensor is freed, e.g. when the model is dropped from the model
+            cache. Defaults to True, except on Windows, where a file can't be deleted while it is mapped.
+    """
+    if mmap is None:
+        mmap = sys.platform != "win32"
+
+    if mmap:
+        # The map is copy-on-write, so in-place changes to the tensors (e.g. by model loaders) never reach the file.
+        # There is no need to close the reader. The map is kept open by the tensors, and closed when they are freed.
+        reader = gguf.GGUFReader(path, mode="c")
+        return {
+            tensor.name: _to_ggml_tensor(tensor, torch.from_numpy(tensor.data), compute_dtype)
+            for tensor in reader.tensors
+        }
+
     with WrappedGGUFReader(path) as reader:
         sd: dict[str, GGMLTensor] = {}
         for tensor in reader.tensors:
             # Use .copy() to create a true copy of the data, not a view.
             # This is critical on Windows where the memory-mapped file cannot be deleted
             # while tensors still hold references to the mapped memory.
-            torch_tensor = torch.from_numpy(tensor.data.copy())
+            sd[tensor.name] = _to_ggml_tensor(tensor, torch.from_numpy(tensor.data.copy()), compute_dtype)
+        return sd
+
+
+def _to_ggml_tensor(tensor: gguf.ReaderTensor, torch_tensor: torch.Tensor, compute_dtype: torch.dtype) -> GGMLTensor:
+    shape = torch.Size(tuple(int(v) for v in reversed(tensor.shape)))
+    if tensor.tensor_type in TORCH_COMPATIBLE_QTYPES:
+        torch_tensor = torch_tensor.view(*shape)
+    return GGMLTensor(
+        torch_tensor,
+        ggml_quantization_type=tensor.tensor_type,
+        tensor_shape=shape,
+        compute_dtype=compute_dtype,
+    )
 
+
+def gguf_sd_meta_loader(path: Path, compute_dtype: torch.dtype) -> dict[str, GGMLTensor]:
+    """Reads a GGUF file's tensor table into a state dict of `GGMLTensor`s, without reading any tensor data.
+
+    The quantized data of each tensor is on the meta device, so the tensors' shapes, dtypes and quantization types can
+    be inspected (e.g. to identify the model), but they can't be used in any operations.
+    """
+    with WrappedGGUFReader(path) as reader:
+        sd: dict[str, GGMLTensor] = {}
+        for tensor in reader.tensors:
+            # The reader's data is a memory-mapped view, so creating an empty tensor with its dtype reads nothing.
+            data_dtype = torch.from_numpy(tensor.data[:0]).dtype
             shape = torch.Size(tuple(int(v) for v in reversed(tensor.shape)))
-            if tensor.tensor_type in TORCH_COMPATIBLE_QTYPES:
-                torch_tensor = torch_tensor.view(*shape)
+            data_shape = shape if tensor.tensor_type in TORCH_COMPATIBLE_QTYPES else torch.Size(tensor.data.shape)
             sd[tensor.name] = GGMLTensor(
-                torch_tensor,
+                torch.empty(data_shape, dtype=data_dtype, device="meta"),
                 ggml_quantization_type=tensor.tensor_type,
                 tensor_shape=shape,
                 compute_dtype=compute_dtype,
@@ -12,6 +12,12 @@ TORCH_COMPATIBLE_QTYPES = [None, gguf.GGMLQuantizationType.F32, gguf.GGMLQuantiz
 QK_K = 256
 K_SCALE_SIZE = 12
 
+# The non-linear 4-bit values used by IQ4_NL and IQ4_XS.
+IQ4_NL_KVALUES = [-127, -104, -83, -65, -49, -35, -22, -10, 1, 13, 25, 38, 53, 69, 89, 113]
+
+# The e2m1 values used by MXFP4, doubled.
+MXFP4_KVALUES = [0, 1, 2, 3, 4, 6, 8, 12, 0, -1, -2, -3, -4, -6, -8, -12]
+
 
 def get_scale_min(scales: torch.Tensor):
     n_blocks = scales.shape[0]
@@ -253,6 +259,111 @@ def dequantize_blocks_Q2_K(
     return qs.reshape((n_blocks, -1))
 
 
+# Ternary Quants #
+def dequantize_blocks_TQ2_0(
+    blocks: torch.Tensor, block_size: int, type_size: int, dtype: Optional[torch.dtype] = None
+) -> torch.Tensor:
+    n_blocks = blocks.shape[0]
+
+    qs, d = split_block_dims(blocks, QK_K // 4)
+    d = d.view(torch.float16).to(dtype)
+
+    qs = qs.reshape((n_blocks, -1, 1, 32)) >> torch.tensor([0, 2, 4, 6], device=d.device, dtype=torch.uint8).reshape(
+        (1, 1, 4, 1)
+    )
+    qs = (qs & 0x03).reshape((n_blocks, -1)).to(torch.int8) - 1
+
+    return d * qs
+
+
+def dequantize_blocks_TQ1_0(
+    blocks: torch.Tensor, block_size: int, type_size: int, dtype: Optional[torch.dtype] = None
+) -> torch.Tensor:
+    n_blocks = blocks.shape[0]
+
+    qs, qh, d = split_block_dims(blocks, (QK_K - 4 * QK_K // 64) // 5, QK_K // 64)
+    d = d.view(torch.float16).to(dtype)
+
+    # Each byte packs 5 (or 4, for qh) base-3 digits. Multiplying by a power of 3 (wrapping around at 256) moves a digit
+    # to the top of the byte, where it is extracted by scaling by 3 / 256.
+    pow3 = torch.tensor([1, 3, 9, 27, 81], device=d.device, dtype=torch.uint8)
+    qs0 = (qs[:, :32].reshape((n_blocks, -1, 1, 32)) * pow3.reshape((1, 1, 5, 1))).reshape((n_blocks, -1))
+    qs1 = (qs[:, 32:].reshape((n_blocks, -1, 1, 16)) * pow3.reshape((1, 1, 5, 1))).reshape((n_blocks, -1))
+    qh = (qh.reshape((n_blocks, -1, 1, 4)) * pow3[:4].reshape((1, 1, 4, 1))).reshape((n_blocks, -1))
+    qs = torch.cat([qs0, qs1, qh], dim=-1)
+    qs = ((qs.to(torch.int16) * 3) >> 8).to(torch.int8) - 1
+
+    return d * qs
+
+
+# Non-linear Quants #
+def dequantize_blocks_IQ4_NL(
+    blocks: torch.Tensor, block_size: int, type_size: int, dtype: Optional[torch.dtype] = None
+) -> torch.Tensor:
+    n_blocks = blocks.shape[0]
+
+    d, qs = split_block_dims(blocks, 2)
+    d = d.view(torch.float16).to(dtype)
+
+    qs = qs.reshape((n_blocks, -1, 1, block_size // 2)) >> torch.tensor(
+        [0, 4], device=d.device, dtype=torch.uint8
+    ).reshape((1, 1, 2, 1))
+    qs = (qs & 0x0F).reshape((n_blocks, -1))
+    kvalues = torch.tensor(IQ4_NL_KVALUES, device=d.device, dtype=torch.int8)
+
+    return d * kvalues[qs.long()]
+
+
+def dequantize_blocks_IQ4_XS(
+    blocks: torch.Tensor, block_size: int, type_size: int, dtype: Optional[torch.dtype] = None
+) -> torch.Tensor:
+    n_blocks = blocks.shape[0]
+
+    d, scales_h, scales_l, qs = split_block_dims(blocks, 2, 2, QK_K // 64)
+    d = d.view(torch.float16).to(dtype)
+
+    # 8 6-bit scales: the low 4 bits are packed in scales_l, and the high 2 bits in the 16-bit scales_h.
+    scales_h = scales_h.to(torch.int32)
+    scales_h = (scales_h[:, :1] | (scales_h[:, 1:] << 8)) >> torch.arange(
+        0, QK_K // 16, 2, device=d.device, dtype=torch.int32
+    ).reshape((1, -1))
+    scales_l = scales_l.reshape((n_blocks, -1, 1)) >> torch.tensor([0, 4], device=d.device, dtype=torch.uint8).reshape(
+        (1, 1, 2)
+    )
+    scales = (scales_l.reshape((n_blocks, -1)) & 0x0F) | ((scales_h & 0x03) << 4)
+    dl = (d * (scales - 32)).reshape((n_blocks, -1, 1))
+
+    qs = qs.reshape((n_blocks, -1, 1, 16)) >> torch.tensor([0, 4], device=d.device, dtype=torch.uint8).reshape(
+        (1, 1, 2, 1)
+    )
+    qs = (qs & 0x0F).reshape((n_blocks, -1, 32))
+    kvalues = torch.tensor(IQ4_NL_KVALUES, device=d.device, dtype=torch.int8)
+
+    return (dl * kvalues[qs.long()]).reshape((n_blocks, -1))
+
+
+# Microscaling Quants #
+def dequantize_blocks_MXFP4(
+    blocks: torch.Tensor, block_size: int, type_size: int, dtype: Optional[torch.dtype] = None
+) -> torch.Tensor:
+    n_blocks = blocks.shape[0]
+
+    e, qs = split_block_dims(blocks, 1)
+
+    # The e8m0 shared exponent, halved to match the doubled kvalues. Exponents 0 and 1 give subnormal floats.
+    e = e.to(torch.int32)
+    bits = torch.where(e < 2, torch.full_like(e, 0x00200000) << e, (e - 1) << 23)
+    d = bits.view(torch.float32).to(dtype)
+
+    qs = qs.reshape((n_blocks, 1, block_size // 2)) >> torch.tensor([0, 4], device=d.device, dtype=torch.uint8).reshape(
+        (1, 2, 1)
+    )
+    qs = (qs & 0x0F).reshape((n_blocks, -1))
+    kvalues = torch.tensor(MXFP4_KVALUES, device=d.device, dtype=torch.int8)
+
+    return d * kvalues[qs.long()]
+
+
 DEQUANTIZE_FUNCTIONS: dict[
     gguf.GGMLQuantizationType, Callable[[torch.Tensor, int, int, Optional[torch.dtype]], torch.Tensor]
 ] = {
@@ -267,8 +378,16 @@ DEQUANTIZE_FUNCTIONS: dict[
     gguf.GGMLQuantizationType.Q4_K: dequantize_blocks_Q4_K,
     gguf.GGMLQuantizationType.Q3_K: dequantize_blocks_Q3_K,
     gguf.GGMLQuantizationType.Q2_K: dequantize_blocks_Q2_K,
+    gguf.GGMLQuantizationType.TQ2_0: dequantize_blocks_TQ2_0,
+    gguf.GGMLQuantizationType.TQ1_0: dequantize_blocks_TQ1_0,
+    gguf.GGMLQuantizationType.IQ4_NL: dequantize_blocks_IQ4_NL,
+    gguf.GGMLQuantizationType.IQ4_XS: dequantize_blocks_IQ4_XS,
 }
 
+# MXFP4 was added in a later version of gguf.
+if hasattr(gguf.GGMLQuantizationType, "MXFP4"):
+    DEQUANTIZE_FUNCTIONS[gguf.GGMLQuantizationType.MXFP4] = dequantize_blocks_MXFP4
+
 
 def is_torch_compatible(tensor: Optional[torch.Tensor]):
     return getattr(tensor, "tensor_type", None) in TORCH_COMPATIBLE_QTYPES
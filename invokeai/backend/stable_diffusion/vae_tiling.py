@@ -1,8 +1,24 @@
-from contextlib import contextmanager
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Literal, Optional, TypeVar
 
+import torch
 from diffusers.models.autoencoders.autoencoder_kl import AutoencoderKL
 from diffusers.models.autoencoders.autoencoder_tiny import AutoencoderTiny
 
+from invokeai.app.invocations.constants import LATENT_SCALE_FACTOR
+from invokeai.backend.util.devices import TorchDevice
+from invokeai.backend.util.logging import InvokeAILogger
+from invokeai.backend.util.vae_working_memory import estimate_vae_working_memory_sd15_sdxl
+
+# The tile sizes (in image pixels) considered by adaptive tiling, largest first. Bigger tiles produce better results,
+# so we always pick the largest tile that is expected to fit in the available memory.
+ADAPTIVE_VAE_TILE_SIZES = (1024, 768, 512, 384, 256)
+ADAPTIVE_VAE_TILE_OVERLAP_FACTOR = 0.25
+
+T = TypeVar("T")
+
 
 @contextmanager
 def patch_vae_tiling_params(
@@ -33,3 +49,159 @@ def patch_vae_tiling_params(
         vae.tile_sample_min_size = orig_tile_sample_min_size
         vae.tile_latent_min_size = orig_tile_latent_min_size
         vae.tile_overlap_factor = orig_tile_overlap_factor
+
+
+@dataclass
+class VAETilingAttempt:
+    """A single attempt to run a VAE operation with adaptive tiling."""
+
+    tile_size: Optional[int]  # In image pixels. None if the attempt was not tiled.
+    seconds: float
+    succeeded: bool
+
+
+@dataclass
+class VAETilingStats:
+    """The tiling decision and timings of an adaptively-tiled VAE encode or decode."""
+
+    operation: Literal["encode", "decode"]
+    image_height: int
+    image_width: int
+    free_memory_bytes: Optional[int]
+    attempts: list[VAETilingAttempt] = field(default_factory=list)
+
+    @property
+    def tile_size(self) -> Optional[int]:
+        """The tile size of the successful attempt, or None if it was not tiled."""
+        for attempt in self.attempts:
+            if attempt.succeeded:
+                return attempt.tile_size
+        return None
+
+    @property
+    def num_oom_retries(self) -> int:
+        return sum(1 for attempt in self.attempts if not attempt.succeeded)
+
+
+def get_free_device_memory(device: torch.device) -> Optional[int]:
+    """Get the memory (in bytes) that is available for working memory on the device, or None if it is unbounded (CPU)
+    or unknown."""
+    if device.type == "cuda":
+        vram_free, _vram_total = torch.cuda.mem_get_info(device)
+        # Memory that is reserved by the torch caching allocator but not allocated is also available to us.
+        return vram_free + torch.cuda.memory_reserved(device) - torch.cuda.memory_allocated(device)
+    if device.type == "mps":
+        return max(0, torch.mps.recommended_max_memory() - torch.mps.driver_allocated_memory())
+    return None
+
+
+def plan_adaptive_vae_tiling(
+    operation: Literal["encode", "decode"],
+    image_tensor: torch.Tensor,
+    vae: AutoencoderKL | AutoencoderTiny,
+    fp32: bool,
+    free_memory_bytes: Optional[int],
+) -> list[Optional[int]]:
+    """Choose the tile sizes to attempt, in order, for an adaptively-tiled VAE operation.
+
+    The first entry is the preferred configuration: untiled (None) if the whole image is expected to fit in
+    `free_memory_bytes`, otherwise the largest tile size that is expected to fit. The remaining entries are
+    progressively smaller tile sizes to fall back to if the preferred configuration runs out of memory.
+    """
+    scale = LATENT_SCALE_FACTOR if operation == "decode" else 1
+    largest_image_side = scale * max(image_tensor.shape[-2], image_tensor.shape[-1])
+    # Tiling with a tile that is at least as large as the image is equivalent to not tiling.
+    tile_sizes = [s for s in ADAPTIVE_VAE_TILE_SIZES if s < largest_image_side]
+
+    def fits(tile_size: Optional[int]) -> bool:
+        if free_memory_bytes is None:
+            return True
+        working_memory = estimate_vae_working_memory_sd15_sdxl(
+            operation=operation, image_tensor=image_tensor, vae=vae, tile_size=tile_size, fp32=fp32
+        )
+        return working_memory <= free_memory_bytes
+
+    if fits(None) or len(tile_sizes) == 0:
+        return [None, *tile_sizes]
+
+    for i, tile_size in enumerate(tile_sizes):
+        if fits(tile_size):
+            return tile_sizes[i:]
+
+    # Nothing is expected to fit. Try the smallest tile size anyways - the estimates are conservative.
+    return tile_sizes[-1:]
+
+
+def run_with_adaptive_vae_tiling(
+    vae: AutoencoderKL | AutoencoderTiny,
+    operation: Literal["encode", "decode"],
+    image_tensor: torch.Tensor,
+    fp32: bool,
+    fn: Callable[[], T],
+) -> tuple[T, VAETilingStats]:
+    """Run a VAE operation, choosing whether to tile it and the tile size based on the free device memory.
+
+    If an attempt runs out of memory, it is retried with the next smaller tile size. The VAE's tiling state is left
+    enabled or disabled according to the last attempt.
+
+    Args:
+        vae: The VAE. It must already be on its execution device.
+        operation: The VAE operation that `fn` runs.
+        image_tensor: The input tensor of the operation (latents for decode, image for encode).
+        fp32: Whether the operation runs in full precision.
+        fn: Runs the operation with the VAE's current tiling configuration.
+
+    Returns:
+        The result of `fn` and the tiling stats.
+    """
+    free_memory_bytes = get_free_device_memory(vae.device)
+    tile_sizes = plan_adaptive_vae_tiling(
+        operation=operation, image_tensor=image_tensor, vae=vae, fp32=fp32, free_memory_bytes=free_memory_bytes
+    )
+    scale = LATENT_SCALE_FACTOR if operation == "decode" else 1
+    stats = VAETilingStats(
+        operation=operation,
+        image_height=scale * image_tensor.shape[-2],
+        image_width=scale * image_tensor.shape[-1],
+        free_memory_bytes=free_memory_bytes,
+    )
+    logger = InvokeAILogger.get_logger()
+
+    for i, tile_size in enumerate(tile_sizes):
+        tiling_context = nullcontext()
+        if tile_size is None:
+            vae.disable_tiling()
+        else:
+            vae.enable_tiling()
+            tiling_context = patch_vae_tiling_params(
+                vae,
+                tile_sample_min_size=tile_size,
+                tile_latent_min_size=tile_size // LATENT_SCALE_FACTOR,
+                tile_overlap_factor=ADAPTIVE_VAE_TILE_OVERLAP_FACTOR,
+            )
+
+        start_time = time.time()
+        out_of_memory = False
+        try:
+            with tiling_context:
+                result = fn()
+        except torch.cuda.OutOfMemoryError:
+            if i == len(tile_sizes) - 1:
+                raise
+            out_of_memory = True
+
+        stats.attempts.append(
+            VAETilingAttempt(tile_size=tile_size, seconds=time.time() - start_time, succeeded=not out_of_memory)
+        )
+        if not out_of_memory:
+            return result, stats
+
+        # We release the working memory outside of the except block, so that the exception's references to the
+        # intermediate tensors have been dropped.
+        logger.warning(
+            f"VAE {operation} ran out of memory with tile size {tile_size or 'untiled'}, retrying with tile size "
+            f"{tile_sizes[i + 1]}."
+        )
+        TorchDevice.empty_cache()
+
+    raise AssertionError("Unreachable: the last adaptive VAE tiling attempt either returns or raises.")
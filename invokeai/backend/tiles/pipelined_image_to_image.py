@@ -0,0 +1,154 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import torch
+
+from invokeai.app.services.session_processor.session_processor_common import CanceledException
+from invokeai.backend.tiles.utils import Tile
+
+# The max number of batches whose outputs are being copied to the host or merged, while the next batch runs. Each has a
+# host buffer.
+MAX_BATCHES_IN_FLIGHT = 2
+
+
+def batch_tiles(tiles: list[Tile], batch_size: int) -> list[list[Tile]]:
+    """Group consecutive tiles of the same size into batches of up to `batch_size` tiles, preserving their order."""
+    batches: list[list[Tile]] = []
+    for tile in tiles:
+        if batches and len(batches[-1]) < batch_size and _tile_size(batches[-1][0]) == _tile_size(tile):
+            batches[-1].append(tile)
+        else:
+            batches.append([tile])
+    return batches
+
+
+def _tile_size(tile: Tile) -> tuple[int, int]:
+    return (tile.coords.bottom - tile.coords.top, tile.coords.right - tile.coords.left)
+
+
+def run_tiled_image_to_image(
+    image_tensor: torch.Tensor,
+    tiles: list[Tile],
+    scale: int,
+    run_model: Callable[[torch.Tensor], torch.Tensor],
+    batch_size: int = 1,
+    is_canceled: Callable[[], bool] = lambda: False,
+    step_callback: Callable[[int, int], None] = lambda step, total_steps: None,
+) -> torch.Tensor:
+    """Run an image-to-image model over the tiles of an image, and merge the output tiles into the output image.
+
+    The work is pipelined, so that the device doesn't sit idle between tiles:
+    - Consecutive tiles of the same size are run in batches of up to `batch_size` tiles.
+    - Each batch's output is converted to uint8 on the device and, on CUDA, copied to a pinned host buffer on a separate
+      stream, so the copy overlaps the next batch's inference.
+    - Output tiles are merged into the output image on a CPU thread, in order.
+
+    Tiles are merged in the order they are given. Only half of the overlap on the top and left side of each tile is
+    kept, as in the serial implementation.
+
+    Args:
+        image_tensor: The input image, with shape (1, C, H, W) and values in the range [0, 1], on the model's device
+            and dtype.
+        tiles: The tiles to process, in processing order.
+        scale: The scale of the model.
+        run_model: Runs the model on a batch of tiles, with shape (N, C, h, w).
+        batch_size: The max number of tiles to run per forward pass.
+        is_canceled: Returns True if the processing should be canceled.
+        step_callback: Called with the number of tiles merged so far and the total number of tiles.
+
+    Returns:
+        The output image, with shape (H * scale, W * scale, C), dtype uint8, on the CPU.
+    """
+    _, channels, height, width = image_tensor.shape
+    output_tensor = torch.zeros((height * scale, width * scale, channels), dtype=torch.uint8, device="cpu")
+    use_copy_stream = image_tensor.device.type == "cuda"
+    copy_stream = torch.cuda.Stream(device=image_tensor.device) if use_copy_stream else None
+    # Pinned host buffers, reused round-robin. A buffer is reused once the batch that last used it has been merged.
+    host_buffers: list[Optional[torch.Tensor]] = [None] * MAX_BATCHES_IN_FLIGHT
+
+    batches = batch_tiles(tiles, batch_size)
+    total_tiles = len(tiles)
+    merged_tiles = 0
+    in_flight: deque[tuple[Future[None], int]] = deque()
+
+    def finish_batch() -> None:
+        nonlocal merged_tiles
+        future, num_tiles = in_flight.popleft()
+        future.result()
+        merged_tiles += num_tiles
+        step_callback(merged_tiles, total_tiles)
+
+    step_callback(0, total_tiles)
+    merge_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tile_merge")
+    try:
+        for i, batch in enumerate(batches):
+            # Exit early if the invocation has been canceled.
+            if is_canceled():
+                raise CanceledException
+
+            while in_flight and (len(in_flight) >= MAX_BATCHES_IN_FLIGHT or in_flight[0][0].done()):
+                finish_batch()
+
+            input_batch = torch.cat(
+                [
+                    image_tensor[:, :, tile.coords.top : tile.coords.bottom, tile.coords.left : tile.coords.right]
+                    for tile in batch
+                ]
+            )
+            output_batch = run_model(input_batch)
+            # (N, C, H, W) -> (N, H, W, C), converted to the output tensor's format on the device, so that a quarter of
+            # the data is copied to the host
+            output_batch = (output_batch.permute(0, 2, 3, 1).clamp(0, 1) * 255).to(dtype=torch.uint8)
+
+            copied: Optional[torch.cuda.Event] = None
+            if copy_stream is not None:
+                slot = i % MAX_BATCHES_IN_FLIGHT
+                host_buffer = host_buffers[slot]
+                if host_buffer is None or host_buffer.shape != output_batch.shape:
+                    host_buffer = torch.empty(output_batch.shape, dtype=torch.uint8, pin_memory=True)
+                    host_buffers[slot] = host_buffer
+                computed = torch.cuda.Event()
+                computed.record()
+                copied = torch.cuda.Event()
+                with torch.cuda.stream(copy_stream):
+                    copy_stream.wait_event(computed)
+                    host_buffer.copy_(output_batch, non_blocking=True)
+                    copied.record(copy_stream)
+                # The output batch must not be freed until the copy stream is done with it
+                output_batch.record_stream(copy_stream)
+            else:
+                host_buffer = output_batch.to(device="cpu")
+
+            future = merge_executor.submit(_merge_batch, output_tensor, host_buffer, copied, batch, scale)
+            in_flight.append((future, len(batch)))
+
+        while in_flight:
+            finish_batch()
+    finally:
+        merge_executor.shutdown(wait=True, cancel_futures=True)
+
+    return output_tensor
+
+
+def _merge_batch(
+    output_tensor: torch.Tensor,
+    output_batch: torch.Tensor,
+    copied: Optional[torch.cuda.Event],
+    batch: list[Tile],
+    scale: int,
+) -> None:
+    """Merge a batch of output tiles, with shape (N, H, W, C), into the output tensor."""
+    if copied is not None:
+        copied.synchronize()
+    for tile, output_tile in zip(batch, output_batch, strict=True):
+        # We only keep half of the overlap on the top and left side of the tile. We do this in case there are edge
+        # artifacts. We don't bother with any 'blending' in the current implementation - for most upscalers it seems
+        # unnecessary, but we may find a need in the future.
+        top_overlap = tile.overlap.top * scale // 2
+        left_overlap = tile.overlap.left * scale // 2
+        output_tensor[
+            tile.coords.top * scale + top_overlap : tile.coords.bottom * scale,
+            tile.coords.left * scale + left_overlap : tile.coords.right * scale,
+            :,
+        ] = output_tile[top_overlap:, left_overlap:, :]
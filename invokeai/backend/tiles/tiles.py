@@ -1,4 +1,7 @@
+import functools
 import math
+import threading
+from abc import ABC, abstractmethod
 from typing import Union
 
 import numpy as np
@@ -227,6 +230,231 @@ def calc_tiles_min_overlap(
     return calc_overlap(tiles, num_tiles_x, num_tiles_y)
 
 
+@functools.lru_cache(maxsize=64)
+def _get_linear_blend_mask(length: int, overlap: int, blend_amount: int) -> np.ndarray:
+    """Get a 1D float32 linear blending mask for a tile edge.
+
+    The mask is 0.0 before the blending region, ramps linearly from 0.0 to 1.0 across `blend_amount` px centered at the
+    halfway point of the overlap, and is 1.0 afterwards. Masks are cached per (length, overlap, blend_amount) so that
+    tiles with the same shape share a single read-only array.
+    """
+    mask = np.ones(shape=(length,), dtype=np.float32)
+    if overlap > 0:
+        assert overlap >= blend_amount
+        # Center the blending gradient in the middle of the overlap.
+        blend_start = overlap // 2 - blend_amount // 2
+        # The region before the blending region is masked completely.
+        mask[:blend_start] = 0.0
+        # Apply the blend gradient to the mask.
+        mask[blend_start : blend_start + blend_amount] = np.linspace(
+            start=0.0, stop=1.0, num=blend_amount, dtype=np.float32
+        )
+    mask.setflags(write=False)
+    return mask
+
+
+class TileMerger(ABC):
+    """Incrementally merges tile images into a destination image as they become available.
+
+    Tiles may be added in any order and from any thread. Internally, tiles are merged in the same left-to-right,
+    top-to-bottom order as the batch merge functions, so the result does not depend on the order in which tiles are
+    added. Out-of-order tiles are held until all of their predecessors have been added. Only a single row buffer is
+    allocated at a time, and tile images are released as soon as they have been merged.
+
+    Subclasses implement `_merge_tile_into_row(...)` and `_merge_row_into_dst(...)`.
+    """
+
+    def __init__(self, dst_image: np.ndarray, tiles: list[Tile], blend_amount: int):
+        """
+        Args:
+            dst_image (np.ndarray): The destination image. Shape: (H, W, C).
+            tiles (list[Tile]): The list of tiles. Tile images are identified by their index into this list.
+            blend_amount (int): The amount of blending (in px) between adjacent overlapping tiles.
+        """
+        self._dst_image = dst_image
+        self._tiles = tiles
+        self._blend_amount = blend_amount
+
+        # Sort tile indices first by top y coordinate, then by left x coordinate, and organize them into rows.
+        sorted_tile_idxs = sorted(range(len(tiles)), key=lambda i: (tiles[i].coords.top, tiles[i].coords.left))
+        self._rows: list[list[int]] = []
+        for tile_idx in sorted_tile_idxs:
+            tile = tiles[tile_idx]
+            if self._rows:
+                first_tile_in_cur_row = tiles[self._rows[-1][0]]
+                if (
+                    tile.coords.top == first_tile_in_cur_row.coords.top
+                    and tile.coords.bottom == first_tile_in_cur_row.coords.bottom
+                ):
+                    self._rows[-1].append(tile_idx)
+                    continue
+            self._rows.append([tile_idx])
+
+        self._pending_tile_images: dict[int, np.ndarray] = {}
+        self._added_tile_idxs: set[int] = set()
+        self._row_idx = 0
+        self._col_idx = 0
+        self._row_image: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def tile_idxs_in_merge_order(self) -> list[int]:
+        """The tile indices in the order in which they are merged. Adding tiles in this order minimizes the number of
+        tile images that must be held while waiting for a predecessor."""
+        return [tile_idx for row in self._rows for tile_idx in row]
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether all tiles have been merged into the destination image."""
+        return self._row_idx >= len(self._rows)
+
+    def add_tile(self, tile_idx: int, tile_image: np.ndarray) -> None:
+        """Add a tile image, merging it (and any queued tiles that it unblocks) into the destination image.
+
+        Args:
+            tile_idx (int): The index of the tile in `tiles`.
+            tile_image (np.ndarray): The tile image. Shape: (H, W, C).
+        """
+        if tile_idx < 0 or tile_idx >= len(self._tiles):
+            raise ValueError(f"Tile index {tile_idx} is out of range for {len(self._tiles)} tiles.")
+        with self._lock:
+            if tile_idx in self._added_tile_idxs:
+                raise ValueError(f"Tile {tile_idx} has already been added.")
+            self._added_tile_idxs.add(tile_idx)
+            self._pending_tile_images[tile_idx] = tile_image
+            self._merge_pending()
+
+    def finalize(self) -> np.ndarray:
+        """Check that every tile has been merged and return the destination image."""
+        if not self.is_complete:
+            raise ValueError(f"Only {len(self._added_tile_idxs)} of {len(self._tiles)} tiles have been added.")
+        return self._dst_image
+
+    def _merge_pending(self) -> None:
+        while not self.is_complete:
+            row = self._rows[self._row_idx]
+            tile_idx = row[self._col_idx]
+            tile_image = self._pending_tile_images.pop(tile_idx, None)
+            if tile_image is None:
+                # We are still waiting for this tile.
+                return
+
+            first_tile_in_row = self._tiles[row[0]]
+            if self._row_image is None:
+                row_height = first_tile_in_row.coords.bottom - first_tile_in_row.coords.top
+                self._row_image = np.zeros(
+                    (row_height, self._dst_image.shape[1], self._dst_image.shape[2]), dtype=self._dst_image.dtype
+                )
+
+            self._merge_tile_into_row(self._row_image, self._tiles[tile_idx], tile_image)
+            self._col_idx += 1
+
+            if self._col_idx == len(row):
+                self._merge_row_into_dst(first_tile_in_row, self._row_image)
+                self._row_image = None
+                self._row_idx += 1
+                self._col_idx = 0
+
+    @abstractmethod
+    def _merge_tile_into_row(self, row_image: np.ndarray, tile: Tile, tile_image: np.ndarray) -> None:
+        """Merge a tile image into the current row buffer. Tiles in a row are merged left-to-right."""
+
+    @abstractmethod
+    def _merge_row_into_dst(self, first_tile_in_row: Tile, row_image: np.ndarray) -> None:
+        """Merge a completed row buffer into the destination image. Rows are merged top-to-bottom."""
+
+
+class LinearBlendingTileMerger(TileMerger):
+    """A `TileMerger` that applies linear blending between the tiles.
+
+    The linear blending is centered at the halfway point of the overlap between adjacent tiles.
+    """
+
+    def _merge_tile_into_row(self, row_image: np.ndarray, tile: Tile, tile_image: np.ndarray) -> None:
+        # We expect the tiles to be ordered left-to-right. For each tile, we apply linear blending to the left of the
+        # current tile. The inverse linear blending is automatically applied to the right of the tiles that have
+        # already been pasted by the paste(...) operation.
+        mask = None
+        if tile.overlap.left > 0:
+            # Shape: (1, W). The mask is broadcast over the tile height.
+            mask = _get_linear_blend_mask(tile_image.shape[1], tile.overlap.left, self._blend_amount)[np.newaxis, :]
+        paste(
+            dst_image=row_image,
+            src_image=tile_image,
+            box=TBLR(
+                top=0, bottom=tile.coords.bottom - tile.coords.top, left=tile.coords.left, right=tile.coords.right
+            ),
+            mask=mask,
+        )
+
+    def _merge_row_into_dst(self, first_tile_in_row: Tile, row_image: np.ndarray) -> None:
+        # We apply linear blending to the top of the current row. We assume that the entire row has the same vertical
+        # overlaps as the first_tile_in_row.
+        mask = None
+        if first_tile_in_row.overlap.top > 0:
+            # Shape: (H, 1). The mask is broadcast over the row width.
+            mask = _get_linear_blend_mask(row_image.shape[0], first_tile_in_row.overlap.top, self._blend_amount)[
+                :, np.newaxis
+            ]
+        paste(
+            dst_image=self._dst_image,
+            src_image=row_image,
+            box=TBLR(
+                top=first_tile_in_row.coords.top,
+                bottom=first_tile_in_row.coords.bottom,
+                left=0,
+                right=row_image.shape[1],
+            ),
+            mask=mask,
+        )
+
+
+class SeamBlendingTileMerger(TileMerger):
+    """A `TileMerger` that applies seam blending between the tiles.
+
+    The seam blending is centered on a seam of least energy of the overlap between adjacent tiles.
+    """
+
+    def _merge_tile_into_row(self, row_image: np.ndarray, tile: Tile, tile_image: np.ndarray) -> None:
+        # We expect the tiles to be ordered left-to-right.
+        # For each tile:
+        # - extract the overlap regions and pass to seam_blend()
+        # - apply blended region to the row_image
+        # - apply the un-blended region to the row_image
+        overlap_size = tile.overlap.left
+        if overlap_size > 0:
+            assert overlap_size >= self._blend_amount
+
+            overlap_coord_right = tile.coords.left + overlap_size
+            src_overlap = row_image[:, tile.coords.left : overlap_coord_right]
+            dst_overlap = tile_image[:, :overlap_size]
+            blended_overlap = seam_blend(src_overlap, dst_overlap, self._blend_amount, x_seam=False)
+            row_image[:, tile.coords.left : overlap_coord_right] = blended_overlap
+            row_image[:, overlap_coord_right : tile.coords.right] = tile_image[:, overlap_size:]
+        else:
+            # no overlap just paste the tile
+            row_image[:, tile.coords.left : tile.coords.right] = tile_image
+
+    def _merge_row_into_dst(self, first_tile_in_row: Tile, row_image: np.ndarray) -> None:
+        # We assume that the entire row has the same vertical overlaps as the first_tile_in_row.
+        # Rows are processed in the same way as tiles (extract overlap, blend, apply)
+        row_overlap_size = first_tile_in_row.overlap.top
+        if row_overlap_size > 0:
+            assert row_overlap_size >= self._blend_amount
+
+            overlap_coords_bottom = first_tile_in_row.coords.top + row_overlap_size
+            src_overlap = self._dst_image[first_tile_in_row.coords.top : overlap_coords_bottom, :]
+            dst_overlap = row_image[:row_overlap_size, :]
+            blended_overlap = seam_blend(src_overlap, dst_overlap, self._blend_amount, x_seam=True)
+            self._dst_image[first_tile_in_row.coords.top : overlap_coords_bottom, :] = blended_overlap
+            self._dst_image[overlap_coords_bottom : first_tile_in_row.coords.bottom, :] = row_image[
+                row_overlap_size:, :
+            ]
+        else:
+            # no overlap just paste the row
+            self._dst_image[first_tile_in_row.coords.top : first_tile_in_row.coords.bottom, :] = row_image
+
+
 def merge_tiles_with_linear_blending(
     dst_image: np.ndarray, tiles: list[Tile], tile_images: list[np.ndarray], blend_amount: int
 ):
@@ -245,97 +473,10 @@ def merge_tiles_with_linear_blending(
         tile_images (list[np.ndarray]): The tile images to merge into `dst_image`.
         blend_amount (int): The amount of blending (in px) between adjacent overlapping tiles.
     """
-    # Sort tiles and images first by left x coordinate, then by top y coordinate. During tile processing, we want to
-    # iterate over tiles left-to-right, top-to-bottom.
-    tiles_and_images = list(zip(tiles, tile_images, strict=True))
-    tiles_and_images = sorted(tiles_and_images, key=lambda x: x[0].coords.left)
-    tiles_and_images = sorted(tiles_and_images, key=lambda x: x[0].coords.top)
-
-    # Organize tiles into rows.
-    tile_and_image_rows: list[list[tuple[Tile, np.ndarray]]] = []
-    cur_tile_and_image_row: list[tuple[Tile, np.ndarray]] = []
-    first_tile_in_cur_row, _ = tiles_and_images[0]
-    for tile_and_image in tiles_and_images:
-        tile, _ = tile_and_image
-        if not (
-            tile.coords.top == first_tile_in_cur_row.coords.top
-            and tile.coords.bottom == first_tile_in_cur_row.coords.bottom
-        ):
-            # Store the previous row, and start a new one.
-            tile_and_image_rows.append(cur_tile_and_image_row)
-            cur_tile_and_image_row = []
-            first_tile_in_cur_row, _ = tile_and_image
-
-        cur_tile_and_image_row.append(tile_and_image)
-    tile_and_image_rows.append(cur_tile_and_image_row)
-
-    # Prepare 1D linear gradients for blending.
-    gradient_left_x = np.linspace(start=0.0, stop=1.0, num=blend_amount)
-    gradient_top_y = np.linspace(start=0.0, stop=1.0, num=blend_amount)
-    # Convert shape: (blend_amount, ) -> (blend_amount, 1). The extra dimension enables the gradient to be applied
-    # to a 2D image via broadcasting. Note that no additional dimension is needed on gradient_left_x for
-    # broadcasting to work correctly.
-    gradient_top_y = np.expand_dims(gradient_top_y, axis=1)
-
-    for tile_and_image_row in tile_and_image_rows:
-        first_tile_in_row, _ = tile_and_image_row[0]
-        row_height = first_tile_in_row.coords.bottom - first_tile_in_row.coords.top
-        row_image = np.zeros((row_height, dst_image.shape[1], dst_image.shape[2]), dtype=dst_image.dtype)
-
-        # Blend the tiles in the row horizontally.
-        for tile, tile_image in tile_and_image_row:
-            # We expect the tiles to be ordered left-to-right. For each tile, we construct a mask that applies linear
-            # blending to the left of the current tile. The inverse linear blending is automatically applied to the
-            # right of the tiles that have already been pasted by the paste(...) operation.
-            tile_height, tile_width, _ = tile_image.shape
-            mask = np.ones(shape=(tile_height, tile_width), dtype=np.float64)
-
-            # Left blending:
-            if tile.overlap.left > 0:
-                assert tile.overlap.left >= blend_amount
-                # Center the blending gradient in the middle of the overlap.
-                blend_start_left = tile.overlap.left // 2 - blend_amount // 2
-                # The region left of the blending region is masked completely.
-                mask[:, :blend_start_left] = 0.0
-                # Apply the blend gradient to the mask.
-                mask[:, blend_start_left : blend_start_left + blend_amount] = gradient_left_x
-                # For visual debugging:
-                # tile_image[:, blend_start_left : blend_start_left + blend_amount] = 0
-
-            paste(
-                dst_image=row_image,
-                src_image=tile_image,
-                box=TBLR(
-                    top=0, bottom=tile.coords.bottom - tile.coords.top, left=tile.coords.left, right=tile.coords.right
-                ),
-                mask=mask,
-            )
-
-        # Blend the row into the dst_image vertically.
-        # We construct a mask that applies linear blending to the top of the current row. The inverse linear blending is
-        # automatically applied to the bottom of the tiles that have already been pasted by the paste(...) operation.
-        mask = np.ones(shape=(row_image.shape[0], row_image.shape[1]), dtype=np.float64)
-        # Top blending:
-        # (See comments under 'Left blending' for an explanation of the logic.)
-        # We assume that the entire row has the same vertical overlaps as the first_tile_in_row.
-        if first_tile_in_row.overlap.top > 0:
-            assert first_tile_in_row.overlap.top >= blend_amount
-            blend_start_top = first_tile_in_row.overlap.top // 2 - blend_amount // 2
-            mask[:blend_start_top, :] = 0.0
-            mask[blend_start_top : blend_start_top + blend_amount, :] = gradient_top_y
-            # For visual debugging:
-            # row_image[blend_start_top : blend_start_top + blend_amount, :] = 0
-        paste(
-            dst_image=dst_image,
-            src_image=row_image,
-            box=TBLR(
-                top=first_tile_in_row.coords.top,
-                bottom=first_tile_in_row.coords.bottom,
-                left=0,
-                right=row_image.shape[1],
-            ),
-            mask=mask,
-        )
+    merger = LinearBlendingTileMerger(dst_image=dst_image, tiles=tiles, blend_amount=blend_amount)
+    for tile_idx, (_, tile_image) in enumerate(zip(tiles, tile_images, strict=True)):
+        merger.add_tile(tile_idx, tile_image)
+    merger.finalize()
 
 
 def merge_tiles_with_seam_blending(
@@ -356,71 +497,7 @@ def merge_tiles_with_seam_blending(
         tile_images (list[np.ndarray]): The tile images to merge into `dst_image`.
         blend_amount (int): The amount of blending (in px) between adjacent overlapping tiles.
     """
-    # Sort tiles and images first by left x coordinate, then by top y coordinate. During tile processing, we want to
-    # iterate over tiles left-to-right, top-to-bottom.
-    tiles_and_images = list(zip(tiles, tile_images, strict=True))
-    tiles_and_images = sorted(tiles_and_images, key=lambda x: x[0].coords.left)
-    tiles_and_images = sorted(tiles_and_images, key=lambda x: x[0].coords.top)
-
-    # Organize tiles into rows.
-    tile_and_image_rows: list[list[tuple[Tile, np.ndarray]]] = []
-    cur_tile_and_image_row: list[tuple[Tile, np.ndarray]] = []
-    first_tile_in_cur_row, _ = tiles_and_images[0]
-    for tile_and_image in tiles_and_images:
-        tile, _ = tile_and_image
-        if not (
-            tile.coords.top == first_tile_in_cur_row.coords.top
-            and tile.coords.bottom == first_tile_in_cur_row.coords.bottom
-        ):
-            # Store the previous row, and start a new one.
-            tile_and_image_rows.append(cur_tile_and_image_row)
-            cur_tile_and_image_row = []
-            first_tile_in_cur_row, _ = tile_and_image
-
-        cur_tile_and_image_row.append(tile_and_image)
-    tile_and_image_rows.append(cur_tile_and_image_row)
-
-    for tile_and_image_row in tile_and_image_rows:
-        first_tile_in_row, _ = tile_and_image_row[0]
-        row_height = first_tile_in_row.coords.bottom - first_tile_in_row.coords.top
-        row_image = np.zeros((row_height, dst_image.shape[1], dst_image.shape[2]), dtype=dst_image.dtype)
-
-        # Blend the tiles in the row horizontally.
-        for tile, tile_image in tile_and_image_row:
-            # We expect the tiles to be ordered left-to-right.
-            # For each tile:
-            # - extract the overlap regions and pass to seam_blend()
-            # - apply blended region to the row_image
-            # - apply the un-blended region to the row_image
-            tile_height, tile_width, _ = tile_image.shape
-            overlap_size = tile.overlap.left
-            # Left blending:
-            if overlap_size > 0:
-                assert overlap_size >= blend_amount
-
-                overlap_coord_right = tile.coords.left + overlap_size
-                src_overlap = row_image[:, tile.coords.left : overlap_coord_right]
-                dst_overlap = tile_image[:, :overlap_size]
-                blended_overlap = seam_blend(src_overlap, dst_overlap, blend_amount, x_seam=False)
-                row_image[:, tile.coords.left : overlap_coord_right] = blended_overlap
-                row_image[:, overlap_coord_right : tile.coords.right] = tile_image[:, overlap_size:]
-            else:
-                # no overlap just paste the tile
-                row_image[:, tile.coords.left : tile.coords.right] = tile_image
-
-        # Blend the row into the dst_image
-        # We assume that the entire row has the same vertical overlaps as the first_tile_in_row.
-        # Rows are processed in the same way as tiles (extract overlap, blend, apply)
-        row_overlap_size = first_tile_in_row.overlap.top
-        if row_overlap_size > 0:
-            assert row_overlap_size >= blend_amount
-
-            overlap_coords_bottom = first_tile_in_row.coords.top + row_overlap_size
-            src_overlap = dst_image[first_tile_in_row.coords.top : overlap_coords_bottom, :]
-            dst_overlap = row_image[:row_overlap_size, :]
-            blended_overlap = seam_blend(src_overlap, dst_overlap, blend_amount, x_seam=True)
-            dst_image[first_tile_in_row.coords.top : overlap_coords_bottom, :] = blended_overlap
-            dst_image[overlap_coords_bottom : first_tile_in_row.coords.bottom, :] = row_image[row_overlap_size:, :]
-        else:
-            # no overlap just paste the row
-            dst_image[first_tile_in_row.coords.top : first_tile_in_row.coords.bottom, :] = row_image
+    merger = SeamBlendingTileMerger(dst_image=dst_image, tiles=tiles, blend_amount=blend_amount)
+    for tile_idx, (_, tile_image) in enumerate(zip(tiles, tile_images, strict=True)):
+        merger.add_tile(tile_idx, tile_image)
+    merger.finalize()
@@ -0,0 +1,237 @@
+"""Lightweight span tracing for sessions, with Chrome trace and OTLP/JSON file exporters.
+
+Usage:
+
+```py
+from invokeai.backend.util.tracing import get_tracer
+
+tracer = get_tracer()
+with tracer.span("model_cache.lock", category="model", model_key=key):
+    ...
+```
+
+Tracing is disabled by default. When disabled, `span()` returns a shared no-op context manager, so instrumented code
+pays for a single attribute check. When enabled, finished spans are buffered in memory until they are collected with
+`collect_spans()`, and can be written to disk with `write_chrome_trace()` and `write_otlp_json()`.
+
+Chrome traces can be viewed in https://ui.perfetto.dev or chrome://tracing. OTLP/JSON files use the same format as
+the OpenTelemetry Collector's file exporter (one `ExportTraceServiceRequest` per line), so they can be replayed into
+any OTLP-compatible backend.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Generator, Optional
+
+# Finished spans are dropped beyond this limit, so that a trace that is never collected cannot grow without bound.
+MAX_BUFFERED_SPANS = 200_000
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass
+class Span:
+    """A finished span."""
+
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int  # Nanoseconds since the epoch.
+    end_ns: int  # Nanoseconds since the epoch.
+    thread_id: int
+    thread_name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+
+class Tracer:
+    """Records nested spans. Nesting is tracked per thread."""
+
+    def __init__(self) -> None:
+        self._enabled = False
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        self._span_ids = itertools.count(1)
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self) -> None:
+        self._enabled = True
+
+    def disable(self) -> None:
+        self._enabled = False
+        self.collect_spans()
+
+    def span(self, name: str, category: str = "", **attributes: Any) -> AbstractContextManager[None]:
+        """Record a span around the body of a `with` block. Spans opened inside the block on the same thread are
+        recorded as its children."""
+        if not self._enabled:
+            return _NULL_SPAN
+        return self._span(name, category, attributes)
+
+    def add_span(self, name: str, start_ns: int, end_ns: int, category: str = "", **attributes: Any) -> None:
+        """Record a span that has already finished, e.g. one whose start was only known in hindsight."""
+        if not self._enabled:
+            return
+        stack = self._get_stack()
+        self._record(
+            Span(
+                name=name,
+                category=category,
+                span_id=next(self._span_ids),
+                parent_id=stack[-1] if stack else None,
+                start_ns=start_ns,
+                end_ns=end_ns,
+                thread_id=threading.get_ident(),
+                thread_name=threading.current_thread().name,
+                attributes=attributes,
+            )
+        )
+
+    def collect_spans(self) -> list[Span]:
+        """Return and clear all finished spans, ordered by start time."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return sorted(spans, key=lambda s: s.start_ns)
+
+    @contextmanager
+    def _span(self, name: str, category: str, attributes: dict[str, Any]) -> Generator[None, None, None]:
+        stack = self._get_stack()
+        span_id = next(self._span_ids)
+        parent_id = stack[-1] if stack else None
+        stack.append(span_id)
+        start_ns = time.time_ns()
+        try:
+            yield
+        except BaseException as e:
+            attributes["error"] = e.__class__.__name__
+            raise
+        finally:
+            stack.pop()
+            self._record(
+                Span(
+                    name=name,
+                    category=category,
+                    span_id=span_id,
+                    parent_id=parent_id,
+                    start_ns=start_ns,
+                    end_ns=time.time_ns(),
+                    thread_id=threading.get_ident(),
+                    thread_name=threading.current_thread().name,
+                    attributes=attributes,
+                )
+            )
+
+    def _get_stack(self) -> list[int]:
+        stack: Optional[list[int]] = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) < MAX_BUFFERED_SPANS:
+                self._spans.append(span)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer."""
+    return _tracer
+
+
+def write_chrome_trace(spans: list[Span], path: Path) -> None:
+    """Write spans as a Chrome trace event JSON file."""
+    pid = os.getpid()
+    events: list[dict[str, Any]] = []
+    for thread_id, thread_name in sorted({(s.thread_id, s.thread_name) for s in spans}):
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+    for span in spans:
+        events.append(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {k: _to_json_value(v) for k, v in span.attributes.items()},
+            }
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def write_otlp_json(spans: list[Span], path: Path, trace_id: str, service_name: str = "invokeai") -> None:
+    """Append spans to an OTLP/JSON file as a single `ExportTraceServiceRequest` line.
+
+    Args:
+        spans: The spans to export.
+        path: The file to append to.
+        trace_id: An identifier for the trace, e.g. the session id. It is hashed into a 16-byte OTLP trace id.
+        service_name: The `service.name` resource attribute.
+    """
+    otlp_trace_id = hashlib.md5(trace_id.encode()).hexdigest()
+    otlp_spans = [
+        {
+            "traceId": otlp_trace_id,
+            "spanId": f"{span.span_id:016x}",
+            **({"parentSpanId": f"{span.parent_id:016x}"} if span.parent_id is not None else {}),
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [
+                _to_otlp_attribute(k, v)
+                for k, v in {"category": span.category, "thread.name": span.thread_name, **span.attributes}.items()
+            ],
+            **({"status": {"code": 2}} if "error" in span.attributes else {}),  # STATUS_CODE_ERROR
+        }
+        for span in spans
+    ]
+    request = {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_to_otlp_attribute("service.name", service_name)]},
+                "scopeSpans": [{"scope": {"name": "invokeai"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(request) + "\n")
+
+
+def _to_json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _to_otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
@@ -836,6 +836,26 @@ export type paths = {
         patch?: never;
         trace?: never;
     };
+    "/api/v1/images/download/stream": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Stream Images Download
+         * @description Downloads a zip file of images, streamed as it is generated rather than prepared in the background
+         */
+        post: operations["stream_images_download"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/images/download/{bulk_download_item_name}": {
         parameters: {
             query?: never;
@@ -1268,6 +1288,70 @@ export type paths = {
         patch?: never;
         trace?: never;
     };
+    "/api/v1/app/performance_history": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Performance History
+         * @description Gets invocation timing percentiles, grouped by invocation type, model, resolution, steps and app version
+         */
+        get: operations["get_performance_history"];
+        put?: never;
+        post?: never;
+        /**
+         * Clear Performance History
+         * @description Clears the performance history
+         */
+        delete: operations["clear_performance_history"];
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/v1/app/performance_history/versions": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Performance History Versions
+         * @description Gets the app versions that have entries in the performance history, oldest first
+         */
+        get: operations["get_performance_history_versions"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/v1/app/performance_history/regressions": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Performance Regressions
+         * @description Finds groups of comparable invocations whose median duration regressed between two app versions
+         */
+        get: operations["get_performance_regressions"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/queue/{queue_id}/enqueue_batch": {
         parameters: {
             query?: never;
@@ -2893,6 +2977,19 @@ export type components = {
              */
             image_names: string[];
         };
+        /** Body_stream_images_download */
+        Body_stream_images_download: {
+            /**
+             * Image Names
+             * @description The list of names of images to download
+             */
+            image_names?: string[] | null;
+            /**
+             * Board Id
+             * @description The board from which image should be downloaded
+             */
+            board_id?: string | null;
+        };
         /** Body_unstar_images_in_list */
         Body_unstar_images_in_list: {
             /**
@@ -7127,6 +7224,16 @@ export type components = {
              * @description Content type of downloaded file
              */
             content_type?: string | null;
+            /**
+             * Expected Size
+             * @description Expected size of the downloaded file, if known
+             */
+            expected_size?: number | null;
+            /**
+             * Expected Sha256
+             * @description Expected SHA256 hash of the downloaded file, if known
+             */
+            expected_sha256?: string | null;
         };
         /**
          * DownloadJobStatus
@@ -13681,6 +13788,7 @@ export type components = {
          *         models_dir: Path to the models directory.
          *         convert_cache_dir: Path to the converted models cache directory (DEPRECATED, but do not delete because it is needed for migration from previous versions).
          *         download_cache_dir: Path to the directory that contains dynamically downloaded models.
+         *         vram_placement_plans_dir: Path to the directory that contains the profiled VRAM placement plans of partially-loaded models.
          *         legacy_conf_dir: Path to directory of legacy checkpoint config files.
          *         db_dir: Path to InvokeAI databases directory.
          *         outputs_dir: Path to directory for outputs.
@@ -13697,6 +13805,8 @@ export type components = {
          *         profile_graphs: Enable graph profiling using `cProfile`.
          *         profile_prefix: An optional prefix for profile output files.
          *         profiles_dir: Path to profiles output directory.
+         *         trace_graphs: Record tracing spans for each session (dequeue, nodes, model cache operations, LoRA patching, denoising steps, image saves and database writes) and write them to the profiles directory as a Chrome trace (`.trace.json`, viewable in https://ui.perfetto.dev) and as OTLP/JSON (`.otlp.json`).
+         *         performance_history_size: The number of invocation timings to keep in the performance history, which is used to compare performance across app versions. Set to 0 to disable recording.
          *         max_cache_ram_gb: The maximum amount of CPU RAM to use for model caching in GB. If unset, the limit will be configured based on the available RAM. In most cases, it is recommended to leave this unset.
          *         max_cache_vram_gb: The amount of VRAM to use for model caching in GB. If unset, the limit will be configured based on the available VRAM and the device_working_mem_gb. In most cases, it is recommended to leave this unset.
          *         log_memory_usage: If True, a memory snapshot will be captured before and after every model cache operation, and the result will be logged (at debug level). There is a time cost to capturing the memory snapshots, so it is recommended to only enable this feature if you are actively inspecting the model cache's behaviour.
@@ -13704,6 +13814,9 @@ export type components = {
          *         device_working_mem_gb: The amount of working memory to keep available on the compute device (in GB). Has no effect if running on CPU. If you are experiencing OOM errors, try increasing this value.
          *         enable_partial_loading: Enable partial loading of models. This enables models to run with reduced VRAM requirements (at the cost of slower speed) by streaming the model from RAM to VRAM as its used. In some edge cases, partial loading can cause models to run more slowly if they were previously being fully loaded into VRAM.
          *         keep_ram_copy_of_weights: Whether to keep a full RAM copy of a model's weights when the model is loaded in VRAM. Keeping a RAM copy increases average RAM usage, but speeds up model switching and LoRA patching (assuming there is sufficient RAM). Set this to False if RAM pressure is consistently high.
+         *         enable_vram_placement_profiling: Profile the first forward pass of each partially-loaded model architecture to plan which of its weights to keep in VRAM, saving the plans to `vram_placement_plans_dir`. On CUDA, the profiled execution order is also used to prefetch streamed weights. Experimental. When disabled, the plan is estimated from the shapes of the weights.
+         *         gguf_dequant_cache_vram_gb: The max amount of VRAM to use for keeping dequantized GGUF model weights between steps, in GB. Only VRAM that is not needed for models or working memory is used. Speeds up quantized models (e.g. Q8 FLUX) when there is spare VRAM. Set to 0 to disable.
+         *         gguf_dequant_cache_ram_gb: The max amount of RAM to use for keeping dequantized GGUF model weights between steps, in GB. This RAM counts against the model cache's RAM limit. Only helps models that run on the CPU. Set to 0 to disable.
          *         ram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
          *         vram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_vram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
          *         lazy_offload: DEPRECATED: This setting is no longer used. Lazy-offloading is enabled by default. This config setting will be removed once the new model cache behavior is stable.
@@ -13714,14 +13827,18 @@ export type components = {
          *         attention_type: Attention type.<br>Valid values: `auto`, `normal`, `xformers`, `sliced`, `torch-sdp`
          *         attention_slice_size: Slice size, valid when attention_type=="sliced".<br>Valid values: `auto`, `balanced`, `max`, `1`, `2`, `3`, `4`, `5`, `6`, `7`, `8`
          *         force_tiled_decode: Whether to enable tiled VAE decode (reduces memory consumption with some performance penalty).
+         *         adaptive_vae_tiling: Automatically choose whether to tile VAE encode/decode, and the tile size, based on the free memory on the compute device. Out-of-memory errors are retried with smaller tiles. Only applies to SD1.5 and SDXL VAEs, and has no effect on nodes with tiling enabled or when `force_tiled_decode` is set.
          *         pil_compress_level: The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.
          *         max_queue_size: Maximum number of items in the session queue.
          *         clear_queue_on_startup: Empties session queue on startup.
          *         allow_nodes: List of nodes to allow. Omit to allow all.
          *         deny_nodes: List of nodes to deny. Omit to deny none.
          *         node_cache_size: How many cached nodes to keep in memory.
+         *         max_parallel_nodes: The max number of nodes to run at once within a session. Only nodes that are not GPU-bound (e.g. image resizes, Canny edge detection) run alongside other nodes; GPU-bound nodes always run one at a time. Set to 1 to run all nodes one at a time.
          *         hashing_algorithm: Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.<br>Valid values: `blake3_multi`, `blake3_single`, `random`, `md5`, `sha1`, `sha224`, `sha256`, `sha384`, `sha512`, `blake2b`, `blake2s`, `sha3_224`, `sha3_256`, `sha3_384`, `sha3_512`, `shake_128`, `shake_256`
          *         remote_api_tokens: List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.
+         *         download_connections: The max number of connections used to download each large model file, where the server supports range requests. Interrupted downloads made over several connections are resumed. Set to 1 to download each file over a single connection.
+         *         model_scan_threads: The number of threads used to search, probe and hash models when scanning a directory for models. Raise this for network shares and SSDs; use 1 for spinning disk HDDs.
          *         scan_models_on_startup: Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.
          *         unsafe_disable_picklescan: UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.
          *         allow_unknown_models: Allow installation of models that we are unable to identify. If enabled, models will be marked as `unknown` in the database, and will not have any metadata associated with them. If disabled, unknown models will be rejected during installation.
@@ -13821,6 +13938,13 @@ export type components = {
              * @default models/.download_cache
              */
             download_cache_dir?: string;
+            /**
+             * Vram Placement Plans Dir
+             * Format: path
+             * @description Path to the directory that contains the profiled VRAM placement plans of partially-loaded models.
+             * @default models/.vram_placement_plans
+             */
+            vram_placement_plans_dir?: string;
             /**
              * Legacy Conf Dir
              * Format: path
@@ -13928,6 +14052,18 @@ export type components = {
              * @default profiles
              */
             profiles_dir?: string;
+            /**
+             * Trace Graphs
+             * @description Record tracing spans for each session (dequeue, nodes, model cache operations, LoRA patching, denoising steps, image saves and database writes) and write them to the profiles directory as a Chrome trace (`.trace.json`, viewable in https://ui.perfetto.dev) and as OTLP/JSON (`.otlp.json`).
+             * @default false
+             */
+            trace_graphs?: boolean;
+            /**
+             * Performance History Size
+             * @description The number of invocation timings to keep in the performance history, which is used to compare performance across app versions. Set to 0 to disable recording.
+             * @default 100000
+             */
+            performance_history_size?: number;
             /**
              * Max Cache Ram Gb
              * @description The maximum amount of CPU RAM to use for model caching in GB. If unset, the limit will be configured based on the available RAM. In most cases, it is recommended to leave this unset.
@@ -13968,6 +14104,24 @@ export type components = {
              * @default true
              */
             keep_ram_copy_of_weights?: boolean;
+            /**
+             * Enable Vram Placement Profiling
+             * @description Profile the first forward pass of each partially-loaded model architecture to plan which of its weights to keep in VRAM, saving the plans to `vram_placement_plans_dir`. On CUDA, the profiled execution order is also used to prefetch streamed weights. Experimental. When disabled, the plan is estimated from the shapes of the weights.
+             * @default false
+             */
+            enable_vram_placement_profiling?: boolean;
+            /**
+             * Gguf Dequant Cache Vram Gb
+             * @description The max amount of VRAM to use for keeping dequantized GGUF model weights between steps, in GB. Only VRAM that is not needed for models or working memory is used. Speeds up quantized models (e.g. Q8 FLUX) when there is spare VRAM. Set to 0 to disable.
+             * @default 0
+             */
+            gguf_dequant_cache_vram_gb?: number;
+            /**
+             * Gguf Dequant Cache Ram Gb
+             * @description The max amount of RAM to use for keeping dequantized GGUF model weights between steps, in GB. This RAM counts against the model cache's RAM limit. Only helps models that run on the CPU. Set to 0 to disable.
+             * @default 0
+             */
+            gguf_dequant_cache_ram_gb?: number;
             /**
              * Ram
              * @description DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
@@ -14028,6 +14182,12 @@ export type components = {
              * @default false
              */
             force_tiled_decode?: boolean;
+            /**
+             * Adaptive Vae Tiling
+             * @description Automatically choose whether to tile VAE encode/decode, and the tile size, based on the free memory on the compute device. Out-of-memory errors are retried with smaller tiles. Only applies to SD1.5 and SDXL VAEs, and has no effect on nodes with tiling enabled or when `force_tiled_decode` is set.
+             * @default false
+             */
+            adaptive_vae_tiling?: boolean;
             /**
              * Pil Compress Level
              * @description The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.
@@ -14062,6 +14222,12 @@ export type components = {
              * @default 512
              */
             node_cache_size?: number;
+            /**
+             * Max Parallel Nodes
+             * @description The max number of nodes to run at once within a session. Only nodes that are not GPU-bound (e.g. image resizes, Canny edge detection) run alongside other nodes; GPU-bound nodes always run one at a time. Set to 1 to run all nodes one at a time.
+             * @default 1
+             */
+            max_parallel_nodes?: number;
             /**
              * Hashing Algorithm
              * @description Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.
@@ -14074,6 +14240,18 @@ export type components = {
              * @description List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.
              */
             remote_api_tokens?: components["schemas"]["URLRegexTokenPair"][] | null;
+            /**
+             * Download Connections
+             * @description The max number of connections used to download each large model file, where the server supports range requests. Interrupted downloads made over several connections are resumed. Set to 1 to download each file over a single connection.
+             * @default 4
+             */
+            download_connections?: number;
+            /**
+             * Model Scan Threads
+             * @description The number of threads used to search, probe and hash models when scanning a directory for models. Raise this for network shares and SSDs; use 1 for spinning disk HDDs.
+             * @default 4
+             */
+            model_scan_threads?: number;
             /**
              * Scan Models On Startup
              * @description Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.
@@ -20427,6 +20605,47 @@ export type components = {
          * @enum {string}
          */
         ModelRepoVariant: "" | "fp16" | "fp32" | "onnx" | "openvino" | "flax";
+        /**
+         * ModelScanProgressEvent
+         * @description Event model for model_scan_progress
+         */
+        ModelScanProgressEvent: {
+            /**
+             * Timestamp
+             * @description The timestamp of the event
+             */
+            timestamp: number;
+            /**
+             * Directory
+             * @description The directory being scanned
+             */
+            directory: string;
+            /**
+             * Total
+             * @description The number of models found that are not yet installed
+             */
+            total: number;
+            /**
+             * Probed
+             * @description The number of models probed so far
+             */
+            probed: number;
+            /**
+             * Registered
+             * @description The number of models registered so far
+             */
+            registered: number;
+            /**
+             * Errors
+             * @description The number of models that could not be probed or registered so far
+             */
+            errors: number;
+            /**
+             * Dry Run
+             * @description Whether this is a dry run, which does not register any models
+             */
+            dry_run: boolean;
+        };
         /**
          * ModelSourceType
          * @description Model source type.
@@ -20940,6 +21159,82 @@ export type components = {
              */
             type: "paste_image_into_bounding_box";
         };
+        /**
+         * PerformanceHistorySummary
+         * @description Timing percentiles for invocations with the same type, model, resolution, steps and app version.
+         */
+        PerformanceHistorySummary: {
+            /**
+             * Invocation Type
+             * @description The type of the invocations
+             */
+            invocation_type: string;
+            /**
+             * Model
+             * @description The name of the main model used by the invocations
+             */
+            model: string | null;
+            /**
+             * Width
+             * @description The width of the invocations' outputs
+             */
+            width: number | null;
+            /**
+             * Height
+             * @description The height of the invocations' outputs
+             */
+            height: number | null;
+            /**
+             * Steps
+             * @description The number of steps run by the invocations
+             */
+            steps: number | null;
+            /**
+             * App Version
+             * @description The app version that ran the invocations
+             */
+            app_version: string;
+            /**
+             * Count
+             * @description The number of invocations
+             */
+            count: number;
+            /**
+             * Mean
+             * @description The mean duration, in seconds
+             */
+            mean: number;
+            /**
+             * P50
+             * @description The median duration, in seconds
+             */
+            p50: number;
+            /**
+             * P90
+             * @description The 90th percentile duration, in seconds
+             */
+            p90: number;
+            /**
+             * P99
+             * @description The 99th percentile duration, in seconds
+             */
+            p99: number;
+        };
+        /**
+         * PerformanceRegression
+         * @description A group of comparable invocations whose median duration increased between two app versions.
+         */
+        PerformanceRegression: {
+            /** @description The summary for the baseline app version */
+            baseline: components["schemas"]["PerformanceHistorySummary"];
+            /** @description The summary for the candidate app version */
+            candidate: components["schemas"]["PerformanceHistorySummary"];
+            /**
+             * Ratio
+             * @description The candidate's median duration divided by the baseline's median duration
+             */
+            ratio: number;
+        };
         /**
          * PiDiNet Edge Detection
          * @description Generates an edge map using PiDiNet.
@@ -23701,6 +23996,12 @@ export type components = {
              * @default 512
              */
             tile_size?: number;
+            /**
+             * Tile Batch Size
+             * @description The max number of same-sized tiles to process at once. Higher values can be faster, but use more VRAM.
+             * @default 1
+             */
+            tile_batch_size?: number;
             /**
              * type
              * @default spandrel_image_to_image_autoscale
@@ -23769,6 +24070,12 @@ export type components = {
              * @default 512
              */
             tile_size?: number;
+            /**
+             * Tile Batch Size
+             * @description The max number of same-sized tiles to process at once. Higher values can be faster, but use more VRAM.
+             * @default 1
+             */
+            tile_batch_size?: number;
             /**
              * type
              * @default spandrel_image_to_image
@@ -29566,6 +29873,53 @@ export interface operations {
             };
         };
     };
+    stream_images_download: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: {
+            content: {
+                "application/json": components["schemas"]["Body_stream_images_download"];
+            };
+        };
+        responses: {
+            /** @description A zip file of the images, generated as it is downloaded */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/zip": unknown;
+                };
+            };
+            /** @description No images or board id specified */
+            400: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description Image or board not found */
+            404: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_bulk_download_item: {
         parameters: {
             query?: never;
@@ -30432,6 +30786,118 @@ export interface operations {
             };
         };
     };
+    get_performance_history: {
+        parameters: {
+            query?: {
+                /** @description Only include invocations run by this app version */
+                app_version?: string | null;
+                /** @description Only include invocations of this type */
+                invocation_type?: string | null;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["PerformanceHistorySummary"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    clear_performance_history: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description The operation was successful */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+        };
+    };
+    get_performance_history_versions: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": string[];
+                };
+            };
+        };
+    };
+    get_performance_regressions: {
+        parameters: {
+            query: {
+                /** @description The app version to compare against */
+                baseline_version: string;
+                /** @description The app version to check for regressions */
+                candidate_version?: string;
+                /** @description The relative slowdown of the median to flag, e.g. 0.1 */
+                threshold?: number;
+                /** @description The min number of invocations in each version to compare */
+                min_count?: number;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["PerformanceRegression"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     enqueue_batch: {
         parameters: {
             query?: never;
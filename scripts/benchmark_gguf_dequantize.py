@@ -0,0 +1,100 @@
+"""Benchmark the torch GGUF dequantization kernels against the gguf library's numpy reference implementation.
+
+Throughput is reported in GB/s of dequantized output. Random quantized data is used, so no model files are needed. For
+the numpy reference, the time includes the copies to and from the device, as in the fallback path of GGMLTensor.
+
+Usage:
+    python scripts/benchmark_gguf_dequantize.py --devices cpu cuda --qtypes Q8_0 Q4_K Q2_K --dtype bfloat16
+"""
+
+import argparse
+import functools
+import time
+from typing import Callable
+
+import gguf
+import numpy as np
+import torch
+
+from invokeai.backend.quantization.gguf.utils import DEQUANTIZE_FUNCTIONS, dequantize
+
+
+def make_quantized_data(qtype: gguf.GGMLQuantizationType, rows: int, cols: int) -> np.ndarray:
+    """Random bytes, with the float16 scales made finite. The values are nonsense, but dequantize at the same speed."""
+    block_size, type_size = gguf.GGML_QUANT_SIZES[qtype]
+    rng = np.random.default_rng(0)
+    blocks = rng.integers(0, 256, (rows * cols // block_size, type_size), dtype=np.uint8)
+    # Clearing the exponent's top bit of every other byte makes all float16s finite, wherever the scales are.
+    blocks[:, 1::2] &= 0xBF
+    return blocks.reshape((rows, -1))
+
+
+def run_torch(data: torch.Tensor, qtype: gguf.GGMLQuantizationType, oshape: torch.Size, dtype: torch.dtype):
+    return dequantize(data, qtype, oshape, dtype=None).to(dtype)
+
+
+def run_reference(data: torch.Tensor, qtype: gguf.GGMLQuantizationType, oshape: torch.Size, dtype: torch.dtype):
+    """The numpy fallback path of GGMLTensor."""
+    # The random exponents of some types overflow to inf, which numpy warns about.
+    with np.errstate(over="ignore"):
+        new = gguf.quants.dequantize(data.cpu().numpy(), qtype)
+    return torch.from_numpy(new).to(data.device, dtype=dtype)
+
+
+def time_it(fn: Callable[[], object], device: torch.device, repeats: int) -> float:
+    fn()  # warm up
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GGUF dequantization.")
+    parser.add_argument("--rows", type=int, default=3072, help="The number of rows of the benchmark tensor.")
+    parser.add_argument("--cols", type=int, default=3072, help="The number of columns of the benchmark tensor.")
+    parser.add_argument(
+        "--qtypes",
+        nargs="+",
+        default=[qtype.name for qtype in DEQUANTIZE_FUNCTIONS],
+        help="The quantization types to benchmark.",
+    )
+    parser.add_argument(
+        "--devices", nargs="+", default=["cuda"] if torch.cuda.is_available() else ["cpu"], help="The torch devices."
+    )
+    parser.add_argument("--dtype", default="bfloat16", help="The compute dtype to dequantize to.")
+    parser.add_argument("--repeats", type=int, default=5, help="The number of timed runs of each configuration.")
+    parser.add_argument("--no-reference", action="store_true", help="Don't time the numpy reference implementation.")
+    args = parser.parse_args()
+
+    dtype = getattr(torch, args.dtype)
+    output_gb = args.rows * args.cols * torch.empty(0, dtype=dtype).element_size() / 1e9
+
+    print(f"{args.rows}x{args.cols} tensor, dequantized to {args.dtype} ({output_gb * 1e3:.1f} MB)")
+    print(f"{'qtype':<8} {'device':<8} {'torch GB/s':>10} {'numpy GB/s':>10} {'speedup':>8}")
+    for qtype_name in args.qtypes:
+        qtype = gguf.GGMLQuantizationType[qtype_name]
+        data = make_quantized_data(qtype, args.rows, args.cols)
+        oshape = torch.Size((args.rows, args.cols))
+        for device_name in args.devices:
+            device = torch.device(device_name)
+            fn_args = (torch.from_numpy(data).to(device), qtype, oshape, dtype)
+
+            with torch.no_grad():
+                torch_gbps = output_gb / time_it(functools.partial(run_torch, *fn_args), device, args.repeats)
+                if args.no_reference:
+                    print(f"{qtype_name:<8} {device_name:<8} {torch_gbps:>10.2f}")
+                    continue
+                reference_gbps = output_gb / time_it(functools.partial(run_reference, *fn_args), device, args.repeats)
+            print(
+                f"{qtype_name:<8} {device_name:<8} {torch_gbps:>10.2f} {reference_gbps:>10.2f} "
+                f"{torch_gbps / reference_gbps:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
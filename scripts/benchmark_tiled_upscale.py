@@ -0,0 +1,99 @@
+"""Benchmark the pipelined tiled image-to-image engine used by the spandrel upscaling invocations.
+
+A small stand-in model (a convolution followed by a pixel shuffle) is used, so no model files are needed. The serial,
+one-tile-at-a-time implementation is timed for comparison.
+
+Usage:
+    python scripts/benchmark_tiled_upscale.py --size 1024 --tile-size 256 --batch-sizes 1 2 4 --device cpu
+"""
+
+import argparse
+import functools
+import time
+from typing import Callable
+
+import torch
+
+from invokeai.backend.tiles.pipelined_image_to_image import run_tiled_image_to_image
+from invokeai.backend.tiles.tiles import calc_tiles_min_overlap
+from invokeai.backend.tiles.utils import Tile
+
+
+def build_model(scale: int, channels: int, device: torch.device) -> Callable[[torch.Tensor], torch.Tensor]:
+    model = torch.nn.Sequential(
+        torch.nn.Conv2d(3, channels, 3, padding=1),
+        torch.nn.ReLU(),
+        torch.nn.Conv2d(channels, 3 * scale * scale, 3, padding=1),
+        torch.nn.PixelShuffle(scale),
+    ).to(device)
+    return model
+
+
+def run_serial(
+    image_tensor: torch.Tensor, tiles: list[Tile], scale: int, run_model: Callable[[torch.Tensor], torch.Tensor]
+) -> torch.Tensor:
+    """The serial implementation: run, convert, copy to the CPU and merge each tile in turn."""
+    _, channels, height, width = image_tensor.shape
+    output_tensor = torch.zeros((height * scale, width * scale, channels), dtype=torch.uint8)
+    for tile in tiles:
+        input_tile = image_tensor[:, :, tile.coords.top : tile.coords.bottom, tile.coords.left : tile.coords.right]
+        output_tile = run_model(input_tile).squeeze(0).permute(1, 2, 0).clamp(0, 1)
+        output_tile = (output_tile * 255).to(dtype=torch.uint8, device="cpu")
+        top_overlap = tile.overlap.top * scale // 2
+        left_overlap = tile.overlap.left * scale // 2
+        output_tensor[
+            tile.coords.top * scale + top_overlap : tile.coords.bottom * scale,
+            tile.coords.left * scale + left_overlap : tile.coords.right * scale,
+            :,
+        ] = output_tile[top_overlap:, left_overlap:, :]
+    return output_tensor
+
+
+def time_it(fn: Callable[[], torch.Tensor], device: torch.device, repeats: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tiled image-to-image upscaling.")
+    parser.add_argument("--size", type=int, default=1024, help="The width and height of the input image.")
+    parser.add_argument("--tile-size", type=int, default=256, help="The tile size.")
+    parser.add_argument("--scale", type=int, default=4, help="The scale of the stand-in model.")
+    parser.add_argument("--channels", type=int, default=32, help="The hidden channels of the stand-in model.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4], help="The tile batch sizes to time.")
+    parser.add_argument("--repeats", type=int, default=3, help="The number of timed runs of each configuration.")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu", help="The torch device.")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    model = build_model(args.scale, args.channels, device)
+    image_tensor = torch.rand(1, 3, args.size, args.size, device=device)
+    tiles = calc_tiles_min_overlap(
+        image_height=args.size,
+        image_width=args.size,
+        tile_height=args.tile_size,
+        tile_width=args.tile_size,
+        min_overlap=20,
+    )
+    tiles = sorted(sorted(tiles, key=lambda x: x.coords.left), key=lambda x: x.coords.top)
+
+    print(f"{len(tiles)} tiles of {args.tile_size}px, {args.size}px image, {args.scale}x, on {device}")
+    with torch.no_grad():
+        serial = time_it(lambda: run_serial(image_tensor, tiles, args.scale, model), device, args.repeats)
+        print(f"serial:                {serial:.3f}s")
+        for batch_size in args.batch_sizes:
+            pipelined = time_it(
+                functools.partial(run_tiled_image_to_image, image_tensor, tiles, args.scale, model, batch_size),
+                device,
+                args.repeats,
+            )
+            print(f"pipelined, batch of {batch_size}: {pipelined:.3f}s ({serial / pipelined:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
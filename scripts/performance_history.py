@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""Query the invocation performance history, and find performance regressions between app versions.
+
+The performance history is recorded by the app for each invocation it runs (see the `performance_history_size` config
+setting). Timings are grouped by invocation type, model, resolution, steps and app version.
+
+Examples:
+    # List the app versions with recorded timings
+    python scripts/performance_history.py --root ~/invokeai versions
+
+    # Show timing percentiles for FLUX denoise, for all app versions
+    python scripts/performance_history.py --root ~/invokeai summary --type flux_denoise
+
+    # Flag groups whose median duration is >10% slower in 6.1.0 than in 6.0.2 (exits with status 1 if any are found)
+    python scripts/performance_history.py --root ~/invokeai compare 6.0.2 6.1.0 --threshold 0.1
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from invokeai.app.services.performance_history.performance_history_common import PerformanceHistorySummary
+from invokeai.app.services.performance_history.performance_history_sqlite import SqlitePerformanceHistoryStorage
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+from invokeai.backend.util.logging import InvokeAILogger
+
+
+def format_group(summary: PerformanceHistorySummary) -> str:
+    resolution = f"{summary.width}x{summary.height}" if summary.width is not None else "-"
+    steps = str(summary.steps) if summary.steps is not None else "-"
+    return f"{summary.invocation_type:<32} {summary.model or '-':<32} {resolution:>11} {steps:>5}"
+
+
+def print_summaries(summaries: list[PerformanceHistorySummary]) -> None:
+    print(
+        f"{'type':<32} {'model':<32} {'resolution':>11} {'steps':>5} {'version':<12} {'n':>6} {'p50':>8} {'p90':>8} {'p99':>8}"
+    )
+    for s in summaries:
+        print(f"{format_group(s)} {s.app_version:<12} {s.count:>6} {s.p50:>7.2f}s {s.p90:>7.2f}s {s.p99:>7.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(os.environ.get("INVOKEAI_ROOT", ".")),
+        help="The InvokeAI root directory. Defaults to $INVOKEAI_ROOT, or the current directory.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=None, help="The database file. Defaults to <root>/databases/invokeai.db."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("versions", help="List the app versions with recorded timings, oldest first.")
+
+    summary_parser = subparsers.add_parser("summary", help="Show timing percentiles.")
+    summary_parser.add_argument("--version", default=None, help="Only include this app version.")
+    summary_parser.add_argument("--type", default=None, help="Only include this invocation type.")
+
+    compare_parser = subparsers.add_parser("compare", help="Find regressions between two app versions.")
+    compare_parser.add_argument("baseline", help="The app version to compare against.")
+    compare_parser.add_argument("candidate", help="The app version to check for regressions.")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="The relative slowdown of the median to flag. Default: 0.1."
+    )
+    compare_parser.add_argument(
+        "--min-count", type=int, default=5, help="The min number of invocations in each version. Default: 5."
+    )
+
+    args = parser.parse_args()
+
+    db_path: Path = args.db or args.root / "databases" / "invokeai.db"
+    if not db_path.exists():
+        print(f"Database not found at {db_path}", file=sys.stderr)
+        return 2
+    db = SqliteDatabase(db_path=db_path, logger=InvokeAILogger.get_logger())
+    with db.transaction() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='invocation_performance_history';")
+        if cursor.fetchone() is None:
+            print("The database has no performance history. Run the app to migrate it.", file=sys.stderr)
+            return 2
+    # Entries are never added by this script, so the size limit is irrelevant.
+    storage = SqlitePerformanceHistoryStorage(db=db, max_entries=0)
+
+    if args.command == "versions":
+        for version in storage.get_app_versions():
+            print(version)
+    elif args.command == "summary":
+        print_summaries(storage.get_summaries(app_version=args.version, invocation_type=args.type))
+    elif args.command == "compare":
+        regressions = storage.find_regressions(
+            baseline_version=args.baseline,
+            candidate_version=args.candidate,
+            threshold=args.threshold,
+            min_count=args.min_count,
+        )
+        if not regressions:
+            print(f"No regressions found between {args.baseline} and {args.candidate}.")
+            return 0
+        print(f"{len(regressions)} regression(s) found between {args.baseline} and {args.candidate}:")
+        for r in regressions:
+            print(
+                f"{format_group(r.candidate)} p50 {r.baseline.p50:.2f}s -> {r.candidate.p50:.2f}s "
+                f"({(r.ratio - 1):+.0%}, n={r.baseline.count}/{r.candidate.count})"
+            )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
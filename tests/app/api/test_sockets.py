@@ -0,0 +1,116 @@
+import asyncio
+import io
+import math
+from types import SimpleNamespace
+from typing import Any, Generator
+
+import pytest
+from PIL import Image
+
+from invokeai.app.api.sockets import PREVIEW_FRAME_HEADER, PREVIEW_FRAME_MAGIC, SocketIO, encode_preview_frame
+from invokeai.app.invocations.math import AddInvocation
+from invokeai.app.services.events.events_common import InvocationProgressEvent
+from invokeai.app.services.session_processor.session_processor_common import ProgressImage
+
+
+class MockSocketServer:
+    def __init__(self, sids: list[str]) -> None:
+        self.manager = SimpleNamespace(get_participants=lambda namespace, room: [(s, f"eio-{s}") for s in sids])
+        self.eio = SimpleNamespace(
+            sockets={f"eio-{sid}": SimpleNamespace(queue=SimpleNamespace(qsize=lambda: 0)) for sid in sids}
+        )
+        self.emitted: list[dict[str, Any]] = []
+
+    async def emit(self, **kwargs: Any) -> None:
+        self.emitted.append(kwargs)
+
+
+@pytest.fixture
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def progress_event() -> InvocationProgressEvent:
+    image = Image.new("RGB", (8, 4), color=(255, 0, 0))
+    return InvocationProgressEvent(
+        queue_id="default",
+        item_id=42,
+        batch_id="batch",
+        session_id="session",
+        invocation=AddInvocation(id="add", a=1, b=2),
+        invocation_source_id="source-node",
+        message="Denoising",
+        percentage=0.5,
+        image=ProgressImage.build(image, (64, 32)),
+    )
+
+
+def make_socket_io(server: MockSocketServer) -> SocketIO:
+    socket_io = SocketIO.__new__(SocketIO)
+    socket_io._sio = server  # pyright: ignore [reportAttributeAccessIssue]
+    socket_io._binary_preview_clients = {}
+    return socket_io
+
+
+def decode_header(frame: bytes) -> tuple[tuple[Any, ...], str, bytes]:
+    header = PREVIEW_FRAME_HEADER.unpack_from(frame)
+    node_id_end = PREVIEW_FRAME_HEADER.size + header[2]
+    return header, frame[PREVIEW_FRAME_HEADER.size : node_id_end].decode("utf-8"), frame[node_id_end:]
+
+
+def test_encode_preview_frame_rgb(progress_event: InvocationProgressEvent) -> None:
+    header, node_id, data = decode_header(encode_preview_frame(progress_event, "rgb"))
+
+    assert header == (PREVIEW_FRAME_MAGIC, 0, len("source-node"), 8, 4, 42, 0.5)
+    assert node_id == "source-node"
+    assert data == bytes([255, 0, 0]) * 32
+
+
+def test_encode_preview_frame_webp(progress_event: InvocationProgressEvent) -> None:
+    progress_event.percentage = None
+    header, _, data = decode_header(encode_preview_frame(progress_event, "webp"))
+
+    assert header[1] == 1
+    assert math.isnan(header[6])
+    image = Image.open(io.BytesIO(data))
+    assert image.format == "WEBP"
+    assert image.size == (8, 4)
+
+
+def test_binary_preview_subscribers_get_frames(
+    loop: asyncio.AbstractEventLoop, progress_event: InvocationProgressEvent
+) -> None:
+    server = MockSocketServer(["json", "webp", "rgb"])
+    socket_io = make_socket_io(server)
+    loop.run_until_complete(socket_io._handle_sub_binary_previews("webp", {}))
+    loop.run_until_complete(socket_io._handle_sub_binary_previews("rgb", {"format": "rgb"}))
+
+    loop.run_until_complete(socket_io._handle_queue_event(("invocation_progress", progress_event)))
+
+    json_emit, metadata_emit, *frame_emits = server.emitted
+    assert json_emit["to"] == ["json"]
+    assert json_emit["data"]["image"]["dataURL"].startswith("data:image/jpeg;base64,")
+    # Binary subscribers get the event without the image data, followed by a frame in their format
+    assert metadata_emit["to"] == ["webp", "rgb"]
+    assert metadata_emit["data"]["image"] == {"width": 64, "height": 32}
+    frames = {e["to"][0]: e["data"] for e in frame_emits}
+    assert all(e["event"] == "invocation_progress_image" for e in frame_emits)
+    assert decode_header(frames["webp"])[0][1] == 1
+    assert decode_header(frames["rgb"])[0][1] == 0
+
+
+def test_unsubscribed_clients_get_json(
+    loop: asyncio.AbstractEventLoop, progress_event: InvocationProgressEvent
+) -> None:
+    server = MockSocketServer(["a"])
+    socket_io = make_socket_io(server)
+    loop.run_until_complete(socket_io._handle_sub_binary_previews("a", {}))
+    loop.run_until_complete(socket_io._handle_disconnect("a", "client disconnect"))
+
+    loop.run_until_complete(socket_io._handle_queue_event(("invocation_progress", progress_event)))
+
+    assert len(server.emitted) == 1
+    assert "dataURL" in server.emitted[0]["data"]["image"]
@@ -0,0 +1,152 @@
+import sys
+from pathlib import Path
+from textwrap import dedent
+from typing import Iterator
+
+import pytest
+
+from invokeai.app.invocations import invocation_manifest
+from invokeai.app.invocations.baseinvocation import InvocationRegistry
+from invokeai.app.invocations.invocation_manifest import get_invocation_manifest, scan_invocation_module
+from invokeai.app.services.shared.graph import Graph
+
+LAZY_MODULE_NAME = "lazy_test_invocations"
+
+
+@pytest.fixture
+def lazy_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """A module with an invocation and an output, importable but not yet imported."""
+    (tmp_path / f"{LAZY_MODULE_NAME}.py").write_text(
+        dedent(
+            """
+            from invokeai.app.invocations.baseinvocation import (
+                BaseInvocation,
+                BaseInvocationOutput,
+                invocation,
+                invocation_output,
+            )
+            from invokeai.app.invocations.fields import InputField, OutputField
+            from invokeai.app.services.shared.invocation_context import InvocationContext
+
+
+            @invocation_output("test_lazy_output")
+            class LazyTestInvocationOutput(BaseInvocationOutput):
+                value: int = OutputField(default=0)
+
+
+            @invocation("test_lazy", version="1.0.0")
+            class LazyTestInvocation(BaseInvocation):
+                value: int = InputField(default=0)
+
+                def invoke(self, context: InvocationContext) -> LazyTestInvocationOutput:
+                    return LazyTestInvocationOutput(value=self.value)
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield LAZY_MODULE_NAME
+
+    # Unregister the module's invocation and output so they don't leak into other tests
+    module = sys.modules.pop(LAZY_MODULE_NAME, None)
+    if module is not None:
+        InvocationRegistry._invocation_classes.discard(module.LazyTestInvocation)
+        InvocationRegistry._output_classes.discard(module.LazyTestInvocationOutput)
+        InvocationRegistry.invalidate_invocation_typeadapter()
+        InvocationRegistry.invalidate_output_typeadapter()
+    InvocationRegistry._lazy_invocation_modules.pop("test_lazy", None)
+    InvocationRegistry._lazy_output_modules.pop("test_lazy_output", None)
+
+
+def test_scan_invocation_module(tmp_path: Path):
+    path = tmp_path / "nodes.py"
+    path.write_text(
+        dedent(
+            """
+            @invocation_output("literal_output")
+            class LiteralOutput: ...
+
+            @invocation("literal", version="1.0.0")
+            class Literal: ...
+
+            @baseinvocation.invocation(invocation_type="keyword", version="1.0.0")
+            class Keyword: ...
+            """
+        )
+    )
+    manifest = scan_invocation_module(path)
+    assert manifest.invocation_types == ["literal", "keyword"]
+    assert manifest.output_types == ["literal_output"]
+    assert manifest.eager is False
+    assert manifest.size == path.stat().st_size
+
+
+def test_scan_invocation_module_with_computed_type_is_eager(tmp_path: Path):
+    path = tmp_path / "nodes.py"
+    path.write_text(
+        dedent(
+            """
+            for name in ["a", "b"]:
+                invocation(f"computed_{name}", version="1.0.0")(type(name, (), {}))
+            """
+        )
+    )
+    assert scan_invocation_module(path).eager is True
+
+
+def test_manifest_matches_core_invocations():
+    manifest = get_invocation_manifest()
+    manifest_invocation_types = {t for m in manifest.modules.values() for t in m.invocation_types}
+    manifest_output_types = {t for m in manifest.modules.values() for t in m.output_types}
+
+    core_invocation_types = {
+        i.get_type()
+        for i in InvocationRegistry.get_invocation_classes()
+        if i.__module__.startswith(invocation_manifest.INVOCATIONS_PACKAGE + ".")
+    }
+    core_output_types = {
+        o.get_type()
+        for o in InvocationRegistry.get_output_classes()
+        if o.__module__.startswith(invocation_manifest.INVOCATIONS_PACKAGE + ".")
+    }
+    assert core_invocation_types == manifest_invocation_types
+    assert core_output_types == manifest_output_types
+
+
+def test_manifest_is_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(invocation_manifest, "MANIFEST_CACHE_PATH", tmp_path / "invocation_manifest.json")
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+
+    manifest = get_invocation_manifest()
+    assert (tmp_path / "invocation_manifest.json").exists()
+
+    def scan_invocation_module(path: Path):
+        raise AssertionError(f"{path.name} should not be scanned again")
+
+    monkeypatch.setattr(invocation_manifest, "scan_invocation_module", scan_invocation_module)
+    assert get_invocation_manifest() == manifest
+
+
+def test_lazy_module_is_imported_on_first_use(lazy_module: str):
+    InvocationRegistry.register_lazy_module(lazy_module, ["test_lazy"], ["test_lazy_output"])
+    assert lazy_module not in sys.modules
+
+    invocation_class = InvocationRegistry.get_invocation_for_type("test_lazy")
+    assert invocation_class is not None
+    assert lazy_module in sys.modules
+    assert InvocationRegistry.get_output_for_type("test_lazy_output") is not None
+
+
+def test_lazy_module_is_imported_when_validating_a_graph(lazy_module: str):
+    InvocationRegistry.register_lazy_module(lazy_module, ["test_lazy"], ["test_lazy_output"])
+    assert lazy_module not in sys.modules
+
+    graph = Graph.model_validate({"nodes": {"1": {"id": "1", "type": "test_lazy", "value": 3}}})
+    node = graph.get_node("1")
+    assert type(node).__module__ == lazy_module
+    assert node.value == 3
+
+
+def test_all_lazy_modules_are_imported_when_listing_invocations(lazy_module: str):
+    InvocationRegistry.register_lazy_module(lazy_module, ["test_lazy"], ["test_lazy_output"])
+    assert "test_lazy" in InvocationRegistry.get_invocation_types()
+    assert "test_lazy_output" in InvocationRegistry.get_output_types()
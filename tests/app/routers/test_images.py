@@ -51,6 +51,27 @@ def test_download_images_from_board_id_empty_image_name_list(
     assert json_response["bulk_download_item_name"] == "test.zip"
 
 
+def test_stream_images_download(monkeypatch: Any, mock_invoker: Invoker, client: TestClient) -> None:
+    prepare_download_images_test(monkeypatch, mock_invoker)
+    streamed: list[Any] = []
+
+    def mock_stream(image_names, board_id):
+        streamed.append((image_names, board_id))
+        return iter([b"PK", b"zip data"])
+
+    monkeypatch.setattr(mock_invoker.services.bulk_download, "stream", mock_stream)
+
+    response = client.post("/api/v1/images/download/stream", json={"image_names": ["test.png"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="test.zip"'
+    assert response.content == b"PKzip data"
+    assert streamed == [(["test.png"], None)]
+
+    response = client.post("/api/v1/images/download/stream", json={})
+    assert response.status_code == 400
+
+
 def prepare_download_images_test(monkeypatch: Any, mock_invoker: Invoker) -> None:
     monkeypatch.setattr("invokeai.app.api.routers.images.ApiDependencies", MockApiDependencies(mock_invoker))
     monkeypatch.setattr(
@@ -0,0 +1,52 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from invokeai.app.api.dependencies import ApiDependencies
+from invokeai.app.api_app import app
+from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.session_queue.session_queue_sqlite import SqliteSessionQueue
+from invokeai.app.util.metrics import INVOCATION_SECONDS
+from invokeai.backend.util.logging import InvokeAILogger
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client(invokeai_root_dir: Path) -> TestClient:
+    os.environ["INVOKEAI_ROOT"] = invokeai_root_dir.as_posix()
+    return TestClient(app)
+
+
+class MockApiDependencies(ApiDependencies):
+    invoker: Invoker
+
+    def __init__(self, invoker) -> None:
+        self.invoker = invoker
+
+
+class MockDownloadQueue:
+    def list_jobs(self) -> list[Any]:
+        return []
+
+
+def test_get_metrics(monkeypatch: Any, mock_invoker: Invoker, client: TestClient) -> None:
+    services = mock_invoker.services
+    db = create_mock_sqlite_database(services.configuration, InvokeAILogger.get_logger())
+    monkeypatch.setattr(services, "session_queue", SqliteSessionQueue(db=db))
+    monkeypatch.setattr(services, "download_queue", MockDownloadQueue())
+    monkeypatch.setattr("invokeai.app.api.routers.metrics.ApiDependencies", MockApiDependencies(mock_invoker))
+    INVOCATION_SECONDS.observe(0.2, invocation_type="test_metrics_invocation")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert 'invokeai_queue_items{queue_id="default",status="pending"} 0' in lines
+    assert "invokeai_invocation_cache_hit_ratio 0" in lines
+    assert 'invokeai_download_jobs{status="running"} 0' in lines
+    assert 'invokeai_invocation_seconds_count{invocation_type="test_metrics_invocation"} 1' in lines
+    assert "# TYPE invokeai_db_transaction_seconds histogram" in lines
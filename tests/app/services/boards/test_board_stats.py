@@ -0,0 +1,214 @@
+from itertools import count
+from unittest.mock import MagicMock
+
+import pytest
+
+from invokeai.app.services.board_image_records.board_image_records_sqlite import SqliteBoardImageRecordStorage
+from invokeai.app.services.board_records.board_records_common import BoardChanges, BoardRecordOrderBy, BoardStats
+from invokeai.app.services.board_records.board_records_sqlite import SqliteBoardRecordStorage
+from invokeai.app.services.boards.boards_default import BoardService
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.image_records.image_records_common import ImageCategory, ImageRecordChanges, ResourceOrigin
+from invokeai.app.services.image_records.image_records_sqlite import SqliteImageRecordStorage
+from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+from invokeai.app.services.shared.sqlite_migrator.migrations.migration_28 import Migration28Callback
+from invokeai.backend.util.logging import InvokeAILogger
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+
+
+class Stores:
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+        self.boards = SqliteBoardRecordStorage(db=db)
+        self.images = SqliteImageRecordStorage(db=db)
+        self.board_images = SqliteBoardImageRecordStorage(db=db)
+        self._timestamps = count()
+
+    def add_image(
+        self,
+        image_name: str,
+        board_id: str | None = None,
+        category: ImageCategory = ImageCategory.GENERAL,
+        is_intermediate: bool = False,
+        starred: bool = False,
+    ) -> None:
+        self.images.save(
+            image_name=image_name,
+            image_origin=ResourceOrigin.INTERNAL,
+            image_category=category,
+            width=8,
+            height=8,
+            has_workflow=False,
+            is_intermediate=is_intermediate,
+            starred=starred,
+        )
+        # Images saved in the same millisecond would tie for the cover.
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                "UPDATE images SET created_at = ? WHERE image_name = ?;",
+                (f"2024-01-01 00:00:{next(self._timestamps):02d}.000", image_name),
+            )
+        if board_id is not None:
+            self.board_images.add_image_to_board(board_id, image_name)
+
+    def expected_stats(self, board_id: str) -> BoardStats:
+        """The stats, computed with the per-board queries that the stats replace."""
+        cover_image = self.images.get_most_recent_image_for_board(board_id)
+        return BoardStats(
+            image_count=self.board_images.get_image_count_for_board(board_id),
+            asset_count=self.board_images.get_asset_count_for_board(board_id),
+            cover_image_name=cover_image.image_name if cover_image else None,
+        )
+
+    def assert_stats_are_consistent(self) -> None:
+        for board in self.boards.get_all(BoardRecordOrderBy.CreatedAt, SQLiteDirection.Ascending, True):
+            assert board.stats == self.expected_stats(board.board_id), board.board_name
+
+
+@pytest.fixture
+def stores() -> Stores:
+    config = InvokeAIAppConfig(use_memory_db=True)
+    db = create_mock_sqlite_database(config, InvokeAILogger.get_logger(config=config))
+    return Stores(db)
+
+
+def test_new_board_has_empty_stats(stores: Stores):
+    board = stores.boards.save("board")
+
+    assert board.stats == BoardStats(image_count=0, asset_count=0, cover_image_name=None)
+
+
+def test_stats_count_images_and_assets(stores: Stores):
+    board_id = stores.boards.save("board").board_id
+    stores.add_image("general", board_id)
+    stores.add_image("mask", board_id, category=ImageCategory.MASK)
+    stores.add_image("user", board_id, category=ImageCategory.USER)
+    stores.add_image("intermediate", board_id, is_intermediate=True)
+    stores.add_image("no_board")
+
+    stats = stores.boards.get(board_id).stats
+
+    assert stats.image_count == 1
+    assert stats.asset_count == 2
+    assert stats.cover_image_name == "user"
+    stores.assert_stats_are_consistent()
+
+
+def test_cover_prefers_starred_images(stores: Stores):
+    board_id = stores.boards.save("board").board_id
+    stores.add_image("starred", board_id, starred=True)
+    stores.add_image("newer", board_id)
+
+    assert stores.boards.get(board_id).stats.cover_image_name == "starred"
+
+    stores.images.update("starred", ImageRecordChanges(starred=False))
+    assert stores.boards.get(board_id).stats.cover_image_name == "newer"
+
+    stores.images.update("starred", ImageRecordChanges(starred=True))
+    assert stores.boards.get(board_id).stats.cover_image_name == "starred"
+    stores.assert_stats_are_consistent()
+
+
+def test_stats_follow_image_changes(stores: Stores):
+    board_id = stores.boards.save("board").board_id
+    stores.add_image("a", board_id)
+    stores.add_image("b", board_id)
+
+    stores.images.update("b", ImageRecordChanges(image_category=ImageCategory.CONTROL))
+    stores.assert_stats_are_consistent()
+
+    stores.images.update("b", ImageRecordChanges(is_intermediate=True))
+    stores.assert_stats_are_consistent()
+    assert stores.boards.get(board_id).stats == BoardStats(image_count=1, asset_count=0, cover_image_name="a")
+
+    stores.images.update("b", ImageRecordChanges(is_intermediate=False))
+    stores.assert_stats_are_consistent()
+    assert stores.boards.get(board_id).stats.cover_image_name == "b"
+
+
+def test_stats_follow_board_membership(stores: Stores):
+    board_1 = stores.boards.save("board 1").board_id
+    board_2 = stores.boards.save("board 2").board_id
+    for i in range(4):
+        stores.add_image(f"image_{i}", board_1)
+
+    # Moving the cover image to another board.
+    stores.board_images.add_image_to_board(board_2, "image_3")
+    stores.assert_stats_are_consistent()
+    assert stores.boards.get(board_2).stats.cover_image_name == "image_3"
+
+    # Adding an image to the board it is already in.
+    stores.board_images.add_image_to_board(board_1, "image_2")
+    stores.assert_stats_are_consistent()
+
+    stores.board_images.remove_image_from_board("image_2")
+    stores.assert_stats_are_consistent()
+    assert stores.boards.get(board_1).stats == BoardStats(image_count=2, asset_count=0, cover_image_name="image_1")
+
+
+def test_stats_follow_image_deletion(stores: Stores):
+    board_id = stores.boards.save("board").board_id
+    for i in range(5):
+        stores.add_image(f"image_{i}", board_id)
+    stores.add_image("intermediate", board_id, is_intermediate=True)
+
+    stores.images.delete("image_4")
+    stores.assert_stats_are_consistent()
+
+    stores.images.delete_many(["image_0", "image_3"])
+    stores.assert_stats_are_consistent()
+
+    stores.images.delete_intermediates()
+    stores.assert_stats_are_consistent()
+    assert stores.boards.get(board_id).stats == BoardStats(image_count=2, asset_count=0, cover_image_name="image_2")
+
+
+def test_stats_are_deleted_with_the_board(stores: Stores):
+    board_id = stores.boards.save("board").board_id
+    stores.add_image("image", board_id)
+
+    stores.boards.delete(board_id)
+
+    with stores.db.transaction() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM board_stats;")
+        assert cursor.fetchone()[0] == 0
+
+
+def test_migration_computes_stats_of_existing_boards(stores: Stores):
+    board_ids = [stores.boards.save(f"board {i}").board_id for i in range(3)]
+    stores.add_image("a", board_ids[0])
+    stores.add_image("b", board_ids[0], category=ImageCategory.OTHER, starred=True)
+    stores.add_image("c", board_ids[1])
+    stores.add_image("d", board_ids[1], is_intermediate=True)
+
+    with stores.db.transaction() as cursor:
+        cursor.execute("DELETE FROM board_stats;")
+        Migration28Callback()._populate_board_stats(cursor)
+
+    stores.assert_stats_are_consistent()
+
+
+def test_board_service_lists_boards_without_per_board_queries(stores: Stores):
+    board_ids = [stores.boards.save(f"board {i}").board_id for i in range(3)]
+    stores.add_image("a", board_ids[0])
+    stores.add_image("b", board_ids[1], category=ImageCategory.MASK)
+    stores.boards.update(board_ids[2], BoardChanges(archived=True))
+
+    invoker = MagicMock()
+    invoker.services.board_records = stores.boards
+    board_service = BoardService()
+    board_service.start(invoker)
+
+    boards = board_service.get_all(BoardRecordOrderBy.Name, SQLiteDirection.Ascending)
+    page = board_service.get_many(BoardRecordOrderBy.Name, SQLiteDirection.Ascending, limit=10)
+
+    assert [(b.board_name, b.image_count, b.asset_count, b.cover_image_name) for b in boards] == [
+        ("board 0", 1, 0, "a"),
+        ("board 1", 0, 1, "b"),
+    ]
+    assert page.items == boards
+    assert board_service.get_dto(board_ids[0]) == boards[0]
+    # All of the stats come from the board records.
+    assert invoker.services.image_records.method_calls == []
+    assert invoker.services.board_image_records.method_calls == []
@@ -2,12 +2,16 @@ import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Any
-from zipfile import ZipFile
+from zipfile import ZIP_STORED, ZipFile
 
 import pytest
 
 from invokeai.app.services.board_records.board_records_common import BoardRecord, BoardRecordNotFoundException
-from invokeai.app.services.bulk_download.bulk_download_common import BulkDownloadTargetException
+from invokeai.app.services.bulk_download import bulk_download_default
+from invokeai.app.services.bulk_download.bulk_download_common import (
+    BulkDownloadParametersException,
+    BulkDownloadTargetException,
+)
 from invokeai.app.services.bulk_download.bulk_download_default import BulkDownloadService
 from invokeai.app.services.events.events_common import (
     BulkDownloadCompleteEvent,
@@ -109,6 +113,59 @@ def test_handler_image_names(tmp_path: Path, monkeypatch: Any, mock_image_dto: I
     )
 
 
+def prepare_stream_test(tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker) -> dict:
+    """Create 20 images on disk, returning their contents by name."""
+    images = {f"image_{i}.png": os.urandom(1000 + i) for i in range(20)}
+    for name, contents in images.items():
+        (tmp_path / name).write_bytes(contents)
+
+    monkeypatch.setattr(
+        mock_invoker.services.images, "get_dto", lambda name: mock_image_dto.model_copy(update={"image_name": name})
+    )
+    monkeypatch.setattr(mock_invoker.services.images, "get_path", lambda name: str(tmp_path / name))
+    return images
+
+
+def test_stream(tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker):
+    """Test that a streamed zip file contains the images, stored uncompressed and in order."""
+    images = prepare_stream_test(tmp_path, monkeypatch, mock_image_dto, mock_invoker)
+    monkeypatch.setattr(bulk_download_default, "ZIP_STREAM_CHUNK_SIZE", 4096)
+
+    bulk_download_service = BulkDownloadService()
+    bulk_download_service.start(mock_invoker)
+    chunks = list(bulk_download_service.stream(list(images), None))
+
+    # The zip file is yielded in several chunks, as it is generated
+    assert len(chunks) > 1
+    zip_path = tmp_path / "streamed.zip"
+    zip_path.write_bytes(b"".join(chunks))
+    with ZipFile(zip_path, "r") as zip_file:
+        assert zip_file.namelist() == [f"general/{name}" for name in images]
+        for name, contents in images.items():
+            assert zip_file.getinfo(f"general/{name}").compress_type == ZIP_STORED
+            assert zip_file.read(f"general/{name}") == contents
+    # Nothing is written to the bulk downloads folder
+    assert list((tmp_path / "bulk_downloads").iterdir()) == []
+    # No events are emitted
+    assert mock_invoker.services.events.events == []  # pyright: ignore [reportAttributeAccessIssue]
+
+
+def test_stream_errors(tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker):
+    """Test that missing images raise before the stream starts."""
+    bulk_download_service = BulkDownloadService()
+    bulk_download_service.start(mock_invoker)
+
+    with pytest.raises(BulkDownloadParametersException):
+        bulk_download_service.stream(None, None)
+
+    def mock_get_dto(*args, **kwargs):
+        raise ImageRecordNotFoundException("Image not found")
+
+    monkeypatch.setattr(mock_invoker.services.images, "get_dto", mock_get_dto)
+    with pytest.raises(ImageRecordNotFoundException):
+        bulk_download_service.stream(["missing.png"], None)
+
+
 def test_generate_id(monkeypatch: Any):
     """Test that the generate_id method generates a unique id."""
 
@@ -1,6 +1,10 @@
 """Test the queued download facility"""
 
+import gzip
+import hashlib
+import io
 import re
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
@@ -8,12 +12,22 @@ from typing import Any, Generator, Optional
 
 import pytest
 from pydantic.networks import AnyHttpUrl
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
 from requests.sessions import Session
 from requests_testadapter import TestAdapter
+from urllib3 import HTTPResponse
 
-from invokeai.app.services.config import get_config
+from invokeai.app.services.config import InvokeAIAppConfig, get_config
 from invokeai.app.services.config.config_default import URLRegexTokenPair
-from invokeai.app.services.download import DownloadJob, DownloadJobStatus, DownloadQueueService, MultiFileDownloadJob
+from invokeai.app.services.download import (
+    DownloadJob,
+    DownloadJobStatus,
+    DownloadQueueService,
+    DownloadVerificationException,
+    MultiFileDownloadJob,
+    download_default,
+)
 from invokeai.app.services.events.events_common import (
     DownloadCancelledEvent,
     DownloadCompleteEvent,
@@ -355,3 +369,180 @@ def test_tokens(tmp_path: Path, mm2_session: Session):
         assert job1.access_token == "cv_12345"
         assert job2.access_token is None
         queue.stop()
+
+
+class RangeAdapter(BaseAdapter):
+    """Serves a single file, honouring range requests. Can be made to drop connections part-way through a range."""
+
+    def __init__(self, content: bytes, etag: str = '"v1"', gzip_encoded: bool = False) -> None:
+        super().__init__()
+        self.content = content
+        self.etag = etag
+        self.gzip_encoded = gzip_encoded  # serve the whole file gzip-encoded, ignoring range requests
+        self.ranges: list[tuple[int, int]] = []
+        self.drop_after: Optional[int] = None  # drop range responses after this many bytes
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        resp = Response()
+        resp.request = request
+        resp.url = str(request.url)
+        resp.headers["Accept-Ranges"] = "bytes"
+        resp.headers["ETag"] = self.etag
+        body = self.content
+        resp.status_code = 200
+        if self.gzip_encoded:
+            body = gzip.compress(body)
+            resp.headers["Content-Encoding"] = "gzip"
+            resp.headers["Content-Length"] = str(len(body))
+            # requests only decodes the body of a urllib3 response
+            resp.raw = HTTPResponse(
+                body=io.BytesIO(body), headers=resp.headers, status=200, preload_content=False, decode_content=True
+            )
+            return resp
+        if match := re.match(r"bytes=(\d+)-(\d+)", request.headers.get("Range", "")):
+            start, end = int(match.group(1)), int(match.group(2))
+            with self._lock:
+                self.ranges.append((start, end))
+            body = self.content[start : end + 1]
+            if self.drop_after is not None:
+                body = body[: self.drop_after]
+            resp.status_code = 206
+        resp.headers["Content-Length"] = str(len(body))
+        resp.raw = io.BytesIO(body)
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def segmented_content(monkeypatch: pytest.MonkeyPatch) -> bytes:
+    monkeypatch.setattr(download_default, "SEGMENTED_DOWNLOAD_MIN_SIZE", 1000)
+    return bytes(range(256)) * 1000
+
+
+def range_session(adapter: RangeAdapter) -> Session:
+    session = Session()
+    session.mount("http://www.example.com", adapter)
+    return session
+
+
+def download_file(
+    tmp_path: Path, adapter: RangeAdapter, connections: int = 4, **job_fields: Any
+) -> tuple[DownloadJob, Path]:
+    queue = DownloadQueueService(
+        requests_session=range_session(adapter), app_config=InvokeAIAppConfig(download_connections=connections)
+    )
+    queue.start()
+    dest = tmp_path / "model.safetensors"
+    job = DownloadJob(source=AnyHttpUrl("http://www.example.com/model.safetensors"), dest=dest, **job_fields)
+    queue.submit_download_job(job)
+    queue.join()
+    queue.stop()
+    return job, dest
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download(tmp_path: Path, segmented_content: bytes) -> None:
+    adapter = RangeAdapter(segmented_content)
+    job, dest = download_file(tmp_path, adapter)
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == segmented_content
+    assert job.bytes == len(segmented_content)
+    # the file is split into one segment per connection, covering the whole file
+    assert sorted(adapter.ranges) == [(0, 63999), (64000, 127999), (128000, 191999), (192000, 255999)]
+    assert not (tmp_path / "model.safetensors.downloading").exists()
+    assert not (tmp_path / "model.safetensors.downloading.json").exists()
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_single_connection_download(tmp_path: Path, segmented_content: bytes) -> None:
+    adapter = RangeAdapter(segmented_content)
+    job, dest = download_file(tmp_path, adapter, connections=1)
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == segmented_content
+    assert adapter.ranges == []
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download_resumes(tmp_path: Path, segmented_content: bytes) -> None:
+    adapter = RangeAdapter(segmented_content)
+    adapter.drop_after = 10000
+    job, dest = download_file(tmp_path, adapter)
+
+    assert job.status == DownloadJobStatus.ERROR
+    assert not dest.exists()
+    assert (tmp_path / "model.safetensors.downloading.json").exists()
+
+    # the second attempt only fetches the remainder of each segment. The other segments are stopped when the first
+    # one fails, so they may or may not have made progress.
+    adapter.drop_after = None
+    adapter.ranges = []
+    job, dest = download_file(tmp_path, adapter)
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == segmented_content
+    ranges = sorted(adapter.ranges)
+    assert [end for _, end in ranges] == [63999, 127999, 191999, 255999]
+    assert all(
+        start in (segment_start, segment_start + 10000)
+        for (start, _), segment_start in zip(ranges, range(0, 256000, 64000), strict=True)
+    )
+    assert any(start % 64000 == 10000 for start, _ in ranges)
+    assert not (tmp_path / "model.safetensors.downloading.json").exists()
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download_restarts_if_remote_changed(tmp_path: Path, segmented_content: bytes) -> None:
+    adapter = RangeAdapter(segmented_content)
+    adapter.drop_after = 10000
+    download_file(tmp_path, adapter)
+
+    changed_content = bytes(reversed(segmented_content))
+    adapter = RangeAdapter(changed_content, etag='"v2"')
+    job, dest = download_file(tmp_path, adapter)
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == changed_content
+    assert sorted(adapter.ranges)[0] == (0, 63999)
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_download_verification(tmp_path: Path, segmented_content: bytes) -> None:
+    adapter = RangeAdapter(segmented_content)
+    sha256 = hashlib.sha256(segmented_content).hexdigest()
+    job, dest = download_file(tmp_path, adapter, expected_sha256=sha256, expected_size=len(segmented_content))
+    assert job.status == DownloadJobStatus.COMPLETED
+    dest.unlink()
+
+    job, dest = download_file(tmp_path, adapter, expected_sha256=hashlib.sha256(b"other").hexdigest())
+    assert job.status == DownloadJobStatus.ERROR
+    assert job.error_type is not None and DownloadVerificationException.__name__ in job.error_type
+    assert not dest.exists()
+    assert not (tmp_path / "model.safetensors.downloading").exists()
+
+    job, dest = download_file(tmp_path, adapter, connections=1, expected_size=len(segmented_content) + 1)
+    assert job.status == DownloadJobStatus.ERROR
+    assert not dest.exists()
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_content_encoded_download(tmp_path: Path, segmented_content: bytes) -> None:
+    # The content-length is the size of the encoded body, not of the file
+    adapter = RangeAdapter(segmented_content, gzip_encoded=True)
+    job, dest = download_file(tmp_path, adapter)
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == segmented_content
+    assert adapter.ranges == []
+    dest.unlink()
+
+    job, dest = download_file(tmp_path, adapter, expected_size=len(segmented_content))
+    assert job.status == DownloadJobStatus.COMPLETED
+    dest.unlink()
+
+    job, dest = download_file(tmp_path, adapter, expected_size=len(segmented_content) + 1)
+    assert job.status == DownloadJobStatus.ERROR
+    assert not dest.exists()
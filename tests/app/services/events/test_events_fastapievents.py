@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Any, Generator
+
+import pytest
+
+from invokeai.app.api import sockets
+from invokeai.app.api.sockets import SocketIO
+from invokeai.app.services.events import events_fastapievents
+from invokeai.app.services.events.events_common import (
+    DownloadCompleteEvent,
+    DownloadProgressEvent,
+    DownloadStartedEvent,
+    EventBase,
+)
+from invokeai.app.services.events.events_fastapievents import FastAPIEventService
+
+
+def progress(source: str, current_bytes: int) -> DownloadProgressEvent:
+    return DownloadProgressEvent(
+        source=source, download_path=f"/tmp/{source}", current_bytes=current_bytes, total_bytes=100
+    )
+
+
+def started(source: str) -> DownloadStartedEvent:
+    return DownloadStartedEvent(source=source, download_path=f"/tmp/{source}")
+
+
+def complete(source: str) -> DownloadCompleteEvent:
+    return DownloadCompleteEvent(source=source, download_path=f"/tmp/{source}", total_bytes=100)
+
+
+@pytest.fixture
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def dispatched(monkeypatch: pytest.MonkeyPatch) -> list[EventBase]:
+    dispatched: list[EventBase] = []
+    monkeypatch.setattr(events_fastapievents, "dispatch", lambda event, **kwargs: dispatched.append(event))
+    return dispatched
+
+
+def drain(loop: asyncio.AbstractEventLoop, service: FastAPIEventService) -> None:
+    """Let the event loop dispatch the queued events."""
+
+    async def wait_for_empty_queue() -> None:
+        while service._pending:
+            await asyncio.sleep(0)
+
+    loop.run_until_complete(wait_for_empty_queue())
+
+
+def stop(loop: asyncio.AbstractEventLoop, service: FastAPIEventService) -> None:
+    service.stop()
+    loop.run_until_complete(asyncio.gather(*service._background_tasks))
+
+
+def test_events_are_dispatched_in_order(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]) -> None:
+    service = FastAPIEventService(0, loop)
+    events = [started("a"), progress("a", 10), complete("a")]
+    for event in events:
+        service.dispatch(event)
+    drain(loop, service)
+    assert dispatched == events
+    stop(loop, service)
+
+
+def test_progress_events_are_coalesced(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]) -> None:
+    service = FastAPIEventService(0, loop)
+    service.dispatch(started("a"))
+    service.dispatch(started("b"))
+    for i in range(10):
+        service.dispatch(progress("a", i))
+        service.dispatch(progress("b", i * 2))
+    service.dispatch(complete("b"))
+    drain(loop, service)
+
+    # Only the latest progress of each download is delivered, and no progress is delivered after it completes
+    assert dispatched == [started("a"), started("b"), progress("a", 9), progress("b", 18), complete("b")]
+    stop(loop, service)
+
+
+def test_queue_is_bounded(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]) -> None:
+    service = FastAPIEventService(0, loop, max_pending_events=5)
+    for i in range(8):
+        service.dispatch(started(str(i)))
+        service.dispatch(progress(str(i), 50))
+    drain(loop, service)
+
+    # The oldest progress events are dropped, but every other event is delivered
+    assert [e for e in dispatched if isinstance(e, DownloadStartedEvent)] == [started(str(i)) for i in range(8)]
+    assert [e for e in dispatched if isinstance(e, DownloadProgressEvent)] == [progress("7", 50)]
+    stop(loop, service)
+
+
+def test_events_dispatched_from_threads(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]) -> None:
+    service = FastAPIEventService(0, loop)
+
+    def dispatch_events(source: str) -> None:
+        service.dispatch(started(source))
+        for i in range(100):
+            service.dispatch(progress(source, i))
+        service.dispatch(complete(source))
+
+    threads = [threading.Thread(target=dispatch_events, args=(str(i),)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    drain(loop, service)
+
+    for i in range(4):
+        events = [e for e in dispatched if e.source == str(i)]  # pyright: ignore [reportAttributeAccessIssue]
+        assert events[0] == started(str(i))
+        assert events[-1] == complete(str(i))
+        assert progress(str(i), 99) in events
+    stop(loop, service)
+
+
+class MockSocketServer:
+    def __init__(self, backlogs: dict[str, int]) -> None:
+        self.manager = SimpleNamespace(get_participants=lambda namespace, room: [(s, f"eio-{s}") for s in backlogs])
+        self.eio = SimpleNamespace(
+            sockets={
+                f"eio-{sid}": SimpleNamespace(queue=SimpleNamespace(qsize=lambda n=n: n)) for sid, n in backlogs.items()
+            }
+        )
+        self.emitted: list[dict[str, Any]] = []
+
+    async def emit(self, **kwargs: Any) -> None:
+        self.emitted.append(kwargs)
+
+
+def test_progress_is_not_sent_to_slow_clients(loop: asyncio.AbstractEventLoop) -> None:
+    socket_io = SocketIO.__new__(SocketIO)
+    server = MockSocketServer({"fast": 0, "slow": sockets.SLOW_CLIENT_MAX_PENDING_PACKETS + 1})
+    socket_io._sio = server  # pyright: ignore [reportAttributeAccessIssue]
+
+    loop.run_until_complete(socket_io._handle_model_event(("download_progress", progress("a", 10))))
+    loop.run_until_complete(socket_io._handle_model_event(("download_complete", complete("a"))))
+
+    assert server.emitted[0]["skip_sid"] == ["slow"]
+    assert server.emitted[0]["data"] == progress("a", 10).model_dump(mode="json")
+    # Other events are sent to every client
+    assert server.emitted[1]["skip_sid"] is None
@@ -0,0 +1,184 @@
+import re
+from typing import Callable, Optional
+
+import pytest
+
+from invokeai.app.services.board_image_records.board_image_records_sqlite import SqliteBoardImageRecordStorage
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.image_records.image_records_common import (
+    ASSETS_CATEGORIES,
+    IMAGE_CATEGORIES,
+    ImageCategory,
+)
+from invokeai.app.services.image_records.image_records_sqlite import SqliteImageRecordStorage
+from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+from invokeai.backend.util.logging import InvokeAILogger
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+
+# The queries that search image metadata with `LIKE '%term%'` must read every image, and are not checked. Nor are the
+# queries of the `boards` table, which has one row per board.
+
+NUM_BOARDS = 400
+BOARD_ID = "board_7"
+
+
+class QueryPlanStores:
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+        self.images = SqliteImageRecordStorage(db=db)
+        self.board_images = SqliteBoardImageRecordStorage(db=db)
+
+    def populate(self, num_images: int) -> None:
+        """Adds boards and images with a mix of categories, intermediates and stars. About 2/3 of the images are in
+        a board."""
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                f"""--sql
+                WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < {NUM_BOARDS})
+                INSERT INTO boards (board_id, board_name) SELECT 'board_' || i, 'Board ' || i FROM n;
+                """
+            )
+            cursor.execute(
+                f"""--sql
+                WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < {num_images})
+                INSERT INTO images (
+                    image_name, image_origin, image_category, width, height, is_intermediate, starred, created_at
+                )
+                SELECT
+                    'image_' || i,
+                    'internal',
+                    CASE i % 10 WHEN 0 THEN 'mask' WHEN 1 THEN 'control' WHEN 2 THEN 'user' ELSE 'general' END,
+                    512,
+                    512,
+                    i % 7 = 0,
+                    i % 50 = 0,
+                    STRFTIME('%Y-%m-%d %H:%M:%f', '2024-01-01', '+' || i || ' seconds')
+                FROM n;
+                """
+            )
+            cursor.execute(
+                f"""--sql
+                INSERT INTO board_images (board_id, image_name)
+                SELECT 'board_' || (rowid % {NUM_BOARDS}), image_name FROM images WHERE rowid % 3 != 0;
+                """
+            )
+
+    def capture_queries(self, fn: Callable[[], object]) -> list[str]:
+        """Runs `fn` and returns the SELECT statements that it executed, with their parameters bound."""
+        statements: list[str] = []
+        self.db._conn.set_trace_callback(statements.append)
+        try:
+            fn()
+        finally:
+            self.db._conn.set_trace_callback(None)
+        return [s for s in statements if _strip_comments(s).upper().startswith("SELECT")]
+
+    def explain(self, query: str) -> list[str]:
+        with self.db.transaction() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {_strip_comments(query)}")
+            return [row["detail"] for row in cursor.fetchall()]
+
+
+def _strip_comments(query: str) -> str:
+    return re.sub(r"--[^\n]*", "", query).strip()
+
+
+def get_plan_problems(plan: list[str]) -> list[str]:
+    """Gets the steps of a query plan that read every image, or sort every matching image.
+
+    A query of a single board starts from the board's images in `board_images`, and sorts only those. This is allowed.
+    """
+    problems = [step for step in plan if re.match(r"SCAN (images|board_images)\b", step)]
+    searches_one_board = any(step.startswith("SEARCH board_images") and "(board_id=?" in step for step in plan)
+    if not searches_one_board:
+        problems += [step for step in plan if step.startswith("USE TEMP B-TREE") and "ORDER BY" in step]
+    return problems
+
+
+def gallery_queries(stores: QueryPlanStores) -> list[tuple[str, Callable[[], object]]]:
+    """The queries of the gallery, in each of their shapes."""
+    queries: list[tuple[str, Callable[[], object]]] = []
+    categories: list[tuple[str, Optional[list[ImageCategory]]]] = [
+        ("images", IMAGE_CATEGORIES),
+        ("assets", ASSETS_CATEGORIES),
+        ("all", None),
+    ]
+    for category_name, category_list in categories:
+        for board_id in [None, "none", BOARD_ID]:
+            for starred_first in [True, False]:
+                for order_dir in SQLiteDirection:
+                    shape = f"{category_name}-board={board_id}-starred_first={starred_first}-{order_dir.value}"
+                    kwargs = {
+                        "starred_first": starred_first,
+                        "order_dir": order_dir,
+                        "categories": category_list,
+                        "is_intermediate": False,
+                        "board_id": board_id,
+                    }
+                    queries.append((f"get_many-{shape}", lambda kwargs=kwargs: stores.images.get_many(**kwargs)))
+                    queries.append(
+                        (f"get_image_names-{shape}", lambda kwargs=kwargs: stores.images.get_image_names(**kwargs))
+                    )
+            for board_id_or_none in ["none", BOARD_ID]:
+                queries.append(
+                    (
+                        f"get_all_board_image_names_for_board-{category_name}-board={board_id_or_none}",
+                        lambda b=board_id_or_none, c=category_list: (
+                            stores.board_images.get_all_board_image_names_for_board(b, c, False)
+                        ),
+                    )
+                )
+    queries.append(("get_most_recent_image_for_board", lambda: stores.images.get_most_recent_image_for_board(BOARD_ID)))
+    queries.append(("get_image_count_for_board", lambda: stores.board_images.get_image_count_for_board(BOARD_ID)))
+    queries.append(("get_asset_count_for_board", lambda: stores.board_images.get_asset_count_for_board(BOARD_ID)))
+    queries.append(("get_intermediates_count", lambda: stores.images.get_intermediates_count()))
+    return queries
+
+
+def assert_query_plans(stores: QueryPlanStores) -> None:
+    problems: list[str] = []
+    for name, fn in gallery_queries(stores):
+        queries = stores.capture_queries(fn)
+        assert queries, name
+        for query in queries:
+            plan = stores.explain(query)
+            for problem in get_plan_problems(plan):
+                problems.append(f"{name}: {problem}\n{_strip_comments(query)}\n{plan}")
+    assert not problems, "\n\n".join(problems)
+
+
+def create_stores(num_images: int) -> QueryPlanStores:
+    config = InvokeAIAppConfig(use_memory_db=True)
+    db = create_mock_sqlite_database(config, InvokeAILogger.get_logger(config=config))
+    stores = QueryPlanStores(db)
+    stores.populate(num_images)
+    return stores
+
+
+def test_get_plan_problems():
+    assert get_plan_problems(["SEARCH images USING INDEX idx_images_gallery_created_at (is_intermediate=?)"]) == []
+    assert get_plan_problems(["SCAN images"]) == ["SCAN images"]
+    assert get_plan_problems(
+        ["SEARCH images USING INDEX idx_images_image_name (image_name=?)", "USE TEMP B-TREE FOR ORDER BY"]
+    ) == ["USE TEMP B-TREE FOR ORDER BY"]
+    # Sorting the images of one board is expected.
+    assert (
+        get_plan_problems(
+            [
+                "SEARCH board_images USING COVERING INDEX idx_board_images_board_id_image_name (board_id=?)",
+                "SEARCH images USING INDEX sqlite_autoindex_images_1 (image_name=?)",
+                "USE TEMP B-TREE FOR ORDER BY",
+            ]
+        )
+        == []
+    )
+
+
+def test_gallery_query_plans():
+    assert_query_plans(create_stores(10_000))
+
+
+@pytest.mark.slow
+def test_gallery_query_plans_large_gallery():
+    assert_query_plans(create_stores(1_000_000))
@@ -3,7 +3,10 @@ Test the model installer
 """
 
 import gc
+import os
 import platform
+import threading
+import time
 import uuid
 from pathlib import Path
 from typing import Any, Dict
@@ -24,6 +27,7 @@ from invokeai.app.services.events.events_common import (
 from invokeai.app.services.model_install import (
     HFModelSource,
     ModelInstallServiceBase,
+    model_install_default,
 )
 from invokeai.app.services.model_install.model_install_common import (
     InstallStatus,
@@ -33,6 +37,7 @@ from invokeai.app.services.model_install.model_install_common import (
     URLModelSource,
 )
 from invokeai.app.services.model_records import ModelRecordChanges, UnknownModelException
+from invokeai.backend.model_hash.model_hash import ModelHash
 from invokeai.backend.model_manager.taxonomy import (
     BaseModelType,
     ModelFormat,
@@ -425,3 +430,67 @@ def test_heuristic_import_with_type(mm2_installer: ModelInstallServiceBase, mode
     mm2_installer.wait_for_job(install_job2, timeout=10)
     assert install_job2.complete
     assert install_job2.config_out if model_params["type"] == "embedding" else not install_job2.config_out
+
+
+def test_registration_reuses_cached_hash(
+    monkeypatch: pytest.MonkeyPatch, mm2_installer: ModelInstallServiceBase, embedding_file: Path
+) -> None:
+    key = mm2_installer.register_path(embedding_file)
+    hash_ = mm2_installer.record_store.get_model(key).hash
+    mm2_installer.unregister(key)
+
+    def hash_file(*args: Any, **kwargs: Any) -> str:
+        raise AssertionError("The model should not be re-hashed")
+
+    monkeypatch.setattr(ModelHash, "_blake3_single", staticmethod(hash_file))
+    key = mm2_installer.register_path(embedding_file)
+    assert mm2_installer.record_store.get_model(key).hash == hash_
+
+
+def test_verify_model_hashes(mm2_installer: ModelInstallServiceBase, embedding_file: Path) -> None:
+    key = mm2_installer.register_path(embedding_file)
+    [result] = mm2_installer.verify_model_hashes()
+    assert result.key == key
+    assert result.is_valid
+
+    # Corrupt the model without changing its size or modification time, so the hash cache can't tell
+    stat = embedding_file.stat()
+    data = bytearray(embedding_file.read_bytes())
+    data[-1] ^= 0xFF
+    embedding_file.write_bytes(data)
+    os.utime(embedding_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    [result] = mm2_installer.verify_model_hashes([key])
+    assert not result.is_valid
+    assert result.actual_hash is not None
+    assert result.actual_hash != result.expected_hash
+
+    embedding_file.unlink()
+    [result] = mm2_installer.verify_model_hashes([key])
+    assert not result.is_valid
+    assert result.error is not None
+
+
+def test_hash_cache_is_opened_once(
+    monkeypatch: pytest.MonkeyPatch, mm2_installer: model_install_default.ModelInstallService
+) -> None:
+    opened: list[Any] = []
+
+    class SlowModelHashCache:
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            time.sleep(0.05)
+            opened.append(self)
+
+    monkeypatch.setattr(model_install_default, "ModelHashCache", SlowModelHashCache)
+    monkeypatch.setattr(mm2_installer, "_hash_cache", None)
+
+    # Probes run in a thread pool, so the cache may be first used by several threads at once.
+    caches: list[Any] = []
+    threads = [threading.Thread(target=lambda: caches.append(mm2_installer._get_hash_cache())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(opened) == 1
+    assert all(cache is opened[0] for cache in caches)
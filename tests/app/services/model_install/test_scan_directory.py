@@ -0,0 +1,85 @@
+"""
+Tests for scanning a directory for models (scan_directory).
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from invokeai.app.services.events.events_common import ModelScanProgressEvent
+from invokeai.app.services.model_install import ModelInstallServiceBase
+from invokeai.backend.model_manager.taxonomy import ModelType
+from tests.backend.model_manager.model_manager_fixtures import *  # noqa F403
+
+
+@pytest.fixture
+def scan_dir(tmp_path: Path, embedding_file: Path, diffusers_dir: Path) -> Path:
+    """A directory tree with 3 embeddings, a diffusers model and a file that isn't a model."""
+    scan_dir = tmp_path / "scan"
+    for name in ["a/embedding_1.safetensors", "a/b/embedding_2.safetensors", "c/embedding_3.safetensors"]:
+        (scan_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(embedding_file, scan_dir / name)
+    shutil.copytree(diffusers_dir, scan_dir / "c" / "test-diffusers-main")
+    (scan_dir / "not_a_model.safetensors").write_bytes(b"garbage")
+    return scan_dir
+
+
+def test_scan_directory_registers_models(mm2_installer: ModelInstallServiceBase, scan_dir: Path) -> None:
+    report = mm2_installer.scan_directory(scan_dir)
+
+    assert report.total == 5
+    assert report.probed == 5
+    assert sorted(r.path.name for r in report.registered) == [
+        "embedding_1.safetensors",
+        "embedding_2.safetensors",
+        "embedding_3.safetensors",
+        "test-diffusers-main",
+    ]
+    assert [r.path.name for r in report.errors] == ["not_a_model.safetensors"]
+
+    store = mm2_installer.record_store
+    assert len(store.search_by_attr(model_type=ModelType.TextualInversion)) == 3
+    assert len(store.search_by_attr(model_type=ModelType.Main)) == 1
+    for result in report.registered:
+        assert result.config is not None
+        assert Path(store.get_model(result.config.key).path) == result.path.resolve()
+
+
+def test_scan_directory_dry_run(mm2_installer: ModelInstallServiceBase, scan_dir: Path) -> None:
+    report = mm2_installer.scan_directory(scan_dir, dry_run=True)
+
+    assert report.dry_run
+    assert len(report.registered) == 4
+    assert all(r.config is not None for r in report.registered)
+    assert len(report.errors) == 1
+    assert len(mm2_installer.record_store.all_models()) == 0
+
+
+def test_scan_directory_skips_installed_models(mm2_installer: ModelInstallServiceBase, scan_dir: Path) -> None:
+    mm2_installer.register_path(scan_dir / "a" / "embedding_1.safetensors")
+
+    report = mm2_installer.scan_directory(scan_dir)
+
+    assert report.already_installed == [(scan_dir / "a" / "embedding_1.safetensors").resolve()]
+    assert report.total == 4
+    assert len(report.registered) == 3
+    assert len(mm2_installer.record_store.all_models()) == 4
+
+    # A second scan finds nothing new
+    report = mm2_installer.scan_directory(scan_dir)
+    assert report.total == 1
+    assert report.registered == []
+
+
+def test_scan_directory_emits_progress(mm2_installer: ModelInstallServiceBase, scan_dir: Path) -> None:
+    mm2_installer.scan_directory(scan_dir)
+
+    bus = mm2_installer.event_bus
+    assert bus is not None
+    assert hasattr(bus, "events")  # the dummyeventservice has this
+    progress_events = [x for x in bus.events if isinstance(x, ModelScanProgressEvent)]
+    assert [e.probed for e in progress_events[:5]] == [1, 2, 3, 4, 5]
+    assert progress_events[-1].total == 5
+    assert progress_events[-1].registered == 4
+    assert progress_events[-1].errors == 1
@@ -86,6 +86,24 @@ def test_raises_on_violating_uniqueness(store: ModelRecordServiceBase):
         store.add_model(config2)
 
 
+def test_add_models_skips_duplicates(store: ModelRecordServiceBase):
+    config1 = example_ti_config("key1")
+    store.add_model(config1)
+
+    # Conflicts with config1's path
+    config2 = example_ti_config("key2")
+    config3 = example_ti_config("key3")
+    config3.path = "/tmp/pikachu.bin"
+    config4 = example_ti_config("key4")
+    config4.path = "/tmp/charmander.bin"
+
+    added = store.add_models([config2, config3, config4])
+    assert [c.key for c in added] == ["key3", "key4"]
+    assert store.exists("key3")
+    assert store.exists("key4")
+    assert not store.exists("key2")
+
+
 def test_model_records_updates_model(store: ModelRecordServiceBase):
     config = example_ti_config("key1")
     store.add_model(config)
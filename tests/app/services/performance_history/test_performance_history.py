@@ -0,0 +1,167 @@
+import pytest
+
+from invokeai.app.invocations.denoise_latents import DenoiseLatentsInvocation
+from invokeai.app.invocations.fields import LatentsField
+from invokeai.app.invocations.model import ModelIdentifierField, UNetField
+from invokeai.app.invocations.noise import NoiseInvocation
+from invokeai.app.invocations.primitives import IntegerOutput, LatentsOutput
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.performance_history.performance_history_common import (
+    PerformanceHistoryEntry,
+    PerformanceHistorySummary,
+    build_performance_history_entry,
+    find_regressions,
+    percentile,
+)
+from invokeai.app.services.performance_history.performance_history_sqlite import SqlitePerformanceHistoryStorage
+from invokeai.backend.model_manager.taxonomy import BaseModelType, ModelType, SubModelType
+from invokeai.backend.util.logging import InvokeAILogger
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+
+
+def make_storage(max_entries: int = 1000) -> SqlitePerformanceHistoryStorage:
+    config = InvokeAIAppConfig(use_memory_db=True)
+    db = create_mock_sqlite_database(config, InvokeAILogger.get_logger(config=config))
+    return SqlitePerformanceHistoryStorage(db=db, max_entries=max_entries)
+
+
+def make_entry(duration: float, app_version: str = "1.0.0", **kwargs) -> PerformanceHistoryEntry:
+    fields = {"invocation_type": "denoise_latents", "model": "sd-1.5", "width": 512, "height": 512, "steps": 30}
+    fields.update(kwargs)
+    return PerformanceHistoryEntry(duration=duration, app_version=app_version, **fields)
+
+
+def make_summary(p50: float, count: int = 10, app_version: str = "1.0.0", **kwargs) -> PerformanceHistorySummary:
+    fields = {"invocation_type": "denoise_latents", "model": "sd-1.5", "width": 512, "height": 512, "steps": 30}
+    fields.update(kwargs)
+    return PerformanceHistorySummary(
+        app_version=app_version, count=count, mean=p50, p50=p50, p90=p50, p99=p50, **fields
+    )
+
+
+def test_percentile():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 100) == 5.0
+    assert percentile(values, 90) == pytest.approx(4.6)
+    assert percentile([7.0], 99) == 7.0
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_find_regressions():
+    baseline = [make_summary(1.0), make_summary(1.0, steps=50), make_summary(1.0, width=1024, height=1024)]
+    candidate = [
+        # 50% slower
+        make_summary(1.5, app_version="2.0.0"),
+        # 5% slower, under the threshold
+        make_summary(1.05, app_version="2.0.0", steps=50),
+        # 3x slower, but too few samples
+        make_summary(3.0, count=2, app_version="2.0.0", width=1024, height=1024),
+        # No baseline to compare to
+        make_summary(10.0, app_version="2.0.0", model="sdxl"),
+    ]
+    regressions = find_regressions(baseline, candidate, threshold=0.1, min_count=5)
+    assert len(regressions) == 1
+    assert regressions[0].candidate.steps == 30
+    assert regressions[0].ratio == pytest.approx(1.5)
+
+
+def test_find_regressions_sorted_worst_first():
+    baseline = [make_summary(1.0), make_summary(1.0, steps=50)]
+    candidate = [make_summary(1.5, app_version="2.0.0"), make_summary(2.0, app_version="2.0.0", steps=50)]
+    regressions = find_regressions(baseline, candidate, threshold=0.1, min_count=5)
+    assert [r.ratio for r in regressions] == pytest.approx([2.0, 1.5])
+
+
+def test_storage_summaries():
+    storage = make_storage()
+    storage.add_entries([make_entry(float(d)) for d in range(1, 6)])
+    storage.add_entries([make_entry(10.0, steps=50)])
+    storage.add_entries([make_entry(2.0, app_version="2.0.0")])
+
+    summaries = storage.get_summaries(app_version="1.0.0")
+    assert len(summaries) == 2
+    by_steps = {s.steps: s for s in summaries}
+    assert by_steps[30].count == 5
+    assert by_steps[30].mean == 3.0
+    assert by_steps[30].p50 == 3.0
+    assert by_steps[50].count == 1
+    assert by_steps[50].p99 == 10.0
+
+    assert len(storage.get_summaries()) == 3
+    assert storage.get_summaries(invocation_type="flux_denoise") == []
+    assert storage.get_app_versions() == ["1.0.0", "2.0.0"]
+
+
+def test_storage_groups_null_keys():
+    storage = make_storage()
+    storage.add_entries([make_entry(1.0, model=None, width=None, height=None, steps=None) for _ in range(3)])
+    summaries = storage.get_summaries()
+    assert len(summaries) == 1
+    assert summaries[0].count == 3
+    assert summaries[0].model is None
+
+
+def test_storage_find_regressions():
+    storage = make_storage()
+    storage.add_entries([make_entry(1.0) for _ in range(5)])
+    storage.add_entries([make_entry(1.2, app_version="2.0.0") for _ in range(5)])
+    regressions = storage.find_regressions("1.0.0", "2.0.0", threshold=0.1, min_count=5)
+    assert len(regressions) == 1
+    assert regressions[0].ratio == pytest.approx(1.2)
+    assert storage.find_regressions("1.0.0", "2.0.0", threshold=0.25, min_count=5) == []
+    assert storage.find_regressions("1.0.0", "2.0.0", threshold=0.1, min_count=6) == []
+
+
+def test_storage_drops_oldest_entries():
+    storage = make_storage(max_entries=3)
+    storage.add_entries([make_entry(float(d)) for d in range(1, 4)])
+    storage.add_entries([make_entry(10.0), make_entry(20.0)])
+    summaries = storage.get_summaries()
+    assert summaries[0].count == 3
+    assert summaries[0].p50 == 10.0
+    assert summaries[0].mean == pytest.approx(11.0)
+
+
+def test_storage_clear():
+    storage = make_storage()
+    storage.add_entries([make_entry(1.0)])
+    storage.clear()
+    assert storage.get_summaries() == []
+    assert storage.get_app_versions() == []
+
+
+def test_build_entry_from_invocation_fields():
+    # The output has no size, so the size is taken from the invocation
+    invocation = NoiseInvocation(id="1", width=768, height=512)
+    entry = build_performance_history_entry(invocation, IntegerOutput(value=1), duration=1.5, app_version="1.0.0")
+    assert entry.invocation_type == "noise"
+    assert (entry.width, entry.height) == (768, 512)
+    assert entry.steps is None
+    assert entry.model is None
+    assert entry.duration == 1.5
+
+
+def test_build_entry_from_output_size_and_main_model():
+    def model(name: str, submodel_type: SubModelType) -> ModelIdentifierField:
+        return ModelIdentifierField(
+            key=name,
+            hash=name,
+            name=name,
+            base=BaseModelType.StableDiffusion1,
+            type=ModelType.Main,
+            submodel_type=submodel_type,
+        )
+
+    unet = UNetField(
+        unet=model("sd-1.5", SubModelType.UNet), scheduler=model("sd-1.5", SubModelType.Scheduler), loras=[]
+    )
+    invocation = DenoiseLatentsInvocation(id="1", steps=25, unet=unet)
+    output = LatentsOutput(latents=LatentsField(latents_name="latents"), width=1024, height=768)
+    entry = build_performance_history_entry(invocation, output, duration=2.0, app_version="1.0.0")
+    assert entry.invocation_type == "denoise_latents"
+    assert entry.model == "sd-1.5"
+    assert (entry.width, entry.height) == (1024, 768)
+    assert entry.steps == 25
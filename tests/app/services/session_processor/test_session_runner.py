@@ -0,0 +1,231 @@
+import threading
+import time
+from contextlib import nullcontext
+from typing import Literal, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+# This import must happen before other invoke imports or test in other files(!!) break
+from tests.test_nodes import PromptTestInvocation, PromptTestInvocationOutput, create_edge  # isort: skip
+
+from invokeai.app.invocations.baseinvocation import (
+    BaseInvocation,
+    BaseInvocationOutput,
+    Bottleneck,
+    invocation,
+    invocation_output,
+)
+from invokeai.app.invocations.fields import InputField, OutputField
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.invocation_cache.invocation_cache_memory import MemoryInvocationCache
+from invokeai.app.services.session_processor.session_processor_default import DefaultSessionRunner
+from invokeai.app.services.shared.graph import Graph, GraphExecutionState
+from invokeai.app.services.shared.invocation_context import InvocationContext
+
+
+class ConcurrencyTracker:
+    """Tracks the max number of concurrently running invocations, by bottleneck."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: dict[str, int] = {"cpu": 0, "gpu": 0}
+        self.max_running: dict[str, int] = {"cpu": 0, "gpu": 0, "total": 0}
+
+    def enter(self, kind: str) -> None:
+        with self._lock:
+            self._running[kind] += 1
+            self.max_running[kind] = max(self.max_running[kind], self._running[kind])
+            self.max_running["total"] = max(self.max_running["total"], sum(self._running.values()))
+
+    def exit(self, kind: str) -> None:
+        with self._lock:
+            self._running[kind] -= 1
+
+
+tracker = ConcurrencyTracker()
+
+
+@invocation_output("test_sleep_output")
+class SleepTestInvocationOutput(BaseInvocationOutput):
+    value: str = OutputField(default="")
+
+
+def _sleep(kind: Literal["cpu", "gpu"], value: str, seconds: float) -> SleepTestInvocationOutput:
+    tracker.enter(kind)
+    try:
+        time.sleep(seconds)
+    finally:
+        tracker.exit(kind)
+    return SleepTestInvocationOutput(value=value)
+
+
+@invocation("test_sleep_cpu", version="1.0.0", bottleneck=Bottleneck.CPU)
+class CPUSleepTestInvocation(BaseInvocation):
+    value: str = InputField(default="")
+    seconds: float = InputField(default=0.2)
+
+    def invoke(self, context: InvocationContext) -> SleepTestInvocationOutput:
+        return _sleep("cpu", self.value, self.seconds)
+
+
+@invocation("test_sleep_gpu", version="1.0.0", bottleneck=Bottleneck.GPU)
+class GPUSleepTestInvocation(BaseInvocation):
+    value: str = InputField(default="")
+    seconds: float = InputField(default=0.2)
+
+    def invoke(self, context: InvocationContext) -> SleepTestInvocationOutput:
+        return _sleep("gpu", self.value, self.seconds)
+
+
+@invocation("test_sleep_error", version="1.0.0", bottleneck=Bottleneck.CPU)
+class CPUErrorTestInvocation(BaseInvocation):
+    def invoke(self, context: InvocationContext) -> SleepTestInvocationOutput:
+        raise ValueError("This invocation is supposed to fail")
+
+
+@pytest.fixture(autouse=True)
+def reset_tracker():
+    global tracker
+    tracker = ConcurrencyTracker()
+
+
+def run_session(
+    graph: Graph, max_parallel_nodes: int, services: Optional[MagicMock] = None
+) -> tuple[GraphExecutionState, list[str], MagicMock]:
+    """Runs a graph's session, returning it, the source ids of the completed invocations in completion order, and the
+    node error callback."""
+    if services is None:
+        services = MagicMock()
+        services.configuration = InvokeAIAppConfig(
+            max_parallel_nodes=max_parallel_nodes, node_cache_size=0, performance_history_size=0
+        )
+    services.performance_statistics.collect_stats.side_effect = lambda *args, **kwargs: nullcontext()
+
+    session = GraphExecutionState(graph=graph)
+    queue_item = MagicMock(session=session, status="in_progress", session_id=session.id, item_id=1)
+
+    completed: list[str] = []
+    on_node_error = MagicMock()
+
+    def on_after_run_node(invocation, queue_item, output):
+        completed.append(session.prepared_source_mapping[invocation.id])
+
+    def on_error(invocation, queue_item, error_type, error_message, error_traceback):
+        on_node_error(invocation=invocation, error_type=error_type, error_message=error_message)
+        session.set_node_error(invocation.id, error_message)
+
+    runner = DefaultSessionRunner(on_after_run_node_callbacks=[on_after_run_node])
+    runner._on_node_error = on_error  # type: ignore[method-assign]
+    runner.start(services=services, cancel_event=threading.Event())
+    runner.run(queue_item)
+    return session, completed, on_node_error
+
+
+def test_runs_cpu_bound_nodes_concurrently():
+    graph = Graph()
+    for i in range(4):
+        graph.add_node(CPUSleepTestInvocation(id=f"cpu_{i}", value=str(i)))
+
+    start = time.perf_counter()
+    session, completed, on_node_error = run_session(graph, max_parallel_nodes=4)
+    elapsed = time.perf_counter() - start
+
+    on_node_error.assert_not_called()
+    assert session.is_complete()
+    assert sorted(completed) == ["cpu_0", "cpu_1", "cpu_2", "cpu_3"]
+    assert tracker.max_running["cpu"] > 1
+    # Serially, this would take 0.8s
+    assert elapsed < 0.6
+
+
+def test_runs_gpu_bound_nodes_one_at_a_time():
+    graph = Graph()
+    for i in range(3):
+        graph.add_node(GPUSleepTestInvocation(id=f"gpu_{i}", value=str(i), seconds=0.05))
+    for i in range(3):
+        graph.add_node(CPUSleepTestInvocation(id=f"cpu_{i}", value=str(i), seconds=0.1))
+
+    session, completed, on_node_error = run_session(graph, max_parallel_nodes=4)
+
+    on_node_error.assert_not_called()
+    assert session.is_complete()
+    assert len(completed) == 6
+    assert tracker.max_running["gpu"] == 1
+    # GPU-bound nodes may still run alongside CPU-bound nodes
+    assert tracker.max_running["total"] > 1
+
+
+def test_runs_nodes_serially_by_default():
+    assert InvokeAIAppConfig().max_parallel_nodes == 1
+
+    graph = Graph()
+    for i in range(3):
+        graph.add_node(CPUSleepTestInvocation(id=f"cpu_{i}", value=str(i), seconds=0.01))
+
+    session, completed, on_node_error = run_session(graph, max_parallel_nodes=1)
+
+    on_node_error.assert_not_called()
+    assert session.is_complete()
+    assert len(completed) == 3
+    assert tracker.max_running["total"] == 1
+
+
+def test_completes_nodes_in_dispatch_order():
+    def build_graph() -> Graph:
+        graph = Graph()
+        # The first node is the slowest, but is still completed first
+        for i, seconds in enumerate([0.15, 0.01, 0.05, 0.01]):
+            graph.add_node(CPUSleepTestInvocation(id=f"cpu_{i}", value=str(i), seconds=seconds))
+        graph.add_node(PromptTestInvocation(id="prompt"))
+        graph.add_edge(create_edge("cpu_3", "value", "prompt", "prompt"))
+        return graph
+
+    _, serial_completed, _ = run_session(build_graph(), max_parallel_nodes=1)
+    session, parallel_completed, _ = run_session(build_graph(), max_parallel_nodes=4)
+
+    assert parallel_completed == serial_completed
+    prompt_output = session.results[session.source_prepared_mapping["prompt"].pop()]
+    assert isinstance(prompt_output, PromptTestInvocationOutput)
+    assert prompt_output.prompt == "3"
+
+
+def test_node_error_fails_session():
+    graph = Graph()
+    graph.add_node(CPUSleepTestInvocation(id="cpu_0", seconds=0.1))
+    graph.add_node(CPUErrorTestInvocation(id="error"))
+    graph.add_node(CPUSleepTestInvocation(id="cpu_1", seconds=0.1))
+    graph.add_node(PromptTestInvocation(id="prompt"))
+    graph.add_edge(create_edge("cpu_1", "value", "prompt", "prompt"))
+
+    session, completed, on_node_error = run_session(graph, max_parallel_nodes=4)
+
+    on_node_error.assert_called_once()
+    assert on_node_error.call_args.kwargs["error_type"] == "ValueError"
+    assert session.has_error()
+    # The session stops at the error, so the downstream node never runs
+    assert "prompt" not in completed
+
+
+def test_cache_hits_in_parallel_nodes_do_not_affect_other_nodes_performance_history():
+    services = MagicMock()
+    services.configuration = InvokeAIAppConfig(max_parallel_nodes=2, node_cache_size=10, performance_history_size=10)
+    services.invocation_cache = MemoryInvocationCache(max_cache_size=10)
+    services.invocation_cache.start(MagicMock())
+
+    graph = Graph()
+    graph.add_node(CPUSleepTestInvocation(id="slow", value="slow", seconds=0.3))
+    cached = CPUSleepTestInvocation(id="cached", value="cached", seconds=0)
+    graph.add_node(cached)
+    services.invocation_cache.save(
+        services.invocation_cache.create_key(cached), SleepTestInvocationOutput(value="cached")
+    )
+
+    session, completed, on_node_error = run_session(graph, max_parallel_nodes=2, services=services)
+
+    on_node_error.assert_not_called()
+    assert sorted(completed) == ["cached", "slow"]
+    # The cached node completed while the slow node was running. Only the slow node's timing is recorded.
+    assert services.invocation_cache.get_status().hits == 1
+    entries = services.performance_history.add_entries.call_args.args[0]
+    assert len(entries) == 1
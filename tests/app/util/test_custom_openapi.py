@@ -0,0 +1,95 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+
+from invokeai.app.util import custom_openapi
+from invokeai.app.util.custom_openapi import get_openapi_cache_key, get_openapi_func
+
+
+@pytest.fixture
+def build_calls(monkeypatch: pytest.MonkeyPatch) -> list[FastAPI]:
+    """Replaces the (slow) schema builder with one that records its calls."""
+    calls: list[FastAPI] = []
+
+    def build_openapi_schema(app: FastAPI, post_transform: Any = None) -> dict[str, Any]:
+        calls.append(app)
+        time.sleep(0.05)
+        return {"openapi": "3.1.0", "info": {"title": app.title}, "components": {"schemas": {}}}
+
+    monkeypatch.setattr(custom_openapi, "build_openapi_schema", build_openapi_schema)
+    return calls
+
+
+def test_schema_is_cached_across_apps(tmp_path: Path, build_calls: list[FastAPI]):
+    cache_path = tmp_path / "openapi.json"
+
+    first_app = FastAPI(title="first")
+    schema = get_openapi_func(first_app, cache_path=cache_path, get_cache_key=lambda: "key")()
+    assert len(build_calls) == 1
+    assert cache_path.exists()
+
+    # A new app (i.e. after a restart) is served the cached schema
+    second_app = FastAPI(title="second")
+    assert get_openapi_func(second_app, cache_path=cache_path, get_cache_key=lambda: "key")() == schema
+    assert len(build_calls) == 1
+
+
+def test_schema_is_rebuilt_when_key_changes(tmp_path: Path, build_calls: list[FastAPI]):
+    cache_path = tmp_path / "openapi.json"
+
+    get_openapi_func(FastAPI(), cache_path=cache_path, get_cache_key=lambda: "old")()
+    get_openapi_func(FastAPI(), cache_path=cache_path, get_cache_key=lambda: "new")()
+    assert len(build_calls) == 2
+    get_openapi_func(FastAPI(), cache_path=cache_path, get_cache_key=lambda: "new")()
+    assert len(build_calls) == 2
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path: Path, build_calls: list[FastAPI]):
+    cache_path = tmp_path / "openapi.json"
+    cache_path.write_text("{not json")
+
+    get_openapi_func(FastAPI(), cache_path=cache_path, get_cache_key=lambda: "key")()
+    assert len(build_calls) == 1
+
+
+def test_schema_is_built_once_when_requested_concurrently(build_calls: list[FastAPI]):
+    app = FastAPI()
+    openapi = get_openapi_func(app)
+    threads = [threading.Thread(target=openapi) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(build_calls) == 1
+
+
+def test_cache_key_covers_custom_nodes_and_node_lists(tmp_path: Path):
+    custom_nodes_path = tmp_path / "nodes"
+    custom_nodes_path.mkdir()
+    node_file = custom_nodes_path / "my_node.py"
+    node_file.write_text("# version 1")
+
+    key = get_openapi_cache_key(custom_nodes_path)
+    assert get_openapi_cache_key(custom_nodes_path) == key
+
+    node_file.write_text("# version 2")
+    changed_node_key = get_openapi_cache_key(custom_nodes_path)
+    assert changed_node_key != key
+
+    assert get_openapi_cache_key(custom_nodes_path, allow_nodes=["add"]) != changed_node_key
+    assert get_openapi_cache_key(custom_nodes_path, deny_nodes=["add"]) != changed_node_key
+
+
+def test_cache_key_covers_pydantic_and_fastapi_versions(monkeypatch: pytest.MonkeyPatch):
+    key = get_openapi_cache_key(None)
+
+    monkeypatch.setattr(custom_openapi.pydantic, "VERSION", "0.0.1")
+    pydantic_key = get_openapi_cache_key(None)
+    assert pydantic_key != key
+
+    monkeypatch.setattr(custom_openapi.fastapi, "__version__", "0.0.1")
+    assert get_openapi_cache_key(None) != pydantic_key
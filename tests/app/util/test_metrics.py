@@ -0,0 +1,130 @@
+import pytest
+
+from invokeai.app.util.metrics import MetricsRegistry, _Metric, register_model_cache_metrics
+from invokeai.backend.model_manager.load.model_cache.model_cache import CacheEntrySnapshot
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "A counter.", labels=("kind",))
+    gauge = registry.gauge("test_gauge", "A gauge.")
+
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc(kind='b"\n')
+    gauge.set(1.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP test_total A counter.",
+        "# TYPE test_total counter",
+        'test_total{kind="a"} 3',
+        'test_total{kind="b\\"\\n"} 1',
+        "# HELP test_gauge A gauge.",
+        "# TYPE test_gauge gauge",
+        "test_gauge 1.5",
+    ]
+
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "A histogram.", buckets=(0.1, 1.0), labels=("type",))
+
+    histogram.observe(0.05, type="x")
+    histogram.observe(0.1, type="x")
+    histogram.observe(0.5, type="x")
+    histogram.observe(2, type="x")
+
+    assert histogram.get_count(type="x") == 4
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{type="x",le="0.1"} 2',
+        'test_seconds_bucket{type="x",le="1"} 3',
+        'test_seconds_bucket{type="x",le="+Inf"} 4',
+        'test_seconds_sum{type="x"} 2.65',
+        'test_seconds_count{type="x"} 4',
+    ]
+
+
+def test_histogram_time():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "A histogram.", buckets=(1.0,))
+
+    with pytest.raises(RuntimeError):
+        with histogram.time():
+            raise RuntimeError()
+
+    assert histogram.get_count() == 1
+
+
+def test_labels_are_validated():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "A counter.", labels=("kind",))
+
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        counter.inc(kind="a", other="b")
+    with pytest.raises(ValueError):
+        counter.inc(-1, kind="a")
+
+
+def test_metric_subclass_missing_samples_raises():
+    class IncompleteMetric(_Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteMetric("test", "An incomplete metric.")  # type: ignore
+
+
+def test_duplicate_registration_raises():
+    registry = MetricsRegistry()
+    registry.counter("test_total", "A counter.")
+
+    with pytest.raises(ValueError):
+        registry.gauge("test_total", "A gauge.")
+
+
+class MockModelCache:
+    def __init__(self) -> None:
+        self.on_hit = None
+        self.on_miss = None
+        self.on_models_cleared = None
+
+    def on_cache_hit(self, cb):
+        self.on_hit = cb
+
+    def on_cache_miss(self, cb):
+        self.on_miss = cb
+
+    def on_cache_models_cleared(self, cb):
+        self.on_models_cleared = cb
+
+
+def test_register_model_cache_metrics():
+    from invokeai.app.util import metrics
+
+    cache = MockModelCache()
+    register_model_cache_metrics(cache)  # type: ignore
+    hits, misses, evictions = (
+        metrics.MODEL_CACHE_HITS.get(),
+        metrics.MODEL_CACHE_MISSES.get(),
+        metrics.MODEL_CACHE_EVICTIONS.get(),
+    )
+    snapshot = {
+        "a": CacheEntrySnapshot(cache_key="a", total_bytes=100, current_vram_bytes=40),
+        "b": CacheEntrySnapshot(cache_key="b", total_bytes=50, current_vram_bytes=0),
+    }
+
+    cache.on_miss(model_key="a", cache_snapshot={})
+    cache.on_hit(model_key="a", cache_snapshot=snapshot)
+    cache.on_models_cleared(models_cleared=2, bytes_requested=10, bytes_freed=150, cache_snapshot={})
+
+    assert metrics.MODEL_CACHE_HITS.get() == hits + 1
+    assert metrics.MODEL_CACHE_MISSES.get() == misses + 1
+    assert metrics.MODEL_CACHE_EVICTIONS.get() == evictions + 2
+    assert metrics.MODEL_CACHE_BYTES.get(tier="ram") == 0
+    assert metrics.MODEL_CACHE_MODELS.get() == 0
+
+    cache.on_hit(model_key="a", cache_snapshot=snapshot)
+    assert metrics.MODEL_CACHE_BYTES.get(tier="ram") == 150
+    assert metrics.MODEL_CACHE_BYTES.get(tier="vram") == 40
+    assert metrics.MODEL_CACHE_MODELS.get() == 2
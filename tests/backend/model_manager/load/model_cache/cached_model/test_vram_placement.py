@@ -0,0 +1,207 @@
+from pathlib import Path
+
+import pytest
+import torch
+
+from invokeai.backend.model_manager.load.model_cache.cached_model.cached_model_with_partial_load import (
+    CachedModelWithPartialLoad,
+)
+from invokeai.backend.model_manager.load.model_cache.cached_model.vram_placement import (
+    VRAMPlacementPlan,
+    estimate_flops,
+)
+from invokeai.backend.model_manager.load.model_cache.torch_module_autocast.torch_module_autocast import (
+    apply_custom_layers_to_model,
+)
+from tests.backend.model_manager.load.model_cache.cached_model.utils import DummyModule
+
+
+class TokenModel(torch.nn.Module):
+    """A model whose layers have very different transfer-to-compute ratios."""
+
+    def __init__(self):
+        super().__init__()
+        # A lookup: many bytes, almost no compute.
+        self.embedding = torch.nn.Embedding(1000, 32)
+        # Run on every token.
+        self.linear = torch.nn.Linear(32, 32)
+        # Never called.
+        self.unused = torch.nn.Linear(32, 32)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.linear(self.embedding(x))
+
+
+@pytest.fixture
+def model() -> DummyModule:
+    model = DummyModule()
+    apply_custom_layers_to_model(model)
+    return model
+
+
+@pytest.fixture
+def token_model() -> TokenModel:
+    model = TokenModel()
+    apply_custom_layers_to_model(model)
+    return model
+
+
+def test_estimate_flops():
+    assert estimate_flops(torch.nn.Linear(10, 32)) == 2 * 10 * 32
+    # 8 tokens.
+    assert estimate_flops(torch.nn.Linear(10, 32), output_numel=8 * 32) == 8 * 2 * 10 * 32
+    # 16x16 pixels.
+    assert estimate_flops(torch.nn.Conv2d(4, 8, 3), output_numel=8 * 16 * 16) == 16 * 16 * 2 * 8 * 4 * 3 * 3
+    assert estimate_flops(torch.nn.Embedding(1000, 32), output_numel=8 * 32) == 8 * 32
+
+
+def test_estimated_plan_keeps_required_keys_first(model: DummyModule):
+    cached_model = CachedModelWithPartialLoad(model=model, compute_device=torch.device("cpu"))
+
+    plan = cached_model.placement_plan
+
+    assert not plan.profiled
+    assert plan.key_priority[0] == "buffer1"
+    assert set(plan.key_priority) == set(model.state_dict().keys())
+
+
+def test_estimated_plan_prioritizes_bytes_per_flop(token_model: TokenModel):
+    cached_model = CachedModelWithPartialLoad(model=token_model, compute_device=torch.device("cpu"))
+
+    # The embedding has the most bytes per FLOP. The linear layers have the same shape, so keep state dict order.
+    assert cached_model.placement_plan.key_priority == [
+        "embedding.weight",
+        "linear.weight",
+        "linear.bias",
+        "unused.weight",
+        "unused.bias",
+    ]
+
+
+def test_profiling_is_disabled_by_default(token_model: TokenModel, tmp_path: Path):
+    cached_model = CachedModelWithPartialLoad(
+        model=token_model, compute_device=torch.device("cpu"), placement_plan_dir=tmp_path
+    )
+    assert all(len(m._forward_hooks) == 0 for m in token_model.modules())
+
+    token_model(torch.randint(0, 1000, (1, 8)))
+
+    assert not cached_model.placement_plan.profiled
+    assert cached_model.placement_plan.module_order == []
+    assert not any(tmp_path.iterdir())
+
+
+def test_profiled_plan_is_persisted(token_model: TokenModel, tmp_path: Path):
+    cached_model = CachedModelWithPartialLoad(
+        model=token_model,
+        compute_device=torch.device("cpu"),
+        enable_placement_profiling=True,
+        placement_plan_dir=tmp_path,
+    )
+    assert not cached_model.placement_plan.profiled
+
+    token_model(torch.randint(0, 1000, (1, 8)))
+
+    plan = cached_model.placement_plan
+    assert plan.profiled
+    assert plan.module_order == ["embedding", "linear"]
+    # The layer that was never called has the lowest priority.
+    assert plan.key_priority[-2:] == ["unused.weight", "unused.bias"]
+    assert VRAMPlacementPlan.load(tmp_path, plan.architecture) == plan
+
+    # The profiler's hooks are removed after the first forward pass.
+    assert all(len(m._forward_hooks) == 0 for m in token_model.modules())
+
+    # A model with the same architecture uses the persisted plan, and is not profiled again.
+    other_model = TokenModel()
+    apply_custom_layers_to_model(other_model)
+    other_cached_model = CachedModelWithPartialLoad(
+        model=other_model,
+        compute_device=torch.device("cpu"),
+        enable_placement_profiling=True,
+        placement_plan_dir=tmp_path,
+    )
+    assert other_cached_model.placement_plan == plan
+    assert all(len(m._forward_hooks) == 0 for m in other_model.modules())
+
+
+def test_plans_are_per_architecture(token_model: TokenModel, tmp_path: Path):
+    cached_model = CachedModelWithPartialLoad(
+        model=token_model,
+        compute_device=torch.device("cpu"),
+        enable_placement_profiling=True,
+        placement_plan_dir=tmp_path,
+    )
+    token_model(torch.randint(0, 1000, (1, 8)))
+
+    half_model = TokenModel().to(torch.float16)
+    apply_custom_layers_to_model(half_model)
+    half_cached_model = CachedModelWithPartialLoad(
+        model=half_model,
+        compute_device=torch.device("cpu"),
+        enable_placement_profiling=True,
+        placement_plan_dir=tmp_path,
+    )
+
+    assert half_cached_model.placement_plan.architecture != cached_model.placement_plan.architecture
+    assert not half_cached_model.placement_plan.profiled
+
+
+def test_invalid_plan_is_ignored(token_model: TokenModel, tmp_path: Path):
+    estimated_plan = CachedModelWithPartialLoad(model=token_model, compute_device=torch.device("cpu")).placement_plan
+    (tmp_path / f"{estimated_plan.architecture}.json").write_text("{not json")
+
+    cached_model = CachedModelWithPartialLoad(
+        model=token_model,
+        compute_device=torch.device("cpu"),
+        enable_placement_profiling=True,
+        placement_plan_dir=tmp_path,
+    )
+
+    assert not cached_model.placement_plan.profiled
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available.")
+def test_partial_load_follows_plan(token_model: TokenModel):
+    cached_model = CachedModelWithPartialLoad(model=token_model, compute_device=torch.device("cuda"))
+
+    # Room for the embedding only.
+    cached_model.partial_load_to_vram(1000 * 32 * 4)
+
+    assert token_model.embedding.weight.device.type == "cuda"
+    assert token_model.linear.weight.device.type == "cpu"
+
+    # The lowest priority weights are unloaded first.
+    cached_model.full_load_to_vram()
+    cached_model.partial_unload_from_vram(1)
+    assert token_model.unused.bias.device.type == "cpu"
+    assert token_model.embedding.weight.device.type == "cuda"
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available.")
+@pytest.mark.parametrize("keep_ram_copy", [True, False])
+def test_prefetched_inference(model: DummyModule, tmp_path: Path, keep_ram_copy: bool):
+    cached_model = CachedModelWithPartialLoad(
+        model=model,
+        compute_device=torch.device("cuda"),
+        keep_ram_copy=keep_ram_copy,
+        enable_placement_profiling=True,
+        placement_plan_dir=tmp_path,
+    )
+    x = torch.randn(1, 10)
+    expected = model(x)
+    assert cached_model.placement_plan.module_order == ["linear1", "linear2"]
+
+    # Room for the required weights only, so that both linear layers are streamed.
+    cached_model.partial_load_to_vram(1)
+    assert cached_model._prefetcher is not None
+    assert cached_model._prefetcher.num_streamed_modules == 2
+
+    for _ in range(2):
+        assert torch.allclose(model(x.to("cuda")).cpu(), expected)
+
+    # The prefetched copies are never left in the model.
+    assert all(p.device.type == "cpu" for n, p in model.named_parameters() if n.startswith("linear"))
+
+    cached_model.full_load_to_vram()
+    assert cached_model._prefetcher is None
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import gguf
+import numpy as np
+import pytest
+import safetensors.torch
+import torch
+
+from invokeai.backend.model_manager.model_on_disk import ModelOnDisk
+from invokeai.backend.quantization.gguf.ggml_tensor import GGMLTensor
+from invokeai.backend.quantization.gguf.loaders import gguf_sd_loader
+
+
+@pytest.fixture
+def state_dict() -> dict[str, torch.Tensor]:
+    return {
+        "model.diffusion_model.input_blocks.0.0.weight": torch.randn(32, 4, 3, 3, dtype=torch.float16),
+        "model.diffusion_model.input_blocks.0.0.bias": torch.randn(32, dtype=torch.bfloat16),
+        "cond_stage_model.transformer.text_model.embeddings.position_ids": torch.arange(77, dtype=torch.int64),
+        "first_stage_model.encoder.conv_in.weight": torch.randn(8, 3, 3, 3, dtype=torch.float32),
+    }
+
+
+def assert_meta_matches(meta: dict[str, torch.Tensor], expected: dict[str, torch.Tensor]) -> None:
+    assert meta.keys() == expected.keys()
+    for key, tensor in expected.items():
+        assert meta[key].device.type == "meta"
+        assert meta[key].shape == tensor.shape
+        assert meta[key].dtype == tensor.dtype
+
+
+def test_load_state_dict_meta_safetensors(tmp_path: Path, state_dict: dict[str, torch.Tensor]):
+    path = tmp_path / "model.safetensors"
+    safetensors.torch.save_file(state_dict, path)
+
+    meta = ModelOnDisk(path).load_state_dict_meta()
+    assert_meta_matches(meta, state_dict)
+
+
+def test_load_state_dict_meta_checkpoint(tmp_path: Path, state_dict: dict[str, torch.Tensor]):
+    path = tmp_path / "model.ckpt"
+    torch.save({"state_dict": state_dict, "global_step": 42}, path)
+
+    meta = ModelOnDisk(path).load_state_dict_meta()
+    assert_meta_matches(meta, state_dict)
+
+
+def test_load_state_dict_meta_legacy_checkpoint(tmp_path: Path, state_dict: dict[str, torch.Tensor]):
+    # The legacy (non-zip) format can't be memory-mapped, so it is loaded without mmap
+    path = tmp_path / "model.pt"
+    torch.save(state_dict, path, _use_new_zipfile_serialization=False)
+
+    meta = ModelOnDisk(path).load_state_dict_meta()
+    assert_meta_matches(meta, state_dict)
+
+
+def test_load_state_dict_meta_gguf(tmp_path: Path):
+    path = tmp_path / "model.gguf"
+    writer = gguf.GGUFWriter(path, "flux")
+    writer.add_tensor("double_blocks.0.img_attn.qkv.weight", np.random.randn(64, 32).astype(np.float16))
+    quantized = gguf.quantize(np.random.randn(64, 64).astype(np.float32), gguf.GGMLQuantizationType.Q8_0)
+    writer.add_tensor("double_blocks.0.img_mlp.0.weight", quantized, raw_dtype=gguf.GGMLQuantizationType.Q8_0)
+    writer.write_header_to_file()
+    writer.write_kv_data_to_file()
+    writer.write_tensors_to_file()
+    writer.close()
+
+    meta = ModelOnDisk(path).load_state_dict_meta()
+    full = gguf_sd_loader(path, compute_dtype=torch.float32)
+
+    assert meta.keys() == full.keys()
+    for key, tensor in full.items():
+        meta_tensor = meta[key]
+        assert isinstance(meta_tensor, GGMLTensor)
+        assert meta_tensor.quantized_data.device.type == "meta"
+        assert meta_tensor.shape == tensor.shape
+        assert meta_tensor.quantized_data.shape == tensor.quantized_data.shape
+        assert meta_tensor.quantized_data.dtype == tensor.quantized_data.dtype
+        assert meta_tensor._ggml_quantization_type == tensor._ggml_quantization_type
+
+
+def test_load_state_dict_meta_does_not_load_state_dict(
+    tmp_path: Path, state_dict: dict[str, torch.Tensor], monkeypatch: pytest.MonkeyPatch
+):
+    path = tmp_path / "model.safetensors"
+    safetensors.torch.save_file(state_dict, path)
+
+    def load_file(*args, **kwargs):
+        raise AssertionError("The tensor data should not be loaded")
+
+    monkeypatch.setattr(safetensors.torch, "load_file", load_file)
+    mod = ModelOnDisk(path)
+    meta = mod.load_state_dict_meta()
+    # The result is cached
+    assert mod.load_state_dict_meta() is meta
+
+
+def test_load_state_dict_meta_rejects_unknown_extension(tmp_path: Path):
+    path = tmp_path / "model.onnx"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="Unrecognized model extension"):
+        ModelOnDisk(path).load_state_dict_meta()
@@ -0,0 +1,169 @@
+import gc
+import logging
+from typing import Generator
+from unittest.mock import MagicMock
+
+import gguf
+import pytest
+import torch
+
+from invokeai.backend.model_manager.load.model_cache.model_cache import ModelCache
+from invokeai.backend.quantization.gguf.dequantized_weight_cache import dequantized_weight_cache
+from invokeai.backend.quantization.gguf.ggml_tensor import GGMLTensor
+
+MB = 2**20
+
+
+def quantize_tensor(data: torch.Tensor) -> GGMLTensor:
+    quantized_np = gguf.quantize(data.numpy(), gguf.GGMLQuantizationType.Q8_0)
+    return GGMLTensor(
+        data=torch.from_numpy(quantized_np),
+        ggml_quantization_type=gguf.GGMLQuantizationType.Q8_0,
+        tensor_shape=data.shape,
+        compute_dtype=data.dtype,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_cache() -> Generator[None, None, None]:
+    yield
+    dequantized_weight_cache.clear()
+    dequantized_weight_cache.configure(vram_budget_bytes=0, ram_budget_bytes=0)
+
+
+@pytest.fixture
+def count_dequantize(monkeypatch: pytest.MonkeyPatch) -> list[GGMLTensor]:
+    calls: list[GGMLTensor] = []
+    orig_dequantize = GGMLTensor._dequantize
+
+    def dequantize(self: GGMLTensor) -> torch.Tensor:
+        calls.append(self)
+        return orig_dequantize(self)
+
+    monkeypatch.setattr(GGMLTensor, "_dequantize", dequantize)
+    return calls
+
+
+def test_disabled_by_default(count_dequantize: list[GGMLTensor]):
+    w = quantize_tensor(torch.randn(32, 64))
+    x = torch.randn(32, 64)
+
+    _ = x * w
+    _ = x * w
+
+    assert len(count_dequantize) == 2
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) == 0
+
+
+def test_weights_are_dequantized_once(count_dequantize: list[GGMLTensor]):
+    dequantized_weight_cache.configure(vram_budget_bytes=0, ram_budget_bytes=MB)
+    w = quantize_tensor(torch.randn(32, 64))
+    x = torch.randn(32, 64)
+
+    result_1 = x * w
+    result_2 = x * w
+
+    assert len(count_dequantize) == 1
+    assert torch.equal(result_1, result_2)
+    assert torch.equal(result_1, x * w.get_dequantized_tensor())
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) == 32 * 64 * 4
+
+
+def test_weights_that_do_not_fit_are_dequantized_on_the_fly(count_dequantize: list[GGMLTensor]):
+    # Room for two of the three weights.
+    dequantized_weight_cache.configure(vram_budget_bytes=0, ram_budget_bytes=2 * 32 * 64 * 4)
+    weights = [quantize_tensor(torch.randn(32, 64)) for _ in range(3)]
+    x = torch.randn(32, 64)
+
+    for _ in range(3):
+        for w in weights:
+            _ = x * w
+
+    # The first two weights stay cached across steps. They are not evicted to make room for the third.
+    assert count_dequantize.count(weights[0]) == 1
+    assert count_dequantize.count(weights[1]) == 1
+    assert count_dequantize.count(weights[2]) == 3
+
+
+def test_entries_are_dropped_with_the_quantized_data():
+    dequantized_weight_cache.configure(vram_budget_bytes=0, ram_budget_bytes=MB)
+    w = quantize_tensor(torch.randn(32, 64))
+    _ = torch.randn(32, 64) * w
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) > 0
+
+    del w
+    gc.collect()
+
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) == 0
+
+
+def test_mutating_ops_bypass_the_cache():
+    dequantized_weight_cache.configure(vram_budget_bytes=0, ram_budget_bytes=MB)
+    w = quantize_tensor(torch.randn(32, 64))
+    x = torch.randn(32, 64)
+    expected = x * w
+
+    w.index_put_((torch.tensor([0]),), torch.tensor(100.0))
+
+    assert torch.equal(x * w, expected)
+
+
+def test_free():
+    dequantized_weight_cache.configure(vram_budget_bytes=0, ram_budget_bytes=MB)
+    weights = [quantize_tensor(torch.randn(32, 64)) for _ in range(3)]
+    for w in weights:
+        _ = torch.randn(32, 64) * w
+
+    assert dequantized_weight_cache.free(torch.device("cpu"), 1) == 32 * 64 * 4
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) == 2 * 32 * 64 * 4
+    assert dequantized_weight_cache.free(torch.device("cuda"), MB) == 0
+
+
+@pytest.fixture
+def model_cache() -> Generator[ModelCache, None, None]:
+    logger = MagicMock()
+    logger.getEffectiveLevel.return_value = logging.INFO
+    cache = ModelCache(
+        execution_device_working_mem_gb=0,
+        enable_partial_loading=False,
+        keep_ram_copy_of_weights=True,
+        max_ram_cache_size_gb=1 / 1024,
+        execution_device="cpu",
+        storage_device="cpu",
+        logger=logger,
+        gguf_dequant_cache_ram_gb=1 / 1024,
+    )
+    yield cache
+    cache.shutdown()
+
+
+def test_model_cache_counts_dequantized_weights(model_cache: ModelCache):
+    w = quantize_tensor(torch.randn(32, 64))
+    _ = torch.randn(32, 64) * w
+
+    assert model_cache._get_ram_in_use() == 32 * 64 * 4
+
+
+def test_model_cache_headroom_limits_the_cache(model_cache: ModelCache, count_dequantize: list[GGMLTensor]):
+    model_cache.put("model", torch.nn.Linear(256, 1020))
+    w = quantize_tensor(torch.randn(32, 64))
+    x = torch.randn(32, 64)
+
+    _ = x * w
+    _ = x * w
+
+    # The model leaves less than 8KB of the 1MB RAM cache, so the weight is not cached.
+    assert count_dequantize.count(w) == 2
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) == 0
+
+
+def test_make_room_frees_dequantized_weights_first(model_cache: ModelCache):
+    model_cache.put("model", torch.nn.Linear(128, 512))
+    w = quantize_tensor(torch.randn(32, 64))
+    _ = torch.randn(32, 64) * w
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) > 0
+
+    model_cache.make_room(MB - model_cache._get_ram_in_use() + 1)
+
+    assert dequantized_weight_cache.bytes_in_use(torch.device("cpu")) == 0
+    assert "model" in model_cache._cached_models
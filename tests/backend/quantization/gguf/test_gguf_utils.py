@@ -0,0 +1,49 @@
+import gguf
+import numpy as np
+import pytest
+import torch
+
+from invokeai.backend.quantization.gguf.utils import DEQUANTIZE_FUNCTIONS, dequantize
+
+# The byte offsets of the float16 scales in a block, for types that the gguf library can't quantize. Random bytes are
+# valid quantized data for these types, as long as the scales are finite.
+FLOAT16_SCALE_OFFSETS = {
+    gguf.GGMLQuantizationType.Q2_K: [80, 82],
+    gguf.GGMLQuantizationType.Q3_K: [108],
+    gguf.GGMLQuantizationType.Q4_K: [0, 2],
+    gguf.GGMLQuantizationType.Q5_K: [0, 2],
+    gguf.GGMLQuantizationType.Q6_K: [208],
+    gguf.GGMLQuantizationType.IQ4_NL: [0],
+    gguf.GGMLQuantizationType.IQ4_XS: [0],
+}
+
+
+def make_quantized_data(qtype: gguf.GGMLQuantizationType, shape: tuple[int, int]) -> np.ndarray:
+    rng = np.random.default_rng(123)
+    if qtype not in FLOAT16_SCALE_OFFSETS:
+        return gguf.quantize(rng.standard_normal(shape, dtype=np.float32), qtype)
+
+    block_size, type_size = gguf.GGML_QUANT_SIZES[qtype]
+    n_blocks = shape[0] * shape[1] // block_size
+    blocks = rng.integers(0, 256, (n_blocks, type_size), dtype=np.uint8)
+    for offset in FLOAT16_SCALE_OFFSETS[qtype]:
+        scales = rng.uniform(-0.1, 0.1, n_blocks).astype(np.float16)
+        blocks[:, offset : offset + 2] = scales.view(np.uint8).reshape((n_blocks, 2))
+    return blocks.reshape((shape[0], -1))
+
+
+@pytest.mark.parametrize("qtype", list(DEQUANTIZE_FUNCTIONS), ids=lambda qtype: qtype.name)
+@pytest.mark.parametrize("device", ["cpu", "cuda"])
+def test_dequantize_matches_reference(qtype: gguf.GGMLQuantizationType, device: str):
+    if device == "cuda" and not torch.cuda.is_available():
+        pytest.skip("CUDA is not available.")
+
+    shape = (8, 512)
+    data = make_quantized_data(qtype, shape)
+    expected = torch.from_numpy(gguf.quants.dequantize(data, qtype))
+
+    result = dequantize(torch.from_numpy(data).to(device), qtype, torch.Size(shape), dtype=torch.float32)
+
+    assert result.shape == shape
+    assert result.device.type == device
+    torch.testing.assert_close(result.float().cpu(), expected, rtol=1e-5, atol=1e-6)
@@ -0,0 +1,71 @@
+import gc
+import sys
+from pathlib import Path
+
+import gguf
+import numpy as np
+import pytest
+import torch
+
+from invokeai.backend.quantization.gguf.loaders import gguf_sd_loader
+
+
+@pytest.fixture
+def gguf_path(tmp_path: Path) -> Path:
+    path = tmp_path / "model.gguf"
+    writer = gguf.GGUFWriter(path, "flux")
+    writer.add_tensor("img_in.weight", np.random.randn(64, 32).astype(np.float16))
+    quantized = gguf.quantize(np.random.randn(64, 64).astype(np.float32), gguf.GGMLQuantizationType.Q8_0)
+    writer.add_tensor("img_mlp.0.weight", quantized, raw_dtype=gguf.GGMLQuantizationType.Q8_0)
+    writer.write_header_to_file()
+    writer.write_kv_data_to_file()
+    writer.write_tensors_to_file()
+    writer.close()
+    return path
+
+
+def get_mapped_paths() -> set[str]:
+    with open("/proc/self/maps") as f:
+        return {line.split(maxsplit=5)[5].strip() for line in f if len(line.split(maxsplit=5)) == 6}
+
+
+def test_mmap_matches_copy(gguf_path: Path):
+    mapped = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=True)
+    copied = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=False)
+
+    assert mapped.keys() == copied.keys()
+    for key, tensor in copied.items():
+        assert mapped[key].shape == tensor.shape
+        assert mapped[key]._ggml_quantization_type == tensor._ggml_quantization_type
+        assert torch.equal(mapped[key].quantized_data, tensor.quantized_data)
+        assert torch.equal(mapped[key].get_dequantized_tensor(), tensor.get_dequantized_tensor())
+
+
+def test_mmap_is_copy_on_write(gguf_path: Path):
+    original = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=False)
+    mapped = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=True)
+
+    mapped["img_in.weight"].quantized_data.fill_(0)
+
+    reloaded = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=True)
+    assert torch.equal(reloaded["img_in.weight"].quantized_data, original["img_in.weight"].quantized_data)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires /proc/self/maps")
+def test_mmap_is_unmapped_when_tensors_are_freed(gguf_path: Path):
+    sd = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=True)
+    gc.collect()
+    assert str(gguf_path) in get_mapped_paths()
+
+    del sd
+    gc.collect()
+    assert str(gguf_path) not in get_mapped_paths()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires /proc/self/maps")
+def test_copy_does_not_keep_file_mapped(gguf_path: Path):
+    sd = gguf_sd_loader(gguf_path, compute_dtype=torch.float32, mmap=False)
+    gc.collect()
+
+    assert str(gguf_path) not in get_mapped_paths()
+    assert len(sd) == 2
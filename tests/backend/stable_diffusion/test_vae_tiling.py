@@ -1,6 +1,14 @@
+import pytest
+import torch
 from diffusers.models.autoencoders.autoencoder_kl import AutoencoderKL
 
-from invokeai.backend.stable_diffusion.vae_tiling import patch_vae_tiling_params
+from invokeai.backend.stable_diffusion.vae_tiling import (
+    ADAPTIVE_VAE_TILE_SIZES,
+    patch_vae_tiling_params,
+    plan_adaptive_vae_tiling,
+    run_with_adaptive_vae_tiling,
+)
+from invokeai.backend.util.vae_working_memory import estimate_vae_working_memory_sd15_sdxl
 
 
 def test_patch_vae_tiling_params():
@@ -11,3 +19,80 @@ def test_patch_vae_tiling_params():
 
     with patch_vae_tiling_params(vae, 1, 2, 3):
         pass
+
+
+def test_plan_adaptive_vae_tiling_untiled_when_it_fits():
+    vae = AutoencoderKL()
+    latents = torch.zeros(1, 4, 128, 128)
+    # Tile sizes >= the image size (1024px) are skipped.
+    assert plan_adaptive_vae_tiling("decode", latents, vae, fp32=False, free_memory_bytes=None) == [
+        None,
+        *ADAPTIVE_VAE_TILE_SIZES[1:],
+    ]
+    untiled_memory = estimate_vae_working_memory_sd15_sdxl("decode", latents, vae, tile_size=None, fp32=False)
+    assert plan_adaptive_vae_tiling("decode", latents, vae, fp32=False, free_memory_bytes=untiled_memory)[0] is None
+
+
+def test_plan_adaptive_vae_tiling_largest_tile_that_fits():
+    vae = AutoencoderKL()
+    latents = torch.zeros(1, 4, 256, 256)
+    free_memory = estimate_vae_working_memory_sd15_sdxl("decode", latents, vae, tile_size=512, fp32=False)
+    assert plan_adaptive_vae_tiling("decode", latents, vae, fp32=False, free_memory_bytes=free_memory) == [
+        512,
+        384,
+        256,
+    ]
+
+
+def test_plan_adaptive_vae_tiling_nothing_fits():
+    vae = AutoencoderKL()
+    latents = torch.zeros(1, 4, 256, 256)
+    assert plan_adaptive_vae_tiling("decode", latents, vae, fp32=False, free_memory_bytes=0) == [256]
+
+
+def test_plan_adaptive_vae_tiling_skips_tiles_larger_than_image():
+    vae = AutoencoderKL()
+    image = torch.zeros(1, 3, 600, 400)
+    assert plan_adaptive_vae_tiling("encode", image, vae, fp32=False, free_memory_bytes=0) == [256]
+    assert plan_adaptive_vae_tiling("encode", image, vae, fp32=False, free_memory_bytes=None) == [None, 512, 384, 256]
+
+
+def test_run_with_adaptive_vae_tiling_retries_on_oom(monkeypatch: pytest.MonkeyPatch):
+    """Test that an OOM is retried with the next smaller tile size, and that the attempts are recorded."""
+    vae = AutoencoderKL()
+    latents = torch.zeros(1, 4, 128, 128)
+    free_memory = estimate_vae_working_memory_sd15_sdxl("decode", latents, vae, tile_size=768, fp32=False)
+    monkeypatch.setattr(
+        "invokeai.backend.stable_diffusion.vae_tiling.get_free_device_memory", lambda device: free_memory
+    )
+
+    tile_sizes_seen: list[int | None] = []
+
+    def fn() -> str:
+        tile_sizes_seen.append(vae.tile_sample_min_size if vae.use_tiling else None)
+        if len(tile_sizes_seen) == 1:
+            raise torch.cuda.OutOfMemoryError("oom")
+        return "result"
+
+    result, stats = run_with_adaptive_vae_tiling(vae=vae, operation="decode", image_tensor=latents, fp32=False, fn=fn)
+
+    assert result == "result"
+    assert tile_sizes_seen == [768, 512]
+    assert [a.tile_size for a in stats.attempts] == [768, 512]
+    assert [a.succeeded for a in stats.attempts] == [False, True]
+    assert stats.tile_size == 512
+    assert stats.num_oom_retries == 1
+    assert (stats.image_height, stats.image_width) == (1024, 1024)
+    assert stats.free_memory_bytes == free_memory
+
+
+def test_run_with_adaptive_vae_tiling_raises_on_last_oom(monkeypatch: pytest.MonkeyPatch):
+    vae = AutoencoderKL()
+    latents = torch.zeros(1, 4, 64, 64)
+    monkeypatch.setattr("invokeai.backend.stable_diffusion.vae_tiling.get_free_device_memory", lambda device: 0)
+
+    def fn() -> None:
+        raise torch.cuda.OutOfMemoryError("oom")
+
+    with pytest.raises(torch.cuda.OutOfMemoryError):
+        run_with_adaptive_vae_tiling(vae=vae, operation="decode", image_tensor=latents, fp32=False, fn=fn)
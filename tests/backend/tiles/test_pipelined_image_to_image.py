@@ -0,0 +1,113 @@
+import pytest
+import torch
+
+from invokeai.app.services.session_processor.session_processor_common import CanceledException
+from invokeai.backend.tiles.pipelined_image_to_image import batch_tiles, run_tiled_image_to_image
+from invokeai.backend.tiles.tiles import calc_tiles_min_overlap
+from invokeai.backend.tiles.utils import TBLR, Tile
+
+
+def upscale_model(x: torch.Tensor) -> torch.Tensor:
+    """A stand-in for a 2x upscaling model. The output depends on the position within the tile, so the way overlapping
+    tiles are merged is visible in the output."""
+    upscaled = x.repeat_interleave(2, dim=2).repeat_interleave(2, dim=3)
+    return upscaled * 0.8 + torch.linspace(0, 0.2, upscaled.shape[-1])
+
+
+def get_tiles(height: int, width: int, tile_size: int) -> list[Tile]:
+    tiles = calc_tiles_min_overlap(
+        image_height=height, image_width=width, tile_height=tile_size, tile_width=tile_size, min_overlap=20
+    )
+    tiles = sorted(tiles, key=lambda x: x.coords.left)
+    return sorted(tiles, key=lambda x: x.coords.top)
+
+
+def run_serial(image_tensor: torch.Tensor, tiles: list[Tile], scale: int) -> torch.Tensor:
+    """The serial, one-tile-at-a-time implementation."""
+    _, channels, height, width = image_tensor.shape
+    output_tensor = torch.zeros((height * scale, width * scale, channels), dtype=torch.uint8)
+    for tile in tiles:
+        input_tile = image_tensor[:, :, tile.coords.top : tile.coords.bottom, tile.coords.left : tile.coords.right]
+        output_tile = upscale_model(input_tile).squeeze(0).permute(1, 2, 0).clamp(0, 1)
+        output_tile = (output_tile * 255).to(dtype=torch.uint8)
+        top_overlap = tile.overlap.top * scale // 2
+        left_overlap = tile.overlap.left * scale // 2
+        output_tensor[
+            tile.coords.top * scale + top_overlap : tile.coords.bottom * scale,
+            tile.coords.left * scale + left_overlap : tile.coords.right * scale,
+            :,
+        ] = output_tile[top_overlap:, left_overlap:, :]
+    return output_tensor
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 4])
+def test_matches_serial_implementation(batch_size: int):
+    torch.manual_seed(0)
+    image_tensor = torch.rand(1, 3, 200, 300)
+    tiles = get_tiles(200, 300, tile_size=64)
+
+    output = run_tiled_image_to_image(image_tensor, tiles, scale=2, run_model=upscale_model, batch_size=batch_size)
+
+    assert output.shape == (400, 600, 3)
+    assert torch.equal(output, run_serial(image_tensor, tiles, scale=2))
+
+
+def test_batches_same_sized_tiles():
+    tiles = get_tiles(200, 300, tile_size=64)
+    run_shapes: list[torch.Size] = []
+
+    def run_model(x: torch.Tensor) -> torch.Tensor:
+        run_shapes.append(x.shape)
+        return upscale_model(x)
+
+    run_tiled_image_to_image(torch.rand(1, 3, 200, 300), tiles, scale=2, run_model=run_model, batch_size=4)
+
+    assert sum(shape[0] for shape in run_shapes) == len(tiles)
+    assert len(run_shapes) < len(tiles)
+    assert max(shape[0] for shape in run_shapes) == 4
+
+
+def test_batch_tiles():
+    def tile(left: int, right: int) -> Tile:
+        return Tile(
+            coords=TBLR(top=0, bottom=10, left=left, right=right), overlap=TBLR(top=0, bottom=0, left=0, right=0)
+        )
+
+    tiles = [tile(0, 10), tile(10, 20), tile(20, 30), tile(30, 35), tile(35, 45)]
+
+    assert batch_tiles(tiles, batch_size=2) == [[tiles[0], tiles[1]], [tiles[2]], [tiles[3]], [tiles[4]]]
+    assert batch_tiles(tiles, batch_size=1) == [[t] for t in tiles]
+
+
+def test_step_callback():
+    tiles = get_tiles(200, 300, tile_size=64)
+    steps: list[tuple[int, int]] = []
+
+    run_tiled_image_to_image(
+        torch.rand(1, 3, 200, 300),
+        tiles,
+        scale=2,
+        run_model=upscale_model,
+        batch_size=2,
+        step_callback=lambda step, total: steps.append((step, total)),
+    )
+
+    assert steps[0] == (0, len(tiles))
+    assert steps[-1] == (len(tiles), len(tiles))
+    assert [step for step, _ in steps] == sorted(step for step, _ in steps)
+
+
+def test_cancel():
+    tiles = get_tiles(200, 300, tile_size=64)
+    runs = 0
+
+    def run_model(x: torch.Tensor) -> torch.Tensor:
+        nonlocal runs
+        runs += 1
+        return upscale_model(x)
+
+    with pytest.raises(CanceledException):
+        run_tiled_image_to_image(
+            torch.rand(1, 3, 200, 300), tiles, scale=2, run_model=run_model, is_canceled=lambda: runs >= 2
+        )
+    assert runs == 2
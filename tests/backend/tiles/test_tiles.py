@@ -1,11 +1,19 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 
 from invokeai.backend.tiles.tiles import (
+    LinearBlendingTileMerger,
+    SeamBlendingTileMerger,
+    TileMerger,
+    _get_linear_blend_mask,
     calc_tiles_even_split,
     calc_tiles_min_overlap,
     calc_tiles_with_overlap,
     merge_tiles_with_linear_blending,
+    merge_tiles_with_seam_blending,
 )
 from invokeai.backend.tiles.utils import TBLR, Tile
 
@@ -623,3 +631,119 @@ def test_merge_tiles_with_linear_blending_mismatched_list_lengths():
 
     with pytest.raises(ValueError):
         merge_tiles_with_linear_blending(dst_image=dst_image, tiles=tiles, tile_images=tile_images, blend_amount=0)
+
+
+def test_merge_tiles_with_linear_blending_float32_rounding():
+    """Pin the output of the float32 linear blending. The blended values are truncated when cast back to uint8, so
+    they can differ by 1 from the float64 blending used previously (index 5 of the gradient was 4 with float64).
+    """
+    tiles = [
+        Tile(coords=TBLR(top=0, bottom=4, left=0, right=16), overlap=TBLR(top=0, bottom=0, left=0, right=8)),
+        Tile(coords=TBLR(top=0, bottom=4, left=8, right=24), overlap=TBLR(top=0, bottom=0, left=8, right=0)),
+    ]
+    dst_image = np.zeros((4, 24, 3), dtype=np.uint8)
+    tile_images = [np.zeros((4, 16, 3), dtype=np.uint8), np.zeros((4, 16, 3), dtype=np.uint8) + 7]
+
+    merge_tiles_with_linear_blending(dst_image=dst_image, tiles=tiles, tile_images=tile_images, blend_amount=8)
+
+    expected_row = np.array([0] * 8 + [0, 1, 2, 3, 4, 5, 6, 7] + [7] * 8, dtype=np.uint8)
+    expected_output = np.broadcast_to(expected_row[np.newaxis, :, np.newaxis], (4, 24, 3))
+    np.testing.assert_array_equal(dst_image, expected_output, strict=False)
+
+
+#############################################
+# Test TileMerger
+#############################################
+
+
+def _make_random_tiles(seed: int) -> tuple[list[Tile], list[np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    tiles = calc_tiles_with_overlap(image_height=200, image_width=260, tile_height=64, tile_width=96, overlap=24)
+    tile_images = [
+        rng.integers(0, 256, size=(t.coords.bottom - t.coords.top, t.coords.right - t.coords.left, 3), dtype=np.uint8)
+        for t in tiles
+    ]
+    return tiles, tile_images
+
+
+@pytest.mark.parametrize(
+    ["merger_cls", "merge_fn"],
+    [
+        (LinearBlendingTileMerger, merge_tiles_with_linear_blending),
+        (SeamBlendingTileMerger, merge_tiles_with_seam_blending),
+    ],
+)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_tile_merger_out_of_order_threaded_matches_batch(merger_cls: type[TileMerger], merge_fn, seed: int):
+    """Test that adding tiles in a shuffled order from several threads gives the same result as the batch merge."""
+    tiles, tile_images = _make_random_tiles(seed)
+
+    expected_output = np.zeros((200, 260, 3), dtype=np.uint8)
+    merge_fn(dst_image=expected_output, tiles=tiles, tile_images=tile_images, blend_amount=16)
+
+    dst_image = np.zeros((200, 260, 3), dtype=np.uint8)
+    merger = merger_cls(dst_image=dst_image, tiles=tiles, blend_amount=16)
+    tile_idxs = list(range(len(tiles)))
+    random.Random(seed).shuffle(tile_idxs)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(merger.add_tile, tile_idx, tile_images[tile_idx]) for tile_idx in tile_idxs]
+        for future in futures:
+            future.result()
+
+    assert merger.is_complete
+    np.testing.assert_array_equal(merger.finalize(), expected_output, strict=True)
+
+
+def test_tile_merger_merge_order():
+    """Test that tile_idxs_in_merge_order is ordered top-to-bottom, left-to-right."""
+    tiles, _ = _make_random_tiles(0)
+    reversed_tiles = list(reversed(tiles))
+    merger = LinearBlendingTileMerger(
+        dst_image=np.zeros((200, 260, 3), dtype=np.uint8), tiles=reversed_tiles, blend_amount=0
+    )
+    assert merger.tile_idxs_in_merge_order == list(reversed(range(len(tiles))))
+
+
+def test_tile_merger_duplicate_tile_raises():
+    tiles, tile_images = _make_random_tiles(0)
+    merger = LinearBlendingTileMerger(dst_image=np.zeros((200, 260, 3), dtype=np.uint8), tiles=tiles, blend_amount=0)
+    merger.add_tile(1, tile_images[1])
+    with pytest.raises(ValueError):
+        merger.add_tile(1, tile_images[1])
+
+
+@pytest.mark.parametrize("tile_idx", [-1, 1000])
+def test_tile_merger_out_of_range_tile_raises(tile_idx: int):
+    tiles, tile_images = _make_random_tiles(0)
+    merger = LinearBlendingTileMerger(dst_image=np.zeros((200, 260, 3), dtype=np.uint8), tiles=tiles, blend_amount=0)
+    with pytest.raises(ValueError):
+        merger.add_tile(tile_idx, tile_images[0])
+
+
+def test_tile_merger_finalize_incomplete_raises():
+    tiles, tile_images = _make_random_tiles(0)
+    merger = LinearBlendingTileMerger(dst_image=np.zeros((200, 260, 3), dtype=np.uint8), tiles=tiles, blend_amount=0)
+    for tile_idx in range(len(tiles) - 1):
+        merger.add_tile(tile_idx, tile_images[tile_idx])
+    assert not merger.is_complete
+    with pytest.raises(ValueError):
+        merger.finalize()
+
+
+def test_tile_merger_subclass_missing_hooks_raises():
+    """Test that a TileMerger subclass that does not implement the merge hooks cannot be instantiated."""
+
+    class IncompleteTileMerger(TileMerger):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteTileMerger(dst_image=np.zeros((8, 8, 3), dtype=np.uint8), tiles=[], blend_amount=0)  # type: ignore
+
+
+def test_get_linear_blend_mask_cached_read_only():
+    mask = _get_linear_blend_mask(64, 16, 8)
+    assert mask is _get_linear_blend_mask(64, 16, 8)
+    assert mask.dtype == np.float32
+    assert not mask.flags.writeable
+    with pytest.raises(ValueError):
+        mask[0] = 1.0
@@ -0,0 +1,112 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from invokeai.backend.util.tracing import Tracer, write_chrome_trace, write_otlp_json
+
+
+@pytest.fixture
+def tracer() -> Tracer:
+    tracer = Tracer()
+    tracer.enable()
+    return tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("a"):
+        tracer.add_span("b", start_ns=0, end_ns=1)
+    assert tracer.collect_spans() == []
+
+
+def test_disabled_tracer_returns_shared_null_context():
+    tracer = Tracer()
+    assert tracer.span("a") is tracer.span("b", x=1)
+
+
+def test_nested_spans(tracer: Tracer):
+    with tracer.span("outer", category="session", session_id="abc"):
+        with tracer.span("inner"):
+            pass
+        tracer.add_span("retroactive", start_ns=1, end_ns=2)
+
+    spans = {s.name: s for s in tracer.collect_spans()}
+    assert spans["outer"].parent_id is None
+    assert spans["outer"].category == "session"
+    assert spans["outer"].attributes == {"session_id": "abc"}
+    assert spans["inner"].parent_id == spans["outer"].span_id
+    assert spans["retroactive"].parent_id == spans["outer"].span_id
+    assert spans["inner"].start_ns >= spans["outer"].start_ns
+    assert spans["inner"].end_ns <= spans["outer"].end_ns
+    # Collecting clears the buffer.
+    assert tracer.collect_spans() == []
+
+
+def test_span_records_error(tracer: Tracer):
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError("boom")
+
+    (span,) = tracer.collect_spans()
+    assert span.attributes["error"] == "ValueError"
+
+
+def test_nesting_is_per_thread(tracer: Tracer):
+    def worker():
+        with tracer.span("worker"):
+            pass
+
+    with tracer.span("main"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    spans = {s.name: s for s in tracer.collect_spans()}
+    assert spans["worker"].parent_id is None
+    assert spans["worker"].thread_id != spans["main"].thread_id
+
+
+def test_write_chrome_trace(tracer: Tracer, tmp_path: Path):
+    with tracer.span("outer", category="session", obj=object()):
+        with tracer.span("inner", step=3):
+            pass
+    path = tmp_path / "trace.json"
+    write_chrome_trace(tracer.collect_spans(), path)
+
+    events = json.loads(path.read_text())["traceEvents"]
+    complete_events = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert set(complete_events) == {"outer", "inner"}
+    assert complete_events["outer"]["cat"] == "session"
+    assert isinstance(complete_events["outer"]["args"]["obj"], str)
+    assert complete_events["inner"]["args"] == {"step": 3}
+    assert complete_events["inner"]["ts"] >= complete_events["outer"]["ts"]
+    assert [e["ph"] for e in events].count("M") == 1
+
+
+def test_write_otlp_json(tracer: Tracer, tmp_path: Path):
+    with tracer.span("outer", category="session", ok=True):
+        with tracer.span("inner", step=3, ratio=0.5):
+            pass
+    spans = tracer.collect_spans()
+    path = tmp_path / "trace.otlp.json"
+    write_otlp_json(spans, path, trace_id="session-1")
+    write_otlp_json(spans, path, trace_id="session-2")
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    request = json.loads(lines[0])
+    otlp_spans = {s["name"]: s for s in request["resourceSpans"][0]["scopeSpans"][0]["spans"]}
+    outer, inner = otlp_spans["outer"], otlp_spans["inner"]
+    assert len(outer["traceId"]) == 32
+    assert len(outer["spanId"]) == 16
+    assert outer["traceId"] == inner["traceId"]
+    assert outer["traceId"] != json.loads(lines[1])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["traceId"]
+    assert "parentSpanId" not in outer
+    assert inner["parentSpanId"] == outer["spanId"]
+    assert int(inner["startTimeUnixNano"]) <= int(inner["endTimeUnixNano"])
+    attributes = {a["key"]: a["value"] for a in inner["attributes"]}
+    assert attributes["step"] == {"intValue": "3"}
+    assert attributes["ratio"] == {"doubleValue": 0.5}
+    assert {a["key"]: a["value"] for a in outer["attributes"]}["ok"] == {"boolValue": True}
@@ -62,6 +62,7 @@ def mock_services() -> InvocationServices:
         model_relationship_records=None,  # type: ignore
         model_relationships=None,  # type: ignore
         client_state_persistence=None,  # type: ignore
+        performance_history=None,  # type: ignore
     )
 
 
@@ -17,6 +17,10 @@ class StrippedModelOnDisk(ModelOnDisk):
         path = self.resolve_weight_file(path)
         return self.load_stripped_model(path)
 
+    def load_state_dict_meta(self, path: Optional[Path] = None) -> StateDict:
+        # Stripped models only have metadata to begin with
+        return self.load_state_dict(path)
+
     def metadata(self, path: Optional[Path] = None) -> dict[str, str]:
         path = self.resolve_weight_file(path)
         with open(path, "r") as f:
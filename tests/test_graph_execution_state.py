@@ -5,7 +5,9 @@ import pytest
 
 from invokeai.app.invocations.baseinvocation import BaseInvocation, BaseInvocationOutput, InvocationContext
 from invokeai.app.invocations.collections import RangeInvocation
+from invokeai.app.invocations.fields import ImageField
 from invokeai.app.invocations.math import AddInvocation, MultiplyInvocation
+from invokeai.app.invocations.primitives import ImageCollectionInvocation
 from invokeai.app.services.shared.graph import (
     CollectInvocation,
     Graph,
@@ -15,6 +17,7 @@ from invokeai.app.services.shared.graph import (
 
 # This import must happen before other invoke imports or test in other files(!!) break
 from tests.test_nodes import (
+    ListPassThroughInvocation,
     PromptCollectionTestInvocation,
     PromptTestInvocation,
     TextToImageTestInvocation,
@@ -272,6 +275,161 @@ def test_graph_nested_iterate_execution_order(execution_number: int):
     assert sum_values == [0, 1, 10, 11]
 
 
+def test_graph_state_expands_product_of_iterators():
+    """Tests that a node with two independent iterator ancestors runs once for each combination of their items"""
+    graph = Graph()
+    graph.add_node(RangeInvocation(id="range_a", start=0, stop=3, step=1))
+    graph.add_node(RangeInvocation(id="range_b", start=0, stop=20, step=10))
+    graph.add_node(IterateInvocation(id="iter_a"))
+    graph.add_node(IterateInvocation(id="iter_b"))
+    graph.add_node(AddInvocation(id="sum"))
+    graph.add_node(CollectInvocation(id="collect"))
+    graph.add_edge(create_edge("range_a", "collection", "iter_a", "collection"))
+    graph.add_edge(create_edge("range_b", "collection", "iter_b", "collection"))
+    graph.add_edge(create_edge("iter_a", "item", "sum", "a"))
+    graph.add_edge(create_edge("iter_b", "item", "sum", "b"))
+    graph.add_edge(create_edge("sum", "value", "collect", "item"))
+
+    g = GraphExecutionState(graph=graph)
+    while not g.is_complete():
+        invoke_next(g)
+
+    (collect_id,) = g.source_prepared_mapping["collect"]
+    assert sorted(g.results[collect_id].collection) == [0, 1, 2, 10, 11, 12]
+
+
+def test_graph_state_iterates_collected_results():
+    """Tests iterating over a collection of iterated results, i.e. iterate -> collect -> iterate"""
+    graph = Graph()
+    graph.add_node(RangeInvocation(id="range", start=0, stop=3, step=1))
+    graph.add_node(IterateInvocation(id="iter_1"))
+    graph.add_node(MultiplyInvocation(id="mul", b=10))
+    graph.add_node(CollectInvocation(id="collect"))
+    graph.add_node(IterateInvocation(id="iter_2"))
+    graph.add_node(AddInvocation(id="add", b=1))
+    graph.add_edge(create_edge("range", "collection", "iter_1", "collection"))
+    graph.add_edge(create_edge("iter_1", "item", "mul", "a"))
+    graph.add_edge(create_edge("mul", "value", "collect", "item"))
+    graph.add_edge(create_edge("collect", "collection", "iter_2", "collection"))
+    graph.add_edge(create_edge("iter_2", "item", "add", "a"))
+
+    g = GraphExecutionState(graph=graph)
+    while not g.is_complete():
+        invoke_next(g)
+
+    assert len(g.source_prepared_mapping["add"]) == 3
+    assert {g.results[n].value for n in g.source_prepared_mapping["add"]} == {1, 11, 21}
+
+
+def test_graph_state_large_iteration_does_not_rebuild_graph_structure(monkeypatch: pytest.MonkeyPatch):
+    """Tests that the graph structure is indexed once, not per prepared node, when iterating over many items"""
+    import networkx as nx
+
+    sort_calls = 0
+    topological_sort = nx.topological_sort
+
+    def counting_topological_sort(*args, **kwargs):
+        nonlocal sort_calls
+        sort_calls += 1
+        return topological_sort(*args, **kwargs)
+
+    monkeypatch.setattr(nx, "topological_sort", counting_topological_sort)
+
+    count = 200
+    graph = Graph()
+    graph.add_node(RangeInvocation(id="range", start=0, stop=count, step=1))
+    graph.add_node(IterateInvocation(id="iterate"))
+    graph.add_node(MultiplyInvocation(id="mul", b=10))
+    graph.add_node(AddInvocation(id="add", b=1))
+    graph.add_node(CollectInvocation(id="collect"))
+    graph.add_edge(create_edge("range", "collection", "iterate", "collection"))
+    graph.add_edge(create_edge("iterate", "item", "mul", "a"))
+    graph.add_edge(create_edge("mul", "value", "add", "a"))
+    graph.add_edge(create_edge("add", "value", "collect", "item"))
+
+    g = GraphExecutionState(graph=graph)
+    while not g.is_complete():
+        invoke_next(g)
+
+    (collect_id,) = g.source_prepared_mapping["collect"]
+    assert g.results[collect_id].collection == [i * 10 + 1 for i in range(count)]
+    assert len(g.execution_graph.nodes) == 3 * count + 2
+    # Sorted once each when indexing: the source graph, its iterator graph and the (initially empty) execution graph
+    assert sort_calls <= 3
+
+
+def test_graph_state_reindexes_after_graph_modification():
+    """Tests that nodes added through the execution state API after preparation has started are executed"""
+    graph = Graph()
+    graph.add_node(PromptTestInvocation(id="1", prompt="Banana sushi"))
+    g = GraphExecutionState(graph=graph)
+    invoke_next(g)
+
+    g.add_node(PromptTestInvocation(id="2"))
+    g.add_edge(create_edge("1", "prompt", "2", "prompt"))
+    n, o = invoke_next(g)
+
+    assert n is not None and g.prepared_source_mapping[n.id] == "2"
+    assert o is not None and o.prompt == "Banana sushi"
+    assert g.is_complete()
+
+
+def test_invocations_declare_whether_they_mutate_inputs():
+    from invokeai.app.invocations.compel import CLIPSkipInvocation
+
+    # Core nodes share their inputs unless they declare otherwise
+    assert not AddInvocation.mutates_inputs
+    assert not IterateInvocation.mutates_inputs
+    assert CLIPSkipInvocation.mutates_inputs
+    # Custom nodes (like these test nodes) get copies of their inputs by default
+    assert PromptCollectionTestInvocation.mutates_inputs
+
+
+def test_graph_state_shares_inputs_with_nodes_that_dont_mutate_them():
+    images = [ImageField(image_name=name) for name in ("a", "b", "c")]
+    graph = Graph()
+    graph.add_node(ImageCollectionInvocation(id="images", collection=images))
+    graph.add_node(IterateInvocation(id="iterate"))
+    graph.add_node(CollectInvocation(id="collect"))
+    graph.add_edge(create_edge("images", "collection", "iterate", "collection"))
+    graph.add_edge(create_edge("iterate", "item", "collect", "item"))
+
+    g = GraphExecutionState(graph=graph)
+    while not g.is_complete():
+        invoke_next(g)
+
+    (images_id,) = g.source_prepared_mapping["images"]
+    collection = g.results[images_id].collection
+    iterate_nodes = [g.execution_graph.get_node(n) for n in g.source_prepared_mapping["iterate"]]
+    assert len(iterate_nodes) == 3
+    for node in iterate_nodes:
+        assert all(a is b for a, b in zip(node.collection, collection, strict=True))
+    (collect_id,) = g.source_prepared_mapping["collect"]
+    assert all(a is b for a, b in zip(g.results[collect_id].collection, collection, strict=True))
+
+
+def test_graph_state_copies_inputs_for_nodes_that_mutate_them():
+    images = [ImageField(image_name=name) for name in ("a", "b", "c")]
+    graph = Graph()
+    graph.add_node(ImageCollectionInvocation(id="images", collection=images))
+    graph.add_node(ListPassThroughInvocation(id="pass_through_1"))
+    graph.add_node(ListPassThroughInvocation(id="pass_through_2"))
+    graph.add_edge(create_edge("images", "collection", "pass_through_1", "collection"))
+    graph.add_edge(create_edge("images", "collection", "pass_through_2", "collection"))
+
+    g = GraphExecutionState(graph=graph)
+    while not g.is_complete():
+        invoke_next(g)
+
+    (images_id,) = g.source_prepared_mapping["images"]
+    collection = g.results[images_id].collection
+    for source_id in ("pass_through_1", "pass_through_2"):
+        (node_id,) = g.source_prepared_mapping[source_id]
+        node = g.execution_graph.get_node(node_id)
+        assert node.collection == collection
+        assert not any(a is b for a, b in zip(node.collection, collection, strict=True))
+
+
 def test_graph_validate_self_iterator_without_collection_input_raises_invalid_edge_error():
     """Iterator nodes with no collection input should fail validation cleanly.
 
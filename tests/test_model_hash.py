@@ -1,11 +1,15 @@
 # pyright:reportPrivateUsage=false
 
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
 
 import pytest
 from blake3 import blake3
 
+from invokeai.backend.model_hash.hash_cache import ModelHashCache
 from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS, MODEL_FILE_EXTENSIONS, ModelHash
 
 test_cases: list[tuple[HASHING_ALGORITHMS, str]] = [
@@ -131,3 +135,115 @@ def test_model_hash_uses_custom_filter(tmp_path: Path):
         return file_path.endswith(".pickme")
 
     assert {p.name for p in ModelHash._get_file_paths(tmp_path, file_filter)} == {"file.pickme"}
+
+
+class CountingModelHash(ModelHash):
+    """Counts the files actually hashed, i.e. not served from the cache."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.hashed_files: list[Path] = []
+        hash_file = self._hash_file
+
+        def counting_hash_file(file_path: Path) -> str:
+            self.hashed_files.append(file_path)
+            return hash_file(file_path)
+
+        self._hash_file = counting_hash_file
+
+
+def test_model_hash_cache_skips_unchanged_files(tmp_path: Path):
+    cache = ModelHashCache(tmp_path / "cache" / "model_hashes.db")
+    file = tmp_path / "model.safetensors"
+    file.write_text("model data")
+
+    first = CountingModelHash("blake3_single", cache=cache)
+    hash_ = first.hash(file)
+    assert first.hashed_files == [file]
+
+    # The cache is persistent, and blake3_multi makes the same hash as blake3_single
+    second = CountingModelHash("blake3_multi", cache=ModelHashCache(tmp_path / "cache" / "model_hashes.db"))
+    assert second.hash(file) == hash_
+    assert second.hashed_files == []
+
+    # Other algorithms are cached separately
+    md5 = CountingModelHash("md5", cache=cache)
+    assert md5.hash(file) == "md5:a0cd925fc063f98dbf029eee315060c3"
+    assert md5.hashed_files == [file]
+
+
+def test_model_hash_cache_invalidated_when_file_changes(tmp_path: Path):
+    cache = ModelHashCache()
+    file = tmp_path / "model.safetensors"
+    file.write_text("model data")
+    model_hash = CountingModelHash("blake3_single", cache=cache)
+    hash_ = model_hash.hash(file)
+
+    file.write_text("new model data")
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert model_hash.hash(file) != hash_
+    assert model_hash.hashed_files == [file, file]
+
+
+def test_model_hash_cache_refresh(tmp_path: Path):
+    cache = ModelHashCache()
+    file = tmp_path / "model.safetensors"
+    file.write_text("model data")
+    ModelHash("blake3_single", cache=cache).hash(file)
+
+    refreshing = CountingModelHash("blake3_single", cache=cache, refresh_cache=True)
+    refreshing.hash(file)
+    assert refreshing.hashed_files == [file]
+
+
+def test_model_hash_cache_ignores_random_algorithm(tmp_path: Path):
+    cache = ModelHashCache()
+    file = tmp_path / "model.safetensors"
+    file.write_text("model data")
+    model_hash = ModelHash("random", cache=cache)
+    assert model_hash.hash(file) != model_hash.hash(file)
+
+
+def test_model_hash_cache_dir_components(tmp_path: Path):
+    cache = ModelHashCache()
+    for i in range(3):
+        (tmp_path / f"{i}.bin").write_text(f"data{i}")
+
+    hash_ = ModelHash("sha256", cache=cache).hash(tmp_path)
+    model_hash = CountingModelHash("sha256", cache=cache)
+    assert model_hash.hash(tmp_path) == hash_
+    assert model_hash.hashed_files == []
+
+    (tmp_path / "1.bin").write_text("changed")
+    assert model_hash.hash(tmp_path) != hash_
+    assert model_hash.hashed_files == [tmp_path / "1.bin"]
+
+
+def test_model_hash_hash_many_limits_concurrency_per_device(tmp_path: Path):
+    files = [tmp_path / f"{i}.safetensors" for i in range(6)]
+    for i, f in enumerate(files):
+        f.write_text(f"data{i}")
+    missing = tmp_path / "missing.safetensors"
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    class SlowModelHash(ModelHash):
+        def hash(self, model_path: str | Path) -> str:
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return super().hash(model_path)
+
+    results = SlowModelHash("md5").hash_many([*files, missing], max_workers_per_device=2)
+
+    assert {p: r for p, r in results.items() if p != missing} == {f: ModelHash("md5").hash(f) for f in files}
+    assert isinstance(results[missing], OSError)
+    # All the files are on the same device
+    assert max_running == 2
@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 
 import pytest
@@ -140,3 +141,28 @@ def test_model_search_handles_diffusers_model_dirs(model_search: tuple[ModelSear
     assert on_model_found_called_with == expected
     assert search.stats.models_found == 2
     assert search.stats.models_filtered == 2
+
+
+def test_model_search_with_multiple_workers(tmp_path: Path):
+    files = [tmp_path / f"dir_{i}" / f"subdir_{j}" / f"model_{i}_{j}.safetensors" for i in range(4) for j in range(3)]
+    diffusers_dir = tmp_path / "dir_0" / "diffusers_dir"
+    diffusers_dir.mkdir(parents=True)
+    (diffusers_dir / "model_index.json").write_text("")
+    (diffusers_dir / "ignore_me.ckpt").write_text("")
+    for file in files:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text("")
+
+    callback_threads: set[int] = set()
+
+    def on_model_found_callback(path: Path) -> bool:
+        callback_threads.add(threading.get_ident())
+        return True
+
+    search = ModelSearch(on_model_found=on_model_found_callback, max_workers=4)
+    found = search.search(tmp_path)
+
+    assert found == {*files, diffusers_dir}
+    assert search.stats.models_found == 13
+    # Callbacks are only invoked from the searching thread
+    assert callback_threads == {threading.get_ident()}
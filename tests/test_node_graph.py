@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from pydantic import TypeAdapter
 from pydantic.json_schema import models_json_schema
@@ -29,6 +31,8 @@ from invokeai.app.services.shared.graph import (
     IterateInvocation,
     NodeAlreadyInGraphError,
     NodeNotFoundError,
+    _are_invocation_fields_compatible,
+    _validated_graphs,
     are_connections_compatible,
 )
 from tests.test_nodes import (
@@ -454,6 +458,54 @@ def test_graph_invalid_with_invalid_connection():
     assert g.is_valid() is False
 
 
+def test_graph_validation_is_cached_by_structure():
+    def build_graph(prompt: str) -> Graph:
+        g = Graph()
+        g.add_node(TextToImageTestInvocation(id="1", prompt=prompt))
+        g.add_node(ESRGANInvocation(id="2"))
+        g.add_edge(create_edge("1", "image", "2", "image"))
+        return g
+
+    _validated_graphs.clear()
+    build_graph("Banana sushi").validate_self()
+    same_structure = build_graph("Apple pie")
+    different_structure = build_graph("Banana sushi")
+    different_structure.add_node(ESRGANInvocation(id="3"))
+
+    with patch.object(Graph, "nx_graph_flat", autospec=True, side_effect=Graph.nx_graph_flat) as nx_graph_flat:
+        # Graphs with the same structure are not re-validated, even if their field values differ
+        same_structure.validate_self()
+        nx_graph_flat.assert_not_called()
+
+        # Changing the structure requires validation
+        different_structure.validate_self()
+        nx_graph_flat.assert_called_once()
+
+
+def test_graph_validation_failures_are_not_cached():
+    _validated_graphs.clear()
+    g = Graph()
+    g.nodes["1"] = TextToImageTestInvocation(id="1", prompt="Banana sushi")
+    g.nodes["2"] = PromptTestInvocation(id="2")
+    g.edges.append(create_edge("1", "image", "2", "prompt"))
+
+    for _ in range(2):
+        with pytest.raises(InvalidEdgeError):
+            g.validate_self()
+
+
+def test_connection_compatibility_is_cached_by_class_and_field():
+    _are_invocation_fields_compatible.cache_clear()
+    for i in range(3):
+        from_node = TextToImageTestInvocation(id=f"from_{i}", prompt="Banana sushi")
+        to_node = ESRGANInvocation(id=f"to_{i}")
+        assert are_connections_compatible(from_node, "image", to_node, "image") is True
+        assert are_connections_compatible(from_node, "image", to_node, "tile_size") is False
+    cache_info = _are_invocation_fields_compatible.cache_info()
+    assert cache_info.misses == 2
+    assert cache_info.hits == 4
+
+
 def test_graph_gets_networkx_graph():
     g = Graph()
     n1 = TextToImageTestInvocation(id="1", prompt="Banana sushi")